@@ -0,0 +1,170 @@
+"""
+=================================================================
+BENCHMARK: ARRANQUE DE LA APLICACIÓN (LOGIN Y MENÚ)
+=================================================================
+Lanza la aplicación en procesos nuevos (arranque en frío de Python)
+y mide:
+  - importar PyQt6.QtWidgets
+  - importar Controladores.LoginControlador (lo que se importa al arrancar)
+  - tiempo hasta la primera ventana (QApplication + login visible)
+  - abrir el menú principal después del login
+
+Además falla (código de salida 1) si al mostrarse el login ya se
+importó algún módulo que debería cargarse después (mysql.connector,
+la capa de datos o los módulos de la clínica), o si algún tiempo
+empeora más de TOLERANCIA respecto de la línea base guardada.
+
+Usa la plataforma 'offscreen' de Qt, así que corre sin pantalla.
+
+Uso:
+    python Benchmarks/benchmark_arranque.py                 # comparar con la línea base
+    python Benchmarks/benchmark_arranque.py --guardar       # medir y guardar la línea base
+    python Benchmarks/benchmark_arranque.py --repeticiones 10
+=================================================================
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import json
+import statistics
+import subprocess
+
+RAIZ = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+LINEA_BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'linea_base_arranque.json')
+
+REPETICIONES = 5
+# Un tiempo empeora si supera la línea base en más de este porcentaje y de MARGEN_MS
+TOLERANCIA = 0.25
+MARGEN_MS = 30.0
+
+# Módulos que NO deben estar importados cuando el login ya está en pantalla
+MODULOS_DIFERIDOS = [
+    'mysql.connector',
+    'Config.database_config',
+    'Controladores.MenuControlador',
+    'Controladores.PacienteControlador',
+    'Controladores.DoctorControlador',
+    'Controladores.CitaControlador',
+    'Controladores.TratamientoControlador',
+    'Controladores.HorarioControlador',
+    'Controladores.FacturaControlador',
+    'Vistas.PacienteVista',
+    'Vistas.DoctorVista',
+    'Vistas.CitaVista',
+    'Vistas.FacturaVista',
+    'Vistas.HorarioVista',
+    'Vistas.TratamientoVista',
+]
+
+# Código que corre en el proceso hijo; imprime una línea JSON con los tiempos
+_PROCESO_HIJO = r"""
+import json, sys, time
+inicio = time.perf_counter()
+sys.path.insert(0, {raiz!r})
+
+import PyQt6.QtWidgets
+t_qt = time.perf_counter()
+
+from Controladores.LoginControlador import LoginControlador
+t_login = time.perf_counter()
+
+from PyQt6.QtWidgets import QApplication
+app = QApplication([])
+controlador = LoginControlador()
+controlador.mostrar()
+# Módulos importados para mostrar el login (antes de que arranque la carga en segundo plano)
+cargados = [m for m in {diferidos!r} if m in sys.modules]
+app.processEvents()
+t_ventana = time.perf_counter()
+
+from Controladores.MenuControlador import MenuControlador
+menu = MenuControlador("benchmark", "admin")
+menu.mostrar()
+app.processEvents()
+t_menu = time.perf_counter()
+
+print(json.dumps({{
+    'importar_qt_ms': (t_qt - inicio) * 1000,
+    'importar_login_ms': (t_login - t_qt) * 1000,
+    'primera_ventana_ms': (t_ventana - inicio) * 1000,
+    'abrir_menu_ms': (t_menu - t_ventana) * 1000,
+    'modulos_adelantados': cargados,
+}}))
+"""
+
+METRICAS = ['importar_qt_ms', 'importar_login_ms', 'primera_ventana_ms', 'abrir_menu_ms']
+
+
+def medir_una_vez() -> dict:
+    entorno = dict(os.environ, QT_QPA_PLATFORM='offscreen')
+    codigo = _PROCESO_HIJO.format(raiz=RAIZ, diferidos=MODULOS_DIFERIDOS)
+    proceso = subprocess.run([sys.executable, '-c', codigo], cwd=RAIZ, env=entorno,
+                             capture_output=True, text=True, timeout=120)
+    if proceso.returncode != 0:
+        raise RuntimeError(f"El proceso de arranque falló:\n{proceso.stderr}")
+    # La aplicación también escribe en stdout: el resultado es la última línea
+    return json.loads(proceso.stdout.strip().splitlines()[-1])
+
+
+def medir(repeticiones: int) -> dict:
+    """Mediana de cada tiempo en `repeticiones` arranques en frío"""
+    muestras = [medir_una_vez() for _ in range(repeticiones)]
+    resultado = {m: round(statistics.median(s[m] for s in muestras), 1) for m in METRICAS}
+    resultado['modulos_adelantados'] = sorted({m for s in muestras for m in s['modulos_adelantados']})
+    return resultado
+
+
+def comparar(actual: dict, base: dict) -> list:
+    """Devuelve la lista de tiempos que empeoraron respecto de la línea base"""
+    regresiones = []
+    for metrica in METRICAS:
+        if metrica not in base:
+            continue
+        limite = max(base[metrica] * (1 + TOLERANCIA), base[metrica] + MARGEN_MS)
+        if actual[metrica] > limite:
+            regresiones.append(f"{metrica}: {actual[metrica]:.1f} ms (línea base {base[metrica]:.1f} ms, "
+                               f"límite {limite:.1f} ms)")
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide el arranque en frío de la aplicación")
+    parser.add_argument('--guardar', action='store_true', help="guardar los tiempos como línea base")
+    parser.add_argument('--repeticiones', type=int, default=REPETICIONES)
+    args = parser.parse_args()
+
+    actual = medir(args.repeticiones)
+
+    print("=" * 60)
+    print(f"ARRANQUE EN FRÍO - mediana de {args.repeticiones} ejecuciones")
+    print("=" * 60)
+    for metrica in METRICAS:
+        print(f"{metrica:<24}{actual[metrica]:>10.1f} ms")
+
+    fallos = []
+    if actual['modulos_adelantados']:
+        fallos.append("Módulos importados antes de mostrar el login: " + ", ".join(actual['modulos_adelantados']))
+
+    if args.guardar:
+        with open(LINEA_BASE, 'w', encoding='utf-8') as archivo:
+            json.dump({m: actual[m] for m in METRICAS}, archivo, indent=2)
+        print(f"\n💾 Línea base guardada en {LINEA_BASE}")
+    elif os.path.exists(LINEA_BASE):
+        with open(LINEA_BASE, encoding='utf-8') as archivo:
+            fallos.extend(comparar(actual, json.load(archivo)))
+    else:
+        print("\nℹ️ No hay línea base; ejecute con --guardar para crearla")
+
+    if fallos:
+        print("\n❌ REGRESIONES:")
+        for fallo in fallos:
+            print(f"   • {fallo}")
+        sys.exit(1)
+    print("\n✅ Arranque dentro de los límites")
+
+
+if __name__ == "__main__":
+    main()
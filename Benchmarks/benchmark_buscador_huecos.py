@@ -0,0 +1,106 @@
+"""
+=================================================================
+BENCHMARK: BUSCADOR DE ESPACIOS LIBRES
+=================================================================
+Genera una agenda sintética de 30 doctores a 6 meses (sin tocar la BD)
+y mide cuánto tarda BuscadorHuecos en devolver los próximos espacios
+sobre la agenda precalculada (el precálculo se informa aparte: se hace
+una vez y se reutiliza durante `vigencia` segundos).
+
+Escenarios:
+- agenda normal: ~70% de los bloques del horario ocupados
+- agenda llena: todo ocupado salvo la última semana (peor caso: recorre
+  casi todo el horizonte antes de encontrar espacios)
+
+Objetivo: menos de 10 ms por búsqueda.
+
+Uso:
+    python Benchmarks/benchmark_buscador_huecos.py
+=================================================================
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from Modelos.DoctorModelo import Doctor
+from Modelos.BuscadorHuecos import BuscadorHuecos
+
+DOCTORES = 30
+DIAS = 182
+REPETICIONES = 50
+
+
+def crear_doctores():
+    doctores = []
+    for i in range(DOCTORES):
+        doctor = Doctor(f"Doctor{i}", "Prueba", 1000 + i, "General", 70000000, f"doc{i}@clinica.com")
+        doctor.id_doctor = str(1000 + i)
+        doctores.append(doctor)
+    return doctores
+
+
+def crear_agenda(doctores, inicio: date, ocupacion: float, dias_libres_al_final: int = 0):
+    """Horario 08:00-12:00 y 13:00-17:00 para todos; citas de 30 min según la ocupación"""
+    random.seed(42)
+    disponibilidad = []
+    for doctor in doctores:
+        disponibilidad.append((doctor.id_doctor, "08:00", "12:00"))
+        disponibilidad.append((doctor.id_doctor, "13:00", "17:00"))
+
+    citas = []
+    for dia in range(DIAS - dias_libres_al_final):
+        fecha = inicio + timedelta(days=dia)
+        for doctor in doctores:
+            for hora in list(range(8 * 60, 12 * 60, 30)) + list(range(13 * 60, 17 * 60, 30)):
+                if random.random() < ocupacion:
+                    citas.append((doctor.id_doctor, fecha, f"{hora // 60:02d}:{hora % 60:02d}",
+                                  f"{(hora + 30) // 60:02d}:{(hora + 30) % 60:02d}"))
+    return disponibilidad, citas
+
+
+def medir(nombre, buscador, doctores, disponibilidad, citas, inicio, duracion):
+    ahora = datetime.combine(inicio, datetime.min.time())
+    fin = inicio + timedelta(days=DIAS - 1)
+
+    t0 = time.perf_counter()
+    buscador.preparar(disponibilidad, citas)
+    preparacion = (time.perf_counter() - t0) * 1000
+
+    tiempos = []
+    for _ in range(REPETICIONES):
+        t0 = time.perf_counter()
+        huecos = buscador.buscar_preparado(doctores, inicio, fin, duracion, 10, ahora)
+        tiempos.append(time.perf_counter() - t0)
+
+    tiempos.sort()
+    mediana = tiempos[len(tiempos) // 2] * 1000
+    peor = tiempos[-1] * 1000
+    primero = f"{huecos[0]['fecha']} {huecos[0]['hora_inicio']}" if huecos else "-"
+    print(f"{nombre:<26} | {len(citas):>6} citas | {duracion:>3} min | precálculo {preparacion:6.1f} ms | "
+          f"búsqueda: mediana {mediana:5.2f} ms, peor {peor:5.2f} ms | primero: {primero}")
+
+
+def main():
+    inicio = date.today() + timedelta(days=1)
+    doctores = crear_doctores()
+    buscador = BuscadorHuecos()
+
+    print("=" * 110)
+    normal = crear_agenda(doctores, inicio, 0.7)
+    medir("agenda normal (70%)", buscador, doctores, *normal, inicio, 30)
+    medir("agenda normal (70%)", buscador, doctores, *normal, inicio, 60)
+    medir("un solo doctor", buscador, doctores[:1], *normal, inicio, 60)
+
+    llena = crear_agenda(doctores, inicio, 1.0, dias_libres_al_final=7)
+    medir("agenda llena (peor caso)", buscador, doctores, *llena, inicio, 30)
+    print("=" * 110)
+    print("Nota: la carga desde la BD son dos consultas aparte (Horario y Cita) que no se miden aquí.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+=================================================================
+BENCHMARK: BÚSQUEDA DE PACIENTES POR NOMBRE
+=================================================================
+Construye un IndiceBusqueda con N pacientes sintéticos (nombres y
+apellidos con acentos) y mide búsquedas por prefijo, por parte del
+apellido, por nombre y apellido, y difusas (con errores de tipeo).
+
+Como referencia mide también el recorrido lineal que hacía antes
+PacienteControlador (lower() de cada nombre en cada búsqueda).
+
+Uso:
+    python Benchmarks/benchmark_busqueda_pacientes.py
+    python Benchmarks/benchmark_busqueda_pacientes.py 200000
+=================================================================
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+import time
+
+from Modelos.IndiceBusqueda import IndiceBusqueda
+
+NOMBRES = ["María", "José", "Ana", "Luis", "Carlos", "Sofía", "Andrés", "Lucía", "Jorge", "Camila",
+           "Ricardo", "Valeria", "Fernando", "Daniela", "Óscar", "Gabriela", "Raúl", "Elena", "Iván", "Inés"]
+APELLIDOS = ["Vásquez", "López", "García", "Martínez", "Hernández", "Rodríguez", "Pérez", "Sánchez",
+             "Ramírez", "Flores", "Rivas", "Mendoza", "Zelaya", "Pineda", "Núñez", "Alvarado", "Quijano",
+             "Portillo", "Renderos", "Arriola", "Castillo", "Guzmán", "Orellana", "Cañas", "Ibáñez"]
+
+BUSQUEDAS = [
+    ("prefijo corto (apellido='va')", {'apellido': 'va'}),
+    ("parte del apellido (apellido='asq')", {'apellido': 'asq'}),
+    ("apellido sin acento (apellido='vasquez')", {'apellido': 'vasquez'}),
+    ("nombre y apellido (nombre='maria', apellido='nunez')", {'nombre': 'maria', 'apellido': 'nunez'}),
+    ("nombre compuesto poco común (nombre='ines', apellido='canas ibanez')", {'nombre': 'ines', 'apellido': 'canas ibanez'}),
+    ("difusa (apellido='Vasques Lopes')", {'apellido': 'Vasques Lopes'}),
+]
+
+REPETICIONES = 20
+
+
+class PacienteSintetico:
+    __slots__ = ('id_paciente', 'nombre', 'apellido')
+
+    def __init__(self, id_paciente, nombre, apellido):
+        self.id_paciente = id_paciente
+        self.nombre = nombre
+        self.apellido = apellido
+
+
+def generar_pacientes(n: int):
+    aleatorio = random.Random(42)
+    pacientes = []
+    for id_paciente in range(1, n + 1):
+        nombre = aleatorio.choice(NOMBRES)
+        if aleatorio.random() < 0.3:
+            nombre += " " + aleatorio.choice(NOMBRES)
+        apellido = f"{aleatorio.choice(APELLIDOS)} {aleatorio.choice(APELLIDOS)}"
+        pacientes.append(PacienteSintetico(id_paciente, nombre, apellido))
+    return pacientes
+
+
+def busqueda_lineal(pacientes, nombre: str = "", apellido: str = ""):
+    """La búsqueda anterior: sensible a acentos y recorriendo toda la lista"""
+    nombre_lower = nombre.lower()
+    apellido_lower = apellido.lower()
+    return [p for p in pacientes
+            if (not nombre_lower or nombre_lower in p.nombre.lower())
+            and (not apellido_lower or apellido_lower in p.apellido.lower())]
+
+
+def medir(funcion) -> float:
+    """Devuelve los milisegundos promedio de REPETICIONES ejecuciones"""
+    inicio = time.perf_counter()
+    for _ in range(REPETICIONES):
+        funcion()
+    return (time.perf_counter() - inicio) * 1000 / REPETICIONES
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    pacientes = generar_pacientes(n)
+
+    indice = IndiceBusqueda(('apellido', 'nombre'))
+    inicio = time.perf_counter()
+    indice.reconstruir((p.id_paciente, p, {'nombre': p.nombre, 'apellido': p.apellido}) for p in pacientes)
+    construccion = time.perf_counter() - inicio
+
+    print("=" * 86)
+    print(f"BÚSQUEDA DE PACIENTES - {n:,} pacientes (índice construido en {construccion:.2f} s)")
+    print("=" * 86)
+    print(f"{'Búsqueda':<66}{'Índice':>9}{'Lineal':>11}")
+    print("-" * 86)
+    for descripcion, terminos in BUSQUEDAS:
+        resultados = indice.buscar(**terminos)
+        ms_indice = medir(lambda: indice.buscar(limite=50, **terminos))
+        ms_lineal = medir(lambda: busqueda_lineal(pacientes, **terminos))
+        print(f"{descripcion:<66}{ms_indice:>7.2f}ms{ms_lineal:>9.2f}ms   ({len(resultados)} resultados)")
+
+    # Inserción incremental (lo que pasa al crear un paciente)
+    nuevo = PacienteSintetico(n + 1, "Paciente", "Nuevo Ingreso")
+    ms_insercion = medir(lambda: indice.agregar(nuevo.id_paciente, nuevo, nombre=nuevo.nombre, apellido=nuevo.apellido))
+    print("-" * 86)
+    print(f"Inserción incremental de un paciente: {ms_insercion:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+"""
+=================================================================
+BENCHMARK: MODELOS A ESCALA 1x / 10x / 100x
+=================================================================
+Llena una base de pruebas con DB/GenerarDatos.py a cada escala y
+mide las consultas de los modelos (Modelos/*) contra ella:
+
+    escala 1   ->   1.000 pacientes,    10.000 citas,   3.000 facturas
+    escala 10  ->  10.000 pacientes,   100.000 citas,  30.000 facturas
+    escala 100 -> 100.000 pacientes, 1.000.000 citas, 300.000 facturas
+
+De cada caso se guarda la mediana de N repeticiones. Los resultados
+se comparan con Benchmarks/linea_base_modelos.json (por motor, escala
+y caso) y el script falla (código de salida 1) si alguno empeora más de
+TOLERANCIA. Con --guardar los tiempos medidos pasan a ser la línea
+base (solo se reemplazan las escalas medidas).
+
+La caché de referencia se vacía antes de cada repetición, así se
+mide siempre el viaje a la BD.
+
+Uso:
+    python Benchmarks/benchmark_modelos.py --escalas 1 10 --guardar
+    python Benchmarks/benchmark_modelos.py --escalas 1 10
+    python Benchmarks/benchmark_modelos.py --escalas 100 --casos Cita Factura
+    python Benchmarks/benchmark_modelos.py --escalas 10 --sin-generar   # reutiliza los datos ya cargados
+    python Benchmarks/benchmark_modelos.py --motor sqlite --escalas 1 10  # sin servidor MySQL (en memoria)
+=================================================================
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import json
+import statistics
+import time
+from datetime import date, timedelta
+
+from Config.database_config import BACKENDS, DatabaseConfig
+from DB.GenerarDatos import BASE_PRUEBAS, GeneradorDatos, preparar_base
+
+from Modelos.AgendaDoctor import AgendaDoctor
+from Modelos.CacheReferencia import obtener_cache_referencia
+from Modelos.CitaModelo import Cita
+from Modelos.ConsultasPacientes import ConsultasPacientes
+from Modelos.DoctorModelo import Doctor
+from Modelos.FacturaModelo import FacturacionModel
+from Modelos.HorarioModelo import Horario, HorarioModel
+from Modelos.loginModelo import LoginModelo
+from Modelos.PacienteModelo import Paciente
+from Modelos.ReportePacientes import GeneradorReportePacientes
+from Modelos.ResumenIngresos import ResumenIngresos
+from Modelos.TratamientoModelo import Tratamiento
+
+LINEA_BASE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'linea_base_modelos.json')
+
+ESCALAS = [1, 10, 100]
+REPETICIONES = 3
+# Un caso empeora si supera la línea base en más de este porcentaje y de MARGEN_MS
+TOLERANCIA = 0.25
+MARGEN_MS = 20.0
+
+# Doctor y paciente que existen a cualquier escala (ver DB/GenerarDatos.py)
+DOCTOR = '10001'
+PACIENTE = 1
+
+
+def casos(hoy: date) -> list:
+    """(nombre, función sin argumentos) de cada entrada de los modelos que se mide"""
+    horarios = HorarioModel(cargar=False)
+    login = LoginModelo()
+    return [
+        # Citas
+        ("Cita.obtener_citas_bd (historial completo)", lambda: Cita.obtener_citas_bd()),
+        ("Cita.obtener_citas_bd (próximos 30 días)",
+         lambda: Cita.obtener_citas_bd(fecha_desde=hoy, fecha_hasta=hoy + timedelta(days=30))),
+        ("Cita.obtener_pagina_citas_bd (primera página)",
+         lambda: Cita.obtener_pagina_citas_bd(50, fecha_desde=hoy)[0]),
+        ("Cita.obtener_cita_por_id_bd", lambda: Cita.obtener_cita_por_id_bd(1)),
+        ("Cita.obtener_ultimo_id_bd", lambda: Cita.obtener_ultimo_id_bd()),
+        ("Cita.obtener_intervalos_doctor_bd", lambda: Cita.obtener_intervalos_doctor_bd(DOCTOR, hoy)),
+        ("Cita.obtener_ocupacion_bd (30 días)",
+         lambda: Cita.obtener_ocupacion_bd(hoy, hoy + timedelta(days=30))),
+        # Pacientes
+        ("Paciente.obtener_todos_los_pacientes", lambda: Paciente.obtener_todos_los_pacientes()),
+        ("Paciente.buscar_pacientes_por_nombre_apellido",
+         lambda: Paciente.buscar_pacientes_por_nombre_apellido("", "Mendoza")),
+        ("Paciente.obtener_historial_medico_desde_bd", lambda: Paciente.obtener_historial_medico_desde_bd(PACIENTE)),
+        ("ConsultasPacientes.obtener_resumen", lambda: ConsultasPacientes.obtener_resumen()),
+        ("ConsultasPacientes.pacientes_con_saldo_pendiente (50)",
+         lambda: ConsultasPacientes.pacientes_con_saldo_pendiente(50)),
+        ("GeneradorReportePacientes.generar (solo totales)",
+         lambda: GeneradorReportePacientes().generar(lambda texto: None, incluir_detalle=False)),
+        # Facturas
+        ("FacturacionModel.obtener_todas_facturas_bd", lambda: FacturacionModel.obtener_todas_facturas_bd()),
+        ("FacturacionModel.obtener_pacientes", lambda: FacturacionModel.obtener_pacientes()),
+        ("FacturacionModel.paciente_tiene_factura_hoy", lambda: FacturacionModel.paciente_tiene_factura_hoy(PACIENTE)),
+        ("FacturacionModel.factura_existe", lambda: FacturacionModel.factura_existe('F001')),
+        ("ResumenIngresos.consultar (último año por doctor)",
+         lambda: ResumenIngresos.consultar(hoy - timedelta(days=365), hoy, ('ID_Doctor',))),
+        ("ResumenIngresos.consultar (mes actual por tratamiento y estado)",
+         lambda: ResumenIngresos.consultar(hoy.replace(day=1), hoy, ('ID_Tratamiento', 'Estado'))),
+        # Doctores, horarios y tratamientos
+        ("Doctor.obtener_todos_doctores", lambda: Doctor.obtener_todos_doctores()),
+        ("Doctor.obtener_citas_por_doctor (todas)", lambda: Doctor.obtener_citas_por_doctor(DOCTOR)),
+        ("AgendaDoctor.obtener_pagina (primera página)", lambda: AgendaDoctor.obtener_pagina(DOCTOR).citas),
+        ("Horario.obtener_horarios_bd", lambda: Horario.obtener_horarios_bd()),
+        ("HorarioModel.generar_siguiente_id", lambda: horarios.generar_siguiente_id()),
+        ("Tratamiento.obtener_todos_tratamientos", lambda: Tratamiento.obtener_todos_tratamientos()),
+        # Login
+        ("LoginModelo.listar_usuarios_disponibles", lambda: login.listar_usuarios_disponibles()),
+    ]
+
+
+def medir_caso(funcion, repeticiones: int) -> dict:
+    tiempos = []
+    resultado = None
+    for _ in range(repeticiones):
+        obtener_cache_referencia().limpiar()
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append((time.perf_counter() - inicio) * 1000)
+    medicion = {'mediana_ms': round(statistics.median(tiempos), 2), 'minimo_ms': round(min(tiempos), 2)}
+    if hasattr(resultado, '__len__') and not isinstance(resultado, str):
+        medicion['filas'] = len(resultado)
+    return medicion
+
+
+def medir_escala(repeticiones: int, filtros: list) -> dict:
+    resultados = {}
+    for nombre, funcion in casos(date.today()):
+        if filtros and not any(filtro in nombre for filtro in filtros):
+            continue
+        resultados[nombre] = medir_caso(funcion, repeticiones)
+        filas = resultados[nombre].get('filas', '')
+        print(f"   {nombre:<58}{resultados[nombre]['mediana_ms']:>10.1f} ms {filas:>9}")
+    return resultados
+
+
+def comparar(actual: dict, base: dict) -> list:
+    """Devuelve los casos que empeoraron respecto de la línea base, por escala"""
+    regresiones = []
+    for escala, resultados in actual.items():
+        for nombre, medicion in resultados.items():
+            referencia = base.get(escala, {}).get(nombre)
+            if not referencia:
+                continue
+            limite = max(referencia['mediana_ms'] * (1 + TOLERANCIA), referencia['mediana_ms'] + MARGEN_MS)
+            if medicion['mediana_ms'] > limite:
+                regresiones.append(f"[{escala}] {nombre}: {medicion['mediana_ms']:.1f} ms "
+                                   f"(línea base {referencia['mediana_ms']:.1f} ms, límite {limite:.1f} ms)")
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide los modelos con datos sintéticos a varias escalas")
+    parser.add_argument('--escalas', type=int, nargs='+', default=ESCALAS)
+    parser.add_argument('--motor', choices=sorted(BACKENDS), default=DatabaseConfig.BACKEND,
+                        help="motor de base de datos (por defecto DatabaseConfig.BACKEND)")
+    parser.add_argument('--repeticiones', type=int, default=REPETICIONES)
+    parser.add_argument('--casos', nargs='*', default=[], help="medir solo los casos que contengan estos textos")
+    parser.add_argument('--base', default=BASE_PRUEBAS, help="base de pruebas que se llena con los datos")
+    parser.add_argument('--semilla', type=int, default=42)
+    parser.add_argument('--sin-generar', action='store_true', help="no regenerar: usar los datos ya cargados")
+    parser.add_argument('--guardar', action='store_true', help="guardar los tiempos como línea base")
+    args = parser.parse_args()
+
+    if args.sin_generar and len(args.escalas) != 1:
+        parser.error("--sin-generar solo tiene sentido con una escala")
+    DatabaseConfig.BACKEND = args.motor
+    if not preparar_base(args.base):
+        return 1
+
+    actual = {}
+    for escala in args.escalas:
+        print("=" * 80)
+        print(f"ESCALA {escala}x ({args.motor})")
+        print("=" * 80)
+        if not args.sin_generar:
+            if GeneradorDatos(escala=escala, semilla=args.semilla).generar() is None:
+                return 1
+        # Los tiempos de MySQL y SQLite no se comparan entre sí
+        actual[f"{args.motor}-{escala}x"] = medir_escala(args.repeticiones, args.casos)
+
+    base = {}
+    if os.path.exists(LINEA_BASE):
+        with open(LINEA_BASE, encoding='utf-8') as archivo:
+            base = json.load(archivo)
+
+    if args.guardar:
+        base.update(actual)
+        with open(LINEA_BASE, 'w', encoding='utf-8') as archivo:
+            json.dump(base, archivo, indent=2, ensure_ascii=False)
+        print(f"\n💾 Línea base guardada en {LINEA_BASE}")
+        return 0
+
+    if not base:
+        print("\nℹ️ No hay línea base; ejecute con --guardar para crearla")
+        return 0
+
+    regresiones = comparar(actual, base)
+    if regresiones:
+        print("\n❌ REGRESIONES:")
+        for regresion in regresiones:
+            print(f"   • {regresion}")
+        return 1
+    print("\n✅ Todos los casos dentro de los límites")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+=================================================================
+BENCHMARK: REGISTRO DE IDs DE PACIENTES
+=================================================================
+Mide cuánto cuesta construir N objetos Paciente con IDs traídos de la
+BD (lo mismo que hace Paciente.obtener_todos_los_pacientes) y compara
+con el registro anterior basado en listas.
+
+Con RegistroIds el tiempo por paciente debe mantenerse casi constante
+al duplicar N (crecimiento lineal); con la lista crecía con N (cuadrático).
+
+Uso:
+    python Benchmarks/benchmark_registro_ids.py
+    python Benchmarks/benchmark_registro_ids.py 5000 10000 20000 40000 80000
+=================================================================
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import time
+from datetime import date
+
+from Modelos.PacienteModelo import Paciente
+
+TAMANOS_POR_DEFECTO = [7500, 15000, 30000, 60000]
+# La versión con listas es cuadrática: solo se mide hasta este tamaño
+MAXIMO_LISTA = 15000
+
+
+def cargar_pacientes(n: int) -> float:
+    """Construye n pacientes con ID explícito, como en la carga desde la BD, y devuelve los segundos"""
+    Paciente._pacientes_existentes.reiniciar()
+    fecha = date(1990, 1, 1)
+
+    inicio = time.perf_counter()
+    for id_paciente in range(1, n + 1):
+        Paciente("Nombre", "Apellido", fecha, 70000000, "correo@clinica.com", "", 0.0, id_paciente)
+    return time.perf_counter() - inicio
+
+
+def registrar_con_lista(n: int) -> float:
+    """Reproduce el registro anterior (lista + 'in') para comparar"""
+    existentes = []
+    inicio = time.perf_counter()
+    for id_paciente in range(1, n + 1):
+        if id_paciente not in existentes:
+            existentes.append(id_paciente)
+    return time.perf_counter() - inicio
+
+
+def main():
+    tamanos = [int(n) for n in sys.argv[1:]] or TAMANOS_POR_DEFECTO
+
+    print("=" * 66)
+    print(f"{'N':>8} | {'Paciente (s)':>12} | {'µs/paciente':>11} | {'lista (s)':>10} | {'µs/ID lista':>11}")
+    print("-" * 66)
+
+    anterior = None
+    for n in tamanos:
+        segundos = cargar_pacientes(n)
+        por_fila = segundos / n * 1e6
+
+        if n <= MAXIMO_LISTA:
+            segundos_lista = registrar_con_lista(n)
+            lista = f"{segundos_lista:>10.3f} | {segundos_lista / n * 1e6:>11.2f}"
+        else:
+            lista = f"{'-':>10} | {'-':>11}"
+
+        print(f"{n:>8} | {segundos:>12.3f} | {por_fila:>11.2f} | {lista}")
+
+        if anterior:
+            n_ant, seg_ant = anterior
+            print(f"{'':>8}   x{n / n_ant:.1f} pacientes -> x{segundos / seg_ant:.2f} tiempo")
+        anterior = (n, segundos)
+
+    print("=" * 66)
+    print("Crecimiento lineal: el tiempo se multiplica aprox. igual que N.")
+
+
+if __name__ == "__main__":
+    main()
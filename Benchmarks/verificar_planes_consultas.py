@@ -0,0 +1,193 @@
+"""
+=================================================================
+VERIFICACIÓN: PLANES DE LAS CONSULTAS FRECUENTES
+=================================================================
+Ejecuta EXPLAIN sobre las consultas más usadas de la aplicación y
+falla (código de salida 1) si alguna recorre completa la tabla que
+debería resolver con un índice (type = ALL en EXPLAIN).
+
+Sirve para detectar a tiempo que se perdió un índice (p. ej. una
+migración revertida) o que una consulta dejó de poder usarlo (p. ej.
+envolver la columna en una función: DATE(Fecha) = ...).
+
+Con pocas filas el optimizador de MySQL puede preferir leer la tabla
+entera aunque exista el índice; por eso, si la tabla tiene menos de
+MINIMO_FILAS filas estimadas, el recorrido completo solo se avisa
+siempre que EXPLAIN muestre un índice utilizable (possible_keys).
+
+Con CLINICA_BD_BACKEND=sqlite se usa EXPLAIN QUERY PLAN: SEARCH equivale
+a un acceso por índice, SCAN ... USING INDEX a recorrer solo el índice
+(type = index en MySQL) y un SCAN sin índice al recorrido completo.
+
+Uso:
+    python DB/Migraciones.py subir
+    python Benchmarks/verificar_planes_consultas.py
+    CLINICA_BD_BACKEND=sqlite CLINICA_BD_SQLITE=clinica.db python Benchmarks/verificar_planes_consultas.py
+=================================================================
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import re
+from datetime import date, datetime, time, timedelta
+
+from Config.database_config import BackendSQLite, DatabaseConfig, conexion_bd, Error
+from Modelos.ConsultasPacientes import fecha_limite_menores
+
+MINIMO_FILAS = 1000
+
+HOY = date.today()
+MANANA = HOY + timedelta(days=1)
+
+# (nombre, tabla o alias que debe usar índice, consulta, parámetros)
+# Las consultas son las mismas que ejecutan los modelos indicados
+CONSULTAS_FRECUENTES = [
+    (
+        "Cita.obtener_intervalos_doctor_bd (choques al agendar)", 'Cita',
+        """SELECT Hora_Inicio, Hora_Fin, ID_Cita FROM Cita
+           WHERE ID_Doctor = %s AND Fecha >= %s AND Fecha < %s AND Estado <> 'Cancelada'""",
+        ('1234', HOY, MANANA),
+    ),
+    (
+        "Cita.obtener_ocupacion_bd (búsqueda de huecos)", 'Cita',
+        """SELECT ID_Doctor, Fecha, Hora_Inicio, Hora_Fin FROM Cita
+           WHERE Fecha >= %s AND Fecha < %s AND Estado <> 'Cancelada'""",
+        (HOY, HOY + timedelta(days=31)),
+    ),
+    (
+        "Cita.obtener_citas_bd (página siguiente por clave)", 'c',
+        """SELECT c.ID_Cita FROM Cita c
+           WHERE c.Fecha >= %s
+             AND (c.Fecha > %s OR (c.Fecha = %s AND (c.Hora_Inicio > %s OR (c.Hora_Inicio = %s AND c.ID_Cita > %s))))
+           ORDER BY c.Fecha, c.Hora_Inicio, c.ID_Cita LIMIT 51""",
+        (HOY, datetime.combine(HOY, time(9)), datetime.combine(HOY, time(9)), time(9), time(9), 1),
+    ),
+    (
+        "Cita.obtener_citas_bd (filtro por estado)", 'c',
+        """SELECT c.ID_Cita FROM Cita c
+           WHERE c.Estado IN (%s) AND c.Fecha >= %s
+           ORDER BY c.Fecha, c.Hora_Inicio, c.ID_Cita LIMIT 51""",
+        ('Pendiente', HOY),
+    ),
+    (
+        "AgendaDoctor.obtener_pagina (agenda del doctor por rango de fechas)", 'c',
+        """SELECT c.ID_Cita FROM Cita c
+           WHERE c.ID_Doctor = %s AND c.Fecha >= %s AND c.Fecha < %s
+           ORDER BY c.Fecha DESC, c.Hora_Inicio DESC, c.ID_Cita DESC LIMIT 101""",
+        ('1234', HOY - timedelta(days=365), MANANA),
+    ),
+    (
+        "Factura.paciente_tiene_factura_hoy", 'Factura',
+        """SELECT COUNT(*) FROM Factura
+           WHERE ID_Paciente = %s AND Fecha_Emision >= %s AND Fecha_Emision < %s""",
+        (1, HOY, MANANA),
+    ),
+    (
+        "Paciente por DUI", 'Paciente',
+        "SELECT ID_Paciente FROM Paciente WHERE DUI = %s",
+        ('01234567-8',),
+    ),
+    (
+        "Paciente por apellido (prefijo)", 'Paciente',
+        "SELECT ID_Paciente, Nombre, Apellido FROM Paciente WHERE Apellido LIKE %s",
+        ('Vás%',),
+    ),
+    (
+        "ConsultasPacientes (menores de edad)", 'Paciente',
+        "SELECT COUNT(*) FROM Paciente WHERE Fecha_Nacimiento > %s",
+        (fecha_limite_menores(HOY),),
+    ),
+    (
+        "ConsultasPacientes (saldos pendientes)", 'Factura',
+        """SELECT ID_Paciente, SUM(Monto_Total) FROM Factura
+           WHERE Estado_Pago = 'Pendiente' GROUP BY ID_Paciente""",
+        (),
+    ),
+    (
+        "Login de asistente", 'Asistente',
+        "SELECT COUNT(*) FROM Asistente WHERE Nombre = %s AND Contrasena = %s",
+        ('Chris', 'x'),
+    ),
+]
+
+
+# Paso del plan de SQLite: "SEARCH c USING INDEX ..." o, en versiones viejas, "SCAN TABLE Cita AS c"
+_RE_PASO_SQLITE = re.compile(r"^(SCAN|SEARCH)(?: TABLE)? (\S+)(?: AS (\S+))?(.*)$")
+
+
+def revisar_plan_sqlite(cursor, tabla: str, consulta: str, parametros: tuple):
+    """Como revisar_plan, leyendo EXPLAIN QUERY PLAN de SQLite"""
+    cursor.execute("EXPLAIN QUERY PLAN " + consulta, parametros)
+    for fila in cursor.fetchall():
+        detalle = fila[-1]
+        paso = _RE_PASO_SQLITE.match(detalle)
+        if not paso or tabla not in (paso.group(2), paso.group(3)):
+            continue
+        if paso.group(1) == 'SEARCH' or 'INDEX' in paso.group(4):
+            return 'ok', detalle
+        return 'falla', detalle
+
+    return 'falla', f"la tabla {tabla} no aparece en el plan"
+
+
+def revisar_plan(cursor, tabla: str, consulta: str, parametros: tuple):
+    """
+    Ejecuta EXPLAIN y devuelve (estado, detalle) para la tabla indicada.
+    estado: 'ok', 'aviso' (recorrido completo en tabla pequeña) o 'falla'.
+    """
+    if DatabaseConfig.BACKEND == BackendSQLite.nombre:
+        return revisar_plan_sqlite(cursor, tabla, consulta, parametros)
+
+    cursor.execute("EXPLAIN " + consulta, parametros)
+    columnas = [d[0] for d in cursor.description]
+    filas = [dict(zip(columnas, fila)) for fila in cursor.fetchall()]
+
+    for fila in filas:
+        if fila.get('table') != tabla:
+            continue
+        tipo = fila.get('type')
+        detalle = f"type={tipo} key={fila.get('key')} rows={fila.get('rows')} extra={fila.get('Extra')}"
+        if tipo != 'ALL':
+            return 'ok', detalle
+        if fila.get('possible_keys') and (fila.get('rows') or 0) < MINIMO_FILAS:
+            return 'aviso', detalle
+        return 'falla', detalle
+
+    return 'falla', f"la tabla {tabla} no aparece en el plan"
+
+
+def main() -> int:
+    iconos = {'ok': '✅', 'aviso': '⚠️', 'falla': '❌'}
+    fallas = 0
+
+    try:
+        with conexion_bd() as conexion:
+            if not conexion:
+                print("❌ No se pudo establecer conexión a la base de datos.")
+                return 1
+            cursor = conexion.cursor()
+
+            print("=" * 70)
+            print("PLANES DE CONSULTAS FRECUENTES")
+            print("=" * 70)
+            for nombre, tabla, consulta, parametros in CONSULTAS_FRECUENTES:
+                estado, detalle = revisar_plan(cursor, tabla, consulta, parametros)
+                fallas += estado == 'falla'
+                print(f"{iconos[estado]} {nombre}\n     {detalle}")
+
+    except Error as e:
+        print(f"❌ Error al revisar los planes: {e}")
+        return 1
+
+    print("-" * 70)
+    if fallas:
+        print(f"❌ {fallas} consulta(s) recorren la tabla completa. ¿Faltan migraciones? (python DB/Migraciones.py estado)")
+        return 1
+    print("✅ Todas las consultas frecuentes usan índice")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,11 +11,46 @@ Versión: 1.0
 =================================================================
 """
 
-import mysql.connector
-from mysql.connector import Error
 import os
+import re
+import sys
+import json
+import math
+import time
+import atexit
+import threading
+from collections import deque
+from datetime import datetime
+from contextlib import contextmanager
 from typing import Optional
 
+try:
+    from .logging_config import configurar_logging, obtener_logger
+except ImportError:
+    from logging_config import configurar_logging, obtener_logger
+
+# mysql.connector solo hace falta con el motor MySQL; sin él se puede trabajar con SQLite
+try:
+    import mysql.connector
+    from mysql.connector import Error
+    from mysql.connector.errors import PoolError
+except ImportError:
+    mysql = None
+
+    class Error(Exception):
+        """Error de la capa de datos (mismos atributos que mysql.connector.Error)"""
+
+        def __init__(self, msg: str = None, errno: int = None, values=None, sqlstate: str = None):
+            super().__init__(msg)
+            self.msg = msg
+            self.errno = errno
+            self.sqlstate = sqlstate
+
+    class PoolError(Error):
+        pass
+
+logger = obtener_logger('Config.database_config')
+
 # =================================================================
 # CONFIGURACIÓN DE BASE DE DATOS
 # =================================================================
@@ -40,10 +75,26 @@ class DatabaseConfig:
     MAX_RETRIES = 3
     RETRY_DELAY = 1  # segundos
     
-    # Pool de conexiones (si se usa en el futuro)
+    # Pool de conexiones
     POOL_NAME = 'clinica_dental_pool'
     POOL_SIZE = 5
     POOL_RESET_SESSION = True
+    POOL_TIMEOUT = 10          # segundos de espera máxima por una conexión libre
+    POOL_MAX_IDLE = 300        # segundos antes de desalojar una conexión inactiva
+    POOL_PING_INTERVAL = 30    # segundos de inactividad tras los que se verifica con ping
+    
+    # Instrumentación de consultas
+    METRICS_ENABLED = True
+    METRICS_WINDOW = 1000      # muestras recientes conservadas por consulta
+    SLOW_QUERY_MS = 500        # umbral para reportar una consulta lenta
+    METRICS_FILE = 'metricas_bd.json'
+    
+    # Caché de datos de referencia (doctores, tratamientos)
+    REFERENCE_CACHE_TTL = 300  # segundos antes de volver a leer aunque no haya escrituras locales
+    
+    # Motor de base de datos: 'mysql' (servidor) o 'sqlite' (archivo local, sin servidor)
+    BACKEND = os.environ.get('CLINICA_BD_BACKEND', 'mysql')
+    SQLITE_PATH = os.environ.get('CLINICA_BD_SQLITE', ':memory:')  # ':memory:' = base en memoria
 
     @classmethod
     def get_connection_params(cls) -> dict:
@@ -51,7 +102,7 @@ class DatabaseConfig:
         Obtiene los parámetros de conexión como diccionario
         
         Returns:
-            dict: Parámetros de conexión para mysql.connector
+            dict: Parámetros de conexión para mysql.connector (motor MySQL)
         """
         return {
             'host': cls.HOST,
@@ -80,50 +131,733 @@ class DatabaseConfig:
             else:
                 print(f"⚠️  Configuración no reconocida: {key}")
 
+# =================================================================
+# INSTRUMENTACIÓN DE CONSULTAS
+# =================================================================
+
+_RE_CADENAS = re.compile(r"'(?:[^'\\]|\\.)*'|\"(?:[^\"\\]|\\.)*\"")
+_RE_NUMEROS = re.compile(r"\b\d+(?:\.\d+)?\b")
+_RE_LISTAS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_RE_ESPACIOS = re.compile(r"\s+")
+_DIRECTORIO_CONFIG = os.path.dirname(os.path.abspath(__file__))
+
+def huella_consulta(sql) -> str:
+    """
+    Normaliza una consulta SQL para agrupar ejecuciones equivalentes:
+    literales y parámetros pasan a '?', listas IN se colapsan y se
+    compactan los espacios.
+    """
+    if isinstance(sql, (bytes, bytearray)):
+        sql = sql.decode('utf-8', errors='replace')
+    texto = _RE_CADENAS.sub('?', str(sql))
+    texto = texto.replace('%s', '?')
+    texto = _RE_NUMEROS.sub('?', texto)
+    texto = _RE_LISTAS.sub('(?+)', texto)
+    return _RE_ESPACIOS.sub(' ', texto).strip()
+
+def _funcion_llamadora() -> str:
+    """
+    Recorre la pila hasta el primer marco fuera de este módulo para
+    identificar la función del modelo que lanzó la consulta
+    (por ejemplo 'Cita.obtener_citas_bd').
+    """
+    marco = sys._getframe(2)
+    while marco is not None:
+        codigo = marco.f_code
+        archivo = os.path.dirname(os.path.abspath(codigo.co_filename))
+        if archivo != _DIRECTORIO_CONFIG and 'contextlib' not in codigo.co_filename:
+            return getattr(codigo, 'co_qualname', codigo.co_name)
+        marco = marco.f_back
+    return 'desconocido'
+
+def _percentil(valores_ordenados: list, porcentaje: float) -> float:
+    """Percentil por rango más cercano sobre una lista ya ordenada"""
+    if not valores_ordenados:
+        return 0.0
+    rango = math.ceil(porcentaje / 100 * len(valores_ordenados))
+    return valores_ordenados[max(0, min(rango, len(valores_ordenados)) - 1)]
+
+
+class VentanaMovil:
+    """Últimas N muestras de una métrica con totales acumulados"""
+    
+    def __init__(self, tamano: int):
+        self.muestras = deque(maxlen=tamano)
+        self.total = 0
+        self.suma = 0.0
+        self.maximo = 0.0
+    
+    def agregar(self, valor: float):
+        self.muestras.append(valor)
+        self.total += 1
+        self.suma += valor
+        if valor > self.maximo:
+            self.maximo = valor
+    
+    def resumen(self) -> dict:
+        """Percentiles p50/p95/p99 de la ventana reciente, en milisegundos"""
+        ordenados = sorted(self.muestras)
+        return {
+            'total': self.total,
+            'promedio_ms': round(self.suma / self.total * 1000, 3) if self.total else 0.0,
+            'p50_ms': round(_percentil(ordenados, 50) * 1000, 3),
+            'p95_ms': round(_percentil(ordenados, 95) * 1000, 3),
+            'p99_ms': round(_percentil(ordenados, 99) * 1000, 3),
+            'max_ms': round(self.maximo * 1000, 3),
+        }
+
+
+class MetricasBD:
+    """
+    Registro central de métricas de la capa de datos.
+    
+    Cada ejecución de cursor se agrupa por huella de consulta y por función
+    llamadora, guardando tiempo de ejecución, filas devueltas y la espera
+    previa en el pool de conexiones.
+    """
+    
+    def __init__(self, tamano_ventana: int = None):
+        self.tamano_ventana = tamano_ventana or DatabaseConfig.METRICS_WINDOW
+        self._lock = threading.Lock()
+        self.reiniciar()
+    
+    def reiniciar(self):
+        """Descarta todas las métricas acumuladas"""
+        with self._lock:
+            self._consultas = {}
+            self._espera_pool = VentanaMovil(self.tamano_ventana)
+            self._lentas = deque(maxlen=100)
+            self._desde = datetime.now()
+    
+    def registrar_espera_pool(self, segundos: float):
+        with self._lock:
+            self._espera_pool.agregar(segundos)
+    
+    def registrar_consulta(self, huella: str, origen: str, segundos: float,
+                           filas: int, espera_pool: float = 0.0):
+        """Agrega una ejecución de consulta a su ventana de métricas"""
+        with self._lock:
+            clave = (huella, origen)
+            entrada = self._consultas.get(clave)
+            if entrada is None:
+                entrada = {
+                    'tiempo': VentanaMovil(self.tamano_ventana),
+                    'filas': 0,
+                    'espera_pool': 0.0,
+                }
+                self._consultas[clave] = entrada
+            entrada['tiempo'].agregar(segundos)
+            entrada['filas'] += max(filas, 0)
+            entrada['espera_pool'] += espera_pool
+            
+            if segundos * 1000 >= DatabaseConfig.SLOW_QUERY_MS:
+                logger.warning("🐢 Consulta lenta (%.1f ms, %d filas) en %s: %s",
+                               segundos * 1000, filas, origen, huella)
+                self._lentas.append({
+                    'fecha': datetime.now().isoformat(timespec='seconds'),
+                    'origen': origen,
+                    'consulta': huella,
+                    'tiempo_ms': round(segundos * 1000, 3),
+                    'filas': filas,
+                    'espera_pool_ms': round(espera_pool * 1000, 3),
+                })
+    
+    def resumen(self) -> dict:
+        """
+        Devuelve un diccionario serializable con el estado actual:
+        percentiles por consulta (ordenados por tiempo total), espera en el
+        pool y las consultas lentas más recientes.
+        """
+        with self._lock:
+            consultas = []
+            for (huella, origen), entrada in self._consultas.items():
+                tiempo = entrada['tiempo']
+                datos = {'origen': origen, 'consulta': huella}
+                datos.update(tiempo.resumen())
+                datos['tiempo_total_ms'] = round(tiempo.suma * 1000, 3)
+                datos['filas_total'] = entrada['filas']
+                datos['filas_promedio'] = round(entrada['filas'] / tiempo.total, 1) if tiempo.total else 0
+                datos['espera_pool_total_ms'] = round(entrada['espera_pool'] * 1000, 3)
+                consultas.append(datos)
+            consultas.sort(key=lambda c: c['tiempo_total_ms'], reverse=True)
+            
+            return {
+                'desde': self._desde.isoformat(timespec='seconds'),
+                'generado': datetime.now().isoformat(timespec='seconds'),
+                'pool': dict(_pool.estado() if _pool else {}, espera=self._espera_pool.resumen()),
+                'consultas': consultas,
+                'consultas_lentas': list(self._lentas),
+            }
+    
+    def volcar_json(self, ruta: str = None) -> str:
+        """
+        Escribe el resumen en un archivo JSON
+        
+        Args:
+            ruta: Archivo destino (por defecto DatabaseConfig.METRICS_FILE)
+        
+        Returns:
+            str: Ruta del archivo escrito
+        """
+        ruta = ruta or DatabaseConfig.METRICS_FILE
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            json.dump(self.resumen(), archivo, ensure_ascii=False, indent=2)
+        return ruta
+
+
+class CursorInstrumentado:
+    """
+    Envoltura de cursor que mide cada execute/executemany junto con las
+    lecturas posteriores (fetch*) y reporta el resultado a MetricasBD.
+    La medición se cierra al ejecutar otra consulta o al cerrar el cursor.
+    """
+    
+    def __init__(self, cursor, conexion: 'ConexionAgrupada'):
+        self._cursor = cursor
+        self._conexion = conexion
+        self._pendiente = None
+    
+    def _cerrar_medicion(self):
+        pendiente = self._pendiente
+        if pendiente is None:
+            return
+        self._pendiente = None
+        filas = pendiente['filas']
+        if filas == 0:
+            filas = max(getattr(self._cursor, 'rowcount', 0) or 0, 0)
+        _metricas.registrar_consulta(
+            pendiente['huella'], pendiente['origen'], pendiente['segundos'],
+            filas, self._conexion.tomar_espera_pool()
+        )
+    
+    def _medir(self, metodo, operacion, *args, **kwargs):
+        self._cerrar_medicion()
+        inicio = time.perf_counter()
+        try:
+            return metodo(operacion, *args, **kwargs)
+        finally:
+            self._pendiente = {
+                'huella': huella_consulta(operacion),
+                'origen': _funcion_llamadora(),
+                'segundos': time.perf_counter() - inicio,
+                'filas': 0,
+            }
+    
+    def _medir_lectura(self, metodo, *args):
+        inicio = time.perf_counter()
+        resultado = metodo(*args)
+        if self._pendiente is not None:
+            self._pendiente['segundos'] += time.perf_counter() - inicio
+            if isinstance(resultado, list):
+                self._pendiente['filas'] += len(resultado)
+            elif resultado is not None:
+                self._pendiente['filas'] += 1
+        return resultado
+    
+    def execute(self, operacion, *args, **kwargs):
+        return self._medir(self._cursor.execute, operacion, *args, **kwargs)
+    
+    def executemany(self, operacion, *args, **kwargs):
+        return self._medir(self._cursor.executemany, operacion, *args, **kwargs)
+    
+    def fetchone(self):
+        return self._medir_lectura(self._cursor.fetchone)
+    
+    def fetchmany(self, *args):
+        return self._medir_lectura(self._cursor.fetchmany, *args)
+    
+    def fetchall(self):
+        return self._medir_lectura(self._cursor.fetchall)
+    
+    def __iter__(self):
+        return iter(self.fetchone, None)
+    
+    def close(self):
+        self._cerrar_medicion()
+        return self._cursor.close()
+    
+    def __getattr__(self, nombre):
+        return getattr(self._cursor, nombre)
+
+
+_metricas = MetricasBD()
+
+def obtener_metricas() -> MetricasBD:
+    """Devuelve el registro global de métricas de la base de datos"""
+    return _metricas
+
+def volcar_metricas_json(ruta: str = None) -> str:
+    """Atajo para escribir las métricas actuales en un archivo JSON"""
+    return _metricas.volcar_json(ruta)
+
+# =================================================================
+# MOTORES DE BASE DE DATOS
+# =================================================================
+
+class BackendMySQL:
+    """Servidor MySQL a través de mysql.connector (el motor de la aplicación)"""
+    
+    nombre = 'mysql'
+    
+    @staticmethod
+    def _requerir_conector():
+        if mysql is None:
+            raise Error(msg="mysql-connector-python no está instalado (use BACKEND = 'sqlite' para trabajar sin MySQL)")
+    
+    def conectar(self):
+        """Abre una conexión física con la configuración de DatabaseConfig"""
+        self._requerir_conector()
+        return mysql.connector.connect(**DatabaseConfig.get_connection_params())
+    
+    def descripcion(self) -> str:
+        return f"{DatabaseConfig.HOST}:{DatabaseConfig.PORT}/{DatabaseConfig.DATABASE}"
+    
+    def crear_base(self, nombre: str, sentencias_esquema: list):
+        """
+        Crea la base `nombre` si no existe y, si no tiene tablas, ejecuta el esquema.
+        No cambia DatabaseConfig.DATABASE.
+        
+        Raises:
+            Error: Si MySQL rechaza alguna sentencia
+        """
+        self._requerir_conector()
+        parametros = DatabaseConfig.get_connection_params()
+        parametros.pop('database')
+        conexion = mysql.connector.connect(**parametros)
+        try:
+            cursor = conexion.cursor()
+            cursor.execute(f"CREATE DATABASE IF NOT EXISTS `{nombre}`")
+            cursor.execute(f"USE `{nombre}`")
+            cursor.execute("SHOW TABLES LIKE 'Paciente'")
+            if cursor.fetchone() is None:
+                for sentencia in sentencias_esquema:
+                    cursor.execute(sentencia)
+            conexion.commit()
+        finally:
+            conexion.close()
+    
+    def cerrar(self):
+        pass
+
+
+class BackendSQLite:
+    """
+    Archivo SQLite (o base en memoria) con las consultas traducidas desde MySQL.
+    Ver Config/sqlite_backend.py para lo que se traduce.
+    """
+    
+    nombre = 'sqlite'
+    # Todas las conexiones del proceso ven la misma base en memoria
+    URI_MEMORIA = 'file:clinica_dental?mode=memory&cache=shared'
+    
+    def __init__(self):
+        self._ancla = None
+    
+    @staticmethod
+    def _abrir(ruta: str, uri: bool):
+        try:
+            from .sqlite_backend import abrir_conexion
+        except ImportError:
+            from sqlite_backend import abrir_conexion
+        return abrir_conexion(ruta, DatabaseConfig.AUTOCOMMIT, uri)
+    
+    def conectar(self):
+        """Abre una conexión a DatabaseConfig.SQLITE_PATH"""
+        if DatabaseConfig.SQLITE_PATH != ':memory:':
+            return self._abrir(DatabaseConfig.SQLITE_PATH, uri=False)
+        if self._ancla is None:
+            # La base en memoria vive mientras tenga una conexión abierta; el ancla
+            # la conserva aunque el pool cierre o desaloje todas las suyas
+            self._ancla = self._abrir(self.URI_MEMORIA, uri=True)
+        return self._abrir(self.URI_MEMORIA, uri=True)
+    
+    def descripcion(self) -> str:
+        return f"sqlite:{DatabaseConfig.SQLITE_PATH}"
+    
+    def crear_base(self, nombre: str, sentencias_esquema: list):
+        """
+        Ejecuta el esquema si la base todavía no tiene tablas. En SQLite la base
+        es DatabaseConfig.SQLITE_PATH; `nombre` no se usa.
+        """
+        conexion = self.conectar()
+        try:
+            cursor = conexion.cursor()
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'Paciente'")
+            if cursor.fetchone() is None:
+                for sentencia in sentencias_esquema:
+                    cursor.execute(sentencia)
+            conexion.commit()
+        finally:
+            conexion.close()
+    
+    def cerrar(self):
+        """Cierra la conexión ancla (una base en memoria se descarta)"""
+        if self._ancla is not None:
+            self._ancla.close()
+            self._ancla = None
+
+
+BACKENDS = {
+    BackendMySQL.nombre: BackendMySQL,
+    BackendSQLite.nombre: BackendSQLite,
+}
+
+_backend = None
+
+def obtener_backend():
+    """Devuelve el motor indicado en DatabaseConfig.BACKEND (se crea al primer uso o al cambiarlo)"""
+    global _backend
+    if _backend is None or _backend.nombre != DatabaseConfig.BACKEND:
+        clase = BACKENDS.get(DatabaseConfig.BACKEND)
+        if clase is None:
+            raise Error(msg=f"Motor de base de datos desconocido: '{DatabaseConfig.BACKEND}' "
+                            f"(opciones: {', '.join(BACKENDS)})")
+        if _backend is not None:
+            _backend.cerrar()
+        _backend = clase()
+    return _backend
+
+# =================================================================
+# POOL DE CONEXIONES
+# =================================================================
+
+class ConexionAgrupada:
+    """
+    Envoltura de una conexión física que pertenece al pool.
+    
+    Se comporta igual que una conexión de mysql.connector (también con el
+    motor SQLite, que imita esa interfaz), pero close()
+    la devuelve al pool en lugar de cerrar el socket. Los cursores abiertos
+    desde ella se cierran automáticamente al devolverla.
+    """
+    
+    def __init__(self, pool: 'PoolConexiones', conexion, espera_pool: float = 0.0):
+        self._pool = pool
+        self._conexion = conexion
+        self._cursores = []
+        self._liberada = False
+        self._espera_pool = espera_pool
+    
+    def cursor(self, *args, **kwargs):
+        """Crea un cursor y lo registra para cerrarlo al devolver la conexión"""
+        if self._liberada:
+            raise PoolError("La conexión ya fue devuelta al pool")
+        cursor = self._conexion.cursor(*args, **kwargs)
+        if DatabaseConfig.METRICS_ENABLED:
+            cursor = CursorInstrumentado(cursor, self)
+        self._cursores.append(cursor)
+        return cursor
+    
+    def tomar_espera_pool(self) -> float:
+        """Devuelve la espera del préstamo una sola vez (se atribuye a la primera consulta)"""
+        espera, self._espera_pool = self._espera_pool, 0.0
+        return espera
+    
+    def is_connected(self) -> bool:
+        """
+        Indica si la conexión sigue prestada. La salud de la conexión física
+        ya se verificó al sacarla del pool, así que no se hace otro ping aquí.
+        """
+        return not self._liberada
+    
+    def close(self):
+        """Devuelve la conexión al pool (idempotente)"""
+        if self._liberada:
+            return
+        self._liberada = True
+        
+        reutilizable = True
+        for cursor in self._cursores:
+            try:
+                cursor.close()
+            except Exception:
+                # Resultados sin leer u otro estado inconsistente: no se reutiliza
+                reutilizable = False
+        self._cursores = []
+        
+        self._pool.liberar(self._conexion, reutilizable)
+    
+    def __getattr__(self, nombre):
+        if self._liberada:
+            raise PoolError("La conexión ya fue devuelta al pool")
+        return getattr(self._conexion, nombre)
+
+
+class PoolConexiones:
+    """
+    Pool de conexiones MySQL con préstamo/devolución, verificación de salud
+    y desalojo de conexiones inactivas.
+    
+    Las conexiones físicas se crean bajo demanda hasta POOL_SIZE y se
+    reutilizan en orden LIFO, de modo que las menos usadas envejecen y son
+    desalojadas después de POOL_MAX_IDLE segundos sin uso.
+    """
+    
+    def __init__(self, nombre: str = None, tamano: int = None):
+        self.nombre = nombre or DatabaseConfig.POOL_NAME
+        self.tamano = tamano or DatabaseConfig.POOL_SIZE
+        self._libres = deque()  # (conexion_fisica, ultimo_uso)
+        self._prestadas = 0
+        self._condicion = threading.Condition()
+        self._cerrado = False
+        self._contadores = {
+            'prestamos': 0,
+            'creadas': 0,
+            'desalojadas': 0,
+            'descartadas': 0,
+            'agotado': 0,
+        }
+    
+    # -------------------- Conexiones físicas --------------------
+    
+    def _crear_conexion_fisica(self):
+        """Abre una conexión física nueva aplicando los reintentos configurados"""
+        ultimo_error = None
+        for intento in range(1, DatabaseConfig.MAX_RETRIES + 1):
+            try:
+                logger.debug("🔄 Intentando conectar a la base de datos (intento %d)...", intento)
+                backend = obtener_backend()
+                conexion = backend.conectar()
+                self._contar('creadas')
+                logger.debug("✅ Conexión exitosa a %s", backend.descripcion())
+                return conexion
+            except Error as e:
+                ultimo_error = e
+                # Credenciales o base inexistente no se arreglan reintentando
+                if e.errno in (1045, 1049, 1251):
+                    break
+                if intento < DatabaseConfig.MAX_RETRIES:
+                    time.sleep(DatabaseConfig.RETRY_DELAY)
+        raise ultimo_error
+    
+    @staticmethod
+    def _cerrar_fisica(conexion):
+        try:
+            conexion.close()
+        except Exception:
+            pass
+    
+    @staticmethod
+    def _conexion_sana(conexion, ultimo_uso: float) -> bool:
+        """Verifica con ping las conexiones que llevan tiempo sin usarse"""
+        if time.monotonic() - ultimo_uso < DatabaseConfig.POOL_PING_INTERVAL:
+            return True
+        try:
+            conexion.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+    
+    def _desalojar_inactivas(self):
+        """Cierra las conexiones libres que superan POOL_MAX_IDLE (requiere el lock)"""
+        limite = time.monotonic() - DatabaseConfig.POOL_MAX_IDLE
+        # Las más antiguas están a la izquierda
+        while self._libres and self._libres[0][1] < limite:
+            conexion, _ = self._libres.popleft()
+            self._cerrar_fisica(conexion)
+            self._contadores['desalojadas'] += 1
+    
+    # -------------------- Préstamo y devolución --------------------
+    
+    def obtener(self) -> ConexionAgrupada:
+        """
+        Presta una conexión del pool, creando una nueva si hay cupo.
+        
+        Raises:
+            PoolError: Si no hay conexiones libres dentro de POOL_TIMEOUT
+            Error: Si no se puede abrir una conexión nueva
+        """
+        inicio = time.monotonic()
+        limite_espera = inicio + DatabaseConfig.POOL_TIMEOUT
+        
+        while True:
+            candidata = None
+            with self._condicion:
+                if self._cerrado:
+                    raise PoolError(f"El pool '{self.nombre}' está cerrado")
+                self._desalojar_inactivas()
+                
+                while not self._libres and self._prestadas + len(self._libres) >= self.tamano:
+                    restante = limite_espera - time.monotonic()
+                    if restante <= 0:
+                        self._contadores['agotado'] += 1
+                        raise PoolError(
+                            f"Pool '{self.nombre}' agotado: {self.tamano} conexiones en uso"
+                        )
+                    self._condicion.wait(restante)
+                
+                if self._libres:
+                    candidata = self._libres.pop()
+                self._prestadas += 1
+            
+            if candidata is None:
+                try:
+                    conexion = self._crear_conexion_fisica()
+                except Exception:
+                    self._devolver_cupo()
+                    raise
+                return self._prestar(conexion, inicio)
+            
+            conexion, ultimo_uso = candidata
+            if self._conexion_sana(conexion, ultimo_uso):
+                return self._prestar(conexion, inicio)
+            
+            # Conexión caída: se descarta y se intenta con otra
+            self._cerrar_fisica(conexion)
+            self._devolver_cupo(descartada=True)
+    
+    def _prestar(self, conexion, inicio: float) -> ConexionAgrupada:
+        espera = time.monotonic() - inicio
+        self._contar('prestamos')
+        if DatabaseConfig.METRICS_ENABLED:
+            _metricas.registrar_espera_pool(espera)
+        return ConexionAgrupada(self, conexion, espera)
+    
+    def _contar(self, contador: str):
+        """Incrementa un contador del pool (obtener() corre en varios hilos a la vez)"""
+        with self._condicion:
+            self._contadores[contador] += 1
+    
+    def _devolver_cupo(self, descartada: bool = False):
+        with self._condicion:
+            self._prestadas -= 1
+            if descartada:
+                self._contadores['descartadas'] += 1
+            self._condicion.notify()
+    
+    def liberar(self, conexion, reutilizable: bool = True):
+        """Recibe una conexión física devuelta por ConexionAgrupada.close()"""
+        if reutilizable:
+            try:
+                if conexion.in_transaction:
+                    conexion.rollback()
+                if DatabaseConfig.POOL_RESET_SESSION:
+                    conexion.cmd_reset_connection()
+                    if not DatabaseConfig.AUTOCOMMIT:
+                        conexion.autocommit = False
+            except Exception:
+                reutilizable = False
+        
+        with self._condicion:
+            self._prestadas -= 1
+            if reutilizable and not self._cerrado:
+                self._libres.append((conexion, time.monotonic()))
+                conexion = None
+            else:
+                self._contadores['descartadas'] += 1
+            self._desalojar_inactivas()
+            self._condicion.notify()
+        
+        if conexion is not None:
+            self._cerrar_fisica(conexion)
+    
+    def cerrar_todas(self):
+        """Cierra las conexiones libres y rechaza nuevos préstamos"""
+        with self._condicion:
+            self._cerrado = True
+            libres = list(self._libres)
+            self._libres.clear()
+            self._condicion.notify_all()
+        for conexion, _ in libres:
+            self._cerrar_fisica(conexion)
+    
+    def estado(self) -> dict:
+        """Resumen del estado actual del pool"""
+        with self._condicion:
+            return dict({
+                'nombre': self.nombre,
+                'tamano': self.tamano,
+                'prestadas': self._prestadas,
+                'libres': len(self._libres),
+            }, **self._contadores)
+
+
+_pool: Optional[PoolConexiones] = None
+_pool_lock = threading.Lock()
+
+def obtener_pool() -> PoolConexiones:
+    """Devuelve el pool global, creándolo la primera vez que se necesita"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = PoolConexiones()
+    return _pool
+
+def cerrar_pool():
+    """Cierra el pool global (se llama automáticamente al salir)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.cerrar_todas()
+            _pool = None
+
+atexit.register(cerrar_pool)
+
 # =================================================================
 # FUNCIONES DE CONEXIÓN CENTRALIZADAS
 # =================================================================
 
-def obtener_conexion() -> Optional[mysql.connector.MySQLConnection]:
+def obtener_conexion() -> Optional[ConexionAgrupada]:
     """
-    Establece y devuelve una conexión segura a la base de datos MySQL
-    usando la configuración centralizada.
+    Presta una conexión del pool usando la configuración centralizada.
+    Al llamar close() sobre ella vuelve al pool en lugar de cerrarse.
     
     Returns:
-        Optional[mysql.connector.MySQLConnection]: Conexión a la base de datos o None si falla
+        Optional[ConexionAgrupada]: Conexión a la base de datos o None si falla
     """
     try:
-        print("🔄 Intentando conectar a la base de datos...")
-        
-        # Usar parámetros de conexión centralizados
-        connection_params = DatabaseConfig.get_connection_params()
-        conexion = mysql.connector.connect(**connection_params)
-        
-        if conexion.is_connected():
-            print("✅ Conexión exitosa a la base de datos")
-            print(f"📊 Servidor: {DatabaseConfig.HOST}:{DatabaseConfig.PORT}")
-            print(f"🗄️  Base de datos: {DatabaseConfig.DATABASE}")
-            return conexion
+        return obtener_pool().obtener()
             
-    except mysql.connector.Error as e:
-        print(f"❌ Error de MySQL al conectar a la base de datos: {e}")
+    except Error as e:
+        logger.error("❌ Error de base de datos al conectar: %s", e)
         _handle_mysql_errors(e)
         return None
         
     except Exception as e:
-        print(f"❌ Error inesperado al conectar a la base de datos: {e}")
-        print("⚠️  Funcionando en modo sin base de datos")
+        logger.error("❌ Error inesperado al conectar a la base de datos: %s", e)
+        logger.warning("⚠️  Funcionando en modo sin base de datos")
         return None
 
-def conectar_bd() -> Optional[mysql.connector.MySQLConnection]:
+def conectar_bd() -> Optional[ConexionAgrupada]:
     """
     Función alternativa de conexión (mantiene compatibilidad con código existente)
     
     Returns:
-        Optional[mysql.connector.MySQLConnection]: Conexión a la base de datos o None si falla
+        Optional[ConexionAgrupada]: Conexión a la base de datos o None si falla
     """
     return obtener_conexion()
 
+@contextmanager
+def conexion_bd():
+    """
+    Context manager que presta una conexión del pool y la devuelve al salir.
+    Si ocurre una excepción dentro del bloque se hace rollback antes de devolverla.
+    
+    Uso:
+        with conexion_bd() as conexion:
+            if not conexion:
+                return []
+            cursor = conexion.cursor()
+            ...
+    
+    Yields:
+        Optional[ConexionAgrupada]: Conexión prestada o None si no hay base de datos
+    """
+    conexion = obtener_conexion()
+    try:
+        yield conexion
+    except Exception:
+        if conexion:
+            try:
+                conexion.rollback()
+            except Exception:
+                pass
+        raise
+    finally:
+        if conexion:
+            conexion.close()
+
 def probar_conexion() -> tuple[bool, str]:
     """
     Prueba la conexión a la base de datos
@@ -151,8 +885,8 @@ def probar_conexion() -> tuple[bool, str]:
     except Exception as e:
         return False, f"❌ Error de conexión a la base de datos: {str(e)}"
 
-def cerrar_conexion_segura(conexion: Optional[mysql.connector.MySQLConnection], 
-                          cursor: Optional[mysql.connector.cursor.MySQLCursor] = None):
+def cerrar_conexion_segura(conexion: Optional[ConexionAgrupada], 
+                          cursor=None):
     """
     Cierra de forma segura la conexión y el cursor
     
@@ -163,42 +897,45 @@ def cerrar_conexion_segura(conexion: Optional[mysql.connector.MySQLConnection],
     try:
         if cursor:
             cursor.close()
-            print("🔒 Cursor cerrado correctamente")
             
         if conexion and conexion.is_connected():
             conexion.close()
-            print("🔒 Conexión a la base de datos cerrada correctamente")
+            logger.debug("🔒 Conexión devuelta al pool correctamente")
             
     except Exception as e:
-        print(f"⚠️  Error al cerrar conexión: {e}")
+        logger.warning("⚠️  Error al cerrar conexión: %s", e)
 
 # =================================================================
 # FUNCIONES DE MANEJO DE ERRORES
 # =================================================================
 
-def _handle_mysql_errors(error: mysql.connector.Error):
+def _handle_mysql_errors(error: Error):
     """
     Maneja errores específicos de MySQL con mensajes informativos
     
     Args:
         error: Error de MySQL a manejar
     """
-    if error.errno == 2003:
-        print("⚠️  Error 2003: No se puede conectar al servidor MySQL.")
-        print(f"   Verifica que MySQL esté ejecutándose en {DatabaseConfig.HOST}:{DatabaseConfig.PORT}")
+    if isinstance(error, PoolError):
+        logger.warning("⚠️  Pool de conexiones: %s", error.msg)
+        logger.warning("   Aumenta POOL_SIZE (%s) o revisa conexiones sin devolver.", DatabaseConfig.POOL_SIZE)
+        return
+    elif error.errno == 2003:
+        logger.warning("⚠️  Error 2003: No se puede conectar al servidor MySQL.")
+        logger.warning("   Verifica que MySQL esté ejecutándose en %s:%s", DatabaseConfig.HOST, DatabaseConfig.PORT)
     elif error.errno == 1049:
-        print(f"⚠️  Error 1049: Base de datos '{DatabaseConfig.DATABASE}' no existe.")
-        print("   Ejecuta el script SQL para crear la base de datos.")
+        logger.warning("⚠️  Error 1049: Base de datos '%s' no existe.", DatabaseConfig.DATABASE)
+        logger.warning("   Ejecuta el script SQL para crear la base de datos.")
     elif error.errno == 1045:
-        print("⚠️  Error 1045: Acceso denegado.")
-        print(f"   Verifica usuario '{DatabaseConfig.USER}' y contraseña.")
+        logger.warning("⚠️  Error 1045: Acceso denegado.")
+        logger.warning("   Verifica usuario '%s' y contraseña.", DatabaseConfig.USER)
     elif error.errno == 1251:
-        print("⚠️  Error 1251: Plugin de autenticación no soportado.")
-        print("   Puede ser necesario actualizar la configuración de MySQL.")
+        logger.warning("⚠️  Error 1251: Plugin de autenticación no soportado.")
+        logger.warning("   Puede ser necesario actualizar la configuración de MySQL.")
     else:
-        print(f"⚠️  Error MySQL {error.errno}: {error.msg}")
+        logger.warning("⚠️  Error MySQL %s: %s", error.errno, error.msg)
     
-    print("⚠️  La aplicación funcionará en modo sin base de datos")
+    logger.warning("⚠️  La aplicación funcionará en modo sin base de datos")
 
 # =================================================================
 # CONFIGURACIÓN DE OTROS SERVICIOS (FUTURO)
@@ -216,7 +953,25 @@ class ServiceConfig:
     
     # Configuración de logging
     LOG_LEVEL = 'INFO'
-    LOG_FILE = 'clinica_dental.log'
+    # Una ruta relativa se toma desde la carpeta del proyecto, no desde el directorio
+    # en que se ejecuta el script (si no, cada CLI o benchmark dejaba su propio log)
+    LOG_FILE = os.environ.get('CLINICA_LOG_FILE', 'clinica_dental.log')
+    LOG_TO_CONSOLE = True
+    # Niveles por módulo, p. ej. {'Modelos.DoctorModelo': 'DEBUG', 'Config.database_config': 'WARNING'}
+    LOG_LEVELS = {}
+    
+    @classmethod
+    def aplicar_logging(cls):
+        """Aplica LOG_LEVEL, LOG_FILE y LOG_LEVELS al sistema de logging"""
+        configurar_logging(cls.LOG_LEVEL, cls.ruta_log(), cls.LOG_LEVELS, cls.LOG_TO_CONSOLE)
+
+    @classmethod
+    def ruta_log(cls) -> Optional[str]:
+        """Ruta absoluta de LOG_FILE (None si no se escribe a disco)"""
+        if not cls.LOG_FILE:
+            return None
+        proyecto = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        return os.path.join(proyecto, os.path.expanduser(cls.LOG_FILE))
     
     # Configuración de backup
     BACKUP_INTERVAL = 24  # horas
@@ -254,8 +1009,12 @@ class EnvironmentConfig:
         # Actualizar configuración de base de datos si es necesario
         if 'DATABASE' in config:
             DatabaseConfig.DATABASE = config['DATABASE']
+        
+        if 'LOG_LEVEL' in config:
+            ServiceConfig.LOG_LEVEL = config['LOG_LEVEL']
+            ServiceConfig.aplicar_logging()
             
-        print(f"🔧 Configuración cargada para ambiente: {env}")
+        logger.info("🔧 Configuración cargada para ambiente: %s", env)
         return config
 
 # =================================================================
@@ -265,9 +1024,22 @@ class EnvironmentConfig:
 __all__ = [
     'DatabaseConfig',
     'ServiceConfig', 
+    'Error',
+    'BackendMySQL',
+    'BackendSQLite',
+    'obtener_backend',
     'EnvironmentConfig',
+    'PoolConexiones',
+    'ConexionAgrupada',
+    'obtener_pool',
+    'cerrar_pool',
     'obtener_conexion',
     'conectar_bd',
+    'conexion_bd',
+    'MetricasBD',
+    'huella_consulta',
+    'obtener_metricas',
+    'volcar_metricas_json',
     'probar_conexion',
     'cerrar_conexion_segura'
 ]
@@ -276,6 +1048,8 @@ __all__ = [
 # INICIALIZACIÓN
 # =================================================================
 
+ServiceConfig.aplicar_logging()
+
 if __name__ == "__main__":
     """Prueba de configuración cuando se ejecuta directamente"""
     print("🧪 Probando configuración de base de datos...")
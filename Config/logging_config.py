@@ -0,0 +1,139 @@
+"""
+=================================================================
+CONFIGURACIÓN DE LOGGING PARA CLÍNICA DENTAL
+=================================================================
+Sistema de registro por niveles que reemplaza los print() de los
+caminos críticos (conexiones, cargas masivas, consultas).
+
+- El nivel global y el archivo se toman de ServiceConfig.LOG_LEVEL
+  y ServiceConfig.LOG_FILE (ver database_config.py).
+- La escritura a disco se hace en un hilo aparte (QueueHandler +
+  QueueListener), así el hilo de la interfaz nunca espera al disco.
+- Los mensajes usan formato diferido: logger.debug("x = %s", x) no
+  construye el texto si el nivel DEBUG está desactivado.
+- Se pueden fijar niveles por módulo, por ejemplo
+  {'Modelos.DoctorModelo': 'DEBUG'}.
+
+Autor: Sistema de Gestión Clínica Dental
+Fecha: 2025
+Versión: 1.0
+=================================================================
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+from typing import Dict, Optional
+
+# Todos los loggers de la aplicación cuelgan de esta raíz
+RAIZ_LOGGER = 'clinica'
+
+FORMATO_ARCHIVO = '%(asctime)s | %(levelname)-8s | %(name)s | %(message)s'
+FORMATO_CONSOLA = '%(message)s'
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_lock = threading.Lock()
+
+# =================================================================
+# CONFIGURACIÓN
+# =================================================================
+
+def _nivel(nivel) -> int:
+    """Convierte 'INFO', 'debug' o 20 a la constante numérica de logging"""
+    if isinstance(nivel, int):
+        return nivel
+    valor = logging.getLevelName(str(nivel).upper())
+    return valor if isinstance(valor, int) else logging.INFO
+
+def configurar_logging(nivel='INFO', archivo: Optional[str] = None,
+                       niveles_modulo: Optional[Dict[str, str]] = None,
+                       consola: bool = True):
+    """
+    (Re)configura el logging de la aplicación.
+
+    Args:
+        nivel: Nivel global ('DEBUG', 'INFO', 'WARNING', 'ERROR')
+        archivo: Archivo de log; None para no escribir a disco
+        niveles_modulo: Niveles específicos por módulo, p. ej. {'Modelos.CitaModelo': 'DEBUG'}
+        consola: Si se muestran los mensajes también en la terminal
+    """
+    global _listener
+
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+        raiz = logging.getLogger(RAIZ_LOGGER)
+        for handler in list(raiz.handlers):
+            raiz.removeHandler(handler)
+            handler.close()
+
+        nivel_global = _nivel(nivel)
+        raiz.setLevel(nivel_global)
+        raiz.propagate = False
+
+        # Los handlers reales viven detrás de la cola, en el hilo del listener
+        destinos = []
+        if archivo:
+            try:
+                manejador_archivo = logging.handlers.RotatingFileHandler(
+                    archivo, maxBytes=5 * 1024 * 1024, backupCount=3, encoding='utf-8', delay=True
+                )
+                manejador_archivo.setFormatter(logging.Formatter(FORMATO_ARCHIVO))
+                destinos.append(manejador_archivo)
+            except OSError as e:
+                print(f"⚠️  No se pudo abrir el archivo de log '{archivo}': {e}")
+        if consola:
+            manejador_consola = logging.StreamHandler(sys.stdout)
+            manejador_consola.setFormatter(logging.Formatter(FORMATO_CONSOLA))
+            destinos.append(manejador_consola)
+
+        if destinos:
+            cola = queue.SimpleQueue()
+            raiz.addHandler(logging.handlers.QueueHandler(cola))
+            _listener = logging.handlers.QueueListener(cola, *destinos, respect_handler_level=True)
+            _listener.start()
+        else:
+            raiz.addHandler(logging.NullHandler())
+
+        for modulo, nivel_modulo in (niveles_modulo or {}).items():
+            logging.getLogger(f"{RAIZ_LOGGER}.{modulo}").setLevel(_nivel(nivel_modulo))
+
+def obtener_logger(nombre: str) -> logging.Logger:
+    """
+    Devuelve el logger de un módulo de la aplicación.
+
+    Args:
+        nombre: Nombre del módulo, normalmente __name__ o 'Modelos.CitaModelo'
+
+    Returns:
+        logging.Logger: Logger hijo de la raíz 'clinica'
+    """
+    if nombre == '__main__' or not nombre:
+        nombre = 'main'
+    return logging.getLogger(f"{RAIZ_LOGGER}.{nombre}")
+
+def detener_logging():
+    """Vacía la cola pendiente y detiene el hilo de escritura"""
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+atexit.register(detener_logging)
+
+# =================================================================
+# EXPORTACIONES PRINCIPALES
+# =================================================================
+
+__all__ = [
+    'RAIZ_LOGGER',
+    'configurar_logging',
+    'obtener_logger',
+    'detener_logging'
+]
@@ -0,0 +1,300 @@
+"""
+=================================================================
+CONTROLADOR SQLITE PARA LA CAPA DE DATOS
+=================================================================
+Permite correr los modelos (y los benchmarks) sin servidor MySQL,
+sobre un archivo SQLite o una base en memoria.
+
+Las consultas de los modelos están escritas para MySQL; antes de
+ejecutarlas se traducen:
+  - parámetros %s -> ?
+  - INSERT IGNORE, TRUNCATE TABLE, SET SESSION foreign_key_checks,
+    SELECT ... FOR UPDATE, CAST(... AS UNSIGNED), TRIM(LEADING ...),
+    CURDATE(), NOW(), TIMESTAMPDIFF(YEAR, ...) y REGEXP
+  - en el esquema: AUTO_INCREMENT, ENUM(...) y UNSIGNED
+
+Los valores vuelven con los mismos tipos que entrega mysql.connector:
+DATE -> date, DATETIME -> datetime, TIME -> timedelta y
+DECIMAL -> Decimal. Los errores de sqlite3 se convierten en el Error
+de Config.database_config, así los `except Error` de los modelos
+siguen funcionando.
+
+No se usa directamente: se activa con DatabaseConfig.BACKEND = 'sqlite'
+(o la variable de entorno CLINICA_BD_BACKEND=sqlite).
+=================================================================
+"""
+
+import re
+import sqlite3
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from functools import lru_cache
+
+try:
+    from .database_config import Error
+except ImportError:
+    from database_config import Error
+
+# =================================================================
+# CONVERSIÓN DE TIPOS
+# =================================================================
+
+def _texto_timedelta(valor: timedelta) -> str:
+    segundos = int(valor.total_seconds())
+    return f"{segundos // 3600:02d}:{segundos % 3600 // 60:02d}:{segundos % 60:02d}"
+
+
+def _timedelta_desde_texto(valor: bytes) -> timedelta:
+    horas, minutos, segundos = valor.decode().split(':')
+    return timedelta(hours=int(horas), minutes=int(minutos), seconds=float(segundos))
+
+
+def _datetime_desde_texto(valor: bytes) -> datetime:
+    return datetime.fromisoformat(valor.decode())
+
+
+_tipos_registrados = False
+
+def _registrar_tipos():
+    """
+    Adaptadores y convertidores de sqlite3 (son globales del módulo, se
+    registran una vez). Las fechas se guardan como texto ISO, así las
+    comparaciones y el ORDER BY de texto coinciden con los de MySQL.
+    """
+    global _tipos_registrados
+    if _tipos_registrados:
+        return
+    sqlite3.register_adapter(date, date.isoformat)
+    sqlite3.register_adapter(datetime, lambda valor: valor.isoformat(' '))
+    sqlite3.register_adapter(time, lambda valor: valor.strftime('%H:%M:%S'))
+    sqlite3.register_adapter(timedelta, _texto_timedelta)
+    sqlite3.register_adapter(Decimal, float)
+
+    sqlite3.register_converter('DATE', lambda valor: date.fromisoformat(valor.decode()[:10]))
+    sqlite3.register_converter('DATETIME', _datetime_desde_texto)
+    sqlite3.register_converter('TIME', _timedelta_desde_texto)
+    sqlite3.register_converter('DECIMAL', lambda valor: Decimal(valor.decode()))
+    _tipos_registrados = True
+
+
+def _regexp(patron: str, valor) -> bool:
+    return valor is not None and re.search(patron, str(valor)) is not None
+
+# =================================================================
+# TRADUCCIÓN DE SQL
+# =================================================================
+
+_RE_LITERALES = re.compile(r"('(?:[^'\\]|\\.)*')")
+
+# (patrón, reemplazo) aplicados en orden fuera de los literales de texto
+_TRADUCCIONES = [
+    (re.compile(r"TIMESTAMPDIFF\(\s*YEAR\s*,\s*([\w.]+)\s*,\s*(CURDATE\(\)|[\w.?]+)\s*\)", re.I),
+     r"(CAST(strftime('%Y', \2) AS INTEGER) - CAST(strftime('%Y', \1) AS INTEGER)"
+     r" - (strftime('%m-%d', \2) < strftime('%m-%d', \1)))"),
+    (re.compile(r"\bCURDATE\(\)", re.I), "DATE('now', 'localtime')"),
+    (re.compile(r"\bNOW\(\)", re.I), "DATETIME('now', 'localtime')"),
+    (re.compile(r"\bINSERT\s+IGNORE\b", re.I), "INSERT OR IGNORE"),
+    (re.compile(r"\bTRUNCATE\s+TABLE\b", re.I), "DELETE FROM"),
+    (re.compile(r"\bSET\s+SESSION\s+foreign_key_checks\s*=\s*(\d).*", re.I | re.S), r"PRAGMA foreign_keys = \1"),
+    (re.compile(r"\s+FOR\s+UPDATE\b", re.I), ""),
+    (re.compile(r"\bAS\s+UNSIGNED\b", re.I), "AS INTEGER"),
+    (re.compile(r"\bTRIM\(\s*LEADING\s+(\S+)\s+FROM\s+([\w.]+)\s*\)", re.I), r"LTRIM(\2, \1)"),
+    # Esquema
+    (re.compile(r"\bINT\s+AUTO_INCREMENT\s+PRIMARY\s+KEY\b", re.I), "INTEGER PRIMARY KEY AUTOINCREMENT"),
+    (re.compile(r"\s+UNSIGNED\b", re.I), ""),
+]
+
+# ENUM('a', 'b') lleva literales, así que se reemplaza antes de separarlos
+_RE_ENUM = re.compile(r"\bENUM\s*\(\s*'[^']*'(?:\s*,\s*'[^']*')*\s*\)", re.I)
+
+
+@lru_cache(maxsize=512)
+def traducir_sql(sql: str) -> str:
+    """Convierte una consulta escrita para MySQL al dialecto de SQLite"""
+    partes = _RE_LITERALES.split(_RE_ENUM.sub("TEXT", sql))
+    for i in range(0, len(partes), 2):
+        texto = partes[i].replace('%s', '?').replace('%%', '%')
+        for patron, reemplazo in _TRADUCCIONES:
+            texto = patron.sub(reemplazo, texto)
+        partes[i] = texto
+    return "".join(partes)
+
+# =================================================================
+# ERRORES
+# =================================================================
+
+# Códigos de MySQL equivalentes, para el código que revisa e.errno
+ER_DUP_ENTRY = 1062
+ER_NO_REFERENCED_ROW = 1452
+ER_NO_SUCH_TABLE = 1146
+ER_PARSE_ERROR = 1064
+
+
+def _errno(error: sqlite3.Error):
+    mensaje = str(error)
+    if isinstance(error, sqlite3.IntegrityError):
+        return ER_DUP_ENTRY if 'UNIQUE' in mensaje else ER_NO_REFERENCED_ROW
+    if 'no such table' in mensaje:
+        return ER_NO_SUCH_TABLE
+    if 'syntax error' in mensaje:
+        return ER_PARSE_ERROR
+    return None
+
+
+@contextmanager
+def _traducir_errores():
+    try:
+        yield
+    except sqlite3.Error as e:
+        raise Error(msg=f"SQLite: {e}", errno=_errno(e)) from e
+
+# =================================================================
+# CONEXIÓN Y CURSOR
+# =================================================================
+
+class CursorSQLite:
+    """Cursor de sqlite3 con la interfaz que usan los modelos de mysql.connector"""
+
+    def __init__(self, conexion: 'ConexionSQLite', diccionario: bool = False):
+        self._conexion = conexion
+        self._cursor = conexion.nativa.cursor()
+        self._diccionario = diccionario
+
+    def _fila(self, fila):
+        if fila is None or not self._diccionario:
+            return fila
+        return dict(zip((columna[0] for columna in self._cursor.description), fila))
+
+    def execute(self, operacion, parametros=()):
+        with _traducir_errores():
+            self._cursor.execute(traducir_sql(operacion), tuple(parametros or ()))
+        return None
+
+    def executemany(self, operacion, secuencia_parametros):
+        # En MySQL executemany envía un solo INSERT de varias filas: todo o nada,
+        # también en autocommit. Aquí se agrupa en una transacción por la misma razón
+        # (y porque una transacción por fila haría la carga mucho más lenta)
+        nativa = self._conexion.nativa
+        propia = not nativa.in_transaction
+        with _traducir_errores():
+            if propia:
+                nativa.execute("BEGIN")
+            try:
+                self._cursor.executemany(traducir_sql(operacion), [tuple(p) for p in secuencia_parametros])
+            except sqlite3.Error:
+                if propia:
+                    nativa.rollback()
+                raise
+            if propia and self._conexion.autocommit:
+                nativa.commit()
+        return None
+
+    def fetchone(self):
+        with _traducir_errores():
+            return self._fila(self._cursor.fetchone())
+
+    def fetchmany(self, size: int = 1):
+        with _traducir_errores():
+            return [self._fila(fila) for fila in self._cursor.fetchmany(size)]
+
+    def fetchall(self):
+        with _traducir_errores():
+            return [self._fila(fila) for fila in self._cursor.fetchall()]
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    @property
+    def rowcount(self) -> int:
+        return self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    def close(self):
+        self._cursor.close()
+
+
+class ConexionSQLite:
+    """
+    Conexión física de SQLite con la interfaz que usan el pool y los modelos
+    (cursor, commit, rollback, ping, in_transaction, autocommit...).
+    """
+
+    def __init__(self, nativa: sqlite3.Connection, autocommit: bool = True):
+        self.nativa = nativa
+        self.autocommit = autocommit
+
+    @property
+    def autocommit(self) -> bool:
+        return self.nativa.isolation_level is None
+
+    @autocommit.setter
+    def autocommit(self, valor: bool):
+        # isolation_level None: cada sentencia se confirma sola, como autocommit=True en MySQL
+        self.nativa.isolation_level = None if valor else 'DEFERRED'
+
+    @property
+    def in_transaction(self) -> bool:
+        return self.nativa.in_transaction
+
+    def cursor(self, dictionary: bool = False, **_opciones) -> CursorSQLite:
+        # buffered, prepared, etc. no aplican: sqlite3 siempre trabaja en el mismo proceso
+        return CursorSQLite(self, dictionary)
+
+    def start_transaction(self):
+        # IMMEDIATE toma el bloqueo de escritura al empezar: con un BEGIN diferido,
+        # dos transacciones que leen y luego escriben (lo que en MySQL bloquea el
+        # FOR UPDATE) chocan con "database is locked" en vez de esperar su turno
+        with _traducir_errores():
+            self.nativa.execute("BEGIN IMMEDIATE")
+
+    def commit(self):
+        with _traducir_errores():
+            self.nativa.commit()
+
+    def rollback(self):
+        with _traducir_errores():
+            self.nativa.rollback()
+
+    def ping(self, reconnect: bool = False):
+        with _traducir_errores():
+            self.nativa.execute("SELECT 1")
+
+    def is_connected(self) -> bool:
+        try:
+            self.ping()
+            return True
+        except Error:
+            return False
+
+    def cmd_reset_connection(self):
+        if self.nativa.in_transaction:
+            self.rollback()
+
+    def close(self):
+        self.nativa.close()
+
+
+def abrir_conexion(ruta: str, autocommit: bool = True, uri: bool = False) -> ConexionSQLite:
+    """
+    Abre una conexión SQLite lista para los modelos.
+    :param ruta: Archivo de la base o URI 'file:...' (con uri=True).
+    """
+    _registrar_tipos()
+    with _traducir_errores():
+        nativa = sqlite3.connect(ruta, uri=uri, detect_types=sqlite3.PARSE_DECLTYPES,
+                                 check_same_thread=False, timeout=10)
+        nativa.create_function('REGEXP', 2, _regexp, deterministic=True)
+        # En MySQL (InnoDB) las llaves foráneas siempre se revisan
+        nativa.execute("PRAGMA foreign_keys = ON")
+    return ConexionSQLite(nativa, autocommit)
+
+
+__all__ = ['abrir_conexion', 'traducir_sql', 'ConexionSQLite', 'CursorSQLite']
@@ -0,0 +1,122 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import threading
+import weakref
+from typing import Any, Callable, Dict, List, NamedTuple, Type
+
+from Config.logging_config import obtener_logger
+
+logger = obtener_logger('Controladores.BusEventos')
+
+# ==========================================
+# EVENTOS DE CAMBIO
+# Cada evento lleva el objeto ya guardado en la BD, para que quien lo reciba
+# actualice solo esa fila en lugar de volver a consultar todo
+# ==========================================
+
+class CitaCreada(NamedTuple):
+    cita: Any
+
+
+class CitaActualizada(NamedTuple):
+    """Cita modificada, cancelada o confirmada (el estado nuevo viene en cita.estado)"""
+    cita: Any
+
+
+class FacturaCreada(NamedTuple):
+    factura: Any
+
+
+# ==========================================
+# CLASE: BusEventos
+# PROPÓSITO: Avisar a todas las ventanas abiertas (citas, facturas,
+# pacientes...) de los cambios que hace cualquiera de ellas
+# ==========================================
+
+class BusEventos:
+    """
+    Publicación/suscripción dentro del proceso, por tipo de evento.
+
+    Uso:
+        bus = obtener_bus_eventos()
+        bus.suscribir(CitaActualizada, self._al_actualizar_cita)
+        bus.publicar(CitaActualizada(cita))
+
+    - Los manejadores se llaman en el hilo que publica, en el orden en que se
+      suscribieron. Los controladores publican desde el hilo de la interfaz,
+      así que los manejadores pueden tocar widgets directamente.
+    - Los métodos de objetos se guardan con referencia débil: cuando se cierra
+      una ventana y su controlador se libera, deja de recibir eventos solo.
+    - Si un manejador falla, el error se reporta y los demás siguen recibiendo el evento.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._suscriptores: Dict[Type, List[Callable[[], Callable]]] = {}
+
+    @staticmethod
+    def _referencia(manejador: Callable) -> Callable[[], Callable]:
+        if hasattr(manejador, '__self__') and hasattr(manejador, '__func__'):
+            return weakref.WeakMethod(manejador)
+        return lambda: manejador
+
+    def suscribir(self, tipo_evento: Type, manejador: Callable[[Any], Any]) -> Callable[[], None]:
+        """
+        Registra `manejador` para los eventos de `tipo_evento`.
+        :return: Función que cancela la suscripción.
+        """
+        referencia = self._referencia(manejador)
+        with self._lock:
+            self._suscriptores.setdefault(tipo_evento, []).append(referencia)
+
+        def cancelar():
+            with self._lock:
+                referencias = self._suscriptores.get(tipo_evento, [])
+                if referencia in referencias:
+                    referencias.remove(referencia)
+        return cancelar
+
+    def publicar(self, evento) -> int:
+        """
+        Entrega el evento a los suscriptores de su tipo.
+        :return: Cantidad de manejadores que lo recibieron.
+        """
+        tipo_evento = type(evento)
+        with self._lock:
+            referencias = list(self._suscriptores.get(tipo_evento, []))
+
+        entregados = 0
+        muertas = []
+        for referencia in referencias:
+            manejador = referencia()
+            if manejador is None:
+                muertas.append(referencia)
+                continue
+            try:
+                manejador(evento)
+                entregados += 1
+            except Exception:
+                logger.exception("❌ Error al manejar %s en %s", tipo_evento.__name__, manejador)
+
+        if muertas:
+            with self._lock:
+                vivas = self._suscriptores.get(tipo_evento, [])
+                self._suscriptores[tipo_evento] = [r for r in vivas if r not in muertas]
+        return entregados
+
+    def limpiar(self):
+        """Quita todas las suscripciones"""
+        with self._lock:
+            self._suscriptores.clear()
+
+
+_bus = BusEventos()
+
+def obtener_bus_eventos() -> BusEventos:
+    """Devuelve el bus de eventos compartido por todas las ventanas"""
+    return _bus
+
+
+__all__ = ['BusEventos', 'obtener_bus_eventos', 'CitaCreada', 'CitaActualizada', 'FacturaCreada']
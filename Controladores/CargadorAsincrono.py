@@ -0,0 +1,130 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from typing import Any, Callable, Dict
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from Config.logging_config import obtener_logger
+
+logger = obtener_logger('Controladores.CargadorAsincrono')
+
+# ==========================================
+# CLASE: TareaCarga
+# PROPÓSITO: Ejecutar una consulta a la BD en un hilo del QThreadPool y
+# entregar el resultado al hilo de la interfaz mediante señales
+# ==========================================
+
+class _SenalesTarea(QObject):
+    """Señales de una tarea (QRunnable no es QObject y no puede emitirlas)"""
+    terminado = pyqtSignal(int, str, object)  # lote, nombre, resultado
+    fallo = pyqtSignal(int, str, str)         # lote, nombre, mensaje de error
+
+
+class TareaCarga(QRunnable):
+    """Envuelve una función sin argumentos para correrla en segundo plano"""
+
+    def __init__(self, lote: int, nombre: str, funcion: Callable[[], Any]):
+        super().__init__()
+        self.lote = lote
+        self.nombre = nombre
+        self.funcion = funcion
+        self.senales = _SenalesTarea()
+
+    def run(self):
+        try:
+            resultado = self.funcion()
+        except Exception as e:
+            logger.exception("❌ Error en carga en segundo plano '%s'", self.nombre)
+            self.senales.fallo.emit(self.lote, self.nombre, str(e))
+            return
+        self.senales.terminado.emit(self.lote, self.nombre, resultado)
+
+
+# ==========================================
+# CLASE: CargadorDatos
+# PROPÓSITO: Lanzar varias cargas a la vez (pacientes, doctores, tratamientos...)
+# sin congelar la ventana y avisar cuando llega cada una y cuando terminan todas
+# ==========================================
+
+class CargadorDatos(QObject):
+    """
+    Cargas concurrentes sobre el QThreadPool global.
+
+    Uso:
+        self.cargador = CargadorDatos()
+        self.cargador.todo_cargado.connect(self.al_cargar_datos)
+        self.cargador.cargar({
+            'pacientes': Paciente.obtener_todos_los_pacientes,
+            'doctores': Doctor.obtener_todos_doctores,
+        })
+
+    Las señales se emiten siempre en el hilo de la interfaz, así los slots
+    pueden tocar widgets directamente. Si se llama a cargar() otra vez antes
+    de que termine la anterior, los resultados viejos se descartan.
+    """
+
+    dato_cargado = pyqtSignal(str, object)  # nombre, resultado
+    carga_fallida = pyqtSignal(str, str)    # nombre, mensaje de error
+    todo_cargado = pyqtSignal(dict, dict)   # resultados, errores
+
+    def __init__(self, parent=None, pool: QThreadPool = None):
+        super().__init__(parent)
+        self.pool = pool or QThreadPool.globalInstance()
+        self._lote = 0
+        self._pendientes: Dict[str, TareaCarga] = {}
+        self._resultados: Dict[str, Any] = {}
+        self._errores: Dict[str, str] = {}
+
+    @property
+    def cargando(self) -> bool:
+        """True mientras quede alguna tarea del último lote sin terminar"""
+        return bool(self._pendientes)
+
+    def cargar(self, tareas: Dict[str, Callable[[], Any]]):
+        """
+        Lanza todas las tareas en paralelo.
+        :param tareas: Diccionario nombre -> función sin argumentos que devuelve el dato.
+        """
+        self._lote += 1
+        self._pendientes = {}
+        self._resultados = {}
+        self._errores = {}
+
+        if not tareas:
+            self.todo_cargado.emit({}, {})
+            return
+
+        # Primero se registran todas y después se lanzan, así una tarea muy rápida
+        # no puede dar el lote por terminado antes de que se encolen las demás
+        for nombre, funcion in tareas.items():
+            tarea = TareaCarga(self._lote, nombre, funcion)
+            tarea.senales.terminado.connect(self._al_terminar_tarea)
+            tarea.senales.fallo.connect(self._al_fallar_tarea)
+            self._pendientes[nombre] = tarea
+
+        for tarea in list(self._pendientes.values()):
+            self.pool.start(tarea)
+
+    def _al_terminar_tarea(self, lote: int, nombre: str, resultado):
+        if lote != self._lote or nombre not in self._pendientes:
+            return
+        self._resultados[nombre] = resultado
+        self.dato_cargado.emit(nombre, resultado)
+        self._cerrar_tarea(nombre)
+
+    def _al_fallar_tarea(self, lote: int, nombre: str, mensaje: str):
+        if lote != self._lote or nombre not in self._pendientes:
+            return
+        self._errores[nombre] = mensaje
+        self.carga_fallida.emit(nombre, mensaje)
+        self._cerrar_tarea(nombre)
+
+    def _cerrar_tarea(self, nombre: str):
+        del self._pendientes[nombre]
+        if not self._pendientes:
+            self.todo_cargado.emit(dict(self._resultados), dict(self._errores))
+
+
+__all__ = ['CargadorDatos', 'TareaCarga']
@@ -3,7 +3,8 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
+from functools import partial
 from typing import List
 
 from Modelos.PacienteModelo import Paciente
@@ -12,13 +13,18 @@ from Modelos.CitaModelo import Cita
 from Vistas.FacturaVista import FacturacionView
 from Controladores.FacturaControlador import FacturacionController
 from Modelos.TratamientoModelo import Tratamiento
+from Modelos.IndiceIntervalos import IndiceIntervalos
+from Modelos.BuscadorHuecos import BuscadorHuecos
+from Modelos.ExportacionDatos import ExportadorDatos
+from Controladores.CargadorAsincrono import CargadorDatos
+from Controladores.BusEventos import obtener_bus_eventos, CitaCreada, CitaActualizada
 
 from PyQt6.QtWidgets import QMessageBox, QInputDialog, QApplication
 from PyQt6.QtCore import QDateTime, QDate
 
 
 class ControladorCita:    
-    def __init__(self):
+    def __init__(self, carga_asincrona: bool = True):
         self.vista = None  # Vista asociada al controlador
         self.citas_agendadas: List[Cita] = []  # Lista para almacenar las citas creadas
         self.cita: Cita = None  # Cita actual que se está editando o creando
@@ -26,9 +32,32 @@ class ControladorCita:
         self.pacientes: List[Paciente] = []  # Lista de pacientes disponibles
         self.tratamientos: List[Tratamiento] = []  # Lista de tratamientos disponibles
         self.editando_cita = None
+
+        # Paginación de citas: solo se mantiene en memoria la página visible
+        self.tamano_pagina = 50
+        self.anclas_pagina = [None]  # Clave de la última cita de cada página anterior (None = primera página)
+        self.hay_siguiente = False
+        self.filtros = {'fecha_desde': None, 'fecha_hasta': None, 'estados': None}
+
+        # Citas ocupadas por (doctor, día) para detectar choques al agendar
+        self.indice_citas = IndiceIntervalos()
+        self.buscador_huecos = BuscadorHuecos()
+        self.dias_busqueda_huecos = 30  # Horizonte de búsqueda de espacios libres
+
+        # Carga en segundo plano: la ventana se muestra de inmediato y se llena al llegar los datos
+        self.cargador = None
+        self.cargando = False
+
+        # Cambios hechos desde esta u otra ventana: se aplican a la cita afectada sin recargar
+        bus = obtener_bus_eventos()
+        bus.suscribir(CitaCreada, self._al_crear_cita)
+        bus.suscribir(CitaActualizada, self._al_actualizar_cita)
         
         # Cargar datos desde la base de datos
-        self.cargar_datos_desde_bd()
+        if carga_asincrona:
+            self.cargar_datos_en_segundo_plano()
+        else:
+            self.cargar_datos_desde_bd()
 
     def cargar_datos_desde_bd(self):
         """Carga todos los datos necesarios desde la base de datos"""
@@ -45,13 +74,8 @@ class ControladorCita:
             self.tratamientos = Tratamiento.obtener_todos_tratamientos()
             print(f"Tratamientos cargados: {len(self.tratamientos)}")
             
-            # NUEVO: Cargar citas desde la base de datos
-            self.citas_agendadas = Cita.obtener_citas_bd()
-            print(f"Citas cargadas desde BD: {len(self.citas_agendadas)}")
-            
-            # Inicializar el contador de IDs con las citas existentes
-            if self.citas_agendadas:
-                Cita.inicializar_contador_desde_citas(self.citas_agendadas)
+            # Cargar solo la primera página de citas
+            self.cargar_citas_desde_bd()
             
         except Exception as e:
             print(f"Error al cargar datos desde BD: {e}")
@@ -61,19 +85,142 @@ class ControladorCita:
             self.tratamientos = []
             self.citas_agendadas = []
 
+    def cargar_datos_en_segundo_plano(self):
+        """
+        Lanza en paralelo (QThreadPool) la carga de pacientes, doctores, tratamientos
+        y la primera página de citas. Mientras tanto la vista queda en estado de carga;
+        _al_cargar_datos() la llena cuando llegan todos los resultados.
+        """
+        if self.cargador is None:
+            self.cargador = CargadorDatos()
+            self.cargador.todo_cargado.connect(self._al_cargar_datos)
+
+        self.cargando = True
+        self.actualizar_vista()
+        self.cargador.cargar({
+            'pacientes': Paciente.obtener_todos_los_pacientes,
+            'doctores': Doctor.obtener_todos_doctores,
+            'tratamientos': Tratamiento.obtener_todos_tratamientos,
+            'citas': partial(Cita.obtener_pagina_citas_bd, self.tamano_pagina,
+                             despues_de=self.anclas_pagina[-1], **self.filtros),
+            'ultimo_id': Cita.obtener_ultimo_id_bd,
+        })
+
+    def _al_cargar_datos(self, resultados: dict, errores: dict):
+        """Recibe (en el hilo de la interfaz) los datos cargados en segundo plano"""
+        self.pacientes = resultados.get('pacientes') or []
+        self.doctores = resultados.get('doctores') or []
+        self.tratamientos = resultados.get('tratamientos') or []
+        self.citas_agendadas, self.hay_siguiente = resultados.get('citas') or ([], False)
+        if 'ultimo_id' in resultados:
+            Cita.set_contador_id(resultados['ultimo_id'] + 1)
+
+        print(f"Datos cargados en segundo plano - Pacientes: {len(self.pacientes)}, "
+              f"Doctores: {len(self.doctores)}, Tratamientos: {len(self.tratamientos)}, "
+              f"Citas: {len(self.citas_agendadas)}")
+
+        self.cargando = False
+        self.actualizar_vista()
+
+        if errores and self.vista:
+            detalle = "\n".join(f"• {nombre}: {mensaje}" for nombre, mensaje in errores.items())
+            QMessageBox.warning(self.vista, "⚠️ Carga incompleta",
+                                f"No se pudieron cargar algunos datos:\n\n{detalle}")
+
     def cargar_citas_desde_bd(self):
-        """Método específico para recargar solo las citas desde la base de datos"""
+        """Recarga desde la base de datos solo la página de citas visible"""
         try:
-            self.citas_agendadas = Cita.obtener_citas_bd()
-            print(f"Citas recargadas desde BD: {len(self.citas_agendadas)}")
-            
-            # Actualizar el contador de IDs
-            if self.citas_agendadas:
-                Cita.inicializar_contador_desde_citas(self.citas_agendadas)
+            self.citas_agendadas, self.hay_siguiente = Cita.obtener_pagina_citas_bd(
+                self.tamano_pagina,
+                despues_de=self.anclas_pagina[-1],
+                **self.filtros
+            )
+            print(f"Citas recargadas desde BD: {len(self.citas_agendadas)} (página {len(self.anclas_pagina)})")
+            # El contador de IDs no se consulta aquí: lo fijan la carga inicial
+            # ('ultimo_id') e insert_Cita_bd con el ID que asigna la BD
                 
         except Exception as e:
             print(f"Error al cargar citas desde BD: {e}")
             self.citas_agendadas = []
+            self.hay_siguiente = False
+
+    def _al_crear_cita(self, evento: CitaCreada):
+        """La nueva cita ocupa un espacio; aparecerá en su página al listar de nuevo"""
+        self.buscador_huecos.invalidar()
+
+    def _al_actualizar_cita(self, evento: CitaActualizada):
+        """Reemplaza en la página y en la tabla solo la cita que cambió"""
+        self.buscador_huecos.invalidar()
+        cita = evento.cita
+        for i, actual in enumerate(self.citas_agendadas):
+            if actual.id_cita == cita.id_cita:
+                self.citas_agendadas[i] = cita
+                break
+        if self.vista:
+            self.vista.actualizar_cita(cita)
+
+    def pagina_siguiente(self):
+        """Avanza a la siguiente página de citas"""
+        if not self.hay_siguiente or not self.citas_agendadas:
+            return
+        self.anclas_pagina.append(self.citas_agendadas[-1].clave_orden)
+        self.listar_citas()
+
+    def pagina_anterior(self):
+        """Regresa a la página anterior de citas"""
+        if len(self.anclas_pagina) <= 1:
+            return
+        self.anclas_pagina.pop()
+        self.listar_citas()
+
+    def aplicar_filtros_citas(self):
+        """Toma los filtros de la vista y vuelve a la primera página"""
+        if self.vista:
+            self.filtros = self.vista.obtener_filtros()
+        self.anclas_pagina = [None]
+        self.listar_citas()
+
+    def exportar_citas(self):
+        """Exporta las citas (todas o un rango de fechas) a CSV o JSONL mostrando el avance"""
+        from Vistas.DialogoExportacion import DialogoExportacion, ProgresoExportacion
+
+        # El rango se propone con las fechas del filtro del listado
+        opciones = DialogoExportacion.pedir(self.vista, "Citas", "citas", con_fechas=True,
+                                            desde=self.vista.filtro_desde_edit.date(),
+                                            hasta=self.vista.filtro_hasta_edit.date())
+        if not opciones:
+            return
+
+        progreso = ProgresoExportacion(self.vista, "Exportando citas...")
+        resultado = ExportadorDatos().exportar('citas', opciones.ruta, opciones.fecha_desde,
+                                               opciones.fecha_hasta, progreso=progreso)
+        progreso.cerrar()
+        if progreso.cancelado:
+            return
+        if resultado is None:
+            QMessageBox.critical(self.vista, "❌ Error", f"No se pudo completar la exportación a {opciones.ruta}")
+            return
+        QMessageBox.information(self.vista, "✅ Éxito", resultado.mensaje)
+
+    def buscar_conflicto_cita(self, doctor: Doctor, fecha: date, hora_inicio, hora_fin, excluir_id: int = None):
+        """
+        Devuelve el ID de una cita del mismo doctor que se cruce con el rango dado, o None.
+        Antes de consultar se refresca solo el día de ese doctor desde la BD (una consulta pequeña),
+        así también se ven las citas agendadas desde otras estaciones.
+        """
+        clave = (str(doctor.id_doctor), fecha)
+        self.indice_citas.reemplazar(clave, Cita.obtener_intervalos_doctor_bd(doctor.id_doctor, fecha))
+        return self.indice_citas.buscar_conflicto(clave, hora_inicio, hora_fin, excluir=excluir_id)
+
+    def buscar_cita_por_id(self, texto_id: str) -> Cita:
+        """Busca la cita en la página visible y, si no está ahí, directamente en la BD por su ID"""
+        texto_id = texto_id.strip()
+        for cita in self.citas_agendadas:
+            if str(cita.id_cita) == texto_id:
+                return cita
+        if not texto_id.isdigit():
+            return None
+        return Cita.obtener_cita_por_id_bd(int(texto_id))
 
     def set_vista(self, vista):
         """Establece la vista asociada al controlador"""
@@ -101,6 +248,19 @@ class ControladorCita:
         if self.vista:
             self.vista.actualizar_combos(self.doctores, self.pacientes, self.tratamientos)
             self.vista.resultado_text.clear()
+            self.vista.mostrar_cargando(self.cargando)
+            if not self.cargando:
+                self.actualizar_paginacion_vista()
+
+    def actualizar_paginacion_vista(self):
+        """Refleja en la vista el número de página y si se puede avanzar o retroceder"""
+        if self.vista:
+            self.vista.actualizar_paginacion(
+                len(self.anclas_pagina),
+                len(self.anclas_pagina) > 1,
+                self.hay_siguiente,
+                len(self.citas_agendadas)
+            )
 
     def crear_cita(self):
         """Crea una nueva cita con los datos ingresados en la vista"""
@@ -169,6 +329,14 @@ class ControladorCita:
             paciente_seleccionado = self.pacientes[paciente_idx - 1]
             doctor_seleccionado = self.doctores[doctor_idx - 1]
             
+            # Validar que el doctor no tenga otra cita en ese rango
+            id_conflicto = self.buscar_conflicto_cita(doctor_seleccionado, fecha, hora_inicio, hora_fin)
+            if id_conflicto is not None:
+                QMessageBox.warning(self.vista, "❌ Error", 
+                                f"El doctor {doctor_seleccionado.nombre} {doctor_seleccionado.apellido} "
+                                f"ya tiene la cita #{id_conflicto} en ese rango de horas.")
+                return
+            
             # Tratamiento es opcional
             tratamiento_seleccionado = None
             if tratamiento_idx > 0:
@@ -190,8 +358,8 @@ class ControladorCita:
             
             # Insertar en la base de datos
             if Cita.insert_Cita_bd(nueva_cita):
-                # Si la inserción fue exitosa, agregar a la lista local
-                self.citas_agendadas.append(nueva_cita)  
+                # La nueva cita aparecerá en la página que le corresponda al recargar
+                obtener_bus_eventos().publicar(CitaCreada(nueva_cita))
                 
                 QMessageBox.information(self.vista, "✅ Éxito", 
                                     f"Cita creada correctamente.\nID: {nueva_cita.id_cita}")
@@ -220,61 +388,125 @@ class ControladorCita:
             QMessageBox.critical(self.vista, "❌ Error", 
                             f"Error inesperado al crear la cita: {str(e)}")
 
+    def buscar_espacios_libres(self):
+        """Propone los próximos espacios libres y carga en el formulario el que se elija"""
+        self.vista.resultado_text.clear()
+
+        # Doctor seleccionado o, si no hay, todos los de una especialidad
+        doctor_idx = self.vista.doctor_combo.currentIndex()
+        especialidad = None
+        if doctor_idx > 0:
+            candidatos = [self.doctores[doctor_idx - 1]]
+        else:
+            especialidades = sorted({d.especialidad for d in self.doctores if d.especialidad})
+            opcion, ok = QInputDialog.getItem(self.vista, "Buscar Espacio Libre", "Especialidad:",
+                                              ["Todas"] + especialidades, 0, False)
+            if not ok:
+                return
+            candidatos = self.doctores
+            especialidad = None if opcion == "Todas" else opcion
+
+        # La duración se toma de las horas del formulario (30 minutos si no son válidas)
+        hora_inicio = self.vista.inicio_edit.dateTime().toPyDateTime()
+        hora_fin = self.vista.fin_edit.dateTime().toPyDateTime()
+        duracion = int((hora_fin - hora_inicio).total_seconds() // 60)
+        if duracion <= 0:
+            duracion = 30
+
+        fecha_desde = max(self.vista.fecha_edit.date().toPyDate(), date.today())
+        fecha_hasta = fecha_desde + timedelta(days=self.dias_busqueda_huecos)
+        huecos = self.buscador_huecos.buscar(candidatos, fecha_desde, fecha_hasta, duracion,
+                                             cantidad=10, especialidad=especialidad)
+
+        if not huecos:
+            QMessageBox.information(self.vista, "ℹ️ Información",
+                                    f"No hay espacios libres de {duracion} minutos "
+                                    f"en los próximos {self.dias_busqueda_huecos} días.")
+            return
+
+        opciones = []
+        self.vista.resultado_text.append(f"🔎 PRÓXIMOS ESPACIOS LIBRES ({duracion} min):\n")
+        for hueco in huecos:
+            texto = (f"{hueco['fecha'].strftime('%d/%m/%Y')} "
+                     f"{hueco['hora_inicio'].strftime('%H:%M')}-{hueco['hora_fin'].strftime('%H:%M')} "
+                     f"- Dr. {hueco['doctor'].nombre} {hueco['doctor'].apellido}")
+            opciones.append(texto)
+            self.vista.resultado_text.append(f"🕒 {texto}")
+
+        opcion, ok = QInputDialog.getItem(self.vista, "Buscar Espacio Libre", "Seleccione un espacio:",
+                                          opciones, 0, False)
+        if not ok:
+            return
+
+        # Cargar el espacio elegido en el formulario
+        hueco = huecos[opciones.index(opcion)]
+        for i, doctor in enumerate(self.doctores):
+            if doctor.id_doctor == hueco['doctor'].id_doctor:
+                self.vista.doctor_combo.setCurrentIndex(i + 1)  # +1 porque el índice 0 es "-- Seleccionar --"
+                break
+        self.vista.fecha_edit.setDate(QDate(hueco['fecha'].year, hueco['fecha'].month, hueco['fecha'].day))
+        self.vista.inicio_edit.setDateTime(QDateTime(QDate.currentDate(), hueco['hora_inicio']))
+        self.vista.fin_edit.setDateTime(QDateTime(QDate.currentDate(), hueco['hora_fin']))
+
     def listar_citas(self):
-        """Lista todas las citas cargadas desde la base de datos"""
+        """Lista la página actual de citas cargada desde la base de datos"""
         self.vista.resultado_text.clear()
         
-        # Recargar citas desde la BD antes de mostrarlas
+        # Recargar la página actual desde la BD antes de mostrarla
         self.cargar_citas_desde_bd()
+        self.mostrar_pagina_actual()
+
+    def mostrar_pagina_actual(self):
+        """Muestra la página de citas que ya está en memoria, sin consultar la BD"""
+        self.actualizar_paginacion_vista()
         
+        # La tabla empieza en la página actual y sigue trayendo páginas al desplazarse
+        self.vista.mostrar_citas(self.citas_agendadas,
+                                 self._cargar_mas_citas if self.hay_siguiente else None)
+
         if len(self.citas_agendadas) == 0: 
             self.vista.resultado_text.append("No hay citas registradas en la base de datos...")
             return
         
-        self.vista.resultado_text.append(f"📋 CITAS AGENDADAS ({len(self.citas_agendadas)} total):\n")
-        self.vista.resultado_text.append("=" * 60 + "\n")
-        
-        for i, cita in enumerate(self.citas_agendadas, 1):  
-            self.vista.resultado_text.append(f"🏥 CITA #{i}")
-            self.vista.resultado_text.append(f"{cita}\n" + "-"*50 + "\n")
+        numero_pagina = len(self.anclas_pagina)
+        primera = (numero_pagina - 1) * self.tamano_pagina + 1
+        self.vista.resultado_text.append(
+            f"📋 CITAS AGENDADAS (página {numero_pagina}, desde la cita {primera}). "
+            f"Doble clic en una fila para ver el detalle."
+        )
+
+    def _cargar_mas_citas(self, ultima_cita: Cita):
+        """Trae la página que sigue a `ultima_cita` (la tabla la pide al llegar al final)"""
+        return Cita.obtener_pagina_citas_bd(self.tamano_pagina, despues_de=ultima_cita.clave_orden,
+                                            **self.filtros)
 
     def cancelar_cita(self):
         """Cancela una cita por ID"""
         self.vista.resultado_text.clear()
 
-        # Cargar y mostrar citas desde la BD
-        self.cargar_citas_desde_bd()
+        # Mostrar la página de citas en memoria (el bus de eventos la mantiene al día)
+        self.mostrar_pagina_actual()
         
         if len(self.citas_agendadas) == 0:
-            self.vista.resultado_text.append("No hay citas registradas en la base de datos...")
             QMessageBox.information(self.vista, "ℹ️ Información", "No hay citas registradas")
             return
-
-        # Mostrar todas las citas disponibles
-        self.listar_citas()
         
         id_cita, ok = QInputDialog.getText(self.vista, "Cancelar Cita", "Ingrese el ID de la cita a cancelar:")
         if not ok or not id_cita.strip():
             return
             
-        # Buscar la cita por ID
-        cita_encontrada = None
-        for cita in self.citas_agendadas:
-            if str(cita.id_cita) == id_cita.strip():
-                cita_encontrada = cita
-                break
+        # Buscar la cita por ID (página visible o consulta puntual a la BD)
+        cita_encontrada = self.buscar_cita_por_id(id_cita)
         
         if cita_encontrada:
             # Actualizar el estado en la base de datos
             if Cita.actualizar_estado_bd(cita_encontrada.id_cita, "Cancelada"):
                 # Solo actualizar en memoria si la BD se actualizó correctamente
                 cita_encontrada.estado = "Cancelada"
+                obtener_bus_eventos().publicar(CitaActualizada(cita_encontrada))
                 
                 self.vista.resultado_text.append(f"\n🚫 CITA CANCELADA:\n{cita_encontrada}")
                 QMessageBox.information(self.vista, "✅ Éxito", "Cita cancelada exitosamente en la base de datos.")
-                
-                # Recargar las citas para mostrar el estado actualizado
-                self.cargar_citas_desde_bd()
             else:
                 QMessageBox.critical(self.vista, "❌ Error", "Error al cancelar la cita en la base de datos.")
         else:
@@ -336,6 +568,17 @@ class ControladorCita:
                     QMessageBox.warning(self.vista, "❌ Error", "La hora de fin debe ser posterior a la hora de inicio.")
                     return
                 
+                # Validar que el doctor no tenga otra cita en ese rango (ignorando la misma cita)
+                doctor_seleccionado = self.doctores[doctor_idx - 1]
+                if estado != "Cancelada":
+                    id_conflicto = self.buscar_conflicto_cita(doctor_seleccionado, fecha, hora_inicio, hora_fin,
+                                                              excluir_id=self.editando_cita.id_cita)
+                    if id_conflicto is not None:
+                        QMessageBox.warning(self.vista, "❌ Error", 
+                                          f"El doctor {doctor_seleccionado.nombre} {doctor_seleccionado.apellido} "
+                                          f"ya tiene la cita #{id_conflicto} en ese rango de horas.")
+                        return
+                
                 # Actualizar la cita existente
                 cita = self.editando_cita
                 cita.paciente = self.pacientes[paciente_idx - 1]
@@ -349,6 +592,7 @@ class ControladorCita:
                 cita.estado = estado
 
                 if Cita.actualizar_cita_bd(cita):
+                    obtener_bus_eventos().publicar(CitaActualizada(cita))
                     QMessageBox.information(self.vista, "✅ Éxito", "Cita modificada correctamente en la base de datos.")
                     self.vista.resultado_text.append(
                         f"✏️ CITA MODIFICADA:\n"
@@ -361,9 +605,6 @@ class ControladorCita:
                         f"Costo: ${cita.costo_cita:.2f}\n"
                         f"Estado: {cita.estado}\n"
                     )
-                    
-                    # Recargar las citas desde la BD para mostrar los cambios
-                    self.cargar_citas_desde_bd()
                 else:
                     QMessageBox.critical(self.vista, "❌ Error", "Error al modificar la cita en la base de datos.")
                     return
@@ -378,26 +619,19 @@ class ControladorCita:
                 QMessageBox.critical(self.vista, "❌ Error", f"Error al modificar la cita: {str(e)}")
                 return
 
-        self.cargar_citas_desde_bd()
+        # Si NO estamos editando, mostrar la página actual de citas y pedir ID
+        self.mostrar_pagina_actual()
         
         if len(self.citas_agendadas) == 0:
-            self.vista.resultado_text.append("No hay citas registradas en la base de datos...")
             QMessageBox.information(self.vista, "ℹ️ Información", "No hay citas registradas")
             return
-
-        # Si NO estamos editando, mostrar lista de citas y pedir ID
-        self.listar_citas()  # Mostrar citas disponibles
         
         id_cita, ok = QInputDialog.getText(self.vista, "Modificar Cita", "Ingrese el ID de la cita a modificar:")
         if not ok or not id_cita.strip():
             return
         
-        # Buscar la cita
-        cita_encontrada = None
-        for cita in self.citas_agendadas:
-            if str(cita.id_cita) == id_cita.strip():
-                cita_encontrada = cita
-                break
+        # Buscar la cita (página visible o consulta puntual a la BD)
+        cita_encontrada = self.buscar_cita_por_id(id_cita)
         
         if not cita_encontrada:
             QMessageBox.warning(self.vista, "❌ Error", "No se encontró la cita con ese ID.")
@@ -466,36 +700,28 @@ class ControladorCita:
         """Confirma si se asistió a la cita"""
         self.vista.resultado_text.clear()
         
-        self.cargar_citas_desde_bd()
+        # Mostrar la página de citas en memoria (el bus de eventos la mantiene al día)
+        self.mostrar_pagina_actual()
         
         if len(self.citas_agendadas) == 0:
-            self.vista.resultado_text.append("No hay citas registradas en la base de datos...")
             QMessageBox.information(self.vista, "ℹ️ Información", "No hay citas registradas")
             return
 
-        self.listar_citas()
-
         id_cita, ok = QInputDialog.getText(self.vista, "Confirmar Asistencia", "Ingrese el ID de la cita:")
         if not ok or not id_cita.strip():
             return
         
-        # Buscar la cita por ID
-        cita_encontrada = None
-        for cita in self.citas_agendadas:
-            if str(cita.id_cita) == id_cita.strip():
-                cita_encontrada = cita
-                break
+        # Buscar la cita por ID (página visible o consulta puntual a la BD)
+        cita_encontrada = self.buscar_cita_por_id(id_cita)
         
         if cita_encontrada:
             if Cita.actualizar_estado_bd(cita_encontrada.id_cita, "Confirmada"):
                 # Solo actualizar en memoria si la BD se actualizó correctamente
                 cita_encontrada.estado = "Confirmada"
+                obtener_bus_eventos().publicar(CitaActualizada(cita_encontrada))
                 
                 self.vista.resultado_text.append(f"\n✅ ASISTENCIA CONFIRMADA:\n{cita_encontrada}")
                 QMessageBox.information(self.vista, "✅ Éxito", "Asistencia confirmada exitosamente en la base de datos.")
-                
-                # Recargar las citas para mostrar el estado actualizado
-                self.cargar_citas_desde_bd()
             else:
                 QMessageBox.critical(self.vista, "❌ Error", "Error al confirmar la asistencia en la base de datos.")
         else:
@@ -505,25 +731,19 @@ class ControladorCita:
         """Calcula el monto a pagar según el tipo de consulta y tratamiento y abre la vista de factura"""
         self.vista.resultado_text.clear()
         
-        self.cargar_citas_desde_bd()
+        # Mostrar la página de citas en memoria (el bus de eventos la mantiene al día)
+        self.mostrar_pagina_actual()
         
         if len(self.citas_agendadas) == 0:
-            self.vista.resultado_text.append("No hay citas registradas en la base de datos...")
             QMessageBox.information(self.vista, "ℹ️ Información", "No hay citas registradas")
             return
 
-        self.listar_citas()
-
         id_cita, ok = QInputDialog.getText(self.vista, "Calcular Monto", "Ingrese el ID de la cita:")
         if not ok or not id_cita.strip():
             return
         
-        # Buscar la cita por ID
-        cita_encontrada = None
-        for cita in self.citas_agendadas:
-            if str(cita.id_cita) == id_cita.strip():
-                cita_encontrada = cita
-                break
+        # Buscar la cita por ID (página visible o consulta puntual a la BD)
+        cita_encontrada = self.buscar_cita_por_id(id_cita)
         
         if cita_encontrada:
             costo_cita = cita_encontrada.costo_cita
@@ -565,42 +785,13 @@ class ControladorCita:
                     print("🎮 Creando controlador de facturación...")
                     self.factura_controller = FacturacionController(self.factura_window)
                     
-                    # Esperar un momento para que se carguen los datos
-                    QApplication.processEvents()
-                    
-                    # Pre-llenar datos de la cita en la factura
+                    # Pre-llenar datos de la cita en la factura (se aplica cuando terminen de cargar los combos)
                     print("📋 Pre-llenando datos de la factura...")
-                    
-                    # Buscar el paciente en el combo
-                    paciente_encontrado = False
-                    for i in range(self.factura_window.paciente_combo.count()):
-                        # Obtener el paciente del combo
-                        paciente_combo = self.factura_window.paciente_combo.itemData(i)
-                        if paciente_combo and hasattr(paciente_combo, 'id_paciente'):
-                            if paciente_combo.id_paciente == cita_encontrada.paciente.id_paciente:
-                                self.factura_window.paciente_combo.setCurrentIndex(i)
-                                paciente_encontrado = True
-                                print(f"✅ Paciente seleccionado: {paciente_combo.nombre}")
-                                break
-                    
-                    if not paciente_encontrado:
-                        print("⚠️ No se pudo seleccionar el paciente automáticamente")
-
-                    # Buscar el tratamiento en el combo si existe
-                    if hasattr(cita_encontrada, 'tratamiento') and cita_encontrada.tratamiento:
-                        tratamiento_encontrado = False
-                        for i in range(self.factura_window.tratamiento_combo.count()):
-                            tratamiento_combo = self.factura_window.tratamiento_combo.itemData(i)
-                            if tratamiento_combo and hasattr(tratamiento_combo, 'id_tratamiento'):
-                                if tratamiento_combo.id_tratamiento == cita_encontrada.tratamiento.id_tratamiento:
-                                    self.factura_window.tratamiento_combo.setCurrentIndex(i)
-                                    tratamiento_encontrado = True
-                                    print(f"✅ Tratamiento seleccionado: {tratamiento_combo.descripcion}")
-                                    break
-                        
-                        if not tratamiento_encontrado:
-                            print("⚠️ No se pudo seleccionar el tratamiento automáticamente")
-
+                    tratamiento = getattr(cita_encontrada, 'tratamiento', None)
+                    self.factura_controller.preseleccionar(
+                        cita_encontrada.paciente.id_paciente,
+                        tratamiento.id_tratamiento if tratamiento else None
+                    )
 
                     # Mostrar la ventana de facturación
                     print("👁️ Mostrando ventana de facturación...")
@@ -657,8 +848,7 @@ def main():
         app = QApplication([])
     
     controlador = ControladorCita()
-    window = CitaWindow()
-    controlador.set_vista(window)
+    window = CitaWindow(controlador)
     window.show()
     app.exec()  
 
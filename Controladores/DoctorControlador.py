@@ -14,6 +14,8 @@ import re
 from datetime import datetime
 
 from Modelos.DoctorModelo import Doctor
+from Modelos.AgendaDoctor import AgendaDoctor, TAMANO_PAGINA
+from Modelos.DirectorioDoctores import DirectorioDoctores
 from Vistas.HorarioVista import AgregarHorarioDialog
 
 
@@ -22,6 +24,9 @@ class ControladorDoctor:
         self.vista = vista
         self.doctores: List[Doctor] = []    
         self.editando_doctor = None
+        # Búsquedas por Nº Junta Médica sobre la caché de referencia (se refresca sola
+        # cuando Doctor.insert_doc_db / actualizar_doctor_bd / eliminar_doctor_bd escriben)
+        self.directorio = DirectorioDoctores()
         # Cargar doctores desde la base de datos al inicializar
         self.cargar_doctores()
 
@@ -92,11 +97,9 @@ class ControladorDoctor:
             
             # Verificar duplicados antes de crear el objeto
             try:
-                doctores_existentes = Doctor.obtener_doctores_desde_db()
-                for doctor_existente in doctores_existentes:
-                    if doctor_existente.num_junta_medica == int(num_junta_medica):
-                        QMessageBox.warning(self.vista, "❌ Error", "Ya existe un doctor con ese número de junta médica")
-                        return None
+                if num_junta_medica in self.directorio:
+                    QMessageBox.warning(self.vista, "❌ Error", "Ya existe un doctor con ese número de junta médica")
+                    return None
             except Exception as e:
                 print(f"[WARNING] No se pudo verificar doctores existentes: {e}")
                 # Continuar sin verificación si hay problemas con la BD
@@ -175,10 +178,6 @@ class ControladorDoctor:
             siguiente_id = modelo_horario.generar_siguiente_id()
             print(f"ID de horario generado automáticamente: {siguiente_id}")
             
-            # Mostrar IDs existentes para debugging
-            ids_existentes = modelo_horario.obtener_ids_existentes()
-            print(f"IDs de horarios existentes en BD: {ids_existentes}")
-            
             # Crear y mostrar el diálogo con el ID pre-generado
             dialog = AgregarHorarioDialog(doctores_bd, self.vista)
             
@@ -238,18 +237,24 @@ class ControladorDoctor:
                     doctor=data['doctor']
                 )
                 
-                # Validar conflictos de horario
-                horarios_existentes = Horario.obtener_horarios_bd()
-                for horario_existente in horarios_existentes:
-                    if nuevo_horario.horario_ocupado(horario_existente):
-                        QMessageBox.warning(self.vista, "❌ Error", 
-                                          f"El doctor {data['doctor'].nombre} {data['doctor'].apellido} ya tiene un horario "
-                                          f"ocupado en ese rango de horas.\n"
-                                          f"Horario conflictivo: {horario_existente.hora_inicio} - {horario_existente.hora_fin}")
-                        return
+                # Validar conflictos de horario con el índice por doctor del modelo
+                horario_conflicto = modelo_horario.buscar_conflicto(nuevo_horario)
+                if horario_conflicto:
+                    QMessageBox.warning(self.vista, "❌ Error", 
+                                      f"El doctor {data['doctor'].nombre} {data['doctor'].apellido} ya tiene un horario "
+                                      f"ocupado en ese rango de horas.\n"
+                                      f"Horario conflictivo: {horario_conflicto.hora_inicio} - {horario_conflicto.hora_fin}")
+                    return
+                
+                # El ID mostrado era una vista previa: reservarlo ahora de forma atómica
+                id_reservado = modelo_horario.reservar_siguiente_id()
+                if not id_reservado:
+                    QMessageBox.critical(self.vista, "❌ Error", "No se pudo generar el ID del horario.")
+                    return
+                nuevo_horario.id_horario = data['id_horario'] = id_reservado
                 
-                # Intentar guardar en la base de datos
-                if Horario.insertar_horario_bd(nuevo_horario):
+                # Intentar guardar en la base de datos (el modelo también actualiza su índice)
+                if modelo_horario.agregar_horario(nuevo_horario):
                     # Mostrar el resultado en el área de texto
                     self.vista.resultado_text.append(f"""
 🕒 Horario agregado exitosamente:
@@ -279,29 +284,8 @@ class ControladorDoctor:
             traceback.print_exc()
     
     def mostrar_info_doctor(self):
-        """ Muestra un diálogo con la información de todos los doctores registrados """
-        try:
-            print("Intentando obtener doctores...")  
-            doctores = Doctor.obtener_doctores_desde_db()
-            print(f"Doctores obtenidos: {len(doctores)}")  
-            
-            self.vista.resultado_text.clear()
-            if not doctores:
-                self.vista.resultado_text.append("No hay doctores registrados.")
-            else:
-                self.vista.resultado_text.append("📋 Listado de Doctores:")
-                self.vista.resultado_text.append("=" * 50)
-                for doctor in doctores:
-                    print(f"Mostrando doctor: {doctor}")  #
-                    self.vista.resultado_text.append(f"👨‍⚕️ Dr. {doctor}")
-                    self.vista.resultado_text.append(f"   📞 Teléfono: {doctor.telefono}")
-                    self.vista.resultado_text.append(f"   📧 Correo: {doctor.correo}")
-                    self.vista.resultado_text.append(f"   🆔 N° Junta Médica: {doctor.num_junta_medica}")
-                    self.vista.resultado_text.append("-" * 30)
-        except Exception as e:
-            print(f"Error en mostrar_info_doctor: {e}")  
-            self.vista.resultado_text.clear()
-            self.vista.resultado_text.append(f"❌ Error al obtener doctores: {str(e)}")
+        """ Muestra la información de todos los doctores registrados """
+        self.mostrar_listado_doctores()
             
     def suprimir_doctor(self):
         """
@@ -311,8 +295,7 @@ class ControladorDoctor:
         self.vista.resultado_text.clear()
 
         try:
-            # Obtener doctores desde la base de datos
-            doctores_bd = Doctor.obtener_doctores_desde_db()
+            doctores_bd = self.directorio.todos()
             
             if not doctores_bd:
                 QMessageBox.information(self.vista, "ℹ️ Información", "No hay doctores registrados")
@@ -338,14 +321,7 @@ class ControladorDoctor:
                 return
 
             num_junta_medica_a_eliminar = num_junta_medica_a_eliminar.strip()
-            
-            # Buscar el doctor
-            doctor_encontrado = None
-            for doctor in doctores_bd:
-                # Comparar como strings para evitar problemas de tipos
-                if str(doctor.num_junta_medica) == num_junta_medica_a_eliminar:
-                    doctor_encontrado = doctor
-                    break
+            doctor_encontrado = self.directorio.obtener(num_junta_medica_a_eliminar)
 
             if not doctor_encontrado:
                 QMessageBox.warning(
@@ -355,17 +331,20 @@ class ControladorDoctor:
                 )
                 return
 
-            # Verificar si el doctor tiene citas
+            # Verificar si el doctor tiene citas (basta con el total y las más recientes)
             try:
                 id_para_bd = int(doctor_encontrado.num_junta_medica)
-                citas = Doctor.obtener_citas_por_doctor(id_para_bd)
+                pagina = AgendaDoctor.obtener_pagina(id_para_bd, limite=10)
+                if pagina is None:
+                    raise RuntimeError("la consulta de la agenda no respondió")
+                citas = pagina.citas
                 
-                if citas and len(citas) > 0:
+                if pagina.total > 0:
                     QMessageBox.warning(
                         self.vista, 
                         "❌ No se puede eliminar", 
                         f"El Dr. {doctor_encontrado.nombre} {doctor_encontrado.apellido} "
-                        f"tiene {len(citas)} cita(s) registrada(s).\n\n"
+                        f"tiene {pagina.total} cita(s) registrada(s).\n\n"
                         f"No se puede eliminar un doctor que tiene citas asignadas.\n"
                         f"Primero debe cancelar o reasignar todas sus citas."
                     )
@@ -373,7 +352,7 @@ class ControladorDoctor:
                     # Mostrar las citas del doctor
                     self.vista.resultado_text.append(
                         f"❌ ELIMINACIÓN CANCELADA\n"
-                        f"Dr. {doctor_encontrado.nombre} {doctor_encontrado.apellido} tiene {len(citas)} cita(s):\n\n"
+                        f"Dr. {doctor_encontrado.nombre} {doctor_encontrado.apellido} tiene {pagina.total} cita(s):\n\n"
                     )
                     
                     for i, cita in enumerate(citas, 1):
@@ -390,6 +369,10 @@ class ControladorDoctor:
                             f"Paciente: {cita['paciente_nombre']} {cita['paciente_apellido']}, "
                             f"Estado: {cita['estado']}\n"
                         )
+                    if pagina.hay_mas:
+                        self.vista.resultado_text.append(
+                            f"  ... y {pagina.total - len(citas)} cita(s) más.\n"
+                        )
                     
                     return
 
@@ -473,8 +456,7 @@ class ControladorDoctor:
         self.vista.resultado_text.clear()
 
         try:
-            # Obtener doctores desde la base de datos
-            doctores_bd = Doctor.obtener_doctores_desde_db()
+            doctores_bd = self.directorio.todos()
             
             if not doctores_bd:
                 QMessageBox.information(self.vista, "ℹ️ Información", "No hay doctores registrados")
@@ -576,14 +558,7 @@ class ControladorDoctor:
                 return
 
             num_junta_medica_a_buscar = num_junta_medica_a_buscar.strip()
-            
-            # Buscar el doctor - CORREGIDO: usar atributos en lugar de índices
-            doctor_encontrado = None
-            for doctor in doctores_bd:
-                # Comparar como strings para evitar problemas de tipos
-                if str(doctor.num_junta_medica) == num_junta_medica_a_buscar:
-                    doctor_encontrado = doctor
-                    break
+            doctor_encontrado = self.directorio.obtener(num_junta_medica_a_buscar)
             
             if not doctor_encontrado:
                 QMessageBox.warning(
@@ -626,8 +601,7 @@ class ControladorDoctor:
         self.vista.resultado_text.clear()
         
         try:
-            # Obtener doctores desde la base de datos
-            doctores_bd = Doctor.obtener_doctores_desde_db()
+            doctores_bd = self.directorio.todos()
             
             if not doctores_bd:
                 QMessageBox.warning(
@@ -660,28 +634,15 @@ class ControladorDoctor:
                 return
             
             identificador = identificador.strip()
-            
-            doctor_encontrado = None
-            
-            for doctor in doctores_bd:
-                print(f"🔍 DEBUG: Comparando '{identificador}' con '{doctor.num_junta_medica}'")
-                
-                # Comparar ambos como strings
-                if str(doctor.num_junta_medica) == identificador:
-                    doctor_encontrado = doctor
-                    print(f"✅ Doctor encontrado: {doctor.nombre} {doctor.apellido}")
-                    break
+            doctor_encontrado = self.directorio.obtener(identificador)
             
             if not doctor_encontrado:
-                # Crear lista de números disponibles
-                nums_disponibles = [d.num_junta_medica for d in doctores_bd]
-                
                 QMessageBox.warning(
                     self.vista, 
                     "❌ Error", 
                     f"No se encontró ningún doctor con el Nº Junta Médica: {identificador}\n\n"
                     f"Números disponibles:\n" + 
-                    "\n".join([f"• {num} - Dr. {d.nombre} {d.apellido}" for d, num in zip(doctores_bd, nums_disponibles)])
+                    "\n".join([f"• {d.num_junta_medica} - Dr. {d.nombre} {d.apellido}" for d in doctores_bd])
                 )
                 return
             
@@ -696,8 +657,25 @@ class ControladorDoctor:
                 )
                 return
             
-            print(f"🔍 Buscando citas para doctor con ID: {id_para_bd}")
-            citas = Doctor.obtener_citas_por_doctor(id_para_bd)
+            # Existencia, total y primera página en una sola consulta
+            pagina = AgendaDoctor.obtener_pagina(id_para_bd, limite=TAMANO_PAGINA)
+            if pagina is None:
+                QMessageBox.critical(
+                    self.vista, 
+                    "❌ Error", 
+                    "No se pudo consultar la agenda del doctor en la base de datos."
+                )
+                return
+            if not pagina.doctor_encontrado:
+                # Se eliminó desde otra sesión: refrescar el directorio
+                self.directorio.invalidar()
+                QMessageBox.warning(
+                    self.vista, 
+                    "❌ Error", 
+                    f"El doctor con Nº Junta Médica {identificador} ya no existe en la base de datos."
+                )
+                return
+            citas = pagina.citas
             
             # Mostrar resultados
             self.vista.resultado_text.clear()
@@ -723,8 +701,9 @@ class ControladorDoctor:
                     f"Nº Junta Médica: {doctor_encontrado.num_junta_medica}\n"
                     f"Especialidad: {doctor_encontrado.especialidad}\n"
                     f"{'='*70}\n\n"
-                    f"✅ TOTAL DE CITAS ENCONTRADAS: {len(citas)}\n"
-                    f"{'='*70}\n\n"
+                    f"✅ TOTAL DE CITAS ENCONTRADAS: {pagina.total}\n"
+                    + (f"Mostrando las {len(citas)} más recientes\n" if pagina.hay_mas else "")
+                    + f"{'='*70}\n\n"
                 )
                 
                 # Mostrar cada cita
@@ -756,7 +735,7 @@ class ControladorDoctor:
                 QMessageBox.information(
                     self.vista, 
                     "✅ Citas Encontradas", 
-                    f"Se encontraron {len(citas)} cita(s) para el Dr. {doctor_encontrado.nombre} {doctor_encontrado.apellido}."
+                    f"Se encontraron {pagina.total} cita(s) para el Dr. {doctor_encontrado.nombre} {doctor_encontrado.apellido}."
                 )
                 
         except Exception as e:
@@ -792,66 +771,22 @@ class ControladorDoctor:
             return []
 
     def mostrar_listado_doctores(self):
-        print("🔍 [DEBUG] Iniciando mostrar_listado_doctores...")
-        
+        """Muestra todos los doctores en la tabla de la vista (solo se dibujan las filas visibles)"""
         try:
-            # Verificar si existe la conexión
-            if not hasattr(self, 'conexion') or self.conexion is None:
-                print("❌ [DEBUG] No hay conexión a la base de datos")
-                self.mostrar_mensaje("Error", "No hay conexión a la base de datos")
-                return
-            
-            print("✅ [DEBUG] Conexión existe")
-            
-            # Verificar si la tabla existe
-            try:
-                cursor = self.conexion.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='doctores'")
-                tabla_existe = cursor.fetchone()
-                if not tabla_existe:
-                    print("❌ [DEBUG] La tabla 'doctores' no existe")
-                    self.mostrar_mensaje("Error", "La tabla de doctores no existe")
-                    return
-                
-                print("✅ [DEBUG] La tabla 'doctores' existe")
-            except Exception as e:
-                print(f"❌ [DEBUG] Error verificando tabla: {e}")
-            
-            # Contar registros
-            try:
-                cursor = self.conexion.execute("SELECT COUNT(*) FROM doctores")
-                count = cursor.fetchone()[0]
-                print(f"📊 [DEBUG] Total de doctores en la tabla: {count}")
-                
-                if count == 0:
-                    print("⚠️ [DEBUG] La tabla está vacía")
-                    self.mostrar_mensaje("Información", "No hay doctores registrados")
-                    return
-                    
-            except Exception as e:
-                print(f"❌ [DEBUG] Error contando registros: {e}")
-                self.mostrar_mensaje("Error", f"Error al consultar la base de datos: {e}")
-                return
-            
-            # Obtener los doctores
-            try:
-                cursor = self.conexion.execute("SELECT * FROM doctores")
-                doctores = cursor.fetchall()
-                print(f"📋 [DEBUG] Doctores obtenidos: {len(doctores)}")
-                
-                for i, doctor in enumerate(doctores):
-                    print(f"  {i+1}. {doctor}")
-                
-                # Aquí deberías mostrar los doctores en tu interfaz
-                # self.mostrar_doctores_en_interfaz(doctores)
-                
-            except Exception as e:
-                print(f"❌ [DEBUG] Error obteniendo doctores: {e}")
-                self.mostrar_mensaje("Error", f"Error al obtener doctores: {e}")
-                
+            doctores = self.directorio.todos()
         except Exception as e:
-            print(f"❌ [DEBUG] Error general: {e}")
-            self.mostrar_mensaje("Error", f"Error inesperado: {e}")
-            
+            print(f"Error en mostrar_listado_doctores: {e}")
+            self.vista.resultado_text.clear()
+            self.vista.resultado_text.append(f"❌ Error al obtener doctores: {str(e)}")
+            return
+
+        self.vista.mostrar_doctores(doctores or [])
+        self.vista.resultado_text.clear()
+        if not doctores:
+            self.vista.resultado_text.append("No hay doctores registrados.")
+        else:
+            self.vista.resultado_text.append(f"📋 {len(doctores)} doctor(es) registrados.")
+
 def main():
     """Función principal para ejecutar el controlador de doctores"""
     from PyQt6.QtWidgets import QApplication
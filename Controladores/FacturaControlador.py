@@ -1,14 +1,17 @@
 import sys
 import os
-import mysql.connector
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))) 
 
 from PyQt6.QtWidgets import QApplication, QMessageBox 
 from datetime import datetime
 from typing import Dict, Any, List
+from Config.database_config import Error
 from Modelos.PacienteModelo import Paciente 
 from Modelos.FacturaModelo import Factura, FacturacionModel, Tratamiento
+from Modelos.ExportacionDatos import ExportadorDatos
 from Vistas.FacturaVista import FacturacionView 
+from Controladores.CargadorAsincrono import CargadorDatos
+from Controladores.BusEventos import obtener_bus_eventos, FacturaCreada
 
 class FacturacionController:
     def __init__(self, view: FacturacionView = None):
@@ -16,6 +19,11 @@ class FacturacionController:
             print("🔧 Inicializando FacturacionController...")
             self.view = view
             self.model = FacturacionModel()
+            self.cargador = None
+            self.seleccion_pendiente = None
+            self.facturas_listadas = False
+            # Facturas creadas desde esta u otra ventana se agregan al listado sin recargarlo
+            obtener_bus_eventos().suscribir(FacturaCreada, self._al_crear_factura)
             print("✅ Modelo creado exitosamente")
             
             if self.view:
@@ -23,7 +31,7 @@ class FacturacionController:
                 self.setup_connections()
                 print("✅ Conexiones configuradas")
                 
-                print("📊 Cargando datos iniciales...")
+                print("📊 Cargando datos iniciales en segundo plano...")
                 self.cargar_datos_iniciales()
                 print("✅ FacturacionController inicializado completamente")
             else:
@@ -44,48 +52,60 @@ class FacturacionController:
         self.view.crear_factura_signal.connect(self.crear_factura)
         self.view.mostrar_facturas_signal.connect(self.mostrar_facturas)
         self.view.limpiar_campos_signal.connect(self.limpiar_campos)
+        self.view.exportar_facturas_signal.connect(self.exportar_facturas)
         # self.view.actualizar_datos_signal.connect(self.cargar_datos_iniciales)
     
     def cargar_datos_iniciales(self):
-        """Carga pacientes y tratamientos en los ComboBox"""
+        """
+        Lanza en segundo plano la carga de pacientes, tratamientos y el próximo ID de factura.
+        La ventana queda usable para mirar mientras tanto; los ComboBox se llenan en
+        _al_cargar_datos() cuando llegan los resultados.
+        """
+        if self.cargador is None:
+            self.cargador = CargadorDatos()
+            self.cargador.todo_cargado.connect(self._al_cargar_datos)
+
+        print("Solicitando pacientes, tratamientos e ID de factura a la base de datos...")
+        self.view.mostrar_cargando(True)
+        self.cargador.cargar({
+            'pacientes': self.model.obtener_pacientes,
+            'tratamientos': self.model.obtener_tratamientos,
+            'siguiente_id': self.model.generar_id_factura_automatico,
+        })
+
+    def _al_cargar_datos(self, resultados: dict, errores: dict):
+        """Llena los ComboBox con los datos cargados en segundo plano"""
         try:
-            # Cargar pacientes con timeout y manejo de errores
-            print("Solicitando pacientes a la base de datos...")
-            
-            try:
-                pacientes = self.model.obtener_pacientes()
-                print(f"Total de pacientes recuperados: {len(pacientes)}")
-                
-                if pacientes:
-                    self.view.cargar_pacientes(pacientes)
-                    print("✅ Pacientes cargados exitosamente en la vista")
-                else:
-                    print("⚠️ No se encontraron pacientes en la base de datos")
-                    self.view.mostrar_mensaje("info", "ℹ️ Información", 
-                                            "No hay pacientes registrados en la base de datos.")
-                    
-            except mysql.connector.Error as db_error:
-                print(f"❌ Error de base de datos al cargar pacientes: {db_error}")
+            self.view.mostrar_cargando(False)
+
+            # Pacientes
+            if 'pacientes' in errores:
+                print(f"❌ Error al cargar pacientes: {errores['pacientes']}")
                 self.view.mostrar_mensaje("error", "❌ Error de Conexión", 
                                         f"No se pudo conectar a la base de datos.\n"
                                         f"Verifique que MySQL esté ejecutándose.\n\n"
-                                        f"Error: {str(db_error)}")
-                return
-            except Exception as paciente_error:
-                print(f"❌ Error general al cargar pacientes: {paciente_error}")
-                import traceback
-                traceback.print_exc()
-                self.view.mostrar_mensaje("error", "❌ Error", 
-                                        f"Error al cargar pacientes: {str(paciente_error)}")
+                                        f"Error: {errores['pacientes']}")
                 return
-            
-            # Cargar tratamientos solo si los pacientes se cargaron correctamente
-            print("Solicitando tratamientos a la base de datos...")
-            
-            try:
-                tratamientos = self.model.obtener_tratamientos()
+
+            pacientes = resultados.get('pacientes') or []
+            print(f"Total de pacientes recuperados: {len(pacientes)}")
+            if pacientes:
+                self.view.cargar_pacientes(pacientes)
+                print("✅ Pacientes cargados exitosamente en la vista")
+            else:
+                print("⚠️ No se encontraron pacientes en la base de datos")
+                self.view.mostrar_mensaje("info", "ℹ️ Información", 
+                                        "No hay pacientes registrados en la base de datos.")
+
+            # Tratamientos
+            if 'tratamientos' in errores:
+                print(f"❌ Error al cargar tratamientos: {errores['tratamientos']}")
+                self.view.mostrar_mensaje("error", "❌ Error de Conexión", 
+                                        f"No se pudo cargar los tratamientos.\n\n"
+                                        f"Error: {errores['tratamientos']}")
+            else:
+                tratamientos = resultados.get('tratamientos') or []
                 print(f"Total de tratamientos recuperados: {len(tratamientos)}")
-                
                 if tratamientos:
                     self.view.cargar_tratamientos(tratamientos)
                     print("✅ Tratamientos cargados exitosamente en la vista")
@@ -93,51 +113,77 @@ class FacturacionController:
                     print("⚠️ No se encontraron tratamientos en la base de datos")
                     self.view.mostrar_mensaje("info", "ℹ️ Información", 
                                             "No hay tratamientos registrados en la base de datos.")
-                    
-            except mysql.connector.Error as db_error:
-                print(f"❌ Error de base de datos al cargar tratamientos: {db_error}")
-                self.view.mostrar_mensaje("error", "❌ Error de Conexión", 
-                                        f"No se pudo cargar los tratamientos.\n\n"
-                                        f"Error: {str(db_error)}")
-            except Exception as tratamiento_error:
-                print(f"❌ Error general al cargar tratamientos: {tratamiento_error}")
-                import traceback
-                traceback.print_exc()
-                self.view.mostrar_mensaje("error", "❌ Error", 
-                                        f"Error al cargar tratamientos: {str(tratamiento_error)}")
-            
-            # Generar y mostrar el próximo ID de factura automáticamente
-            try:
-                siguiente_id = self.model.generar_id_factura_automatico()
-                self.view.mostrar_id_automatico(siguiente_id)
-                print(f"✅ ID de factura generado y mostrado: {siguiente_id}")
-            except Exception as id_error:
-                print(f"❌ Error al generar ID automático: {id_error}")
-                self.view.mostrar_id_automatico("F001")  # ID por defecto
-            
+
+            # Próximo ID de factura
+            siguiente_id = resultados.get('siguiente_id') or "F001"  # ID por defecto
+            self.view.mostrar_id_automatico(siguiente_id)
+            print(f"✅ ID de factura generado y mostrado: {siguiente_id}")
+
+            self._aplicar_seleccion_pendiente()
             print("✅ Proceso de carga de datos completado")
-            
+
         except Exception as e:
             print(f"❌ Error crítico al cargar datos iniciales: {e}")
             import traceback
             traceback.print_exc()
             self.view.mostrar_mensaje("error", "❌ Error Crítico", 
                                     f"Error crítico al inicializar datos: {str(e)}")
+
+    def preseleccionar(self, id_paciente=None, id_tratamiento=None):
+        """
+        Selecciona un paciente y un tratamiento en los ComboBox (p. ej. al facturar una cita).
+        Si los datos todavía se están cargando, la selección se aplica cuando lleguen.
+        """
+        self.seleccion_pendiente = (id_paciente, id_tratamiento)
+        if not (self.cargador and self.cargador.cargando):
+            self._aplicar_seleccion_pendiente()
+
+    def _aplicar_seleccion_pendiente(self):
+        if not self.seleccion_pendiente:
+            return
+        id_paciente, id_tratamiento = self.seleccion_pendiente
+        self.seleccion_pendiente = None
+
+        if id_paciente is not None:
+            if self._seleccionar_en_combo(self.view.paciente_combo, 'id_paciente', id_paciente):
+                print(f"✅ Paciente seleccionado: {id_paciente}")
+            else:
+                print("⚠️ No se pudo seleccionar el paciente automáticamente")
+
+        if id_tratamiento is not None:
+            if self._seleccionar_en_combo(self.view.tratamiento_combo, 'id_tratamiento', id_tratamiento):
+                print(f"✅ Tratamiento seleccionado: {id_tratamiento}")
+            else:
+                print("⚠️ No se pudo seleccionar el tratamiento automáticamente")
+
+    @staticmethod
+    def _seleccionar_en_combo(combo, atributo: str, valor) -> bool:
+        """Selecciona el elemento del ComboBox cuyo dato tiene `atributo` igual a `valor`"""
+        for i in range(combo.count()):
+            dato = combo.itemData(i)
+            if dato is not None and getattr(dato, atributo, None) == valor:
+                combo.setCurrentIndex(i)
+                return True
+        return False
     
     def crear_factura(self, datos: Dict[str, Any]):
         """Crea una nueva factura"""
         try:
-            # Generar ID automáticamente
-            id_factura_automatico = self.model.generar_id_factura_automatico()
+            # Validar datos antes de reservar el ID para no consumir números en vano
+            if not self._validar_datos_factura(datos):
+                return
+            
+            # Reservar el ID de forma atómica (no choca con otras estaciones)
+            id_factura_automatico = self.model.reservar_id_factura()
+            if not id_factura_automatico:
+                self.view.mostrar_mensaje("error", "❌ Error", 
+                                        "No se pudo generar el ID de la factura.")
+                return
             print(f"🆔 ID generado automáticamente: {id_factura_automatico}")
             
             # Actualizar los datos con el ID generado
             datos['id_factura'] = id_factura_automatico
             
-            # Validar datos
-            if not self._validar_datos_factura(datos):
-                return
-            
             # Imprimir información de depuración
             print(f"ID Factura: {datos['id_factura']}")
             print(f"Paciente: {datos['paciente'].__class__.__name__} - {datos['paciente'].id_paciente} - {datos['paciente'].nombre} {datos['paciente'].apellido}")
@@ -159,11 +205,13 @@ class FacturacionController:
                 servicios=[tratamiento.descripcion],
                 montos=[tratamiento.costo],
                 fecha_emision=datetime.now(),
-                estado_pago="Pendiente"
+                estado_pago="Pendiente",
+                tratamientos=[tratamiento]
             )
             
             # Insertar en la base de datos
             if self.model.insertar_factura_bd(nueva_factura):
+                obtener_bus_eventos().publicar(FacturaCreada(nueva_factura))
                 self.view.mostrar_mensaje("success", "✅ Éxito", 
                                         "Factura creada correctamente.")
                 self.view.limpiar_formulario()
@@ -188,6 +236,11 @@ class FacturacionController:
             self.view.mostrar_mensaje("error", "❌ Error", 
                                     f"Error inesperado: {str(e)}")
             
+    def _al_crear_factura(self, evento: FacturaCreada):
+        """Si el listado ya se mostró, agrega la factura nueva al inicio"""
+        if self.view and self.facturas_listadas:
+            self.view.agregar_factura(evento.factura)
+
     def _validar_datos_factura(self, datos: Dict[str, Any]) -> bool:
         """Valida los datos de la factura antes de crearla"""
         # Ya no validamos el ID porque se genera automáticamente
@@ -204,24 +257,39 @@ class FacturacionController:
         
         return True
     
+    def exportar_facturas(self, opciones):
+        """Exporta las facturas (todas o un rango de fechas de emisión) a CSV o JSONL"""
+        progreso = self.view.iniciar_progreso_exportacion("Exportando facturas...")
+        resultado = ExportadorDatos().exportar('facturas', opciones.ruta, opciones.fecha_desde,
+                                               opciones.fecha_hasta, progreso=progreso)
+        progreso.cerrar()
+        if progreso.cancelado:
+            return
+        if resultado is None:
+            self.view.mostrar_mensaje("error", "❌ Error",
+                                      f"No se pudo completar la exportación a {opciones.ruta}")
+            return
+        self.view.mostrar_mensaje("success", "✅ Éxito", resultado.mensaje)
+
     def mostrar_facturas(self):
         """Muestra todas las facturas registradas"""
         try:
             facturas = self.model.obtener_todas_facturas_bd()
+            self.facturas_listadas = True
             
             if not facturas:
+                self.view.mostrar_facturas([])
                 self.view.mostrar_mensaje("info", "ℹ️ Información", 
                                         "No hay facturas registradas.")
                 self.view.actualizar_resultado("No hay facturas registradas.", limpiar=True)
                 return
             
-            # Mostrar facturas en el área de resultados
-            self.view.actualizar_resultado("📋 FACTURAS REGISTRADAS:\n", limpiar=True)
-            
-            for factura in facturas:
-                self.view.agregar_factura_resultado(str(factura))
-                
-            self.view.actualizar_resultado(f"\n📊 Total de facturas: {len(facturas)}")
+            # Mostrar facturas en la tabla (las filas se dibujan al desplazarse)
+            self.view.mostrar_facturas(facturas)
+            total_facturado = sum(factura.monto_total for factura in facturas)
+            self.view.actualizar_resultado(
+                f"📊 Total de facturas: {len(facturas)} - Monto total: ${total_facturado:,.2f}\n"
+                f"Doble clic en una factura para ver su detalle.", limpiar=True)
             
         except Exception as e:
             self.view.mostrar_mensaje("error", "❌ Error", 
@@ -298,7 +366,7 @@ def main():
         print("▶️ Iniciando loop de eventos...")
         app.exec()  # Sin sys.exit() para permitir continuar
         
-    except mysql.connector.Error as db_error:
+    except Error as db_error:
         print(f"❌ Error de base de datos: {db_error}")
         QMessageBox.critical(None, "Error de Base de Datos", 
                            f"No se pudo conectar a la base de datos.\n\n"
@@ -7,18 +7,51 @@ from typing import List
 
 from Modelos.HorarioModelo import Horario, HorarioModel
 from Modelos.DoctorModelo import Doctor 
+from Controladores.CargadorAsincrono import CargadorDatos
 from PyQt6.QtWidgets import QMessageBox, QInputDialog, QApplication
 from PyQt6.QtCore import QDateTime 
 
 class HorarioController:
     def __init__(self, vista):
         self.vista = vista
-        self.modelo = HorarioModel() 
+        self.modelo = HorarioModel(cargar=False)  # Los datos llegan en segundo plano
         
-        # Cargar doctores desde la base de datos
+        # Cargar doctores y horarios desde la base de datos sin congelar la ventana
         self.doctores = []
-        self.cargar_datos_desde_bd()
-        self.inicializar_vista()
+        self.cargador = None
+        self.cargar_datos_en_segundo_plano()
+
+    def cargar_datos_en_segundo_plano(self):
+        """Lanza en paralelo la carga de doctores y horarios; la vista muestra el estado de carga"""
+        if self.cargador is None:
+            self.cargador = CargadorDatos()
+            self.cargador.todo_cargado.connect(self._al_cargar_datos)
+
+        self.vista.mostrar_cargando(True)
+        self.cargador.cargar({
+            'doctores': Doctor.obtener_todos_doctores,
+            'horarios': Horario.obtener_horarios_bd,
+        })
+
+    def _al_cargar_datos(self, resultados: dict, errores: dict):
+        """Recibe los datos cargados en segundo plano y llena la vista"""
+        if 'doctores' in errores:
+            print(f"Error al cargar datos desde BD: {errores['doctores']}")
+            # Doctores de respaldo si hay error en la BD
+            self.doctores = [
+                Doctor("Melisa", "Rivas", "12345678-9", "Cirujano Dentista", 12345678, "correo@gmail.com"),
+                Doctor("Carlos", "López", "98765432-1", "Ortodontista", 87654321, "correo1@gmail.com")
+            ]
+        else:
+            self.doctores = resultados.get('doctores') or []
+        print(f"Doctores cargados desde BD: {len(self.doctores)}")
+
+        self.modelo.establecer_datos(list(self.doctores), resultados.get('horarios') or [])
+        print(f"Horarios cargados desde BD: {len(self.modelo.horarios)}")
+
+        self.vista.mostrar_cargando(False)
+        self.vista.actualizar_combos(self.doctores)
+        self.vista.actualizar_lista_horarios({"Hoy": self.modelo.horarios})
         
     def cargar_datos_desde_bd(self):
         """Carga todos los datos necesarios desde la base de datos"""
@@ -47,10 +80,6 @@ class HorarioController:
             siguiente_id = self.modelo.generar_siguiente_id()
             print(f"ID generado automáticamente: {siguiente_id}")
             
-            # Mostrar IDs existentes para debugging
-            ids_existentes = self.modelo.obtener_ids_existentes()
-            print(f"IDs existentes en BD: {ids_existentes}")
-            
             datos = self.vista.mostrar_dialogo_agregar(self.doctores, siguiente_id)
             if not datos: 
                 return
@@ -81,21 +110,29 @@ class HorarioController:
             # Validar ID único usando el nuevo método del modelo
             if not self.modelo.verificar_id_disponible(id_horario):
                 QMessageBox.warning(self.vista, "❌ Error", 
-                                  f"El ID de horario '{id_horario}' ya existe.\n"
-                                  f"IDs existentes: {', '.join(ids_existentes)}")
+                                  f"El ID de horario '{id_horario}' ya existe.")
                 return
 
             # Crear el nuevo objeto Horario
             nuevo_horario = Horario(id_horario, hora_inicio, hora_fin, doctor)
 
-            # Validar conflicto de horarios 
-            horarios_existentes = self.modelo.obtener_horarios()
-            for horario_existente in horarios_existentes:
-                if nuevo_horario.horario_ocupado(horario_existente):
-                    QMessageBox.warning(self.vista, "❌ Error", 
-                                      f"El doctor {doctor.nombre} {doctor.apellido} ya tiene un horario "
-                                      f"ocupado en ese rango de horas.")
+            # Validar conflicto de horarios (el modelo refresca ese doctor desde la BD)
+            horario_conflicto = self.modelo.buscar_conflicto(nuevo_horario)
+            if horario_conflicto:
+                QMessageBox.warning(self.vista, "❌ Error", 
+                                  f"El doctor {doctor.nombre} {doctor.apellido} ya tiene un horario "
+                                  f"ocupado en ese rango de horas.\n"
+                                  f"Horario conflictivo: {horario_conflicto.hora_inicio} - {horario_conflicto.hora_fin}")
+                return
+            
+            # El ID sugerido solo era una vista previa: reservarlo ahora de forma atómica.
+            # Un ID escrito a mano se guarda tal cual y el modelo adelanta la secuencia.
+            if id_horario == siguiente_id:
+                id_reservado = self.modelo.reservar_siguiente_id()
+                if not id_reservado:
+                    QMessageBox.critical(self.vista, "❌ Error", "No se pudo generar el ID del horario.")
                     return
+                nuevo_horario.id_horario = id_reservado
             
             # Si todas las validaciones pasan, agregar al modelo (que insertará en BD)
             if self.modelo.agregar_horario(nuevo_horario):
@@ -151,8 +188,7 @@ def main():
     from PyQt6.QtWidgets import QApplication
     
     app = QApplication([])
-    window = HorarioView()
-    controller = HorarioController(window)
+    window = HorarioView()  # La vista crea su propio HorarioController
     window.show()
     app.exec()  # Sin sys.exit() para permitir continuar
 
@@ -3,11 +3,22 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from Modelos.loginModelo import LoginModelo
 from Vistas.LoginVista import LoginVista
+from Controladores.CargadorAsincrono import CargadorDatos
+
+from PyQt6.QtCore import QTimer
+
+# ==========================================
+# ARRANQUE: Este es el primer módulo que se importa. Solo trae el login
+# (vista, modelo y Qt); la capa de datos, el menú y los módulos de la
+# clínica se importan cuando se usan por primera vez.
+# Benchmarks/benchmark_arranque.py verifica que siga siendo así.
+# ==========================================
 
 class LoginControlador:
     def __init__(self):
         self.modelo = LoginModelo()
         self.vista = LoginVista()
+        self.cargador = None
         self.conectar_eventos()
     
     def conectar_eventos(self):
@@ -41,8 +52,19 @@ class LoginControlador:
         self.abrir_ventana_principal(tipo_usuario)
     
     def mostrar(self):
-        """Muestra la ventana de login"""
+        """Muestra la ventana de login; los usuarios disponibles se cargan después de pintarla"""
         self.vista.show()
+        QTimer.singleShot(0, self.cargar_usuarios_en_segundo_plano)
+
+    def cargar_usuarios_en_segundo_plano(self):
+        """Consulta los usuarios en un hilo aparte (incluye importar y conectar la BD)"""
+        if self.cargador is None:
+            self.cargador = CargadorDatos()
+            self.cargador.todo_cargado.connect(self._al_cargar_usuarios)
+        self.cargador.cargar({'usuarios': self.modelo.listar_usuarios_disponibles})
+
+    def _al_cargar_usuarios(self, resultados: dict, errores: dict):
+        self.vista.mostrar_info_usuarios(resultados.get('usuarios') or [], errores.get('usuarios'))
     
     def abrir_ventana_principal(self, tipo_usuario):
         """Abre la ventana principal según el tipo de usuario"""
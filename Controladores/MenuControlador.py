@@ -4,6 +4,9 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from Modelos.MenuModelo import MenuModelo
 from Vistas.MenuVista import MenuVista
 
+# Los controladores y vistas de cada módulo se importan dentro de abrir_*:
+# abrir el menú no carga pacientes, citas, facturas... hasta que se eligen
+
 class MenuControlador:
     def __init__(self, usuario=None, tipo_usuario="admin"):
         self.modelo = MenuModelo()
@@ -59,9 +62,10 @@ class MenuControlador:
     def abrir_pacientes(self):
         if self.modelo.tiene_permiso('pacientes'):
             print("Abriendo módulo de Pacientes...")
-            from Controladores.PacienteControlador import PacienteControlador   
-            from Vistas.PacienteVista import PacienteWindow
             try:
+                from Controladores.PacienteControlador import PacienteControlador   
+                from Vistas.PacienteVista import PacienteWindow
+                
                 if self.Paciente_window:
                     self.Paciente_window.close()
                     
@@ -135,10 +139,10 @@ class MenuControlador:
                 if self.cita_window:
                     self.cita_window.close()
                     
+                # El controlador carga sus datos en segundo plano: la ventana se abre de inmediato
                 controlador = ControladorCita()
                 
-                self.cita_window = CitaWindow()
-                controlador.set_vista(self.cita_window)
+                self.cita_window = CitaWindow(controlador)
                 
                 try:
                     controlador.inicializar_vista()
@@ -210,18 +214,14 @@ class MenuControlador:
         if self.modelo.tiene_permiso('horarios'):
             print("Abriendo módulo de Horarios...")
             try:
-                from Controladores.HorarioControlador import HorarioController   
                 from Vistas.HorarioVista import HorarioView
                 
                 if self.Horario_window:
                     self.Horario_window.close()
                     
-                # Crear vista primero
+                # La vista crea su propio HorarioController, que carga los datos en segundo plano
                 self.Horario_window = HorarioView()
                 
-                # Crear controlador con la vista
-                controlador = HorarioController(self.Horario_window)
-                
                 # Mostrar la ventana
                 self.Horario_window.show()
                     
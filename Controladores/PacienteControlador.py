@@ -11,7 +11,14 @@ from Modelos.PacienteModelo import Paciente
 
 from Modelos.CitaModelo import Cita
 from Modelos.TratamientoModelo import Tratamiento
+from Modelos.IndiceBusqueda import IndiceBusqueda, coincide_texto, refina_busqueda
+from Modelos.ReportePacientes import GeneradorReportePacientes, leer_lote_pacientes
+from Modelos.ConsultasPacientes import ConsultasPacientes
+from Modelos.ExportacionDatos import ExportadorDatos
+from Controladores.CargadorAsincrono import CargadorDatos
+from Controladores.BusEventos import obtener_bus_eventos, FacturaCreada
 from datetime import datetime
+from functools import partial
 from typing import List
 import re
 
@@ -27,6 +34,15 @@ class PacienteControlador:
         self.pacientes_registrados: List[Paciente] = []
         self.paciente_actual: Paciente = None
         self.vista = None  # Referencia a la vista
+        # Índice de búsqueda por apellido/nombre (sin acentos ni mayúsculas), se mantiene al crear/modificar/eliminar
+        self.indice_busqueda = IndiceBusqueda(('apellido', 'nombre'))
+        # Búsqueda en vivo: última búsqueda (para refinarla) y carga en segundo plano si se consulta la BD
+        self._ultima_busqueda = None  # (nombre, apellido, resultados)
+        self._busqueda_en_curso = 0
+        self._al_terminar_busqueda = None
+        self.cargador_busqueda = None
+        # Una factura pendiente nueva sube el saldo de su paciente: se corrige solo esa fila
+        obtener_bus_eventos().suscribir(FacturaCreada, self._al_crear_factura)
         # Inicializar el contador de IDs de manera robusta
         Paciente.inicializar_contador_desde_pacientes(self.pacientes_registrados)
 
@@ -143,6 +159,25 @@ class PacienteControlador:
                 return paciente
         return None
 
+    def _al_crear_factura(self, evento: FacturaCreada):
+        """
+        Vuelve a leer de la BD el saldo pendiente del paciente de la factura y lo
+        actualiza en la tabla. No se suma al valor en memoria: los pacientes se cargan
+        con saldo 0, así que la suma solo reflejaría las facturas de esta sesión.
+        """
+        factura = evento.factura
+        if factura.paciente is None:
+            return
+        # La tabla se llena por lotes desde la BD: el paciente puede estar en ella
+        # aunque no esté en memoria; la fila se repinta por su ID
+        paciente = self.buscar_paciente_por_id(factura.paciente.id_paciente) or factura.paciente
+        saldo = ConsultasPacientes.saldo_pendiente(paciente.id_paciente)
+        if saldo is None:
+            return
+        paciente.saldo_pendiente = saldo
+        if self.vista:
+            self.vista.actualizar_paciente_en_tabla(paciente)
+
     def existe_paciente_con_dui(self, dui: str) -> bool:
         """Verifica si ya existe un paciente con el DUI dado (solo si DUI no está vacío)"""
         if not dui or len(dui.replace(" ", "")) == 0:
@@ -150,39 +185,55 @@ class PacienteControlador:
         return any(paciente.dui == dui and paciente.dui for paciente in self.pacientes_registrados)
 
 
-    def buscar_pacientes_por_nombre(self, nombre: str) -> List[Paciente]:
-        """Busca pacientes que contengan el nombre dado"""
-        nombre_lower = nombre.lower()
-        return [p for p in self.pacientes_registrados 
-                if nombre_lower in p.nombre.lower() or nombre_lower in p.apellido.lower()]
-
-    def buscar_pacientes_por_nombre_apellido(self, nombre: str = "", apellido: str = "") -> List[Paciente]:
-        """Busca pacientes por nombre y/o apellido (coincidencia parcial)"""
-        pacientes_encontrados = []
-
-        nombre_lower = nombre.lower() if nombre else ""
-        apellido_lower = apellido.lower() if apellido else ""
-
-        for paciente in self.pacientes_registrados:
-            nombre_paciente = paciente.nombre.lower()
-            apellido_paciente = paciente.apellido.lower()
-
-            # Verificar si coincide con la búsqueda
-            coincide_nombre = not nombre_lower or nombre_lower in nombre_paciente
-            coincide_apellido = not apellido_lower or apellido_lower in apellido_paciente
+    def _indexar_paciente(self, paciente: Paciente):
+        """Agrega o actualiza un paciente en el índice de búsqueda"""
+        self._ultima_busqueda = None
+        self.indice_busqueda.agregar(paciente.id_paciente, paciente,
+                                     nombre=paciente.nombre, apellido=paciente.apellido)
 
-            if coincide_nombre and coincide_apellido:
-                pacientes_encontrados.append(paciente)
+    def reconstruir_indice_busqueda(self):
+        """Vuelve a indexar todos los pacientes en memoria (después de cargarlos de la BD)"""
+        self._ultima_busqueda = None
+        self.indice_busqueda.reconstruir(
+            (p.id_paciente, p, {'nombre': p.nombre, 'apellido': p.apellido})
+            for p in self.pacientes_registrados
+        )
 
-        return pacientes_encontrados
-
-    def buscar_pacientes_con_saldo_pendiente(self) -> List[Paciente]:
-        """Obtiene todos los pacientes con saldo pendiente"""
-        return [p for p in self.pacientes_registrados if p.tiene_saldo_pendiente()]
+    def buscar_pacientes_por_nombre(self, nombre: str) -> List[Paciente]:
+        """Busca pacientes cuyo nombre o apellido contenga el texto dado"""
+        encontrados = {p.id_paciente: p for p in self.indice_busqueda.buscar(nombre=nombre, difuso=False)}
+        for paciente in self.indice_busqueda.buscar(apellido=nombre, difuso=False):
+            encontrados.setdefault(paciente.id_paciente, paciente)
+        if not encontrados:
+            return self.indice_busqueda.buscar(apellido=nombre)
+        return list(encontrados.values())
 
-    def buscar_pacientes_menores_edad(self) -> List[Paciente]:
-        """Obtiene todos los pacientes menores de edad"""
-        return [p for p in self.pacientes_registrados if p.es_menor_de_edad()]
+    def buscar_pacientes_por_nombre_apellido(self, nombre: str = "", apellido: str = "") -> List[Paciente]:
+        """
+        Busca pacientes por nombre y/o apellido (coincidencia parcial, sin importar acentos
+        ni mayúsculas). Si nada coincide exactamente, devuelve los nombres más parecidos.
+        """
+        return self.indice_busqueda.buscar(nombre=nombre, apellido=apellido)
+
+    # Los filtros, ordenamientos y totales se resuelven en SQL (ConsultasPacientes) y solo
+    # traen las filas pedidas; sin conexión a la BD se calculan sobre los pacientes en memoria
+
+    def buscar_pacientes_con_saldo_pendiente(self, limite: int = None) -> List[Paciente]:
+        """Obtiene los pacientes con saldo pendiente, del saldo más alto al más bajo"""
+        pacientes = ConsultasPacientes.pacientes_con_saldo_pendiente(limite)
+        if pacientes is None:
+            pacientes = sorted((p for p in self.pacientes_registrados if p.tiene_saldo_pendiente()),
+                               key=lambda p: p.saldo_pendiente, reverse=True)
+            pacientes = pacientes[:limite] if limite else pacientes
+        return pacientes
+
+    def buscar_pacientes_menores_edad(self, limite: int = None) -> List[Paciente]:
+        """Obtiene los pacientes menores de edad"""
+        pacientes = ConsultasPacientes.pacientes_menores_edad(limite)
+        if pacientes is None:
+            pacientes = [p for p in self.pacientes_registrados if p.es_menor_de_edad()]
+            pacientes = pacientes[:limite] if limite else pacientes
+        return pacientes
 
     # ==========================================
     # MÉTODOS DE GESTIÓN DE PACIENTES (LÓGICA DE NEGOCIO)
@@ -230,6 +281,7 @@ class PacienteControlador:
 
             # Agregar a la lista local
             self.pacientes_registrados.append(nuevo_paciente)
+            self._indexar_paciente(nuevo_paciente)
             self.paciente_actual = nuevo_paciente
 
             # Actualizar el contador
@@ -291,6 +343,7 @@ Bienvenido/a al sistema de gestión médica.
 
                     setattr(self.paciente_actual, campo, valor)
 
+            self._indexar_paciente(self.paciente_actual)
             return True, "Paciente modificado exitosamente"
         except Exception as e:
             return False, f"Error al modificar paciente: {str(e)}"
@@ -309,6 +362,8 @@ Bienvenido/a al sistema de gestión médica.
             return False, "No se puede eliminar un paciente con saldo pendiente"
 
         self.pacientes_registrados.remove(paciente)
+        self.indice_busqueda.quitar(paciente.id_paciente)
+        self._ultima_busqueda = None
         if self.paciente_actual == paciente:
             self.paciente_actual = None
 
@@ -526,13 +581,24 @@ Tratamiento completado exitosamente para el paciente {self.paciente_actual.nombr
         return self.pacientes_registrados.copy()  # Copia para evitar modificaciones externas
 
     def get_resumen_pacientes(self) -> dict:
-        """Obtiene un resumen estadístico de todos los pacientes"""
-        total_pacientes = len(self.pacientes_registrados)
-        pacientes_con_saldo = len(self.buscar_pacientes_con_saldo_pendiente())
-        pacientes_menores = len(self.buscar_pacientes_menores_edad())
-
-        saldo_total_pendiente = sum(p.saldo_pendiente for p in self.pacientes_registrados)
-        ingresos_totales = sum(p.get_balance_total() for p in self.pacientes_registrados)
+        """Obtiene un resumen estadístico de todos los pacientes (contado en la BD)"""
+        resumen = ConsultasPacientes.obtener_resumen()
+        if resumen is not None:
+            return resumen
+        return self._resumen_pacientes_en_memoria()
+
+    def _resumen_pacientes_en_memoria(self) -> dict:
+        """Resumen sobre los pacientes en memoria, en una sola pasada (cuando no hay BD)"""
+        total_pacientes = pacientes_con_saldo = pacientes_menores = 0
+        saldo_total_pendiente = ingresos_totales = 0.0
+        for p in self.pacientes_registrados:
+            total_pacientes += 1
+            if p.saldo_pendiente > 0:
+                pacientes_con_saldo += 1
+            if p.es_menor_de_edad():
+                pacientes_menores += 1
+            saldo_total_pendiente += p.saldo_pendiente
+            ingresos_totales += p.get_balance_total()
 
         return {
             'total_pacientes': total_pacientes,
@@ -543,14 +609,22 @@ Tratamiento completado exitosamente para el paciente {self.paciente_actual.nombr
             'promedio_saldo_por_paciente': saldo_total_pendiente / total_pacientes if total_pacientes > 0 else 0
         }
 
-    def get_pacientes_ordenados_por_nombre(self) -> List[Paciente]:
-        """Obtiene la lista de pacientes ordenada por nombre"""
-        return sorted(self.pacientes_registrados, key=lambda p: f"{p.apellido} {p.nombre}")
+    def get_pacientes_ordenados_por_nombre(self, limite: int = None) -> List[Paciente]:
+        """Obtiene la lista de pacientes ordenada por apellido y nombre"""
+        pacientes = ConsultasPacientes.pacientes_ordenados_por_nombre(limite)
+        if pacientes is None:
+            pacientes = sorted(self.pacientes_registrados, key=lambda p: (p.apellido, p.nombre))
+            pacientes = pacientes[:limite] if limite else pacientes
+        return pacientes
 
-    def get_pacientes_ordenados_por_saldo(self, descendente: bool = True) -> List[Paciente]:
+    def get_pacientes_ordenados_por_saldo(self, descendente: bool = True, limite: int = None) -> List[Paciente]:
         """Obtiene la lista de pacientes ordenada por saldo pendiente"""
-        return sorted(self.pacientes_registrados, 
-                     key=lambda p: p.saldo_pendiente, reverse=descendente)
+        pacientes = ConsultasPacientes.pacientes_ordenados_por_saldo(descendente, limite)
+        if pacientes is None:
+            pacientes = sorted(self.pacientes_registrados,
+                               key=lambda p: p.saldo_pendiente, reverse=descendente)
+            pacientes = pacientes[:limite] if limite else pacientes
+        return pacientes
 
     # ==========================================
     # MÉTODOS DE FORMATEO Y UTILIDADES PARA LA VISTA
@@ -648,17 +722,14 @@ Tratamiento completado exitosamente para el paciente {self.paciente_actual.nombr
             
             # Actualizar la lista de pacientes registrados
             self.pacientes_registrados = pacientes_bd
+            self.reconstruir_indice_busqueda()
             
             # IMPORTANTE: Inicializar correctamente el contador de IDs basado en los IDs existentes en la BD
             if pacientes_bd:
-                # Obtener el ID más alto de los pacientes cargados
-                max_id = max(p.id_paciente for p in pacientes_bd)
-                # Establecer el contador para el siguiente ID disponible
-                Paciente._contador_id = max_id + 1
-                # Registrar todos los IDs existentes
-                Paciente._pacientes_existentes = [p.id_paciente for p in pacientes_bd]
-                print(f"🔧 Contador de IDs inicializado. Próximo ID disponible: {Paciente._contador_id}")
-                print(f"📊 IDs existentes registrados: {sorted(Paciente._pacientes_existentes)}")
+                # Registrar todos los IDs existentes; el siguiente ID libre es el mayor + 1
+                Paciente.inicializar_contador_desde_pacientes(pacientes_bd)
+                print(f"🔧 Contador de IDs inicializado. Próximo ID disponible: {Paciente.get_next_id()}")
+                print(f"📊 IDs existentes registrados: {len(Paciente._pacientes_existentes)}")
             
             # Actualizar la vista si está disponible
             if self.vista:
@@ -673,6 +744,53 @@ Tratamiento completado exitosamente para el paciente {self.paciente_actual.nombr
             print(mensaje_error)
             return False, mensaje_error
     
+    def generar_reporte_pacientes(self, escribir, incluir_detalle: bool = True):
+        """
+        Genera el resumen de todos los pacientes leyendo la BD por lotes y lo entrega
+        por partes a `escribir` (la vista o un archivo). Devuelve las estadísticas.
+        """
+        return GeneradorReportePacientes().generar(escribir, incluir_detalle)
+
+    def exportar_reporte_pacientes(self, ruta: str) -> tuple[bool, str]:
+        """Escribe el reporte completo de pacientes en un archivo de texto"""
+        estadisticas = GeneradorReportePacientes().generar_archivo(ruta)
+        if estadisticas is None:
+            return False, f"No se pudo escribir el archivo {ruta}"
+        return True, f"Reporte de {estadisticas.total_pacientes} pacientes guardado en {ruta}"
+
+    def exportar_pacientes(self, ruta: str, progreso=None) -> tuple[bool, str]:
+        """Exporta la tabla de pacientes a CSV o JSONL (según la extensión) leyendo la BD por lotes"""
+        resultado = ExportadorDatos().exportar('pacientes', ruta, progreso=progreso)
+        if resultado is None:
+            return False, f"No se pudo completar la exportación a {ruta}"
+        return True, resultado.mensaje
+
+    def lote_pacientes_para_tabla(self, ultimo: Paciente = None, tamano_lote: int = 200) -> tuple[List[Paciente], bool]:
+        """
+        Lee de la BD los pacientes que siguen a `ultimo` (por ID) para la tabla de la vista.
+        Tiene la forma que espera TablaDatos.mostrar(..., cargar_mas=...): (pacientes, hay_más).
+        """
+        filas = leer_lote_pacientes(ultimo.id_paciente if ultimo else 0, tamano_lote)
+        if not filas:
+            return [], False
+
+        pacientes = []
+        for fila in filas:
+            try:
+                pacientes.append(Paciente(
+                    nombre=fila.nombre,
+                    apellido=fila.apellido,
+                    fecha_nacimiento=fila.fecha_nacimiento,
+                    telefono=int(fila.telefono) if str(fila.telefono).isdigit() else 0,
+                    correo=fila.correo,
+                    dui=fila.dui,
+                    saldo_pendiente=fila.saldo_pendiente,
+                    id_paciente=fila.id_paciente
+                ))
+            except Exception as e:
+                print(f"⚠️ Error al procesar paciente {fila.id_paciente}: {e}")
+        return pacientes, len(filas) == tamano_lote
+
     def obtener_todos_los_pacientes_para_vista(self) -> List[Paciente]:
         """
         Obtiene todos los pacientes para mostrar en la vista
@@ -834,10 +952,63 @@ Sistema: Clínica Dental - Gestión de Pacientes
 # QUERYS EJECUNTANDOSE DESDE EL MODELO  
 # ==========================================
     def buscar_pacientes_desde_bd(self, nombre, apellido):
-        """Busca pacientes directamente en la base de datos"""
+        """
+        Busca pacientes por nombre/apellido. Si los pacientes ya están cargados se usa
+        el índice en memoria; si no, se consulta la base de datos.
+        """
+        if len(self.indice_busqueda):
+            return self.buscar_pacientes_por_nombre_apellido(nombre, apellido)
         print(f"🧠 Buscando pacientes en BD: nombre='{nombre}', apellido='{apellido}'")
         return Paciente.buscar_pacientes_por_nombre_apellido(nombre, apellido)
 
+    def buscar_pacientes_en_vivo(self, nombre: str, apellido: str, al_terminar):
+        """
+        Búsqueda mientras se escribe. Entrega los resultados llamando a al_terminar(pacientes).
+
+        - Si la búsqueda solo agrega letras/palabras a la anterior, filtra los resultados
+          anteriores en lugar de volver a buscar.
+        - Con los pacientes en memoria responde al instante desde el índice.
+        - Si hay que ir a la BD, la consulta corre en segundo plano; si llega otra búsqueda
+          antes de que termine, el resultado viejo se descarta.
+        """
+        self._busqueda_en_curso += 1
+
+        anterior = self._ultima_busqueda
+        if anterior and refina_busqueda(anterior[0], nombre) and refina_busqueda(anterior[1], apellido):
+            filtrados = [p for p in anterior[2]
+                         if coincide_texto(p.nombre, nombre) and coincide_texto(p.apellido, apellido)]
+            # Sin coincidencias exactas se vuelve a buscar para ofrecer resultados parecidos
+            if filtrados:
+                self._ultima_busqueda = (nombre, apellido, filtrados)
+                al_terminar(filtrados)
+                return
+
+        if len(self.indice_busqueda):
+            resultados = self.buscar_pacientes_por_nombre_apellido(nombre, apellido)
+            self._ultima_busqueda = (nombre, apellido, resultados)
+            al_terminar(resultados)
+            return
+
+        if self.cargador_busqueda is None:
+            self.cargador_busqueda = CargadorDatos()
+            self.cargador_busqueda.todo_cargado.connect(self._al_buscar_en_bd)
+        self._al_terminar_busqueda = (self._busqueda_en_curso, nombre, apellido, al_terminar)
+        self.cargador_busqueda.cargar({
+            'pacientes': partial(Paciente.buscar_pacientes_por_nombre_apellido, nombre, apellido),
+        })
+
+    def _al_buscar_en_bd(self, resultados: dict, errores: dict):
+        """Recibe el resultado de la búsqueda en BD; lo ignora si ya hubo otra búsqueda después"""
+        if not self._al_terminar_busqueda:
+            return
+        numero, nombre, apellido, al_terminar = self._al_terminar_busqueda
+        if numero != self._busqueda_en_curso:
+            return
+        self._al_terminar_busqueda = None
+        pacientes = resultados.get('pacientes') or []
+        self._ultima_busqueda = (nombre, apellido, pacientes)
+        al_terminar(pacientes)
+
 
 # ==========================================
 # EJECUCIÓN AUTOMÁTICA DEL CONTROLADOR
@@ -0,0 +1,67 @@
+"""
+=================================================================
+EXPORTACIÓN DE FACTURAS, CITAS Y PACIENTES (CSV / JSONL)
+=================================================================
+Vuelca una tabla completa (o un rango de fechas) a un archivo sin
+cargarla en memoria: las filas se leen del servidor por lotes con un
+cursor sin búfer y se escriben a medida que llegan.
+
+  - facturas: filtra por Fecha_Emision
+  - citas:    filtra por Fecha
+  - pacientes: sin filtro de fechas (la tabla no tiene fecha de alta)
+
+El formato sale de la extensión (.csv o .jsonl) o de --formato.
+
+Uso:
+    python DB/ExportarDatos.py facturas facturas_2025.csv --desde 2025-01-01 --hasta 2025-12-31
+    python DB/ExportarDatos.py citas citas.jsonl --desde 2025-06-01
+    python DB/ExportarDatos.py pacientes pacientes.csv --lote 5000
+=================================================================
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+from datetime import date
+
+from Modelos.ExportacionDatos import CONSULTAS, FORMATOS, TAMANO_LOTE, ExportadorDatos
+
+
+def fecha(texto: str) -> date:
+    try:
+        return date.fromisoformat(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"fecha inválida '{texto}' (use AAAA-MM-DD)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exporta facturas, citas o pacientes a CSV o JSONL")
+    parser.add_argument('entidad', choices=sorted(CONSULTAS))
+    parser.add_argument('archivo', help="archivo de salida (.csv o .jsonl)")
+    parser.add_argument('--desde', type=fecha, help="fecha inicial incluida (AAAA-MM-DD)")
+    parser.add_argument('--hasta', type=fecha, help="fecha final incluida (AAAA-MM-DD)")
+    parser.add_argument('--formato', choices=FORMATOS, help="por defecto según la extensión del archivo")
+    parser.add_argument('--lote', type=int, default=TAMANO_LOTE, help="filas por lectura al servidor")
+    args = parser.parse_args()
+
+    if args.desde and args.hasta and args.desde > args.hasta:
+        parser.error("--desde no puede ser posterior a --hasta")
+
+    print(f"📤 Exportando {args.entidad} a {args.archivo}...")
+    resultado = ExportadorDatos(args.lote).exportar(
+        args.entidad, args.archivo, args.desde, args.hasta, args.formato,
+        progreso=lambda filas: print(f"   {filas:>10} filas", end='\r'))
+    print()
+    if resultado is None:
+        print("❌ No se pudo completar la exportación (ver clinica_dental.log)")
+        return 1
+
+    print(f"✅ {resultado.filas} filas en {resultado.segundos:.2f} s "
+          f"({resultado.filas_por_segundo} filas/s) -> {resultado.ruta}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
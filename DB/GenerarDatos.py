@@ -0,0 +1,387 @@
+"""
+=================================================================
+GENERADOR DE DATOS SINTÉTICOS
+=================================================================
+Llena una base de pruebas con volúmenes parecidos a los de una
+clínica real, respetando las llaves foráneas, para poder medir los
+modelos con algo más que las tres filas de ejemplo del script SQL.
+
+Volúmenes por escala (Doctor, Tratamiento y Horario no escalan:
+una clínica más vieja tiene más historia, no más doctores):
+
+    escala     Paciente     Cita    Factura  Historial_Medico
+       1          1.000    10.000     3.000        3.000
+      10         10.000   100.000    30.000       30.000
+     100        100.000 1.000.000   300.000      300.000
+
+Con la misma semilla se generan siempre los mismos datos. La base
+indicada se crea si no existe (con el esquema de
+GestionClinicaDental.sql) y SE VACÍA antes de cargar; por eso se
+niega a trabajar sobre la base de producción.
+
+Funciona con cualquiera de los motores de Config/database_config.py;
+sin servidor MySQL se puede generar en un archivo SQLite:
+    CLINICA_BD_BACKEND=sqlite CLINICA_BD_SQLITE=clinica.db python DB/GenerarDatos.py
+
+Uso:
+    python DB/GenerarDatos.py --escala 1
+    python DB/GenerarDatos.py --escala 100 --base ClinicaDental_Benchmark --semilla 7
+=================================================================
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import math
+import random
+import re
+import time
+from datetime import date, datetime, time as datetime_time, timedelta
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional
+
+from Config.database_config import (DatabaseConfig, EnvironmentConfig, Error, cerrar_pool, conexion_bd,
+                                    obtener_backend)
+from Config.logging_config import obtener_logger
+from Modelos.SecuenciaModelo import Secuencia
+from Modelos.ResumenIngresos import ResumenIngresos
+
+logger = obtener_logger('DB.GenerarDatos')
+
+BASE_PRUEBAS = 'ClinicaDental_Benchmark'
+ESQUEMA_SQL = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'GestionClinicaDental.sql')
+
+# Filas por tabla a escala 1
+VOLUMENES_1X = {
+    'Paciente': 1_000,
+    'Cita': 10_000,
+    'Factura': 3_000,
+    'Historial_Medico': 3_000,
+}
+DOCTORES = 50
+TRATAMIENTOS_POR_DOCTOR = 4
+
+LOTE = 5_000               # filas por executemany / commit
+DIAS_FUTURO = 30           # la agenda llega hasta un mes después de hoy
+DIAS_MINIMOS_AGENDA = 330  # aun a escala pequeña la historia cubre casi un año laborable
+INICIO_JORNADA = 8 * 60    # 08:00
+DURACION_CITA = 30         # minutos
+CITAS_POR_DIA = 16         # 08:00 - 16:00
+
+# Tablas que se vacían antes de cargar (orden indiferente: se cargan sin revisar llaves)
+TABLAS = [
+    'Asistente_Factura', 'Asistente_Cita', 'Asistente_Paciente', 'Tratamiento_Factura',
+    'Factura', 'Cita', 'Historial_Medico', 'Horario', 'Tratamiento', 'Paciente', 'Doctor',
+    'Ingresos_Diarios', 'Ingresos_Mensuales',
+]
+
+NOMBRES = ['Laura', 'Ricardo', 'Carla', 'José', 'María', 'Luis', 'Ana', 'Carlos', 'Sofía', 'Miguel',
+           'Gabriela', 'Jorge', 'Daniela', 'Fernando', 'Valeria', 'Roberto', 'Camila', 'Andrés',
+           'Lucía', 'Mario', 'Patricia', 'Diego', 'Rebeca', 'Óscar', 'Andrea', 'Kevin', 'Paola']
+APELLIDOS = ['Mendoza', 'Vásquez', 'López', 'Hernández', 'Martínez', 'García', 'Rodríguez', 'Pineda',
+             'Zelaya', 'Flores', 'Rivas', 'Ramírez', 'Cruz', 'Guzmán', 'Morales', 'Castillo',
+             'Portillo', 'Quijano', 'Arriola', 'Renderos', 'Orellana', 'Alvarado', 'Menjívar', 'Sánchez']
+ESPECIALIDADES = ['Odontología General', 'Ortodoncia', 'Endodoncia', 'Periodoncia', 'Odontopediatría']
+# (descripción, costo base)
+CATALOGO_TRATAMIENTOS = [
+    ('Limpieza dental general', 20.00), ('Colocación de brackets', 450.00),
+    ('Tratamiento de conducto', 250.00), ('Extracción simple', 35.00),
+    ('Extracción de cordal', 120.00), ('Resina dental', 40.00), ('Blanqueamiento', 150.00),
+    ('Corona de porcelana', 380.00), ('Control de ortodoncia', 30.00),
+    ('Curetaje periodontal', 90.00), ('Sellantes', 25.00), ('Radiografía panorámica', 30.00),
+]
+NOTAS = ['Paciente con caries recurrentes.', 'Evaluación inicial.', 'Control de ortodoncia.',
+         'Sensibilidad dental al frío.', 'Sangrado de encías al cepillado.', 'Alergia a la penicilina.',
+         'Bruxismo nocturno, se recomienda férula.', 'Sin antecedentes relevantes.']
+
+# (estado, peso) para citas ya pasadas y para citas futuras
+ESTADOS_PASADOS = [('Asistida', 70), ('Confirmada', 10), ('Cancelada', 12), ('Ausente', 8)]
+ESTADOS_FUTUROS = [('Pendiente', 60), ('Confirmada', 30), ('Cancelada', 10)]
+
+
+def volumenes(escala: float) -> dict:
+    """Filas a generar por tabla para la escala indicada"""
+    filas = {tabla: max(1, int(cantidad * escala)) for tabla, cantidad in VOLUMENES_1X.items()}
+    filas['Doctor'] = DOCTORES
+    filas['Tratamiento'] = DOCTORES * TRATAMIENTOS_POR_DOCTOR
+    filas['Horario'] = DOCTORES * 2
+    return filas
+
+
+def _sentencias_esquema() -> List[str]:
+    """CREATE TABLE / CREATE INDEX de GestionClinicaDental.sql (sin los datos de ejemplo)"""
+    with open(ESQUEMA_SQL, encoding='utf-8') as archivo:
+        texto = "\n".join(linea for linea in archivo.read().splitlines()
+                          if not linea.strip().startswith('--'))
+    sentencias = [s.strip() for s in texto.split(';')]
+    return [s for s in sentencias if re.match(r'CREATE\s+(TABLE|INDEX)', s, re.IGNORECASE)]
+
+
+def preparar_base(nombre: str = BASE_PRUEBAS) -> bool:
+    """
+    Crea la base `nombre` con el esquema de la aplicación si todavía no existe
+    y apunta la configuración (y el pool) hacia ella. Con el motor SQLite la
+    base es DatabaseConfig.SQLITE_PATH y `nombre` no se usa.
+    """
+    if nombre == EnvironmentConfig.PRODUCTION['DATABASE']:
+        logger.error("❌ %s es la base de producción; use una base de pruebas", nombre)
+        return False
+
+    try:
+        obtener_backend().crear_base(nombre, _sentencias_esquema())
+    except Error as e:
+        logger.error("❌ Error al preparar la base %s: %s", nombre, e)
+        return False
+
+    # Las conexiones ya prestadas apuntan a la base anterior
+    cerrar_pool()
+    DatabaseConfig.DATABASE = nombre
+    return True
+
+
+def _en_lotes(filas: Iterable[tuple], tamano: int) -> Iterator[List[tuple]]:
+    iterador = iter(filas)
+    while True:
+        lote = list(islice(iterador, tamano))
+        if not lote:
+            return
+        yield lote
+
+
+def _dias_laborables(hasta: date, cantidad: int) -> List[date]:
+    """Los `cantidad` días de lunes a sábado que terminan en `hasta`, en orden"""
+    dias = []
+    dia = hasta
+    while len(dias) < cantidad:
+        if dia.weekday() != 6:
+            dias.append(dia)
+        dia -= timedelta(days=1)
+    return dias[::-1]
+
+
+# ==========================================
+# CLASE: GeneradorDatos
+# PROPÓSITO: Producir y cargar, por lotes, los datos sintéticos de cada tabla
+# ==========================================
+
+class GeneradorDatos:
+    """
+    Uso:
+        if preparar_base('ClinicaDental_Benchmark'):
+            resumen = GeneradorDatos(escala=10).generar()
+
+    Las filas se producen con generadores y se insertan con executemany en
+    lotes de LOTE filas, así la memoria no crece con la escala.
+    """
+
+    def __init__(self, escala: float = 1, semilla: int = 42, lote: int = LOTE, hoy: date = None):
+        self.escala = escala
+        self.semilla = semilla
+        self.lote = lote
+        self.hoy = hoy or date.today()
+        self.volumenes = volumenes(escala)
+
+        self.ids_doctor = [str(10001 + i) for i in range(DOCTORES)]
+        # Tratamientos de cada doctor: [(ID_Tratamiento, descripción, costo)]
+        self.tratamientos_doctor = {}
+        # Días con citas; facturas e historiales caen en la parte ya pasada del mismo periodo
+        self.citas_por_doctor = math.ceil(self.volumenes['Cita'] / DOCTORES)
+        dias = max(DIAS_MINIMOS_AGENDA, math.ceil(self.citas_por_doctor / CITAS_POR_DIA))
+        self.dias_agenda = _dias_laborables(self.hoy + timedelta(days=DIAS_FUTURO), dias)
+
+    # -------------------- Filas por tabla --------------------
+
+    def _doctores(self, rnd: random.Random) -> Iterator[tuple]:
+        for i, id_doctor in enumerate(self.ids_doctor):
+            yield (id_doctor, rnd.choice(NOMBRES), rnd.choice(APELLIDOS),
+                   ESPECIALIDADES[i % len(ESPECIALIDADES)], f"7{rnd.randrange(10**7):07d}",
+                   f"dr{id_doctor}@clinica.com")
+
+    def _tratamientos(self, rnd: random.Random) -> Iterator[tuple]:
+        id_tratamiento = 0
+        for id_doctor in self.ids_doctor:
+            propios = []
+            for descripcion, costo in rnd.sample(CATALOGO_TRATAMIENTOS, TRATAMIENTOS_POR_DOCTOR):
+                id_tratamiento += 1
+                costo = round(costo * rnd.uniform(0.9, 1.2), 2)
+                propios.append((id_tratamiento, descripcion, costo))
+                fecha = datetime.combine(self.dias_agenda[0], datetime_time(8))
+                yield (id_tratamiento, id_doctor, descripcion, costo, fecha)
+            self.tratamientos_doctor[id_doctor] = propios
+
+    def _horarios(self, rnd: random.Random) -> Iterator[tuple]:
+        numero = 0
+        for id_doctor in self.ids_doctor:
+            for inicio, fin in ((datetime_time(8), datetime_time(12)), (datetime_time(13), datetime_time(17))):
+                numero += 1
+                yield (Secuencia.formatear('Horario', numero), id_doctor, inicio, fin, rnd.random() < 0.9)
+
+    def _pacientes(self, rnd: random.Random) -> Iterator[tuple]:
+        for id_paciente in range(1, self.volumenes['Paciente'] + 1):
+            nacimiento = self.hoy - timedelta(days=rnd.randrange(3 * 365, 85 * 365))
+            menor = (self.hoy - nacimiento).days < 18 * 365
+            dui = None if menor else f"{id_paciente:08d}-{id_paciente % 10}"
+            correo = f"p{id_paciente}@correo.com" if rnd.random() < 0.8 else None
+            yield (id_paciente, rnd.choice(NOMBRES), rnd.choice(APELLIDOS), nacimiento, dui,
+                   f"{rnd.choice('67')}{rnd.randrange(10**7):07d}", correo)
+
+    def _citas(self, rnd: random.Random) -> Iterator[tuple]:
+        # Las citas de cada doctor se reparten parejo entre los turnos de 30 minutos
+        # de la agenda; dos citas nunca caen en el mismo turno, así no hay choques
+        estados_pasados, pesos_pasados = zip(*ESTADOS_PASADOS)
+        estados_futuros, pesos_futuros = zip(*ESTADOS_FUTUROS)
+        turnos_agenda = len(self.dias_agenda) * CITAS_POR_DIA
+        for i in range(self.volumenes['Cita']):
+            id_doctor = self.ids_doctor[i % DOCTORES]
+            turno = (i // DOCTORES) * turnos_agenda // self.citas_por_doctor
+            dia = self.dias_agenda[turno // CITAS_POR_DIA]
+            minutos = INICIO_JORNADA + (turno % CITAS_POR_DIA) * DURACION_CITA
+            inicio = datetime_time(minutos // 60, minutos % 60)
+            fin = datetime_time((minutos + DURACION_CITA) // 60, (minutos + DURACION_CITA) % 60)
+            if dia < self.hoy:
+                estado = rnd.choices(estados_pasados, pesos_pasados)[0]
+            else:
+                estado = rnd.choices(estados_futuros, pesos_futuros)[0]
+            id_tratamiento, _, costo = rnd.choice(self.tratamientos_doctor[id_doctor])
+            yield (i + 1, rnd.randint(1, self.volumenes['Paciente']), id_doctor, id_tratamiento,
+                   datetime.combine(dia, inicio), inicio, fin, estado, costo)
+
+    def _fecha_pasada(self, rnd: random.Random) -> date:
+        """Un día entre el inicio de la agenda y hoy"""
+        dias = max(0, (self.hoy - self.dias_agenda[0]).days)
+        return self.hoy - timedelta(days=rnd.randint(0, dias))
+
+    def _tratamiento_factura(self, numero: int) -> tuple:
+        """(ID_Tratamiento, descripción, costo) de la factura `numero`; lo usan Factura y Tratamiento_Factura"""
+        propios = self.tratamientos_doctor[self.ids_doctor[numero % DOCTORES]]
+        return propios[(numero // DOCTORES) % len(propios)]
+
+    def _facturas(self, rnd: random.Random) -> Iterator[tuple]:
+        for numero in range(1, self.volumenes['Factura'] + 1):
+            _, descripcion, costo = self._tratamiento_factura(numero)
+            emision = datetime.combine(self._fecha_pasada(rnd), datetime_time(rnd.randint(8, 16), rnd.choice((0, 30))))
+            estado = 'Pagada' if rnd.random() < 0.75 else 'Pendiente'
+            yield (Secuencia.formatear('Factura', numero), rnd.randint(1, self.volumenes['Paciente']),
+                   emision, descripcion, costo, costo, estado)
+
+    def _tratamientos_factura(self, rnd: random.Random) -> Iterator[tuple]:
+        for numero in range(1, self.volumenes['Factura'] + 1):
+            yield (self._tratamiento_factura(numero)[0], Secuencia.formatear('Factura', numero))
+
+    def _historiales(self, rnd: random.Random) -> Iterator[tuple]:
+        for id_historial in range(1, self.volumenes['Historial_Medico'] + 1):
+            yield (id_historial, rnd.randint(1, self.volumenes['Paciente']), self._fecha_pasada(rnd),
+                   rnd.choice(NOTAS), 'Activo' if rnd.random() < 0.85 else 'Archivado')
+
+    # -------------------- Carga --------------------
+
+    # (tabla, columnas, método que produce las filas); los doctores van primero
+    # porque _tratamientos y _citas dependen de ellos
+    CARGAS = [
+        ('Doctor', 'ID_Doctor, Nombre, Apellido, Especialidad, Telefono, Correo', '_doctores'),
+        ('Tratamiento', 'ID_Tratamiento, ID_Doctor, Descripcion, Costo, Fecha', '_tratamientos'),
+        ('Horario', 'ID_Horario, ID_Doctor, Hora_Inicio, Hora_Fin, Disponible', '_horarios'),
+        ('Paciente', 'ID_Paciente, Nombre, Apellido, Fecha_Nacimiento, DUI, Telefono, Correo', '_pacientes'),
+        ('Cita', 'ID_Cita, ID_Paciente, ID_Doctor, ID_Tratamiento, Fecha, Hora_Inicio, Hora_Fin, Estado, Costo',
+         '_citas'),
+        ('Factura', 'ID_Factura, ID_Paciente, Fecha_Emision, Descripcion_Servicio, Monto_Servicio, '
+                    'Monto_Total, Estado_Pago', '_facturas'),
+        ('Tratamiento_Factura', 'ID_Tratamiento, ID_Factura', '_tratamientos_factura'),
+        ('Historial_Medico', 'ID_Historial, ID_Paciente, Fecha_Creacion, Notas_Generales, Estado', '_historiales'),
+    ]
+
+    def _cargar_tabla(self, conexion, cursor, tabla: str, columnas: str, filas: Iterable[tuple]) -> int:
+        marcadores = ", ".join(["%s"] * len(columnas.split(',')))
+        query = f"INSERT INTO {tabla} ({columnas}) VALUES ({marcadores})"
+        total = 0
+        for lote in _en_lotes(filas, self.lote):
+            cursor.executemany(query, lote)
+            conexion.commit()
+            total += len(lote)
+        return total
+
+    def generar(self) -> Optional[dict]:
+        """
+        Vacía las tablas de la base configurada y carga los datos de la escala.
+        :return: {tabla: {'filas', 'segundos', 'filas_por_segundo'}}, o None si la BD falla.
+        """
+        resumen = {}
+        try:
+            with conexion_bd() as conexion:
+                if not conexion:
+                    logger.error("❌ No se pudo establecer conexión a la base de datos.")
+                    return None
+                cursor = conexion.cursor()
+                # Las filas se generan ya consistentes; revisar llaves fila por fila solo
+                # haría la carga varias veces más lenta
+                cursor.execute("SET SESSION foreign_key_checks = 0, unique_checks = 0")
+                try:
+                    for tabla in TABLAS:
+                        cursor.execute(f"TRUNCATE TABLE {tabla}")
+
+                    for tabla, columnas, metodo in self.CARGAS:
+                        # Una semilla por tabla: cambiar el volumen de una no altera las demás
+                        rnd = random.Random(f"{self.semilla}-{tabla}")
+                        inicio = time.perf_counter()
+                        filas = self._cargar_tabla(conexion, cursor, tabla, columnas, getattr(self, metodo)(rnd))
+                        segundos = time.perf_counter() - inicio
+                        resumen[tabla] = {
+                            'filas': filas,
+                            'segundos': round(segundos, 2),
+                            'filas_por_segundo': round(filas / segundos) if segundos else filas,
+                        }
+                        logger.info("📥 %s: %s filas en %.1f s", tabla, filas, segundos)
+
+                    # Los próximos IDs con prefijo siguen después de los generados
+                    cursor.execute("DELETE FROM Secuencia WHERE Nombre IN ('Factura', 'Horario')")
+                    cursor.execute("INSERT INTO Secuencia (Nombre, Valor) VALUES (%s, %s), (%s, %s)",
+                                   ('Factura', self.volumenes['Factura'], 'Horario', self.volumenes['Horario']))
+                    conexion.commit()
+                finally:
+                    cursor.execute("SET SESSION foreign_key_checks = 1, unique_checks = 1")
+
+        except Error as e:
+            logger.error("❌ Error al generar los datos: %s", e)
+            return None
+
+        # Los datos se cargaron por fuera de los modelos: el resumen de ingresos se arma al final
+        inicio = time.perf_counter()
+        filas = ResumenIngresos.recalcular()
+        if filas is None:
+            return None
+        segundos = time.perf_counter() - inicio
+        resumen['Ingresos_Diarios'] = {
+            'filas': filas,
+            'segundos': round(segundos, 2),
+            'filas_por_segundo': round(filas / segundos) if segundos else filas,
+        }
+        return resumen
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Genera datos sintéticos de la clínica en una base de pruebas")
+    parser.add_argument('--escala', type=float, default=1, help="1 = 1.000 pacientes y 10.000 citas")
+    parser.add_argument('--base', default=BASE_PRUEBAS, help=f"base de pruebas (por defecto {BASE_PRUEBAS})")
+    parser.add_argument('--semilla', type=int, default=42)
+    args = parser.parse_args()
+
+    if not preparar_base(args.base):
+        return 1
+
+    print(f"🧪 Generando escala {args.escala:g} en {args.base}...")
+    resumen = GeneradorDatos(escala=args.escala, semilla=args.semilla).generar()
+    if resumen is None:
+        return 1
+
+    print("=" * 60)
+    for tabla, datos in resumen.items():
+        print(f"{tabla:<18}{datos['filas']:>10} filas {datos['segundos']:>8.1f} s "
+              f"{datos['filas_por_segundo']:>10} filas/s")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
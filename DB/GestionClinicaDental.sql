@@ -124,6 +124,57 @@ CREATE TABLE Asistente_Factura (
 	FOREIGN KEY (ID_Factura) REFERENCES Factura(ID_Factura) ON DELETE CASCADE
 );
 
+-- Tabla: Secuencia (contadores atómicos para IDs con prefijo: F001, H001...)
+-- Valor guarda el último número entregado. Para reservar uno se hace, en una
+-- transacción, UPDATE Valor = Valor + 1 (bloquea la fila hasta el commit) y
+-- luego SELECT Valor: dos estaciones nunca leen el mismo número
+CREATE TABLE Secuencia (
+	Nombre VARCHAR(30) PRIMARY KEY,
+	Valor INT UNSIGNED NOT NULL
+);
+
+-- Resúmenes de ingresos por día y por mes (Mes = primer día del mes).
+-- Origen 'Factura': Estado = Estado_Pago; Origen 'Cita': Estado = estado de la cita.
+-- Los mantienen los modelos al escribir facturas y citas (Modelos/ResumenIngresos.py);
+-- ID_Doctor '' / ID_Tratamiento 0 = factura sin tratamiento asociado.
+-- En bases ya instaladas se crean y llenan con: python DB/Migraciones.py subir (versión 5)
+CREATE TABLE Ingresos_Diarios (
+	Fecha DATE NOT NULL,
+	Origen VARCHAR(10) NOT NULL,
+	ID_Doctor VARCHAR(10) NOT NULL DEFAULT '',
+	ID_Tratamiento INT NOT NULL DEFAULT 0,
+	Estado VARCHAR(20) NOT NULL,
+	Cantidad INT NOT NULL DEFAULT 0,
+	Monto DECIMAL(14,2) NOT NULL DEFAULT 0,
+	PRIMARY KEY (Fecha, Origen, ID_Doctor, ID_Tratamiento, Estado)
+);
+
+CREATE TABLE Ingresos_Mensuales (
+	Mes DATE NOT NULL,
+	Origen VARCHAR(10) NOT NULL,
+	ID_Doctor VARCHAR(10) NOT NULL DEFAULT '',
+	ID_Tratamiento INT NOT NULL DEFAULT 0,
+	Estado VARCHAR(20) NOT NULL,
+	Cantidad INT NOT NULL DEFAULT 0,
+	Monto DECIMAL(14,2) NOT NULL DEFAULT 0,
+	PRIMARY KEY (Mes, Origen, ID_Doctor, ID_Tratamiento, Estado)
+);
+
+-- Índices de las consultas frecuentes.
+-- En bases ya instaladas se agregan con: python DB/Migraciones.py subir
+-- (versiones 1-4; el migrador omite los índices que ya existen y solo registra la versión)
+CREATE INDEX idx_cita_doctor_fecha ON Cita (ID_Doctor, Fecha, Hora_Inicio, Hora_Fin, Estado);
+CREATE INDEX idx_cita_fecha_hora ON Cita (Fecha, Hora_Inicio);
+CREATE INDEX idx_cita_estado_fecha ON Cita (Estado, Fecha, Hora_Inicio);
+CREATE INDEX idx_factura_paciente_fecha ON Factura (ID_Paciente, Fecha_Emision);
+CREATE INDEX idx_factura_fecha ON Factura (Fecha_Emision);
+CREATE INDEX idx_paciente_apellido_nombre ON Paciente (Apellido, Nombre);
+CREATE INDEX idx_paciente_nombre ON Paciente (Nombre);
+CREATE INDEX idx_paciente_dui ON Paciente (DUI);
+CREATE INDEX idx_asistente_nombre ON Asistente (Nombre);
+CREATE INDEX idx_paciente_fecha_nacimiento ON Paciente (Fecha_Nacimiento);
+CREATE INDEX idx_factura_estado_paciente ON Factura (Estado_Pago, ID_Paciente, Monto_Total);
+
 
 INSERT INTO Paciente (Nombre, Apellido, Fecha_Nacimiento, Telefono, Correo) VALUES
 ('Laura', 'Mendoza', '1991-04-12', '70112233', 'laura.mendoza@correo.com'),
@@ -192,3 +243,16 @@ INSERT INTO Asistente_Factura (ID_Asistente, ID_Factura) VALUES
 (1, 'F001'),
 (2, 'F002'),
 (3, 'F003');
+
+
+-- Secuencias alineadas con los datos de ejemplo (F003 y H003 ya existen)
+INSERT INTO Secuencia (Nombre, Valor) VALUES
+('Factura', 3),
+('Horario', 3);
+
+-- Ingresos_Diarios / Ingresos_Mensuales quedan vacías a propósito: la única
+-- definición del resumen es ResumenIngresos.recalcular() (reparte cada factura
+-- entre sus tratamientos y deja las que no tienen ninguno sin doctor ni
+-- tratamiento). Después de cargar este script ejecute:
+--     python DB/Migraciones.py subir
+-- (la versión 5 llena los resúmenes; luego los mantienen los modelos).
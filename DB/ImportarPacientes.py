@@ -0,0 +1,80 @@
+"""
+=================================================================
+IMPORTACIÓN MASIVA DE PACIENTES DESDE CSV
+=================================================================
+Carga el padrón de pacientes de otra clínica (miles de filas) sin
+pasar por Paciente.insertar_en_bd, que abre una conexión y confirma
+una transacción por paciente:
+
+  - el CSV se lee por lotes, sin cargarlo entero en memoria
+  - cada lote se valida en un proceso aparte con las mismas reglas
+    del formulario (DUI, correo, teléfono, edad)
+  - los DUI ya registrados o repetidos en el archivo se descartan
+  - cada lote se inserta con executemany en una sola transacción
+
+Columnas (encabezado obligatorio, sin distinguir mayúsculas):
+    Nombre, Apellido, Fecha_Nacimiento, DUI, Telefono, Correo
+Las fechas pueden venir como AAAA-MM-DD o DD/MM/AAAA.
+
+Las filas rechazadas se escriben, con su número de fila y el motivo,
+en <archivo>.rechazos.csv (o en --rechazos).
+
+Uso:
+    python DB/ImportarPacientes.py pacientes.csv
+    python DB/ImportarPacientes.py pacientes.csv --trabajadores 4 --lote 2000
+    python DB/ImportarPacientes.py pacientes.csv --simular       # solo validar
+=================================================================
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+
+from Modelos.ImportacionPacientes import ImportadorPacientes, TAMANO_LOTE
+
+
+def mostrar_progreso(resultado):
+    print(f"   {resultado.leidas:>9} leídas {resultado.importadas:>9} importadas "
+          f"{resultado.rechazadas:>8} rechazadas {resultado.filas_por_segundo:>10} filas/s", end='\r')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa pacientes desde un archivo CSV")
+    parser.add_argument('archivo', help="CSV con encabezado")
+    parser.add_argument('--rechazos', help="CSV de filas rechazadas (por defecto <archivo>.rechazos.csv)")
+    parser.add_argument('--trabajadores', type=int, default=None,
+                        help="procesos de validación (por defecto uno por CPU; 1 = sin procesos)")
+    parser.add_argument('--lote', type=int, default=TAMANO_LOTE, help="filas por lote y por transacción")
+    parser.add_argument('--simular', action='store_true', help="validar sin escribir en la base de datos")
+    args = parser.parse_args()
+
+    if not os.path.isfile(args.archivo):
+        parser.error(f"No existe el archivo {args.archivo}")
+
+    importador = ImportadorPacientes(trabajadores=args.trabajadores, tamano_lote=args.lote, simular=args.simular)
+    print(f"📥 Importando {args.archivo} ({importador.trabajadores} procesos, lotes de {args.lote})...")
+    resultado = importador.importar(args.archivo, args.rechazos, progreso=mostrar_progreso)
+    print()
+    if resultado is None:
+        print("❌ No se pudo completar la importación (ver clinica_dental.log)")
+        return 1
+
+    resumen = resultado.resumen()
+    print("=" * 60)
+    print(f"Filas leídas:      {resumen['leidas']:>10}")
+    print(f"Importadas:        {resumen['importadas']:>10}" + ("  (simulación)" if args.simular else ""))
+    print(f"Rechazadas:        {resumen['rechazadas']:>10}")
+    print(f"Tiempo:            {resumen['segundos']:>10.2f} s")
+    print(f"Rendimiento:       {resumen['filas_por_segundo']:>10} filas/s")
+    if resumen['motivos']:
+        print("-" * 60)
+        for motivo, cantidad in resumen['motivos'].items():
+            print(f"   {cantidad:>8}  {motivo}")
+    print("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,349 @@
+"""
+=================================================================
+MIGRACIONES DEL ESQUEMA
+=================================================================
+Cambios versionados sobre la BD ClinicaDental. Cada versión aplicada
+se registra en la tabla Version_Esquema, así el migrador sabe qué
+falta aplicar en cada instalación.
+
+Cada paso revisa antes el estado real de la BD (information_schema en
+MySQL, sqlite_master en SQLite), por lo que volver a correr una versión
+a medio aplicar no falla. MySQL
+confirma cada CREATE/DROP INDEX por su cuenta (no hay transacción
+para DDL); si algo se corta a la mitad basta con volver a ejecutar.
+
+Uso:
+    python DB/Migraciones.py estado
+    python DB/Migraciones.py subir              # aplica todo lo pendiente
+    python DB/Migraciones.py subir --hasta 2
+    python DB/Migraciones.py bajar --hasta 1    # revierte las versiones > 1
+=================================================================
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+from typing import List, Optional, Tuple
+
+from Config.database_config import BackendSQLite, DatabaseConfig, conexion_bd, Error
+from Config.logging_config import obtener_logger
+from Modelos.ResumenIngresos import ResumenIngresos, sql_crear_tabla
+
+logger = obtener_logger('DB.Migraciones')
+
+# Error de MySQL al quitar un índice que usa una llave foránea
+ER_DROP_INDEX_FK = 1553
+
+
+def _es_sqlite() -> bool:
+    """SQLite no tiene information_schema: los pasos consultan sqlite_master"""
+    return DatabaseConfig.BACKEND == BackendSQLite.nombre
+
+# ==========================================
+# PASOS DE MIGRACIÓN
+# ==========================================
+
+class CrearIndice:
+    """Paso que crea un índice (subir) o lo quita (bajar) solo si hace falta"""
+
+    def __init__(self, tabla: str, nombre: str, columnas: List[str]):
+        self.tabla = tabla
+        self.nombre = nombre
+        self.columnas = columnas
+
+    def _existe(self, cursor) -> bool:
+        if _es_sqlite():
+            cursor.execute("""
+                SELECT 1 FROM sqlite_master
+                WHERE type = 'index' AND tbl_name = %s AND name = %s
+            """, (self.tabla, self.nombre))
+        else:
+            cursor.execute("""
+                SELECT 1 FROM information_schema.STATISTICS
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+                LIMIT 1
+            """, (self.tabla, self.nombre))
+        return cursor.fetchone() is not None
+
+    def subir(self, cursor):
+        if self._existe(cursor):
+            logger.info("⏭️ %s ya existe, se omite", self)
+            return
+        cursor.execute(f"CREATE INDEX {self.nombre} ON {self.tabla} ({', '.join(self.columnas)})")
+        logger.info("✅ Creado %s", self)
+
+    def bajar(self, cursor):
+        if not self._existe(cursor):
+            logger.info("⏭️ %s no existe, se omite", self)
+            return
+        if _es_sqlite():
+            # En SQLite el nombre del índice es único en la base y las llaves foráneas no lo necesitan
+            cursor.execute(f"DROP INDEX {self.nombre}")
+            logger.info("🗑️ Eliminado %s", self)
+            return
+        try:
+            cursor.execute(f"DROP INDEX {self.nombre} ON {self.tabla}")
+        except Error as e:
+            if e.errno != ER_DROP_INDEX_FK:
+                raise
+            # Al crear este índice MySQL descartó el índice propio de la llave foránea
+            # (la primera columna); se le devuelve uno antes de quitar el compuesto
+            cursor.execute(f"CREATE INDEX fk_{self.nombre} ON {self.tabla} ({self.columnas[0]})")
+            cursor.execute(f"DROP INDEX {self.nombre} ON {self.tabla}")
+        logger.info("🗑️ Eliminado %s", self)
+
+    def __str__(self):
+        return f"índice {self.nombre} en {self.tabla}({', '.join(self.columnas)})"
+
+
+class CrearTabla:
+    """Paso que crea una tabla (subir) o la elimina (bajar) solo si hace falta"""
+
+    def __init__(self, nombre: str, sql_crear: str):
+        self.nombre = nombre
+        self.sql_crear = sql_crear
+
+    def _existe(self, cursor) -> bool:
+        if _es_sqlite():
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", (self.nombre,))
+        else:
+            cursor.execute("""
+                SELECT 1 FROM information_schema.TABLES
+                WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+                LIMIT 1
+            """, (self.nombre,))
+        return cursor.fetchone() is not None
+
+    def subir(self, cursor):
+        if self._existe(cursor):
+            logger.info("⏭️ %s ya existe, se omite", self)
+            return
+        cursor.execute(self.sql_crear)
+        logger.info("✅ Creada %s", self)
+
+    def bajar(self, cursor):
+        if not self._existe(cursor):
+            logger.info("⏭️ %s no existe, se omite", self)
+            return
+        cursor.execute(f"DROP TABLE {self.nombre}")
+        logger.info("🗑️ Eliminada %s", self)
+
+    def __str__(self):
+        return f"tabla {self.nombre}"
+
+
+class RecalcularResumenIngresos:
+    """Paso que llena los resúmenes de ingresos con las facturas y citas existentes"""
+
+    def subir(self, cursor):
+        if ResumenIngresos.recalcular() is None:
+            raise Error(msg="No se pudo recalcular el resumen de ingresos")
+
+    def bajar(self, cursor):
+        # Las tablas se eliminan en el paso CrearTabla correspondiente
+        pass
+
+    def __str__(self):
+        return "recálculo del resumen de ingresos"
+
+
+class Migracion:
+    """Una versión del esquema: número, descripción y pasos en orden"""
+
+    def __init__(self, version: int, descripcion: str, pasos: list):
+        self.version = version
+        self.descripcion = descripcion
+        self.pasos = pasos
+
+
+# ==========================================
+# VERSIONES
+# Agregar siempre al final con el siguiente número; nunca editar una
+# versión ya publicada (otras instalaciones ya la tienen registrada)
+# ==========================================
+
+MIGRACIONES = [
+    Migracion(1, "Índices de citas: agenda por doctor, listado paginado y filtro por estado", [
+        # Choques al agendar y búsqueda de huecos: WHERE ID_Doctor = ? AND Fecha en rango.
+        # Incluye horas y estado para responder sin leer la fila (índice de cobertura)
+        CrearIndice('Cita', 'idx_cita_doctor_fecha', ['ID_Doctor', 'Fecha', 'Hora_Inicio', 'Hora_Fin', 'Estado']),
+        # Paginación por clave: ORDER BY Fecha, Hora_Inicio, ID_Cita (InnoDB agrega la PK al final)
+        CrearIndice('Cita', 'idx_cita_fecha_hora', ['Fecha', 'Hora_Inicio']),
+        # Listado filtrado por estado y ordenado por fecha
+        CrearIndice('Cita', 'idx_cita_estado_fecha', ['Estado', 'Fecha', 'Hora_Inicio']),
+    ]),
+    Migracion(2, "Índices de facturas por paciente y por fecha de emisión", [
+        CrearIndice('Factura', 'idx_factura_paciente_fecha', ['ID_Paciente', 'Fecha_Emision']),
+        CrearIndice('Factura', 'idx_factura_fecha', ['Fecha_Emision']),
+    ]),
+    Migracion(3, "Índices de búsqueda de pacientes y de login de asistentes", [
+        CrearIndice('Paciente', 'idx_paciente_apellido_nombre', ['Apellido', 'Nombre']),
+        CrearIndice('Paciente', 'idx_paciente_nombre', ['Nombre']),
+        CrearIndice('Paciente', 'idx_paciente_dui', ['DUI']),
+        CrearIndice('Asistente', 'idx_asistente_nombre', ['Nombre']),
+    ]),
+    Migracion(4, "Índices para los totales de pacientes calculados en SQL", [
+        # Menores de edad: WHERE Fecha_Nacimiento > (hoy - 18 años)
+        CrearIndice('Paciente', 'idx_paciente_fecha_nacimiento', ['Fecha_Nacimiento']),
+        # Saldos pendientes: WHERE Estado_Pago = 'Pendiente' GROUP BY ID_Paciente, SUM(Monto_Total)
+        CrearIndice('Factura', 'idx_factura_estado_paciente', ['Estado_Pago', 'ID_Paciente', 'Monto_Total']),
+    ]),
+    Migracion(5, "Resúmenes de ingresos por día y por mes (doctor, tratamiento y estado)", [
+        CrearTabla('Ingresos_Diarios', sql_crear_tabla('Ingresos_Diarios')),
+        CrearTabla('Ingresos_Mensuales', sql_crear_tabla('Ingresos_Mensuales')),
+        # Las facturas anteriores no tienen Tratamiento_Factura: quedan sin doctor ni tratamiento
+        RecalcularResumenIngresos(),
+    ]),
+]
+
+
+# ==========================================
+# CLASE: Migrador
+# PROPÓSITO: Aplicar o revertir versiones y llevar el registro en Version_Esquema
+# ==========================================
+
+class Migrador:
+    """Aplica las MIGRACIONES pendientes en orden y revierte en orden inverso"""
+
+    def __init__(self, migraciones: List[Migracion] = None):
+        self.migraciones = sorted(migraciones or MIGRACIONES, key=lambda m: m.version)
+        self.ultimo_error: Optional[str] = None
+
+    @staticmethod
+    def _asegurar_tabla(cursor):
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS Version_Esquema (
+                Version INT PRIMARY KEY,
+                Descripcion VARCHAR(200) NOT NULL,
+                Aplicada_En DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+    def versiones_aplicadas(self) -> Optional[set]:
+        """Devuelve el conjunto de versiones registradas, o None si no hay conexión"""
+        try:
+            with conexion_bd() as conexion:
+                if not conexion:
+                    logger.error("❌ No se pudo establecer conexión a la base de datos.")
+                    self.ultimo_error = "Sin conexión a la base de datos"
+                    return None
+                cursor = conexion.cursor()
+                self._asegurar_tabla(cursor)
+                cursor.execute("SELECT Version FROM Version_Esquema")
+                return {fila[0] for fila in cursor.fetchall()}
+        except Error as e:
+            logger.error("❌ Error al leer las versiones del esquema: %s", e)
+            self.ultimo_error = str(e)
+            return None
+
+    def estado(self) -> List[Tuple[int, str, bool]]:
+        """Lista (versión, descripción, aplicada) de todas las migraciones conocidas"""
+        aplicadas = self.versiones_aplicadas() or set()
+        return [(m.version, m.descripcion, m.version in aplicadas) for m in self.migraciones]
+
+    def subir(self, hasta: int = None) -> List[int]:
+        """
+        Aplica las versiones pendientes (hasta `hasta` inclusive si se indica).
+        Se detiene en la primera que falle para no saltarse dependencias.
+        :return: Versiones aplicadas en esta ejecución.
+        """
+        aplicadas = self.versiones_aplicadas()
+        if aplicadas is None:
+            return []
+
+        nuevas = []
+        for migracion in self.migraciones:
+            if migracion.version in aplicadas or (hasta is not None and migracion.version > hasta):
+                continue
+            if not self._ejecutar(migracion, subir=True):
+                break
+            nuevas.append(migracion.version)
+        return nuevas
+
+    def bajar(self, hasta: int = 0) -> List[int]:
+        """
+        Revierte, de la más nueva a la más vieja, las versiones mayores que `hasta`.
+        :return: Versiones revertidas en esta ejecución.
+        """
+        aplicadas = self.versiones_aplicadas()
+        if aplicadas is None:
+            return []
+
+        revertidas = []
+        for migracion in reversed(self.migraciones):
+            if migracion.version not in aplicadas or migracion.version <= hasta:
+                continue
+            if not self._ejecutar(migracion, subir=False):
+                break
+            revertidas.append(migracion.version)
+        return revertidas
+
+    def _ejecutar(self, migracion: Migracion, subir: bool) -> bool:
+        accion = "Aplicando" if subir else "Revirtiendo"
+        logger.info("🔧 %s versión %s: %s", accion, migracion.version, migracion.descripcion)
+        try:
+            with conexion_bd() as conexion:
+                if not conexion:
+                    logger.error("❌ No se pudo establecer conexión a la base de datos.")
+                    self.ultimo_error = "Sin conexión a la base de datos"
+                    return False
+                cursor = conexion.cursor()
+
+                pasos = migracion.pasos if subir else list(reversed(migracion.pasos))
+                for paso in pasos:
+                    if subir:
+                        paso.subir(cursor)
+                    else:
+                        paso.bajar(cursor)
+
+                if subir:
+                    cursor.execute(
+                        "INSERT IGNORE INTO Version_Esquema (Version, Descripcion) VALUES (%s, %s)",
+                        (migracion.version, migracion.descripcion)
+                    )
+                else:
+                    cursor.execute("DELETE FROM Version_Esquema WHERE Version = %s", (migracion.version,))
+                conexion.commit()
+                return True
+
+        except Error as e:
+            logger.error("❌ Error en la versión %s: %s", migracion.version, e)
+            self.ultimo_error = f"Versión {migracion.version}: {e}"
+            return False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migraciones del esquema de ClinicaDental")
+    sub = parser.add_subparsers(dest='comando', required=True)
+    sub.add_parser('estado', help="Muestra qué versiones están aplicadas")
+    p_subir = sub.add_parser('subir', help="Aplica las versiones pendientes")
+    p_subir.add_argument('--hasta', type=int, default=None, help="Última versión a aplicar")
+    p_bajar = sub.add_parser('bajar', help="Revierte versiones")
+    p_bajar.add_argument('--hasta', type=int, required=True, help="Versión que debe quedar (0 = ninguna)")
+    args = parser.parse_args()
+
+    migrador = Migrador()
+    if args.comando == 'estado':
+        for version, descripcion, aplicada in migrador.estado():
+            print(f"{'✅' if aplicada else '⏳'} {version:>3}  {descripcion}")
+        return 0
+
+    if args.comando == 'subir':
+        cambios = migrador.subir(args.hasta)
+        # Sin cambios y con error no es que el esquema estuviera al día: falló la primera versión
+        al_dia = '' if migrador.ultimo_error else ' (el esquema ya estaba al día)'
+        print(f"Versiones aplicadas: {cambios or 'ninguna' + al_dia}")
+    else:
+        cambios = migrador.bajar(args.hasta)
+        print(f"Versiones revertidas: {cambios or 'ninguna'}")
+
+    if migrador.ultimo_error:
+        print(f"❌ {migrador.ultimo_error}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
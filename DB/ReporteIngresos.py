@@ -0,0 +1,81 @@
+"""
+=================================================================
+REPORTE DE INGRESOS
+=================================================================
+Totales de facturación (o de citas) en un rango de fechas, agrupados
+por doctor, tratamiento y/o estado. Se leen de los resúmenes
+Ingresos_Diarios / Ingresos_Mensuales, no de la tabla Factura, así
+el tiempo no depende de cuántas facturas haya en la historia.
+
+Con --recalcular se reconstruyen los resúmenes desde Factura y Cita
+(por ejemplo después de cargar datos directamente en la BD).
+
+Uso:
+    python DB/ReporteIngresos.py --desde 2025-01-01 --hasta 2025-12-31
+    python DB/ReporteIngresos.py --desde 2025-07-01 --hasta 2025-07-31 --por ID_Tratamiento Estado
+    python DB/ReporteIngresos.py --origen Cita --por ID_Doctor Estado
+    python DB/ReporteIngresos.py --recalcular
+=================================================================
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+from datetime import date
+
+from Modelos.ResumenIngresos import DIMENSIONES, ORIGEN_CITA, ORIGEN_FACTURA, ResumenIngresos
+
+
+def fecha(texto: str) -> date:
+    try:
+        return date.fromisoformat(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"fecha inválida '{texto}' (use AAAA-MM-DD)")
+
+
+def main():
+    hoy = date.today()
+    parser = argparse.ArgumentParser(description="Reporte de ingresos por doctor, tratamiento y estado")
+    parser.add_argument('--desde', type=fecha, default=hoy.replace(month=1, day=1),
+                        help="fecha inicial incluida (por defecto el 1 de enero)")
+    parser.add_argument('--hasta', type=fecha, default=hoy, help="fecha final incluida (por defecto hoy)")
+    parser.add_argument('--por', nargs='*', choices=DIMENSIONES, default=['ID_Doctor'],
+                        help="columnas de agrupación (sin valores: solo el total)")
+    parser.add_argument('--origen', choices=[ORIGEN_FACTURA, ORIGEN_CITA], default=ORIGEN_FACTURA)
+    parser.add_argument('--estados', nargs='+', help="limitar a estos estados de pago (o de cita)")
+    parser.add_argument('--recalcular', action='store_true', help="reconstruir los resúmenes antes del reporte")
+    args = parser.parse_args()
+
+    if args.desde > args.hasta:
+        parser.error("--desde no puede ser posterior a --hasta")
+
+    if args.recalcular:
+        filas = ResumenIngresos.recalcular()
+        if filas is None:
+            print("❌ No se pudo recalcular el resumen (ver clinica_dental.log)")
+            return 1
+        print(f"📊 Resumen recalculado: {filas} filas diarias")
+
+    filas = ResumenIngresos.consultar(args.desde, args.hasta, args.por, args.origen, args.estados)
+
+    print("=" * 70)
+    print(f"INGRESOS ({args.origen}) del {args.desde:%d/%m/%Y} al {args.hasta:%d/%m/%Y}")
+    print("=" * 70)
+    encabezado = "".join(f"{columna:<16}" for columna in args.por)
+    print(f"{encabezado}{'Cantidad':>10}{'Monto':>16}")
+    print("-" * 70)
+    total_cantidad, total_monto = 0, 0
+    for fila in filas:
+        valores = "".join(f"{fila[columna] or '(sin asignar)'!s:<16}" for columna in args.por)
+        print(f"{valores}{fila['Cantidad']:>10}{fila['Monto']:>16,.2f}")
+        total_cantidad += fila['Cantidad']
+        total_monto += fila['Monto']
+    print("-" * 70)
+    print(f"{'TOTAL':<{max(len(encabezado), 5)}}{total_cantidad:>10}{total_monto:>16,.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
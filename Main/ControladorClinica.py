@@ -8,19 +8,28 @@ import sys
 import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-import Controladores.CitaControlador as Cita
-import Controladores.DoctorControlador as Dcotor
-import Controladores.FacturaControlador as Factura
-import Controladores.HorarioControlador as Horario
-import Controladores.LoginControlador as Login
-import Controladores.MenuControlador as Menu
-import Controladores.PacienteControlador as Paciente
-import Controladores.TratamientoControlador as Tratamiento
+import importlib
+
+# Solo se importa el login al arrancar: importar los ocho controladores trae sus
+# vistas, hojas de estilo y mysql.connector antes de mostrar la primera ventana.
+# El resto se importa cuando se ejecuta (o cuando el menú abre el módulo).
+CONTROLADORES = {
+    'Login': 'Controladores.LoginControlador',
+    'Menu': 'Controladores.MenuControlador',
+    'Paciente': 'Controladores.PacienteControlador',
+    'Doctor': 'Controladores.DoctorControlador',
+    'Cita': 'Controladores.CitaControlador',
+    'Tratamiento': 'Controladores.TratamientoControlador',
+    'Horario': 'Controladores.HorarioControlador',
+    'Factura': 'Controladores.FacturaControlador',
+}
 
 def ejecutar_controlador_secuencial(modulo, nombre):
-    """Ejecuta un controlador y espera a que se cierre para continuar"""
+    """Ejecuta un controlador (módulo o nombre de CONTROLADORES) y espera a que se cierre para continuar"""
     print(f"====== {nombre} ======")
     try:
+        if isinstance(modulo, str):
+            modulo = importlib.import_module(CONTROLADORES.get(modulo, modulo))
         # Ejecutar el controlador - cada uno maneja su propia QApplication
         modulo.main()
         print(f"✅ {nombre} completado")
@@ -35,7 +44,7 @@ def main():
     print("📋 Se ejecutará un controlador a la vez. Cierre la ventana para continuar al siguiente.\n")
     
     controladores = [        
-        (Login, " - Sistema de Login")      
+        ('Login', " - Sistema de Login")      
     ]
     
     for modulo, nombre in controladores:
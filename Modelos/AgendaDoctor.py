@@ -0,0 +1,194 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from datetime import date, time as datetime_time, timedelta
+from typing import List, NamedTuple, Optional
+
+from Config.database_config import conexion_bd, Error
+from Config.logging_config import obtener_logger
+
+try:
+    from .MapaIdentidad import MapaIdentidad
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from MapaIdentidad import MapaIdentidad
+
+logger = obtener_logger('Modelos.AgendaDoctor')
+
+TAMANO_PAGINA = 100
+
+# La consulta parte de Doctor con LEFT JOIN a sus citas:
+#   - sin filas            -> el doctor no existe
+#   - una fila sin ID_Cita -> el doctor existe pero no tiene citas en el rango
+# El total del rango sale de una subconsulta sobre idx_cita_doctor_fecha, así
+# existencia, conteo y página llegan en un solo viaje a la BD.
+_SELECT_AGENDA = """
+    SELECT
+        d.ID_Doctor,
+        (SELECT COUNT(*) FROM Cita cc WHERE cc.ID_Doctor = d.ID_Doctor {filtro_total}) AS Total,
+        c.ID_Cita,
+        c.Fecha,
+        c.Hora_Inicio,
+        c.Hora_Fin,
+        c.Estado,
+        c.Costo,
+        p.ID_Paciente,
+        p.Nombre,
+        p.Apellido,
+        p.DUI,
+        p.Telefono,
+        COALESCE(t.Descripcion, 'Sin tratamiento específico'),
+        COALESCE(t.Costo, 0)
+    FROM Doctor d
+    LEFT JOIN (
+        Cita c
+        INNER JOIN Paciente p ON p.ID_Paciente = c.ID_Paciente
+        LEFT JOIN Tratamiento t ON t.ID_Tratamiento = c.ID_Tratamiento
+    ) ON c.ID_Doctor = d.ID_Doctor {filtro_citas}
+    WHERE d.ID_Doctor = %s
+    ORDER BY c.Fecha DESC, c.Hora_Inicio DESC, c.ID_Cita DESC
+    LIMIT %s
+"""
+
+
+def hora_texto(valor) -> str:
+    """Convierte TIME de MySQL (timedelta) o datetime.time a 'HH:MM'"""
+    if isinstance(valor, timedelta):
+        minutos = int(valor.total_seconds()) // 60
+        return f"{minutos // 60:02d}:{minutos % 60:02d}"
+    if isinstance(valor, datetime_time):
+        return valor.strftime('%H:%M')
+    return str(valor) if valor is not None else ""
+
+
+def _filtros_fecha(columna: str, fecha_desde: Optional[date], fecha_hasta: Optional[date]):
+    """Condiciones (con AND inicial) y parámetros para el rango de fechas"""
+    condiciones = []
+    parametros = []
+    if fecha_desde:
+        condiciones.append(f"{columna}.Fecha >= %s")
+        parametros.append(fecha_desde)
+    if fecha_hasta:
+        # Fecha es DATETIME: incluir todo el día final
+        condiciones.append(f"{columna}.Fecha < %s")
+        parametros.append(fecha_hasta + timedelta(days=1))
+    texto = "".join(f" AND {condicion}" for condicion in condiciones)
+    return texto, parametros
+
+
+class PaginaAgenda(NamedTuple):
+    """Resultado de una consulta de agenda"""
+    doctor_encontrado: bool
+    citas: List[dict]
+    total: int          # citas del doctor en el rango de fechas (todas las páginas)
+    hay_mas: bool
+
+    @property
+    def clave_siguiente(self) -> Optional[tuple]:
+        """Clave para pedir la página siguiente (None si no hay más)"""
+        if not self.hay_mas or not self.citas:
+            return None
+        return self.citas[-1]['clave_orden']
+
+
+# ==========================================
+# CLASE: AgendaDoctor
+# PROPÓSITO: Consultar las citas de un doctor en un solo viaje a la BD,
+# con filtro de fechas y paginación (de la más reciente a la más antigua)
+# resueltos en el servidor
+# ==========================================
+
+class AgendaDoctor:
+    """
+    Uso:
+        pagina = AgendaDoctor.obtener_pagina(1234, fecha_desde=date(2025, 1, 1))
+        if pagina is None: ...                    # la BD falló
+        elif not pagina.doctor_encontrado: ...    # el doctor no existe
+        siguiente = AgendaDoctor.obtener_pagina(1234, despues_de=pagina.clave_siguiente)
+    """
+
+    @staticmethod
+    def obtener_pagina(id_doctor: int, fecha_desde: date = None, fecha_hasta: date = None,
+                       despues_de: tuple = None, limite: int = TAMANO_PAGINA) -> Optional[PaginaAgenda]:
+        """
+        :param id_doctor: ID_Doctor (número de junta médica).
+        :param fecha_desde: Solo citas desde esta fecha (inclusive).
+        :param fecha_hasta: Solo citas hasta esta fecha (inclusive).
+        :param despues_de: Clave (Fecha, Hora_Inicio, ID_Cita) de la última cita de la página
+                           anterior; la consulta continúa justo después, sin OFFSET.
+        :param limite: Número máximo de citas de la página.
+        :return: PaginaAgenda, o None si no hay conexión o la BD falla.
+        """
+        filtro_total, parametros_total = _filtros_fecha('cc', fecha_desde, fecha_hasta)
+        filtro_citas, parametros_citas = _filtros_fecha('c', fecha_desde, fecha_hasta)
+        if despues_de:
+            fecha_clave, hora_clave, id_clave = despues_de
+            # Forma expandida de (Fecha, Hora_Inicio, ID_Cita) < clave (orden descendente)
+            filtro_citas += (
+                " AND (c.Fecha < %s OR (c.Fecha = %s AND "
+                "(c.Hora_Inicio < %s OR (c.Hora_Inicio = %s AND c.ID_Cita < %s))))"
+            )
+            parametros_citas += [fecha_clave, fecha_clave, hora_clave, hora_clave, id_clave]
+
+        query = _SELECT_AGENDA.format(filtro_total=filtro_total, filtro_citas=filtro_citas)
+        # Se pide una fila de más para saber si hay otra página
+        parametros = tuple(parametros_total + parametros_citas + [id_doctor, int(limite) + 1])
+
+        try:
+            with conexion_bd() as conexion:
+                if not conexion:
+                    logger.error("❌ No se pudo establecer conexión a la base de datos.")
+                    return None
+                cursor = conexion.cursor()
+                cursor.execute(query, parametros)
+                filas = cursor.fetchall()
+
+        except Error as e:
+            logger.error("❌ Error SQL al obtener la agenda del doctor %s: %s", id_doctor, e)
+            return None
+
+        if not filas:
+            logger.warning("⚠️ Doctor con ID %s no encontrado en la base de datos", id_doctor)
+            return PaginaAgenda(False, [], 0, False)
+
+        total = int(filas[0][1] or 0)
+        filas = [fila for fila in filas if fila[2] is not None]
+        hay_mas = len(filas) > limite
+
+        # Los datos de cada paciente se preparan una sola vez aunque tenga muchas citas
+        mapa = MapaIdentidad()
+        citas = [AgendaDoctor._cita_desde_fila(fila, mapa) for fila in filas[:limite]]
+        mapa.registrar_resumen('AgendaDoctor.obtener_pagina')
+        return PaginaAgenda(True, citas, total, hay_mas)
+
+    @staticmethod
+    def _cita_desde_fila(fila, mapa: MapaIdentidad) -> dict:
+        (_, _, id_cita, fecha, hora_inicio, hora_fin, estado, costo, id_paciente,
+         paciente_nombre, paciente_apellido, dui, paciente_telefono,
+         tratamiento_descripcion, tratamiento_costo) = fila
+
+        datos_paciente = mapa.obtener('Paciente', id_paciente, lambda: {
+            'id_paciente': id_paciente,
+            'paciente_nombre': paciente_nombre or "Sin nombre",
+            'paciente_apellido': paciente_apellido or "Sin apellido",
+            'paciente_dui': dui or "Sin DUI",
+            'paciente_telefono': paciente_telefono or "Sin teléfono"
+        })
+
+        return {
+            'id_cita': id_cita,
+            'fecha': fecha,
+            'hora_inicio': hora_texto(hora_inicio),
+            'hora_fin': hora_texto(hora_fin),
+            'estado': estado or "Pendiente",
+            'costo': f"${costo:.2f}" if costo else "$0.00",
+            **datos_paciente,
+            'tratamiento_descripcion': tratamiento_descripcion or "Sin tratamiento",
+            'tratamiento_costo': f"${tratamiento_costo:.2f}" if tratamiento_costo else "$0.00",
+            # Valores tal como vienen de la BD, para continuar la paginación
+            'clave_orden': (fecha, hora_inicio, id_cita),
+        }
+
+
+__all__ = ['AgendaDoctor', 'PaginaAgenda', 'TAMANO_PAGINA', 'hora_texto']
@@ -0,0 +1,226 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from datetime import date, datetime, time, timedelta
+from time import monotonic as time_monotonic
+from typing import Dict, List, Optional, Tuple
+
+from Config.logging_config import obtener_logger
+
+try:
+    from .CitaModelo import Cita
+    from .HorarioModelo import Horario
+    from .IndiceIntervalos import hora_a_minutos
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from CitaModelo import Cita
+    from HorarioModelo import Horario
+    from IndiceIntervalos import hora_a_minutos
+
+logger = obtener_logger('Modelos.BuscadorHuecos')
+
+# ==========================================
+# CLASE: BuscadorHuecos
+# PROPÓSITO: Encontrar los próximos espacios libres para agendar una cita
+# combinando los horarios disponibles de cada doctor con sus citas ya agendadas.
+#
+# Cada día se representa como un mapa de bits (un int de Python) donde
+# cada bit es un bloque de `resolucion` minutos:
+#   libre = horario_del_doctor & ~citas_del_dia
+# y los inicios con `duracion` minutos seguidos libres se obtienen con
+# unos pocos AND y desplazamientos, sin recorrer minuto a minuto.
+# ==========================================
+
+class BuscadorHuecos:
+    """Motor de búsqueda de espacios libres para citas"""
+
+    def __init__(self, resolucion: int = 5, paso: int = 15, vigencia: float = 60.0):
+        """
+        Args:
+            resolucion: Minutos que representa cada bit del día
+            paso: Cada cuántos minutos puede empezar una cita (múltiplo de la resolución)
+            vigencia: Segundos que se reutiliza la agenda precalculada antes de recargarla
+        """
+        self.resolucion = resolucion
+        self.vigencia = vigencia
+        self.bloques_dia = 24 * 60 // resolucion
+        self.paso_bloques = max(1, paso // resolucion)
+
+        # Bits en los que puede empezar una cita (00:00, 00:15, 00:30...)
+        self._alineados = 0
+        for bloque in range(0, self.bloques_dia, self.paso_bloques):
+            self._alineados |= 1 << bloque
+
+        # Agenda precalculada (ver preparar())
+        self._base: Dict[str, int] = {}
+        self._ocupado: Dict[Tuple[str, date], int] = {}
+        self._clave_cache = None
+        self._preparado_en = 0.0
+
+    # ==========================================
+    # MAPAS DE BITS
+    # ==========================================
+
+    def _mascara(self, inicio_min: int, fin_min: int, ocupado: bool) -> int:
+        """
+        Bits del rango [inicio_min, fin_min).
+        Un rango disponible solo aporta bloques completos; uno ocupado
+        bloquea cualquier bloque que toque.
+        """
+        if ocupado:
+            desde = inicio_min // self.resolucion
+            hasta = -(-fin_min // self.resolucion)
+        else:
+            desde = -(-inicio_min // self.resolucion)
+            hasta = fin_min // self.resolucion
+        hasta = min(hasta, self.bloques_dia)
+        if hasta <= desde:
+            return 0
+        return ((1 << (hasta - desde)) - 1) << desde
+
+    @staticmethod
+    def _inicios_con_bloques_libres(libre: int, bloques: int) -> int:
+        """Bits j tales que los bloques j .. j+bloques-1 están todos libres"""
+        inicios = libre
+        largo = 1
+        while largo < bloques and inicios:
+            salto = min(largo, bloques - largo)
+            inicios &= inicios >> salto
+            largo += salto
+        return inicios
+
+    @staticmethod
+    def _minutos_a_hora(minutos: int) -> time:
+        minutos = min(minutos, 24 * 60 - 1)
+        return time(minutos // 60, minutos % 60)
+
+    # ==========================================
+    # PRECÁLCULO
+    # ==========================================
+
+    def preparar(self, disponibilidad: List[Tuple], ocupacion: List[Tuple]):
+        """
+        Precalcula los mapas de bits de la agenda. Las búsquedas posteriores
+        solo combinan estos enteros, sin volver a interpretar horas ni filas.
+
+        Args:
+            disponibilidad: Filas (ID_Doctor, Hora_Inicio, Hora_Fin) de horarios disponibles
+            ocupacion: Filas (ID_Doctor, Fecha, Hora_Inicio, Hora_Fin) de citas no canceladas
+        """
+        # Horario base de cada doctor (igual todos los días)
+        base: Dict[str, int] = {}
+        for id_doctor, inicio, fin in disponibilidad:
+            clave = str(id_doctor)
+            base[clave] = base.get(clave, 0) | self._mascara(hora_a_minutos(inicio), hora_a_minutos(fin), False)
+
+        # Bloques ocupados por (doctor, día)
+        ocupado: Dict[Tuple[str, date], int] = {}
+        for id_doctor, fecha, inicio, fin in ocupacion:
+            if isinstance(fecha, datetime):
+                fecha = fecha.date()
+            clave = (str(id_doctor), fecha)
+            ocupado[clave] = ocupado.get(clave, 0) | self._mascara(hora_a_minutos(inicio), hora_a_minutos(fin), True)
+
+        self._base = base
+        self._ocupado = ocupado
+        self._preparado_en = time_monotonic()
+
+    def invalidar(self):
+        """Descarta la agenda precalculada (p. ej. después de agendar o cancelar una cita)"""
+        self._clave_cache = None
+
+    # ==========================================
+    # BÚSQUEDA
+    # ==========================================
+
+    def buscar(self, doctores: list, fecha_desde: date, fecha_hasta: date, duracion: int,
+               cantidad: int = 10, especialidad: Optional[str] = None,
+               ahora: Optional[datetime] = None) -> List[dict]:
+        """
+        Devuelve los próximos espacios libres.
+        La agenda se carga de la BD (dos consultas) y se precalcula solo si el rango pedido
+        no está cubierto por la carga anterior o si pasaron más de `vigencia` segundos.
+
+        Args:
+            doctores: Doctores candidatos (uno solo para buscar en su agenda)
+            fecha_desde: Primer día a revisar (inclusive)
+            fecha_hasta: Último día a revisar (inclusive)
+            duracion: Duración de la cita en minutos
+            cantidad: Número máximo de espacios a devolver
+            especialidad: Si se indica, solo doctores de esa especialidad
+            ahora: Momento actual; evita proponer horas pasadas (por defecto datetime.now())
+
+        Returns:
+            Lista de dicts {'doctor', 'fecha', 'hora_inicio', 'hora_fin'} en orden cronológico
+        """
+        if especialidad:
+            doctores = [d for d in doctores if d.especialidad == especialidad]
+        if not doctores:
+            return []
+
+        # La agenda se precalcula para todos los doctores, así cualquier subconjunto
+        # (un doctor, una especialidad) reutiliza el mismo precálculo
+        vencida = time_monotonic() - self._preparado_en > self.vigencia
+        cubierta = (self._clave_cache is not None
+                    and self._clave_cache[0] <= fecha_desde and fecha_hasta <= self._clave_cache[1])
+        if vencida or not cubierta:
+            self.preparar(Horario.obtener_disponibilidad_bd(),
+                          Cita.obtener_ocupacion_bd(fecha_desde, fecha_hasta))
+            self._clave_cache = (fecha_desde, fecha_hasta)
+
+        return self.buscar_preparado(doctores, fecha_desde, fecha_hasta, duracion, cantidad, ahora)
+
+    def buscar_en_datos(self, doctores: list, disponibilidad: List[Tuple], ocupacion: List[Tuple],
+                        fecha_desde: date, fecha_hasta: date, duracion: int,
+                        cantidad: int = 10, ahora: Optional[datetime] = None) -> List[dict]:
+        """Igual que buscar(), pero con las filas ya cargadas (precalcula y busca)"""
+        self.preparar(disponibilidad, ocupacion)
+        self._clave_cache = None
+        return self.buscar_preparado(doctores, fecha_desde, fecha_hasta, duracion, cantidad, ahora)
+
+    def buscar_preparado(self, doctores: list, fecha_desde: date, fecha_hasta: date, duracion: int,
+                         cantidad: int = 10, ahora: Optional[datetime] = None) -> List[dict]:
+        """Busca sobre la agenda ya precalculada con preparar()"""
+        ahora = ahora or datetime.now()
+        bloques = max(1, -(-duracion // self.resolucion))
+        doctores_por_id = {str(d.id_doctor): d for d in doctores}
+        base = [(clave, mascara) for clave, mascara in self._base.items() if clave in doctores_por_id]
+        ocupado = self._ocupado
+
+        huecos = []
+        dia = max(fecha_desde, ahora.date())
+        while dia <= fecha_hasta and len(huecos) < cantidad:
+            # En el día de hoy solo sirven los bloques que empiezan después de la hora actual
+            corte = 0
+            if dia == ahora.date():
+                corte = self._mascara(0, ahora.hour * 60 + ahora.minute + 1, True)
+
+            del_dia = []
+            for clave, mascara_base in base:
+                libre = mascara_base & ~ocupado.get((clave, dia), 0) & ~corte
+                inicios = self._inicios_con_bloques_libres(libre, bloques) & self._alineados
+                # De cada doctor bastan sus primeros `cantidad` inicios del día
+                faltan = cantidad - len(huecos)
+                while inicios and faltan:
+                    bit = inicios & -inicios
+                    del_dia.append((bit.bit_length() - 1, clave))
+                    inicios ^= bit
+                    faltan -= 1
+
+            for bloque, clave in sorted(del_dia)[:cantidad - len(huecos)]:
+                inicio_min = bloque * self.resolucion
+                huecos.append({
+                    'doctor': doctores_por_id[clave],
+                    'fecha': dia,
+                    'hora_inicio': self._minutos_a_hora(inicio_min),
+                    'hora_fin': self._minutos_a_hora(inicio_min + duracion),
+                })
+
+            dia += timedelta(days=1)
+
+        logger.debug("🔎 %s espacios libres encontrados (%s doctores, %s min)", len(huecos), len(base), duracion)
+        return huecos
+
+
+__all__ = ['BuscadorHuecos']
@@ -0,0 +1,126 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from Config.database_config import DatabaseConfig
+from Config.logging_config import obtener_logger
+
+logger = obtener_logger('Modelos.CacheReferencia')
+
+# ==========================================
+# CLASE: CacheReferencia
+# PROPÓSITO: Guardar en memoria los datos que casi no cambian (doctores,
+# tratamientos) para no consultarlos en cada acción de los controladores
+# ==========================================
+
+class CacheReferencia:
+    """
+    Caché de lectura compartida por todo el proceso.
+
+    Las entradas se agrupan por entidad ('Doctor', 'Tratamiento'). Cada
+    entidad tiene un número de versión; las escrituras lo incrementan con
+    invalidar() y toda entrada leída con una versión anterior deja de valer.
+    Además, cada entrada vence a los `ttl` segundos para recoger cambios
+    hechos desde otra estación de trabajo.
+
+    Uso:
+        doctores = cache.obtener('Doctor', 'todos', Doctor._leer_doctores_bd)
+        cache.invalidar('Doctor')    # después de insertar, actualizar o eliminar
+
+    Si la función de carga devuelve None (la BD falló) el resultado no se guarda.
+    """
+
+    def __init__(self, ttl: float = None):
+        # Sin ttl se usa DatabaseConfig.REFERENCE_CACHE_TTL (leído en cada carga)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._versiones: Dict[str, int] = {}
+        # (entidad, clave) -> (valor, versión con la que se leyó, instante de vencimiento)
+        self._entradas: Dict[Tuple[str, Hashable], Tuple[Any, int, float]] = {}
+        self._contadores: Dict[str, Dict[str, int]] = {}
+
+    def _contar(self, entidad: str, contador: str):
+        contadores = self._contadores.setdefault(entidad, {'aciertos': 0, 'fallos': 0, 'invalidaciones': 0})
+        contadores[contador] += 1
+
+    def version(self, entidad: str) -> int:
+        with self._lock:
+            return self._versiones.get(entidad, 0)
+
+    def obtener(self, entidad: str, clave: Hashable, cargar: Callable[[], Any], ttl: float = None) -> Any:
+        """
+        Devuelve el valor guardado para (entidad, clave) o lo lee con `cargar`.
+        La carga se hace fuera del lock; si mientras tanto hubo una escritura,
+        el valor se guarda con la versión vieja y la siguiente lectura lo descarta.
+        """
+        llave = (entidad, clave)
+        with self._lock:
+            version = self._versiones.get(entidad, 0)
+            entrada = self._entradas.get(llave)
+            if entrada is not None:
+                valor, version_entrada, vence = entrada
+                if version_entrada == version and time.monotonic() < vence:
+                    self._contar(entidad, 'aciertos')
+                    return valor
+                del self._entradas[llave]
+            self._contar(entidad, 'fallos')
+
+        valor = cargar()
+        if valor is None:
+            return None
+
+        if ttl is None:
+            ttl = self.ttl if self.ttl is not None else DatabaseConfig.REFERENCE_CACHE_TTL
+        with self._lock:
+            self._entradas[llave] = (valor, version, time.monotonic() + ttl)
+        return valor
+
+    def invalidar(self, entidad: str):
+        """Incrementa la versión de la entidad: todo lo guardado de ella queda vencido"""
+        with self._lock:
+            version = self._versiones.get(entidad, 0) + 1
+            self._versiones[entidad] = version
+            for llave in [llave for llave in self._entradas if llave[0] == entidad]:
+                del self._entradas[llave]
+            self._contar(entidad, 'invalidaciones')
+        logger.debug("♻️ Caché de %s invalidada (versión %s)", entidad, version)
+
+    def limpiar(self):
+        """Descarta todas las entradas (las versiones y los contadores se conservan)"""
+        with self._lock:
+            self._entradas.clear()
+
+    def estadisticas(self) -> dict:
+        """Aciertos, fallos e invalidaciones por entidad y en total"""
+        with self._lock:
+            por_entidad = {
+                entidad: dict(contadores, version=self._versiones.get(entidad, 0))
+                for entidad, contadores in self._contadores.items()
+            }
+        aciertos = sum(c['aciertos'] for c in por_entidad.values())
+        fallos = sum(c['fallos'] for c in por_entidad.values())
+        consultas = aciertos + fallos
+        return {
+            'aciertos': aciertos,
+            'fallos': fallos,
+            'tasa_aciertos': round(aciertos / consultas, 3) if consultas else 0.0,
+            'entidades': por_entidad,
+        }
+
+    def reiniciar_estadisticas(self):
+        with self._lock:
+            self._contadores.clear()
+
+
+_cache = CacheReferencia()
+
+def obtener_cache_referencia() -> CacheReferencia:
+    """Devuelve la caché de datos de referencia del proceso"""
+    return _cache
+
+
+__all__ = ['CacheReferencia', 'obtener_cache_referencia']
@@ -3,9 +3,8 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 # Importar configuración centralizada
-from Config.database_config import obtener_conexion, conectar_bd, cerrar_conexion_segura
-import mysql.connector  # Mantener para manejo de errores específicos
-from mysql.connector import Error
+from Config.database_config import obtener_conexion, conectar_bd, conexion_bd, cerrar_conexion_segura, Error
+from Config.logging_config import obtener_logger
     
 import sys
 import os
@@ -17,8 +16,8 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 # ==========================================
 # IMPORTACIONES: Clases del modelo y librerías necesarias
 # ==========================================
-from datetime import date, time
-from typing import List
+from datetime import date, time, timedelta
+from typing import List, Optional, Tuple
 import re
 from typing import TYPE_CHECKING
 
@@ -27,6 +26,9 @@ try:
     from .PacienteModelo import Paciente
     from .DoctorModelo import Doctor
     from .TratamientoModelo import Tratamiento
+    from .MapaIdentidad import MapaIdentidad
+    from .RegistroIds import RegistroIds
+    from .ResumenIngresos import ResumenIngresos
 except ImportError:
     # Fallback para importaciones absolutas
     import sys
@@ -35,17 +37,21 @@ except ImportError:
     from PacienteModelo import Paciente
     from DoctorModelo import Doctor
     from TratamientoModelo import Tratamiento
+    from MapaIdentidad import MapaIdentidad
+    from RegistroIds import RegistroIds
+    from ResumenIngresos import ResumenIngresos
 
 if TYPE_CHECKING:
     pass  
 
+logger = obtener_logger('Modelos.CitaModelo')
+
 class Cita:
     """
     Clase que representa una cita en la clínica dental.
     Contiene información sobre el paciente, el doctor, el horario y el estado de la cita.
     """
-    _contador_id = 1
-    _citas_existentes = []
+    _citas_existentes = RegistroIds()  # IDs en uso y siguiente ID libre (búsquedas O(1))
 
     def __init__(self, paciente: Paciente, doctor: Doctor, fecha: date, hora_inicio: time, hora_fin: time, costo_cita: float = 25, id_cita: int = None):
         
@@ -59,11 +65,7 @@ class Cita:
             self.id_cita = Cita._obtener_siguiente_id()  # Asignar un ID único
         else:
             self.id_cita = id_cita
-            if id_cita >= Cita._contador_id:
-                Cita._contador_id = id_cita + 1
-
-        if self.id_cita not in Cita._citas_existentes:  
-            Cita._citas_existentes.append(self.id_cita)
+            Cita._citas_existentes.registrar(id_cita)
 
         # Validaciones de fecha y hora
         if costo_cita < 0:
@@ -80,41 +82,22 @@ class Cita:
     @classmethod
     def _obtener_siguiente_id(cls) -> int:
         """Obtiene el siguiente ID disponible de forma robusta"""
-        # Buscar el siguiente ID que no esté en uso
-        while cls._contador_id in cls._citas_existentes:
-            cls._contador_id += 1
-        
-        # Retornar el ID actual y incrementar para el siguiente
-        id_actual = cls._contador_id
-        cls._contador_id += 1
-        return id_actual
+        return cls._citas_existentes.asignar()
     
     @classmethod
     def get_next_id(cls) -> int:
         """Obtiene el próximo ID disponible sin incrementar el contador"""
-        return cls._contador_id
+        return cls._citas_existentes.siguiente
 
     @classmethod
     def set_contador_id(cls, nuevo_contador: int):
         """Establece el contador de ID (útil para cargar datos existentes)"""
-        if nuevo_contador > cls._contador_id:
-            cls._contador_id = nuevo_contador
+        cls._citas_existentes.adelantar_a(nuevo_contador)
 
     @classmethod
     def inicializar_contador_desde_citas(cls, citas_existentes: List['Cita']):
         """Inicializa el contador de ID a partir de una lista de citas existentes"""
-        if not citas_existentes:
-            cls._contador_id = 1
-            cls._citas_existentes = []
-            return
-        
-        ids_existentes = [cita.id_cita for cita in citas_existentes]
-        cls._citas_existentes = ids_existentes.copy()
-
-        if ids_existentes:
-            cls._contador_id = max(ids_existentes) + 1
-        else:
-            cls._contador_id = 1
+        cls._citas_existentes.reiniciar(cita.id_cita for cita in citas_existentes or [])
 
     def calcular_monto_total(self, tratamiento: Tratamiento) -> float: 
         """ Calcula el monto total de la cita sumando el costo del tratamiento.
@@ -196,77 +179,60 @@ class Cita:
         :param cita: Instancia de la clase Cita a insertar.
         :return: True si la inserción fue exitosa, False en caso contrario.
         """
-        conexion = None
-        cursor = None     
 
         try:
-            conexion= conectar_bd()
-            if not conexion:
-                print("No se pudo establecer conexión con la base de datos.")
-                return False
-            cursor = conexion.cursor()
-
-            query = """
-            INSERT INTO Cita (ID_Paciente, ID_Doctor, ID_Tratamiento, Fecha, Hora_Inicio, Hora_Fin, Estado, Costo)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            """
-
-            # Obtener ID de tratamiento si existe
-            id_tratamiento = None
-            if hasattr(cita, 'tratamiento') and cita.tratamiento:
-                id_tratamiento = cita.tratamiento.id_tratamiento
-
-            cursor.execute(query, (
-                cita.paciente.id_paciente,
-                cita.doctor.id_doctor,
-                id_tratamiento,  
-                cita.fecha,
-                cita.hora_inicio.strftime('%H:%M:%S'),
-                cita.hora_fin.strftime('%H:%M:%S'),
-                cita.estado,
-                cita.costo_cita
-            ))
-
-            conexion.commit()
-
-            # Obtener el ID generado por la base de datos
-            cita_id_bd = cursor.lastrowid
-            print(f"Cita insertada correctamente con ID de BD: {cita_id_bd}")
-            return True
+            with conexion_bd() as conexion:
+                if not conexion:
+                    logger.warning("No se pudo establecer conexión con la base de datos.")
+                    return False
+                cursor = conexion.cursor()
+                ResumenIngresos.asegurar_tablas(cursor)
+                # La cita y el resumen de ingresos se confirman juntos
+                conexion.start_transaction()
+
+                query = """
+                INSERT INTO Cita (ID_Paciente, ID_Doctor, ID_Tratamiento, Fecha, Hora_Inicio, Hora_Fin, Estado, Costo)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                """
+
+                # Obtener ID de tratamiento si existe
+                id_tratamiento = None
+                if hasattr(cita, 'tratamiento') and cita.tratamiento:
+                    id_tratamiento = cita.tratamiento.id_tratamiento
+
+                cursor.execute(query, (
+                    cita.paciente.id_paciente,
+                    cita.doctor.id_doctor,
+                    id_tratamiento,  
+                    cita.fecha,
+                    cita.hora_inicio.strftime('%H:%M:%S'),
+                    cita.hora_fin.strftime('%H:%M:%S'),
+                    cita.estado,
+                    cita.costo_cita
+                ))
+                # El ID real es el que asignó la BD (AUTO_INCREMENT): el asignado en memoria
+                # puede haber quedado atrás si otra estación insertó o si la BD saltó valores.
+                # Se lee antes de los INSERT del resumen, que cambian lastrowid
+                cita_id_bd = cursor.lastrowid
+                ResumenIngresos.registrar(cursor, [ResumenIngresos.movimiento_cita(
+                    cita.fecha, cita.doctor.id_doctor, id_tratamiento, cita.estado, cita.costo_cita)])
+
+                conexion.commit()
+
+                if cita_id_bd:
+                    if cita.id_cita != cita_id_bd:
+                        Cita._citas_existentes.liberar(cita.id_cita)
+                        cita.id_cita = cita_id_bd
+                    Cita._citas_existentes.registrar(cita_id_bd)
+                logger.debug("Cita insertada correctamente con ID de BD: %s", cita_id_bd)
+                return True
         
         except Error as e:
-            print(f"Error al insertar la cita: {e}")
-            if conexion:
-                conexion.rollback()
+            logger.error("Error al insertar la cita: %s", e)
             return False
-        
-        finally:
-            if cursor:
-                cursor.close()
-            if conexion and conexion.is_connected():
-                conexion.close()
-                print("Conexión a la base de datos cerrada.")
-    
-    @staticmethod
-    def obtener_citas_bd() -> List['Cita']:
-        """
-        Obtiene todas las citas de la base de datos.
-        :return: Lista de instancias de Cita.
-        """
-        conexion = None
-        cursor = None
-        citas = []
-
-        try:
-            conexion= conectar_bd()
-            if not conexion:
-                print("No se pudo establecer conexión con la base de datos.")
-                return False
-
-            cursor = conexion.cursor()
 
-            # Query con JOINs para obtener toda la información en una consulta
-            query = """
+    # Columnas comunes para todas las consultas que hidratan objetos Cita
+    _SELECT_CITAS = """
             SELECT 
                 c.ID_Cita,
                 c.Fecha,
@@ -296,92 +262,268 @@ class Cita:
             INNER JOIN Paciente p ON c.ID_Paciente = p.ID_Paciente
             INNER JOIN Doctor d ON c.ID_Doctor = d.ID_Doctor
             LEFT JOIN Tratamiento t ON c.ID_Tratamiento = t.ID_Tratamiento
-            ORDER BY c.Fecha, c.Hora_Inicio
             """
-            cursor.execute(query)
-
-            for row in cursor.fetchall():
-                (id_cita, fecha, hora_inicio, hora_fin, estado, costo,
-                 id_paciente, paciente_nombre, paciente_apellido, fecha_nacimiento, dui, paciente_telefono, paciente_correo,
-                 id_doctor, doctor_nombre, doctor_apellido, especialidad, doctor_telefono, doctor_correo, contrasena,
-                 id_tratamiento, tratamiento_descripcion, tratamiento_costo, tratamiento_fecha) = row
-                
-                from datetime import time as datetime_time, timedelta
-                
-                if isinstance(hora_inicio, timedelta):
-                    total_seconds = int(hora_inicio.total_seconds())
-                    hours = total_seconds // 3600
-                    minutes = (total_seconds % 3600) // 60
-                    hora_inicio = datetime_time(hours, minutes)
-                
-                if isinstance(hora_fin, timedelta):
-                    total_seconds = int(hora_fin.total_seconds())
-                    hours = total_seconds // 3600
-                    minutes = (total_seconds % 3600) // 60
-                    hora_fin = datetime_time(hours, minutes)
-
-                # Creacion de la instancia de Paciente con los datos obtenidos de los joins
-                paciente = Paciente(
-                    nombre=paciente_nombre,
-                    apellido=paciente_apellido,
-                    fecha_nacimiento=fecha_nacimiento,
-                    telefono=int(paciente_telefono) if paciente_telefono else 0,
-                    correo=paciente_correo or "",
-                    dui=dui or "",
-                    id_paciente=id_paciente
-                )
-
-                # Creacion de la instancia de Doctor con los datos obtenidos de los joins
-                doctor = Doctor(
-                    nombre=doctor_nombre,
-                    apellido=doctor_apellido,
-                    num_junta_medica=id_doctor,
-                    especialidad=especialidad,
-                    telefono=doctor_telefono,
-                    correo=doctor_correo
-                )
-                
-                doctor.id_doctor = id_doctor
-                
-                # Crear la cita
-                cita = Cita(
-                    paciente=paciente,
-                    doctor=doctor,
-                    fecha=fecha,
-                    hora_inicio=hora_inicio,
-                    hora_fin=hora_fin,
-                    costo_cita=costo,
-                    id_cita=id_cita
-                )
-                
-                
-                cita.estado = estado
+
+    @staticmethod
+    def _cita_desde_fila(row, mapa: MapaIdentidad = None) -> 'Cita':
+        """
+        Construye una Cita (con su Paciente, Doctor y Tratamiento) a partir de una fila de _SELECT_CITAS.
+        Guarda en cita.clave_orden la clave (Fecha, Hora_Inicio, ID_Cita) tal como viene de la BD,
+        que es la que se usa para paginar.
+        Con un mapa de identidad, el Paciente, Doctor y Tratamiento se construyen una sola vez por ID
+        y se comparten entre todas las citas de la misma carga.
+        """
+        if mapa is None:
+            mapa = MapaIdentidad()
+
+        (id_cita, fecha, hora_inicio, hora_fin, estado, costo,
+         id_paciente, paciente_nombre, paciente_apellido, fecha_nacimiento, dui, paciente_telefono, paciente_correo,
+         id_doctor, doctor_nombre, doctor_apellido, especialidad, doctor_telefono, doctor_correo, contrasena,
+         id_tratamiento, tratamiento_descripcion, tratamiento_costo, tratamiento_fecha) = row
+        
+        from datetime import time as datetime_time, timedelta
         
-                if id_tratamiento and tratamiento_descripcion:
-                    tratamiento = Tratamiento(
-                        id_tratamiento=id_tratamiento,
-                        id_doctor=id_doctor,
-                        descripcion=tratamiento_descripcion,
-                        costo=tratamiento_costo,
-                        fecha=tratamiento_fecha,
-                        doctor=doctor
-                    )
-                    cita.tratamiento = tratamiento
-                
-                citas.append(cita)
-
-            return citas
+        clave_orden = (fecha, hora_inicio, id_cita)
+        
+        if isinstance(hora_inicio, timedelta):
+            total_seconds = int(hora_inicio.total_seconds())
+            hours = total_seconds // 3600
+            minutes = (total_seconds % 3600) // 60
+            hora_inicio = datetime_time(hours, minutes)
+        
+        if isinstance(hora_fin, timedelta):
+            total_seconds = int(hora_fin.total_seconds())
+            hours = total_seconds // 3600
+            minutes = (total_seconds % 3600) // 60
+            hora_fin = datetime_time(hours, minutes)
+
+        # Creacion de la instancia de Paciente con los datos obtenidos de los joins
+        paciente = mapa.obtener(Paciente, id_paciente, lambda: Paciente(
+            nombre=paciente_nombre,
+            apellido=paciente_apellido,
+            fecha_nacimiento=fecha_nacimiento,
+            telefono=int(paciente_telefono) if paciente_telefono else 0,
+            correo=paciente_correo or "",
+            dui=dui or "",
+            id_paciente=id_paciente
+        ))
+
+        # Creacion de la instancia de Doctor con los datos obtenidos de los joins
+        def crear_doctor():
+            doctor = Doctor(
+                nombre=doctor_nombre,
+                apellido=doctor_apellido,
+                num_junta_medica=id_doctor,
+                especialidad=especialidad,
+                telefono=doctor_telefono,
+                correo=doctor_correo
+            )
+            doctor.id_doctor = id_doctor
+            return doctor
+
+        doctor = mapa.obtener(Doctor, id_doctor, crear_doctor)
+        
+        # Crear la cita
+        cita = Cita(
+            paciente=paciente,
+            doctor=doctor,
+            fecha=fecha,
+            hora_inicio=hora_inicio,
+            hora_fin=hora_fin,
+            costo_cita=costo,
+            id_cita=id_cita
+        )
+        
+        cita.estado = estado
+        cita.clave_orden = clave_orden
+
+        if id_tratamiento and tratamiento_descripcion:
+            cita.tratamiento = mapa.obtener(Tratamiento, id_tratamiento, lambda: Tratamiento(
+                id_tratamiento=id_tratamiento,
+                id_doctor=id_doctor,
+                descripcion=tratamiento_descripcion,
+                costo=tratamiento_costo,
+                fecha=tratamiento_fecha,
+                doctor=doctor
+            ))
+        
+        return cita
+
+    @staticmethod
+    def obtener_citas_bd(fecha_desde: date = None, fecha_hasta: date = None,
+                         estados: List[str] = None, despues_de: tuple = None,
+                         limite: int = None) -> List['Cita']:
+        """
+        Obtiene citas de la base de datos ordenadas por (Fecha, Hora_Inicio, ID_Cita).
+        Sin parámetros devuelve todo el historial.
+        :param fecha_desde: Solo citas desde esta fecha (inclusive).
+        :param fecha_hasta: Solo citas hasta esta fecha (inclusive).
+        :param estados: Solo citas con alguno de estos estados.
+        :param despues_de: Clave (Fecha, Hora_Inicio, ID_Cita) de la última cita de la página anterior;
+                           la consulta continúa justo después (paginación por clave, sin OFFSET).
+        :param limite: Número máximo de citas a devolver.
+        :return: Lista de instancias de Cita.
+        """
+        condiciones = []
+        parametros = []
+
+        if fecha_desde:
+            condiciones.append("c.Fecha >= %s")
+            parametros.append(fecha_desde)
+        if fecha_hasta:
+            # Fecha es DATETIME: incluir todo el día final
+            condiciones.append("c.Fecha < %s")
+            parametros.append(fecha_hasta + timedelta(days=1))
+        if estados:
+            condiciones.append(f"c.Estado IN ({', '.join(['%s'] * len(estados))})")
+            parametros.extend(estados)
+        if despues_de:
+            fecha_clave, hora_clave, id_clave = despues_de
+            # Forma expandida de (Fecha, Hora_Inicio, ID_Cita) > clave para que use el índice
+            condiciones.append(
+                "(c.Fecha > %s OR (c.Fecha = %s AND "
+                "(c.Hora_Inicio > %s OR (c.Hora_Inicio = %s AND c.ID_Cita > %s))))"
+            )
+            parametros.extend([fecha_clave, fecha_clave, hora_clave, hora_clave, id_clave])
+
+        query = Cita._SELECT_CITAS
+        if condiciones:
+            query += " WHERE " + " AND ".join(condiciones)
+        query += " ORDER BY c.Fecha, c.Hora_Inicio, c.ID_Cita"
+        if limite:
+            query += " LIMIT %s"
+            parametros.append(int(limite))
+
+        try:
+            with conexion_bd() as conexion:
+                if not conexion:
+                    logger.warning("No se pudo establecer conexión con la base de datos.")
+                    return []
+
+                cursor = conexion.cursor()
+                cursor.execute(query, tuple(parametros))
+
+                # Un mapa por carga: cada paciente/doctor/tratamiento se hidrata una sola vez
+                mapa = MapaIdentidad()
+                citas = [Cita._cita_desde_fila(row, mapa) for row in cursor.fetchall()]
+                mapa.registrar_resumen('Cita.obtener_citas_bd')
+
+                return citas
         
         except Error as e:
-            print(f"Error al obtener las citas: {e}")
+            logger.error("Error al obtener las citas: %s", e)
+            return []
+
+    @staticmethod
+    def obtener_pagina_citas_bd(tamano: int, despues_de: tuple = None, fecha_desde: date = None,
+                                fecha_hasta: date = None, estados: List[str] = None) -> Tuple[List['Cita'], bool]:
+        """
+        Obtiene una página de citas a partir de la clave despues_de.
+        :return: (citas de la página, True si hay más citas después de esta página)
+        """
+        citas = Cita.obtener_citas_bd(fecha_desde, fecha_hasta, estados, despues_de, tamano + 1)
+        hay_siguiente = len(citas) > tamano
+        return citas[:tamano], hay_siguiente
+
+    @staticmethod
+    def obtener_cita_por_id_bd(id_cita: int) -> Optional['Cita']:
+        """
+        Obtiene una sola cita por su ID.
+        :return: Instancia de Cita o None si no existe.
+        """
+        try:
+            with conexion_bd() as conexion:
+                if not conexion:
+                    logger.warning("No se pudo establecer conexión con la base de datos.")
+                    return None
+
+                cursor = conexion.cursor()
+                cursor.execute(Cita._SELECT_CITAS + " WHERE c.ID_Cita = %s", (id_cita,))
+                row = cursor.fetchone()
+
+                return Cita._cita_desde_fila(row) if row else None
+
+        except Error as e:
+            logger.error("Error al obtener la cita %s: %s", id_cita, e)
+            return None
+
+    @staticmethod
+    def obtener_ultimo_id_bd() -> int:
+        """Devuelve el ID de cita más alto registrado (0 si no hay citas)"""
+        try:
+            with conexion_bd() as conexion:
+                if not conexion:
+                    return 0
+                cursor = conexion.cursor()
+                cursor.execute("SELECT MAX(ID_Cita) FROM Cita")
+                resultado = cursor.fetchone()
+                return int(resultado[0]) if resultado and resultado[0] else 0
+        except Error as e:
+            logger.error("Error al obtener el último ID de cita: %s", e)
+            return 0
+
+    @staticmethod
+    def obtener_intervalos_doctor_bd(id_doctor, fecha: date) -> List[tuple]:
+        """
+        Obtiene los rangos ocupados por un doctor en un día (citas no canceladas).
+        :return: Lista de (Hora_Inicio, Hora_Fin, ID_Cita).
+        """
+        try:
+            with conexion_bd() as conexion:
+                if not conexion:
+                    logger.warning("No se pudo establecer conexión con la base de datos.")
+                    return []
+
+                cursor = conexion.cursor()
+                cursor.execute("""
+                    SELECT Hora_Inicio, Hora_Fin, ID_Cita
+                    FROM Cita
+                    WHERE ID_Doctor = %s AND Fecha >= %s AND Fecha < %s AND Estado <> 'Cancelada'
+                """, (id_doctor, fecha, fecha + timedelta(days=1)))
+                return cursor.fetchall()
+
+        except Error as e:
+            logger.error("Error al obtener las citas del doctor %s el %s: %s", id_doctor, fecha, e)
+            return []
+
+    @staticmethod
+    def obtener_ocupacion_bd(fecha_desde: date, fecha_hasta: date, ids_doctor: List[str] = None) -> List[tuple]:
+        """
+        Obtiene los rangos ocupados (citas no canceladas) de varios doctores en un rango de fechas.
+        :return: Lista de (ID_Doctor, Fecha, Hora_Inicio, Hora_Fin).
+        """
+        query = """
+            SELECT ID_Doctor, Fecha, Hora_Inicio, Hora_Fin
+            FROM Cita
+            WHERE Fecha >= %s AND Fecha < %s AND Estado <> 'Cancelada'
+        """
+        parametros = [fecha_desde, fecha_hasta + timedelta(days=1)]
+        if ids_doctor:
+            query += f" AND ID_Doctor IN ({', '.join(['%s'] * len(ids_doctor))})"
+            parametros.extend(ids_doctor)
+
+        try:
+            with conexion_bd() as conexion:
+                if not conexion:
+                    logger.warning("No se pudo establecer conexión con la base de datos.")
+                    return []
+
+                cursor = conexion.cursor()
+                cursor.execute(query, tuple(parametros))
+                return cursor.fetchall()
+
+        except Error as e:
+            logger.error("Error al obtener la ocupación de los doctores: %s", e)
             return []
-        
-        finally:
-            if cursor:
-                cursor.close()
-            if conexion and conexion.is_connected():
-                conexion.close()
     
+    @staticmethod
+    def _leer_para_resumen(cursor, id_cita: int) -> Optional[tuple]:
+        """(Fecha, ID_Doctor, ID_Tratamiento, Estado, Costo) de la cita, bloqueada hasta el commit"""
+        cursor.execute(
+            "SELECT Fecha, ID_Doctor, ID_Tratamiento, Estado, Costo FROM Cita WHERE ID_Cita = %s FOR UPDATE",
+            (id_cita,))
+        return cursor.fetchone()
+
     @staticmethod
     def actualizar_estado_bd(id_cita: int, nuevo_estado: str) -> bool:
         """
@@ -390,54 +532,54 @@ class Cita:
         :param nuevo_estado: Nuevo estado de la cita.
         :return: True si la actualización fue exitosa, False en caso contrario.
         """
-        conexion = None
-        cursor = None
 
         try:
-            conexion= conectar_bd()
-            if not conexion:
-                print("No se pudo establecer conexión con la base de datos.")
-                return False
-
-            cursor = conexion.cursor()
-
-            # Validar que el estado sea válido
-            estados_validos = ["Pendiente", "Confirmada", "Cancelada", "Asistida", "Ausente"]
-            if nuevo_estado not in estados_validos:
-                print(f"Estado inválido: {nuevo_estado}")
-                return False
-
-            # Query para actualizar el estado
-            query = """
-            UPDATE Cita 
-            SET Estado = %s 
-            WHERE ID_Cita = %s
-            """
-
-            cursor.execute(query, (nuevo_estado, id_cita))
-            conexion.commit()
-
-            # Verificar si se actualizó alguna fila
-            if cursor.rowcount > 0:
-                print(f"Estado de la cita {id_cita} actualizado a '{nuevo_estado}' exitosamente.")
-                return True
-            else:
-                print(f"No se encontró la cita con ID {id_cita}")
-                return False
+            with conexion_bd() as conexion:
+                if not conexion:
+                    logger.warning("No se pudo establecer conexión con la base de datos.")
+                    return False
+
+                cursor = conexion.cursor()
+
+                # Validar que el estado sea válido
+                estados_validos = ["Pendiente", "Confirmada", "Cancelada", "Asistida", "Ausente"]
+                if nuevo_estado not in estados_validos:
+                    logger.warning("Estado inválido: %s", nuevo_estado)
+                    return False
+
+                ResumenIngresos.asegurar_tablas(cursor)
+                conexion.start_transaction()
+                anterior = Cita._leer_para_resumen(cursor, id_cita)
+
+                # Query para actualizar el estado
+                query = """
+                UPDATE Cita 
+                SET Estado = %s 
+                WHERE ID_Cita = %s
+                """
+
+                cursor.execute(query, (nuevo_estado, id_cita))
+
+                # Verificar si se actualizó alguna fila
+                if cursor.rowcount > 0:
+                    # El monto pasa del estado anterior al nuevo en el resumen de ingresos
+                    fecha, id_doctor, id_tratamiento, estado, costo = anterior
+                    ResumenIngresos.registrar(cursor, [
+                        ResumenIngresos.movimiento_cita(fecha, id_doctor, id_tratamiento, estado, costo, signo=-1),
+                        ResumenIngresos.movimiento_cita(fecha, id_doctor, id_tratamiento, nuevo_estado, costo),
+                    ])
+                    conexion.commit()
+                    logger.debug("Estado de la cita %s actualizado a '%s' exitosamente.", id_cita, nuevo_estado)
+                    return True
+                else:
+                    conexion.rollback()
+                    logger.warning("No se encontró la cita con ID %s", id_cita)
+                    return False
 
         except Error as e:
-            print(f"Error al actualizar el estado de la cita: {e}")
-            if conexion:
-                conexion.rollback()
+            logger.error("Error al actualizar el estado de la cita: %s", e)
             return False
 
-        finally:
-            if cursor:
-                cursor.close()
-            if conexion and conexion.is_connected():
-                conexion.close()
-                print("Conexión a la base de datos cerrada.")
-            
     @staticmethod
     def actualizar_cita_bd(cita: 'Cita') -> bool:
         """
@@ -445,69 +587,66 @@ class Cita:
         :param cita: Instancia de la clase Cita con los datos actualizados.
         :return: True si la actualización fue exitosa, False en caso contrario.
         """
-        conexion = None
-        cursor = None
 
         try:
-            conexion = conectar_bd()
-            if not conexion:
-                print("No se pudo establecer conexión con la base de datos.")
-                return False
-
-            cursor = conexion.cursor()
-
-            # Obtener ID de tratamiento si existe
-            id_tratamiento = None
-            if hasattr(cita, 'tratamiento') and cita.tratamiento:
-                id_tratamiento = cita.tratamiento.id_tratamiento
-
-            # Query para actualizar todos los campos de la cita
-            query = """
-            UPDATE Cita 
-            SET ID_Paciente = %s, 
-                ID_Doctor = %s, 
-                ID_Tratamiento = %s, 
-                Fecha = %s, 
-                Hora_Inicio = %s, 
-                Hora_Fin = %s, 
-                Estado = %s, 
-                Costo = %s 
-            WHERE ID_Cita = %s
-            """
-
-            cursor.execute(query, (
-                cita.paciente.id_paciente,
-                cita.doctor.id_doctor,
-                id_tratamiento,
-                cita.fecha,
-                cita.hora_inicio.strftime('%H:%M:%S'),
-                cita.hora_fin.strftime('%H:%M:%S'),
-                cita.estado,
-                cita.costo_cita,
-                cita.id_cita
-            ))
-
-            conexion.commit()
-
-            # Verificar si se actualizó alguna fila
-            if cursor.rowcount > 0:
-                print(f"Cita {cita.id_cita} actualizada exitosamente en la base de datos.")
-                return True
-            else:
-                print(f"No se encontró la cita con ID {cita.id_cita}")
-                return False
+            with conexion_bd() as conexion:
+                if not conexion:
+                    logger.warning("No se pudo establecer conexión con la base de datos.")
+                    return False
+
+                cursor = conexion.cursor()
+
+                # Obtener ID de tratamiento si existe
+                id_tratamiento = None
+                if hasattr(cita, 'tratamiento') and cita.tratamiento:
+                    id_tratamiento = cita.tratamiento.id_tratamiento
+
+                ResumenIngresos.asegurar_tablas(cursor)
+                conexion.start_transaction()
+                anterior = Cita._leer_para_resumen(cursor, cita.id_cita)
+
+                # Query para actualizar todos los campos de la cita
+                query = """
+                UPDATE Cita 
+                SET ID_Paciente = %s, 
+                    ID_Doctor = %s, 
+                    ID_Tratamiento = %s, 
+                    Fecha = %s, 
+                    Hora_Inicio = %s, 
+                    Hora_Fin = %s, 
+                    Estado = %s, 
+                    Costo = %s 
+                WHERE ID_Cita = %s
+                """
+
+                cursor.execute(query, (
+                    cita.paciente.id_paciente,
+                    cita.doctor.id_doctor,
+                    id_tratamiento,
+                    cita.fecha,
+                    cita.hora_inicio.strftime('%H:%M:%S'),
+                    cita.hora_fin.strftime('%H:%M:%S'),
+                    cita.estado,
+                    cita.costo_cita,
+                    cita.id_cita
+                ))
+
+                # Verificar si se actualizó alguna fila
+                if cursor.rowcount > 0:
+                    # Se descuenta la versión anterior de la cita y se suma la nueva
+                    ResumenIngresos.registrar(cursor, [
+                        ResumenIngresos.movimiento_cita(*anterior, signo=-1),
+                        ResumenIngresos.movimiento_cita(cita.fecha, cita.doctor.id_doctor, id_tratamiento,
+                                                        cita.estado, cita.costo_cita),
+                    ])
+                    conexion.commit()
+                    logger.debug("Cita %s actualizada exitosamente en la base de datos.", cita.id_cita)
+                    return True
+                else:
+                    conexion.rollback()
+                    logger.warning("No se encontró la cita con ID %s", cita.id_cita)
+                    return False
 
         except Error as e:
-            print(f"Error al actualizar la cita: {e}")
-            if conexion:
-                conexion.rollback()
+            logger.error("Error al actualizar la cita: %s", e)
             return False
-
-        finally:
-            if cursor:
-                cursor.close()
-            if conexion and conexion.is_connected():
-                conexion.close()
-                print("Conexión a la base de datos cerrada.")
-
-
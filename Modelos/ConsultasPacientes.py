@@ -0,0 +1,203 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from datetime import date
+from typing import List, Optional
+
+from Config.database_config import conexion_bd, Error
+from Config.logging_config import obtener_logger
+
+try:
+    from .PacienteModelo import Paciente
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from PacienteModelo import Paciente
+
+logger = obtener_logger('Modelos.ConsultasPacientes')
+
+EDAD_MAYORIA = 18
+
+# Saldo pendiente por paciente: suma de sus facturas con pago pendiente.
+# Se resuelve con idx_factura_estado_paciente (Estado_Pago, ID_Paciente, Monto_Total)
+# sin leer la tabla Factura.
+_SALDOS_PENDIENTES = """
+    SELECT ID_Paciente, SUM(Monto_Total) AS Saldo
+    FROM Factura
+    WHERE Estado_Pago = 'Pendiente'
+    GROUP BY ID_Paciente
+"""
+
+_COLUMNAS_PACIENTE = "p.ID_Paciente, p.Nombre, p.Apellido, p.Fecha_Nacimiento, p.DUI, p.Telefono, p.Correo"
+
+
+def fecha_limite_menores(hoy: date = None) -> date:
+    """
+    Fecha de nacimiento a partir de la cual (sin incluirla) el paciente es menor de edad.
+    Comparar Fecha_Nacimiento > límite puede usar el índice; TIMESTAMPDIFF(...) < 18 no.
+    """
+    hoy = hoy or date.today()
+    try:
+        return hoy.replace(year=hoy.year - EDAD_MAYORIA)
+    except ValueError:
+        # 29 de febrero en un año no bisiesto
+        return hoy.replace(year=hoy.year - EDAD_MAYORIA, day=28)
+
+
+# ==========================================
+# CLASE: ConsultasPacientes
+# PROPÓSITO: Filtros, ordenamientos y totales de pacientes resueltos en SQL,
+# devolviendo solo las filas o números que se piden (no hace falta tener
+# toda la tabla cargada en memoria)
+# ==========================================
+
+class ConsultasPacientes:
+    """
+    Todas las consultas devuelven None si no hay conexión o la BD falla, para que
+    el controlador pueda distinguirlo de "no hay resultados" ([] o ceros).
+    """
+
+    @staticmethod
+    def obtener_resumen() -> Optional[dict]:
+        """Totales del tablero de pacientes en una sola consulta"""
+        try:
+            with conexion_bd() as conexion:
+                if not conexion:
+                    logger.warning("⚠️ No se pudo conectar a la base de datos")
+                    return None
+                cursor = conexion.cursor()
+                cursor.execute(f"""
+                    SELECT
+                        (SELECT COUNT(*) FROM Paciente),
+                        (SELECT COUNT(*) FROM Paciente WHERE Fecha_Nacimiento > %s),
+                        (SELECT COUNT(*) FROM ({_SALDOS_PENDIENTES}) s WHERE s.Saldo > 0),
+                        (SELECT COALESCE(SUM(Monto_Total), 0) FROM Factura WHERE Estado_Pago = 'Pendiente'),
+                        (SELECT COALESCE(SUM(Monto_Total), 0) FROM Factura)
+                """, (fecha_limite_menores(),))
+                total, menores, con_saldo, saldo_total, ingresos = cursor.fetchone()
+
+        except Error as e:
+            logger.error("❌ Error al obtener el resumen de pacientes: %s", e)
+            return None
+
+        saldo_total = float(saldo_total or 0)
+        return {
+            'total_pacientes': total or 0,
+            'pacientes_con_saldo_pendiente': con_saldo or 0,
+            'pacientes_menores_edad': menores or 0,
+            'saldo_total_pendiente': saldo_total,
+            'ingresos_totales': float(ingresos or 0),
+            'promedio_saldo_por_paciente': saldo_total / total if total else 0,
+        }
+
+    @staticmethod
+    def pacientes_con_saldo_pendiente(limite: int = None) -> Optional[List[Paciente]]:
+        """Pacientes con facturas pendientes, del saldo más alto al más bajo"""
+        query = f"""
+            SELECT {_COLUMNAS_PACIENTE}, s.Saldo
+            FROM ({_SALDOS_PENDIENTES}) s
+            INNER JOIN Paciente p ON p.ID_Paciente = s.ID_Paciente
+            WHERE s.Saldo > 0
+            ORDER BY s.Saldo DESC, p.ID_Paciente
+        """
+        return ConsultasPacientes._consultar_pacientes(query, (), limite)
+
+    @staticmethod
+    def saldo_pendiente(id_paciente: int) -> Optional[float]:
+        """Saldo pendiente de un paciente (_SALDOS_PENDIENTES filtrado a su ID), o None si falla"""
+        try:
+            with conexion_bd() as conexion:
+                if not conexion:
+                    logger.warning("⚠️ No se pudo conectar a la base de datos")
+                    return None
+                cursor = conexion.cursor()
+                cursor.execute("""
+                    SELECT COALESCE(SUM(Monto_Total), 0)
+                    FROM Factura
+                    WHERE Estado_Pago = 'Pendiente' AND ID_Paciente = %s
+                """, (id_paciente,))
+                return float(cursor.fetchone()[0] or 0)
+
+        except Error as e:
+            logger.error("❌ Error al obtener el saldo del paciente %s: %s", id_paciente, e)
+            return None
+
+    @staticmethod
+    def pacientes_menores_edad(limite: int = None) -> Optional[List[Paciente]]:
+        """Pacientes menores de edad ordenados por apellido y nombre"""
+        query = f"""
+            SELECT {_COLUMNAS_PACIENTE}, COALESCE(s.Saldo, 0)
+            FROM Paciente p
+            LEFT JOIN ({_SALDOS_PENDIENTES}) s ON s.ID_Paciente = p.ID_Paciente
+            WHERE p.Fecha_Nacimiento > %s
+            ORDER BY p.Apellido, p.Nombre, p.ID_Paciente
+        """
+        return ConsultasPacientes._consultar_pacientes(query, (fecha_limite_menores(),), limite)
+
+    @staticmethod
+    def pacientes_ordenados_por_nombre(limite: int = None) -> Optional[List[Paciente]]:
+        """Pacientes ordenados por apellido y nombre (recorre idx_paciente_apellido_nombre)"""
+        query = f"""
+            SELECT {_COLUMNAS_PACIENTE}, COALESCE(s.Saldo, 0)
+            FROM Paciente p
+            LEFT JOIN ({_SALDOS_PENDIENTES}) s ON s.ID_Paciente = p.ID_Paciente
+            ORDER BY p.Apellido, p.Nombre, p.ID_Paciente
+        """
+        return ConsultasPacientes._consultar_pacientes(query, (), limite)
+
+    @staticmethod
+    def pacientes_ordenados_por_saldo(descendente: bool = True, limite: int = None) -> Optional[List[Paciente]]:
+        """Pacientes ordenados por saldo pendiente (los que no deben nada cuentan como 0)"""
+        direccion = "DESC" if descendente else "ASC"
+        query = f"""
+            SELECT {_COLUMNAS_PACIENTE}, COALESCE(s.Saldo, 0) AS Saldo
+            FROM Paciente p
+            LEFT JOIN ({_SALDOS_PENDIENTES}) s ON s.ID_Paciente = p.ID_Paciente
+            ORDER BY Saldo {direccion}, p.ID_Paciente
+        """
+        return ConsultasPacientes._consultar_pacientes(query, (), limite)
+
+    # ---------- Auxiliares ----------
+
+    @staticmethod
+    def _consultar_pacientes(query: str, parametros: tuple, limite: int = None) -> Optional[List[Paciente]]:
+        if limite:
+            query += " LIMIT %s"
+            parametros = parametros + (int(limite),)
+        try:
+            with conexion_bd() as conexion:
+                if not conexion:
+                    logger.warning("⚠️ No se pudo conectar a la base de datos")
+                    return None
+                cursor = conexion.cursor()
+                cursor.execute(query, parametros)
+                filas = cursor.fetchall()
+
+        except Error as e:
+            logger.error("❌ Error al consultar pacientes: %s", e)
+            return None
+
+        pacientes = []
+        for fila in filas:
+            try:
+                pacientes.append(ConsultasPacientes._paciente_desde_fila(fila))
+            except Exception as e:
+                logger.error("⚠️ Error al procesar paciente %s: %s", fila, e)
+        return pacientes
+
+    @staticmethod
+    def _paciente_desde_fila(fila) -> Paciente:
+        id_paciente, nombre, apellido, fecha_nac, dui, telefono, correo, saldo = fila
+        return Paciente(
+            nombre=nombre,
+            apellido=apellido,
+            fecha_nacimiento=fecha_nac,
+            telefono=int(telefono) if telefono and str(telefono).isdigit() else 0,
+            correo=correo or "",
+            dui=dui or "",
+            saldo_pendiente=float(saldo or 0),
+            id_paciente=id_paciente
+        )
+
+
+__all__ = ['ConsultasPacientes', 'fecha_limite_menores']
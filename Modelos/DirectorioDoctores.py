@@ -0,0 +1,79 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from typing import Callable, Dict, List, Optional
+
+from Config.logging_config import obtener_logger
+
+try:
+    from .DoctorModelo import Doctor
+    from .CacheReferencia import obtener_cache_referencia
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from DoctorModelo import Doctor
+    from CacheReferencia import obtener_cache_referencia
+
+logger = obtener_logger('Modelos.DirectorioDoctores')
+
+# ==========================================
+# CLASE: DirectorioDoctores
+# PROPÓSITO: Tener a mano la lista de doctores y buscarlos por número de
+# junta médica sin consultar la BD en cada acción de la ventana
+# ==========================================
+
+class DirectorioDoctores:
+    """
+    Caché de doctores indexada por número de junta médica.
+
+    La lista sale de la caché de referencia y el índice se reconstruye solo
+    cuando cambia la versión de 'Doctor' (cualquier escritura de doctores en
+    el proceso) o cuando se llama a invalidar().
+    """
+
+    def __init__(self, cargar: Callable[[], List[Doctor]] = None):
+        self._cargar = cargar or Doctor.obtener_doctores_desde_db
+        self._doctores: Optional[List[Doctor]] = None
+        self._por_numero: Dict[str, Doctor] = {}
+        self._version = None
+
+    @staticmethod
+    def _clave(num_junta_medica) -> str:
+        # Los números llegan como int desde la BD y como texto desde los diálogos
+        return str(num_junta_medica).strip()
+
+    def _asegurar_cargado(self):
+        version = obtener_cache_referencia().version('Doctor')
+        if self._doctores is not None and version == self._version:
+            return
+        self._version = version
+        doctores = self._cargar() or []
+        self._doctores = list(doctores)
+        self._por_numero = {self._clave(doctor.num_junta_medica): doctor for doctor in self._doctores}
+        logger.debug("📇 Directorio de doctores cargado: %s doctores", len(self._doctores))
+
+    def todos(self) -> List[Doctor]:
+        """Todos los doctores, en el orden en que los devolvió la BD"""
+        self._asegurar_cargado()
+        return list(self._doctores)
+
+    def obtener(self, num_junta_medica) -> Optional[Doctor]:
+        """Doctor con ese número de junta médica, o None si no existe"""
+        self._asegurar_cargado()
+        return self._por_numero.get(self._clave(num_junta_medica))
+
+    def invalidar(self):
+        """Descarta la lista (también en la caché); la siguiente consulta vuelve a leer la BD"""
+        obtener_cache_referencia().invalidar('Doctor')
+        self._doctores = None
+        self._por_numero = {}
+
+    def __contains__(self, num_junta_medica) -> bool:
+        return self.obtener(num_junta_medica) is not None
+
+    def __len__(self) -> int:
+        self._asegurar_cargado()
+        return len(self._doctores)
+
+
+__all__ = ['DirectorioDoctores']
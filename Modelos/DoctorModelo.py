@@ -3,9 +3,18 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 # Importar configuración centralizada
-from Config.database_config import obtener_conexion, conectar_bd, cerrar_conexion_segura
-import mysql.connector  # Mantener para manejo de errores específicos
-from mysql.connector import Error
+from Config.database_config import obtener_conexion, conectar_bd, conexion_bd, cerrar_conexion_segura, Error
+from Config.logging_config import obtener_logger
+
+try:
+    from .AgendaDoctor import AgendaDoctor
+    from .CacheReferencia import obtener_cache_referencia
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from AgendaDoctor import AgendaDoctor
+    from CacheReferencia import obtener_cache_referencia
+
+logger = obtener_logger('Modelos.DoctorModelo')
 
 class Doctor:
     # # Datos hardcodeados como respaldo cuando falle la conexión
@@ -132,35 +141,47 @@ class Doctor:
         """
         return obtener_conexion()
 
+    @staticmethod
+    def _leer_doctores_bd():
+        """
+        Lee la tabla Doctor completa. Es la función de carga de la caché de referencia:
+        devuelve None si no hay conexión y deja pasar los errores de MySQL.
+        """
+        with conexion_bd() as conexion:
+            if not conexion:
+                logger.error("❌ No se pudo establecer conexión a la base de datos.")
+                return None
+            cursor = conexion.cursor()
+            cursor.execute("SELECT ID_Doctor, Nombre, Apellido, Especialidad, Telefono, Correo FROM Doctor")
+            resultados = cursor.fetchall()
+
+        doctores = []
+        for row in resultados:
+            doctor = Doctor(
+                nombre=row[1] if row[1] else "Sin nombre",
+                apellido=row[2] if row[2] else "Sin apellido",
+                num_junta_medica=row[0],  # Usar ID_Doctor como num_junta_medica
+                especialidad=row[3] if row[3] else "General",
+                telefono=row[4] if row[4] else 0,
+                correo=row[5] if row[5] else ""
+            )
+            doctor.id_doctor = row[0]  # Asignar ID de la BD
+            doctores.append(doctor)
+        logger.debug("Doctores leídos de la BD: %s", len(doctores))
+        return doctores
+
     @staticmethod
     def obtener_doctores_desde_db():
-        """Obtiene todos los doctores de la base de datos y los devuelve como una lista de objetos Doctor."""
+        """Obtiene todos los doctores (desde la caché de referencia o la BD) como una lista de objetos Doctor."""
         try:
-            conexion = Doctor.conectar_db()
-            cursor = conexion.cursor(dictionary=True)
-            query = """
-            SELECT ID_Doctor, Nombre, Apellido, Especialidad, Telefono, Correo 
-            FROM doctor 
-            """
-            cursor.execute(query)
-            doctores = []
-            for row in cursor.fetchall():
-                print(f"Fila obtenida: {row}")  # Debug
-                doctor = Doctor(
-                    nombre=row['Nombre'],
-                    apellido=row['Apellido'],
-                    num_junta_medica=row['ID_Doctor'],
-                    especialidad=row['Especialidad'],
-                    telefono=row['Telefono'],
-                    correo=row['Correo']
-                )
-                doctores.append(doctor)
-            cursor.close()
-            conexion.close()
-            return doctores
+            doctores = obtener_cache_referencia().obtener('Doctor', 'todos', Doctor._leer_doctores_bd)
+            if doctores is None:
+                raise Error("No se pudo establecer conexión a la base de datos")
+            # Copia de la lista: quien la reciba puede agregar o quitar sin tocar la caché
+            return list(doctores)
         except Exception as e:
-            print(f"Error en obtener_doctores_desde_db: {e}")
-            print("Usando datos hardcodeados como respaldo...")
+            logger.error("Error en obtener_doctores_desde_db: %s", e)
+            logger.warning("Usando datos hardcodeados como respaldo...")
             # Usar datos hardcodeados como respaldo
             doctores = []
             for doctor_data in Doctor.DOCTORES_HARDCODE:
@@ -182,78 +203,43 @@ class Doctor:
         Args: doctor (Doctor): El objeto Doctor a insertar.
         Returns: bool: True si la inserción fue exitosa, False en caso contrario."""
         try:
-            conexion = Doctor.conectar_db()
-            cursor = conexion.cursor()
-            query = """
-            INSERT INTO doctor (ID_Doctor, Nombre, Apellido, Especialidad, Telefono, Correo) 
-            VALUES (%s, %s, %s, %s, %s, %s)
-            """
-            values = (
-                int(doctor.num_junta_medica),
-                doctor.nombre,
-                doctor.apellido,
-                doctor.especialidad,
-                doctor.telefono,
-                doctor.correo
-            )
-            print(f"Insertando doctor: {values}")  # Debug
-            cursor.execute(query, values)
-            conexion.commit()
-            cursor.close()
-            conexion.close()
-            print("Doctor insertado correctamente.")
-            return True
+            with conexion_bd() as conexion:
+                cursor = conexion.cursor()
+                query = """
+                INSERT INTO doctor (ID_Doctor, Nombre, Apellido, Especialidad, Telefono, Correo) 
+                VALUES (%s, %s, %s, %s, %s, %s)
+                """
+                values = (
+                    int(doctor.num_junta_medica),
+                    doctor.nombre,
+                    doctor.apellido,
+                    doctor.especialidad,
+                    doctor.telefono,
+                    doctor.correo
+                )
+                logger.debug("Insertando doctor: %s", values)  # Debug
+                cursor.execute(query, values)
+                conexion.commit()
+                obtener_cache_referencia().invalidar('Doctor')
+                logger.debug("Doctor insertado correctamente.")
+                return True
         
         except Exception as e:
-            print(f"Error en insert_doc_db: {e}")
+            logger.error("Error en insert_doc_db: %s", e)
             return False
-        
-        finally:
-            # Cerrar cursor y conexión para liberar recursos
-            if 'cursor' in locals():
-                cursor.close()
-            if 'conexion' in locals():
-                conexion.close()
 
     @staticmethod
     def obtener_todos_doctores():
-        """Obtiene todos los doctores de la base de datos"""
-        conexion = None
-        cursor = None
-        doctores = []
-        
+        """Obtiene todos los doctores (desde la caché de referencia o la BD)"""
         try:
-            conexion = obtener_conexion()
-            if not conexion:
-                print("❌ No se pudo establecer conexión a la base de datos.")
+            doctores = obtener_cache_referencia().obtener('Doctor', 'todos', Doctor._leer_doctores_bd)
+            if doctores is None:
                 return []
-            
-            cursor = conexion.cursor()
-            query = "SELECT ID_Doctor, Nombre, Apellido, Especialidad, Telefono, Correo FROM Doctor"
-            cursor.execute(query)
-            
-            resultados = cursor.fetchall()
-            
-            for row in resultados:
-                doctor = Doctor(
-                    nombre=row[1] if row[1] else "Sin nombre",
-                    apellido=row[2] if row[2] else "Sin apellido",
-                    num_junta_medica=row[0],  # Usar ID_Doctor como num_junta_medica
-                    especialidad=row[3] if row[3] else "General",
-                    telefono=row[4] if row[4] else 0,
-                    correo=row[5] if row[5] else ""
-                )
-            
-                doctor.id_doctor = row[0]  # Asignar ID de la BD
-                doctores.append(doctor)
-                print(f"Doctor agregado: {doctor.nombre} {doctor.apellido}")  # Debug
-            
-                
-            return doctores
+            return list(doctores)
             
         except Error as e:
-            print(f"Error al obtener doctores: {e}")
-            print("Usando datos hardcodeados como respaldo...")
+            logger.error("Error al obtener doctores: %s", e)
+            logger.warning("Usando datos hardcodeados como respaldo...")
             # Usar datos hardcodeados como respaldo
             doctores = []
             for doctor_data in Doctor.DOCTORES_HARDCODE:
@@ -267,151 +253,35 @@ class Doctor:
                 )
                 doctor.id_doctor = doctor_data['ID_Doctor']
                 doctores.append(doctor)
-                print(f"Doctor hardcodeado agregado: {doctor.nombre} {doctor.apellido}")
+                logger.debug("Doctor hardcodeado agregado: %s %s", doctor.nombre, doctor.apellido)
             return doctores
-            
-        finally:
-            if cursor:
-                cursor.close()
-            if conexion and conexion.is_connected():
-                conexion.close()
 
     @staticmethod
-    def obtener_citas_por_doctor(num_junta_medica: int):
+    def obtener_citas_por_doctor(num_junta_medica: int, fecha_desde=None, fecha_hasta=None,
+                                 limite: int = None):
         """
-        Obtiene todas las citas de un doctor específico usando su número de junta médica.
+        Obtiene las citas de un doctor (de la más reciente a la más antigua) usando su número de junta médica.
         SOLO desde la base de datos - SIN datos hardcodeados.
         :param num_junta_medica: Número de junta médica del doctor (que es el ID_Doctor en la BD)
+        :param fecha_desde: Solo citas desde esta fecha (inclusive).
+        :param fecha_hasta: Solo citas hasta esta fecha (inclusive).
+        :param limite: Número máximo de citas; sin límite devuelve todas.
         :return: Lista de citas del doctor o lista vacía si no hay citas
         """
-        conexion = None
-        cursor = None
+        if limite:
+            pagina = AgendaDoctor.obtener_pagina(num_junta_medica, fecha_desde, fecha_hasta, limite=limite)
+            return pagina.citas if pagina else []
+
         citas = []
-        
-        try:
-            conexion = obtener_conexion()
-            if not conexion:
-                print("❌ No se pudo establecer conexión a la base de datos.")
-                return []
-            
-            cursor = conexion.cursor()
-            
-            # DEBUGGING: Verificar que el doctor existe en la BD
-            print(f"🔍 Verificando si existe doctor con ID_Doctor = {num_junta_medica}")
-            cursor.execute("SELECT COUNT(*), Nombre, Apellido FROM Doctor WHERE ID_Doctor = %s", (num_junta_medica,))
-            resultado = cursor.fetchone()
-            
-            print(f"🔍 Resultado de verificación: {resultado}")
-            
-            if not resultado or resultado[0] == 0:
-                print(f"⚠️ Doctor con ID {num_junta_medica} NO encontrado en la base de datos")
+        despues_de = None
+        while True:
+            pagina = AgendaDoctor.obtener_pagina(num_junta_medica, fecha_desde, fecha_hasta, despues_de)
+            if pagina is None:
                 return []
-            
-            doctor_nombre = f"{resultado[1]} {resultado[2]}"
-            print(f"✅ Doctor {doctor_nombre} (ID: {num_junta_medica}) encontrado en BD")
-            
-            # Verificar si hay citas para este doctor
-            print(f"🔍 Buscando citas para doctor ID {num_junta_medica}...")
-            cursor.execute("SELECT COUNT(*) FROM Cita WHERE ID_Doctor = %s", (num_junta_medica,))
-            total_citas = cursor.fetchone()[0]
-            print(f"📊 Total de citas encontradas para este doctor: {total_citas}")
-            
-            if total_citas == 0:
-                print("ℹ️ El doctor no tiene citas registradas")
-                return []
-            
-            # Query para obtener las citas del doctor
-            query = """
-            SELECT 
-                c.ID_Cita,
-                c.Fecha,
-                c.Hora_Inicio,
-                c.Hora_Fin,
-                c.Estado,
-                c.Costo,
-                p.Nombre AS paciente_nombre,
-                p.Apellido AS paciente_apellido,
-                p.DUI,
-                p.Telefono AS paciente_telefono,
-                COALESCE(t.Descripcion, 'Sin tratamiento específico') AS tratamiento_descripcion,
-                COALESCE(t.Costo, 0) AS tratamiento_costo
-            FROM Cita c
-            INNER JOIN Doctor d ON c.ID_Doctor = d.ID_Doctor
-            INNER JOIN Paciente p ON c.ID_Paciente = p.ID_Paciente
-            LEFT JOIN Tratamiento t ON c.ID_Tratamiento = t.ID_Tratamiento
-            WHERE c.ID_Doctor = %s
-            ORDER BY c.Fecha DESC, c.Hora_Inicio DESC
-            """
-            
-            cursor.execute(query, (num_junta_medica,))
-            resultados = cursor.fetchall()
-            
-            print(f"🔍 Query ejecutada, filas devueltas: {len(resultados)}")
-            
-            for row in resultados:
-                (id_cita, fecha, hora_inicio, hora_fin, estado, costo,
-                paciente_nombre, paciente_apellido, dui, paciente_telefono,
-                tratamiento_descripcion, tratamiento_costo) = row
-                
-                # Formatear las horas
-                from datetime import time as datetime_time, timedelta
-                
-                if isinstance(hora_inicio, timedelta):
-                    total_seconds = int(hora_inicio.total_seconds())
-                    hours = total_seconds // 3600
-                    minutes = (total_seconds % 3600) // 60
-                    hora_inicio_str = f"{hours:02d}:{minutes:02d}"
-                elif isinstance(hora_inicio, datetime_time):
-                    hora_inicio_str = hora_inicio.strftime('%H:%M')
-                else:
-                    hora_inicio_str = str(hora_inicio)
-                
-                if isinstance(hora_fin, timedelta):
-                    total_seconds = int(hora_fin.total_seconds())
-                    hours = total_seconds // 3600
-                    minutes = (total_seconds % 3600) // 60
-                    hora_fin_str = f"{hours:02d}:{minutes:02d}"
-                elif isinstance(hora_fin, datetime_time):
-                    hora_fin_str = hora_fin.strftime('%H:%M')
-                else:
-                    hora_fin_str = str(hora_fin)
-                
-                # Crear diccionario con información de la cita
-                cita_info = {
-                    'id_cita': id_cita,
-                    'fecha': fecha,
-                    'hora_inicio': hora_inicio_str,
-                    'hora_fin': hora_fin_str,
-                    'estado': estado or "Pendiente",
-                    'costo': f"${costo:.2f}" if costo else "$0.00",
-                    'paciente_nombre': paciente_nombre or "Sin nombre",
-                    'paciente_apellido': paciente_apellido or "Sin apellido",
-                    'paciente_dui': dui or "Sin DUI",
-                    'paciente_telefono': paciente_telefono or "Sin teléfono",
-                    'tratamiento_descripcion': tratamiento_descripcion or "Sin tratamiento",
-                    'tratamiento_costo': f"${tratamiento_costo:.2f}" if tratamiento_costo else "$0.00"
-                }
-                
-                citas.append(cita_info)
-                print(f"✅ Cita procesada: ID {id_cita}, Paciente: {paciente_nombre} {paciente_apellido}")
-            
-            print(f"🎯 Retornando {len(citas)} citas procesadas")
-            return citas
-            
-        except Error as e:
-            print(f"❌ Error SQL al obtener citas del doctor: {e}")
-            return []
-            
-        except Exception as e:
-            print(f"❌ Error general al obtener citas del doctor: {e}")
-            return []
-            
-        finally:
-            if cursor:
-                cursor.close()
-            if conexion and conexion.is_connected():
-                conexion.close()
-
+            citas.extend(pagina.citas)
+            despues_de = pagina.clave_siguiente
+            if despues_de is None:
+                return citas
 
     # @staticmethod
     # def debug_estructura_bd():
@@ -497,48 +367,39 @@ class Doctor:
         :param id_doctor: ID del doctor a eliminar
         :return: True si se eliminó correctamente, False en caso contrario
         """
-        conexion = None
-        cursor = None
         
         try:
-            conexion = obtener_conexion()
-            if not conexion:
-                print("❌ No se pudo establecer conexión a la base de datos.")
-                return False
-            
-            cursor = conexion.cursor()
-            
-            # Verificar que el doctor existe antes de eliminar
-            cursor.execute("SELECT COUNT(*) FROM Doctor WHERE ID_Doctor = %s", (id_doctor,))
-            existe = cursor.fetchone()[0]
-            
-            if existe == 0:
-                print(f"⚠️ Doctor con ID {id_doctor} no encontrado")
-                return False
-            
-            # Eliminar el doctor
-            cursor.execute("DELETE FROM Doctor WHERE ID_Doctor = %s", (id_doctor,))
-            conexion.commit()
-            
-            # Verificar que se eliminó
-            if cursor.rowcount > 0:
-                print(f"✅ Doctor con ID {id_doctor} eliminado exitosamente")
-                return True
-            else:
-                print(f"❌ No se pudo eliminar el doctor con ID {id_doctor}")
-                return False
+            with conexion_bd() as conexion:
+                if not conexion:
+                    logger.error("❌ No se pudo establecer conexión a la base de datos.")
+                    return False
+            
+                cursor = conexion.cursor()
+            
+                # Verificar que el doctor existe antes de eliminar
+                cursor.execute("SELECT COUNT(*) FROM Doctor WHERE ID_Doctor = %s", (id_doctor,))
+                existe = cursor.fetchone()[0]
+            
+                if existe == 0:
+                    logger.warning("⚠️ Doctor con ID %s no encontrado", id_doctor)
+                    return False
+            
+                # Eliminar el doctor
+                cursor.execute("DELETE FROM Doctor WHERE ID_Doctor = %s", (id_doctor,))
+                conexion.commit()
+                obtener_cache_referencia().invalidar('Doctor')
+            
+                # Verificar que se eliminó
+                if cursor.rowcount > 0:
+                    logger.debug("✅ Doctor con ID %s eliminado exitosamente", id_doctor)
+                    return True
+                else:
+                    logger.error("❌ No se pudo eliminar el doctor con ID %s", id_doctor)
+                    return False
                 
         except Error as e:
-            print(f"❌ Error al eliminar doctor: {e}")
-            if conexion:
-                conexion.rollback()
+            logger.error("❌ Error al eliminar doctor: %s", e)
             return False
-            
-        finally:
-            if cursor:
-                cursor.close()
-            if conexion and conexion.is_connected():
-                conexion.close()
 
     @staticmethod
     def actualizar_doctor_bd(doctor: 'Doctor') -> bool:
@@ -547,59 +408,54 @@ class Doctor:
         :param doctor: Objeto Doctor con los datos actualizados
         :return: True si se actualizó correctamente, False en caso contrario
         """
-        conexion = None
-        cursor = None
         
         try:
-            conexion = obtener_conexion()
-            if not conexion:
-                print("❌ No se pudo establecer conexión a la base de datos.")
-                return False
-            
-            cursor = conexion.cursor()
-            
-            # Verificar que el doctor existe antes de actualizar
-            cursor.execute("SELECT COUNT(*) FROM Doctor WHERE ID_Doctor = %s", (doctor.num_junta_medica,))
-            existe = cursor.fetchone()[0]
-            
-            if existe == 0:
-                print(f"⚠️ Doctor con ID {doctor.num_junta_medica} no encontrado")
-                return False
-            
-            # Actualizar el doctor
-            query = """
-            UPDATE Doctor 
-            SET Nombre = %s, Apellido = %s, Especialidad = %s, Telefono = %s, Correo = %s
-            WHERE ID_Doctor = %s
-            """
-            
-            cursor.execute(query, (
-                doctor.nombre,
-                doctor.apellido,
-                doctor.especialidad,
-                doctor.telefono,
-                doctor.correo,
-                doctor.num_junta_medica
-            ))
-            
-            conexion.commit()
-            
-            # Verificar que se actualizó
-            if cursor.rowcount > 0:
-                print(f"✅ Doctor con ID {doctor.num_junta_medica} actualizado exitosamente")
-                return True
-            else:
-                print(f"❌ No se pudo actualizar el doctor con ID {doctor.num_junta_medica}")
-                return False
+            with conexion_bd() as conexion:
+                if not conexion:
+                    logger.error("❌ No se pudo establecer conexión a la base de datos.")
+                    return False
+            
+                cursor = conexion.cursor()
+            
+                # Verificar que el doctor existe antes de actualizar
+                cursor.execute("SELECT COUNT(*) FROM Doctor WHERE ID_Doctor = %s", (doctor.num_junta_medica,))
+                existe = cursor.fetchone()[0]
+            
+                if existe == 0:
+                    logger.warning("⚠️ Doctor con ID %s no encontrado", doctor.num_junta_medica)
+                    return False
+            
+                # Actualizar el doctor
+                query = """
+                UPDATE Doctor 
+                SET Nombre = %s, Apellido = %s, Especialidad = %s, Telefono = %s, Correo = %s
+                WHERE ID_Doctor = %s
+                """
+            
+                cursor.execute(query, (
+                    doctor.nombre,
+                    doctor.apellido,
+                    doctor.especialidad,
+                    doctor.telefono,
+                    doctor.correo,
+                    doctor.num_junta_medica
+                ))
+            
+                conexion.commit()
+            
+                # Verificar que se actualizó
+                if cursor.rowcount > 0:
+                    logger.debug("✅ Doctor con ID %s actualizado exitosamente", doctor.num_junta_medica)
+                    return True
+                else:
+                    logger.error("❌ No se pudo actualizar el doctor con ID %s", doctor.num_junta_medica)
+                    return False
             
         except Error as e:
-            print(f"❌ Error al actualizar doctor: {e}")
-            if conexion:
-                conexion.rollback()
+            logger.error("❌ Error al actualizar doctor: %s", e)
             return False
-        
+
         finally:
-            if cursor:
-                cursor.close()
-            if conexion and conexion.is_connected():
-                conexion.close()
+            # También si falló: el controlador modifica el objeto (que puede ser el de
+            # la caché) antes de guardarlo, así que la copia en memoria ya no es confiable
+            obtener_cache_referencia().invalidar('Doctor')
@@ -0,0 +1,231 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import csv
+import json
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Callable, NamedTuple, Optional, Tuple
+
+from Config.database_config import conexion_bd, Error
+from Config.logging_config import obtener_logger
+
+logger = obtener_logger('Modelos.ExportacionDatos')
+
+# Filas que se piden al servidor en cada fetchmany (y que se escriben juntas)
+TAMANO_LOTE = 2000
+
+FORMATOS = ('csv', 'jsonl')
+
+
+class ConsultaExportacion(NamedTuple):
+    """Qué se exporta de cada entidad y por qué columna se filtra la fecha"""
+    sql: str
+    columna_fecha: Optional[str]
+    orden: str
+
+
+# Los JOIN traen los nombres para que el archivo se entienda sin la BD.
+# El filtro de fechas y el ORDER BY van por Fecha_Emision / Fecha, que tienen
+# índice (idx_factura_fecha, idx_cita_fecha_hora); Paciente no tiene fecha de alta.
+CONSULTAS = {
+    'facturas': ConsultaExportacion(
+        sql="""
+            SELECT f.ID_Factura, f.Fecha_Emision, f.ID_Paciente,
+                   p.Nombre AS Nombre_Paciente, p.Apellido AS Apellido_Paciente, p.DUI,
+                   f.Descripcion_Servicio, f.Monto_Servicio, f.Monto_Total, f.Estado_Pago
+            FROM Factura f
+            LEFT JOIN Paciente p ON p.ID_Paciente = f.ID_Paciente
+        """,
+        columna_fecha='f.Fecha_Emision',
+        orden='f.Fecha_Emision, f.ID_Factura',
+    ),
+    'citas': ConsultaExportacion(
+        sql="""
+            SELECT c.ID_Cita, c.Fecha, c.Hora_Inicio, c.Hora_Fin, c.Estado, c.Costo,
+                   c.ID_Paciente, p.Nombre AS Nombre_Paciente, p.Apellido AS Apellido_Paciente,
+                   c.ID_Doctor, d.Nombre AS Nombre_Doctor, d.Apellido AS Apellido_Doctor,
+                   c.ID_Tratamiento, t.Descripcion AS Tratamiento
+            FROM Cita c
+            JOIN Paciente p ON p.ID_Paciente = c.ID_Paciente
+            JOIN Doctor d ON d.ID_Doctor = c.ID_Doctor
+            JOIN Tratamiento t ON t.ID_Tratamiento = c.ID_Tratamiento
+        """,
+        columna_fecha='c.Fecha',
+        orden='c.Fecha, c.Hora_Inicio, c.ID_Cita',
+    ),
+    'pacientes': ConsultaExportacion(
+        sql="""
+            SELECT p.ID_Paciente, p.Nombre, p.Apellido, p.Fecha_Nacimiento,
+                   p.DUI, p.Telefono, p.Correo
+            FROM Paciente p
+        """,
+        columna_fecha=None,
+        orden='p.ID_Paciente',
+    ),
+}
+
+
+def _valor_texto(valor):
+    """Valor de la BD como texto para CSV/JSON (mismos formatos que usa el resto de la app)"""
+    if valor is None:
+        return None
+    if isinstance(valor, datetime):
+        return valor.strftime('%Y-%m-%d %H:%M:%S')
+    if isinstance(valor, date):
+        return valor.isoformat()
+    if isinstance(valor, timedelta):
+        # Las columnas TIME llegan como timedelta desde mysql.connector
+        segundos = int(valor.total_seconds())
+        return f"{segundos // 3600:02d}:{segundos % 3600 // 60:02d}:{segundos % 60:02d}"
+    if isinstance(valor, Decimal):
+        return str(valor)
+    return valor
+
+
+def armar_consulta(entidad: str, fecha_desde: date = None, fecha_hasta: date = None) -> Tuple[str, tuple]:
+    """
+    SQL y parámetros de la exportación de `entidad` con el rango de fechas (ambos extremos incluidos).
+    Las columnas de fecha son DATETIME: el límite superior es el día siguiente sin incluir,
+    así el índice sirve para el rango completo.
+    """
+    consulta = CONSULTAS[entidad]
+    condiciones, parametros = [], []
+    if consulta.columna_fecha:
+        if fecha_desde:
+            condiciones.append(f"{consulta.columna_fecha} >= %s")
+            parametros.append(fecha_desde)
+        if fecha_hasta:
+            condiciones.append(f"{consulta.columna_fecha} < %s")
+            parametros.append(fecha_hasta + timedelta(days=1))
+    sql = consulta.sql
+    if condiciones:
+        sql += " WHERE " + " AND ".join(condiciones)
+    return sql + f" ORDER BY {consulta.orden}", tuple(parametros)
+
+
+class ResultadoExportacion(NamedTuple):
+    entidad: str
+    ruta: str
+    filas: int
+    segundos: float
+
+    @property
+    def filas_por_segundo(self) -> float:
+        return round(self.filas / self.segundos, 1) if self.segundos else 0.0
+
+    @property
+    def mensaje(self) -> str:
+        return f"{self.filas} filas de {self.entidad} exportadas a {self.ruta} ({self.segundos:.1f} s)"
+
+
+# ==========================================
+# CLASE: ExportadorDatos
+# PROPÓSITO: Volcar facturas, citas o pacientes a CSV o JSONL directamente
+# desde el cursor, sin cargar la tabla en memoria
+# ==========================================
+
+class ExportadorDatos:
+    """
+    Uso:
+        resultado = ExportadorDatos().exportar('facturas', 'facturas_2025.csv',
+                                               fecha_desde=date(2025, 1, 1), fecha_hasta=date(2025, 12, 31))
+        ExportadorDatos().exportar('pacientes', 'pacientes.jsonl', progreso=lambda filas: print(filas))
+
+    El cursor es sin búfer (buffered=False): el servidor entrega las filas a medida
+    que se piden con fetchmany, así en memoria solo hay un lote a la vez. La conexión
+    queda prestada mientras dura la exportación.
+
+    Se escribe en <ruta>.parcial y se renombra al terminar: si la exportación falla
+    o se cancela no queda un archivo a medias con el nombre final.
+    """
+
+    def __init__(self, tamano_lote: int = TAMANO_LOTE):
+        self.tamano_lote = tamano_lote
+
+    @staticmethod
+    def formato_de(ruta: str) -> str:
+        """Formato según la extensión del archivo (CSV por defecto)"""
+        return 'jsonl' if os.path.splitext(ruta)[1].lower() in ('.jsonl', '.json') else 'csv'
+
+    def exportar(self, entidad: str, ruta: str, fecha_desde: date = None, fecha_hasta: date = None,
+                 formato: str = None, progreso: Callable[[int], object] = None) -> Optional[ResultadoExportacion]:
+        """
+        :param entidad: 'facturas', 'citas' o 'pacientes'.
+        :param formato: 'csv' o 'jsonl' (por defecto según la extensión de `ruta`).
+        :param progreso: Se llama después de cada lote con las filas escritas hasta ahí;
+                         si devuelve False la exportación se cancela.
+        :return: ResultadoExportacion, o None si falló o se canceló (el motivo queda en el log).
+        """
+        if entidad not in CONSULTAS:
+            logger.error("❌ Entidad de exportación desconocida: %s", entidad)
+            return None
+        formato = formato or self.formato_de(ruta)
+        if formato not in FORMATOS:
+            logger.error("❌ Formato de exportación desconocido: %s", formato)
+            return None
+        if not CONSULTAS[entidad].columna_fecha and (fecha_desde or fecha_hasta):
+            logger.warning("⚠️ %s no tiene columna de fecha; se exporta sin filtrar", entidad)
+
+        sql, parametros = armar_consulta(entidad, fecha_desde, fecha_hasta)
+        temporal = ruta + ".parcial"
+        inicio = time.perf_counter()
+        filas = 0
+        completa = False
+
+        try:
+            with conexion_bd() as conexion:
+                if not conexion:
+                    logger.error("❌ No se pudo establecer conexión a la base de datos.")
+                    return None
+                cursor = conexion.cursor(buffered=False)
+                cursor.execute(sql, parametros)
+                columnas = [descripcion[0] for descripcion in cursor.description]
+
+                with open(temporal, 'w', newline='', encoding='utf-8') as archivo:
+                    escritor = csv.writer(archivo) if formato == 'csv' else None
+                    if escritor:
+                        escritor.writerow(columnas)
+
+                    while True:
+                        lote = cursor.fetchmany(self.tamano_lote)
+                        if not lote:
+                            break
+                        if escritor:
+                            escritor.writerows([[_valor_texto(v) for v in fila] for fila in lote])
+                        else:
+                            archivo.writelines(
+                                json.dumps(dict(zip(columnas, map(_valor_texto, fila))), ensure_ascii=False) + "\n"
+                                for fila in lote)
+                        filas += len(lote)
+                        if progreso and progreso(filas) is False:
+                            logger.info("⏹️ Exportación de %s cancelada después de %s filas", entidad, filas)
+                            # Sin leer el resto, la conexión no se devuelve al pool para reutilizarla
+                            return None
+                completa = True
+
+        except Error as e:
+            logger.error("❌ Error de base de datos al exportar %s: %s", entidad, e)
+            return None
+        except OSError as e:
+            logger.error("❌ No se pudo escribir %s: %s", ruta, e)
+            return None
+        finally:
+            if not completa and os.path.exists(temporal):
+                os.remove(temporal)
+
+        try:
+            os.replace(temporal, ruta)
+        except OSError as e:
+            logger.error("❌ No se pudo escribir %s: %s", ruta, e)
+            os.remove(temporal)
+            return None
+
+        resultado = ResultadoExportacion(entidad, ruta, filas, time.perf_counter() - inicio)
+        logger.info("📤 %s: %s filas exportadas a %s en %.1f s", entidad, filas, ruta, resultado.segundos)
+        return resultado
+
+
+__all__ = ['ExportadorDatos', 'ResultadoExportacion', 'armar_consulta', 'CONSULTAS', 'FORMATOS', 'TAMANO_LOTE']
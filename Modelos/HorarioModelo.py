@@ -3,20 +3,25 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 # Importar configuración centralizada
-from Config.database_config import obtener_conexion, cerrar_conexion_segura
-import mysql.connector  # Mantener para manejo de errores específicos
-from mysql.connector import Error
+from Config.database_config import obtener_conexion, conexion_bd, cerrar_conexion_segura, Error
+from Config.logging_config import obtener_logger
 from datetime import datetime, time as datetime_time
-from typing import List
+from typing import List, Optional
 
 # Importar la clase Doctor
 try:
     from .DoctorModelo import Doctor
+    from .SecuenciaModelo import Secuencia
+    from .IndiceIntervalos import IndiceIntervalos, hora_a_minutos
 except ImportError:
     import sys
     import os
     sys.path.append(os.path.dirname(os.path.abspath(__file__)))
     from DoctorModelo import Doctor
+    from SecuenciaModelo import Secuencia
+    from IndiceIntervalos import IndiceIntervalos, hora_a_minutos
+
+logger = obtener_logger('Modelos.HorarioModelo')
 
 class Horario:
     def __init__(self, id_horario: str, hora_inicio: str, hora_fin: str, doctor: Doctor, disponible: bool = True):
@@ -37,15 +42,6 @@ class Horario:
         """Verifica si hay conflicto de horarios con el mismo doctor"""
         if self.doctor.id_doctor != otro_horario.doctor.id_doctor:
             return False
-        
-        def hora_a_minutos(hora_str):
-            if isinstance(hora_str, str):
-                h, m = map(int, hora_str.split(':'))
-                return h * 60 + m
-            elif isinstance(hora_str, datetime_time):
-                return hora_str.hour * 60 + hora_str.minute
-            else:
-                return 0
     
         inicio1 = hora_a_minutos(self.hora_inicio)
         fin1 = hora_a_minutos(self.hora_fin)
@@ -61,154 +57,172 @@ class Horario:
         :param horario: Instancia de la clase Horario a insertar.
         :return: True si la inserción fue exitosa, False en caso contrario.
         """
-        conexion = None
-        cursor = None
 
         try:
-            conexion = obtener_conexion()
-            if conexion is None:
-                print("❌ No se pudo establecer conexión a la base de datos.")
-                return False
-            cursor = conexion.cursor()
-
-            # Verificar que el doctor existe en la base de datos
-            cursor.execute("SELECT ID_Doctor FROM Doctor WHERE ID_Doctor = %s", (horario.doctor.id_doctor,))
-            if not cursor.fetchone():
-                print(f"Error: El doctor con ID {horario.doctor.id_doctor} no existe en la base de datos.")
-                return False
-
-            query = """
-            INSERT INTO Horario (ID_Horario, ID_Doctor, Hora_Inicio, Hora_Fin, Disponible)
-            VALUES (%s, %s, %s, %s, %s)
-            """
-
-            # Convertir las horas a formato TIME si son strings
-            hora_inicio = horario.hora_inicio
-            hora_fin = horario.hora_fin
+            with conexion_bd() as conexion:
+                if conexion is None:
+                    logger.error("❌ No se pudo establecer conexión a la base de datos.")
+                    return False
+                cursor = conexion.cursor()
+
+                # Verificar que el doctor existe en la base de datos
+                cursor.execute("SELECT ID_Doctor FROM Doctor WHERE ID_Doctor = %s", (horario.doctor.id_doctor,))
+                if not cursor.fetchone():
+                    logger.error("Error: El doctor con ID %s no existe en la base de datos.", horario.doctor.id_doctor)
+                    return False
+
+                Secuencia.asegurar_tabla(cursor)
+                conexion.start_transaction()
+
+                query = """
+                INSERT INTO Horario (ID_Horario, ID_Doctor, Hora_Inicio, Hora_Fin, Disponible)
+                VALUES (%s, %s, %s, %s, %s)
+                """
+
+                # Convertir las horas a formato TIME si son strings
+                hora_inicio = horario.hora_inicio
+                hora_fin = horario.hora_fin
             
-            if isinstance(hora_inicio, str):
-                hora_inicio = f"{hora_inicio}:00"
-            if isinstance(hora_fin, str):
-                hora_fin = f"{hora_fin}:00"
-
-            cursor.execute(query, (
-                horario.id_horario,
-                horario.doctor.id_doctor,
-                hora_inicio,
-                hora_fin,
-                horario.disponible
-            ))
-
-            conexion.commit()
-            print(f"Horario insertado correctamente con ID: {horario.id_horario}")
-            return True
+                if isinstance(hora_inicio, str):
+                    hora_inicio = f"{hora_inicio}:00"
+                if isinstance(hora_fin, str):
+                    hora_fin = f"{hora_fin}:00"
+
+                cursor.execute(query, (
+                    horario.id_horario,
+                    horario.doctor.id_doctor,
+                    hora_inicio,
+                    hora_fin,
+                    horario.disponible
+                ))
+                # Un ID escrito a mano también avanza el contador, para que
+                # Secuencia.siguiente() no lo entregue después
+                Secuencia.avanzar_hasta(cursor, 'Horario', horario.id_horario)
+
+                conexion.commit()
+                logger.debug("Horario insertado correctamente con ID: %s", horario.id_horario)
+                return True
 
         except Error as e:
-            print(f"Error al insertar el horario: {e}")
-            if conexion:
-                conexion.rollback()
+            logger.error("Error al insertar el horario: %s", e)
             return False
 
-        finally:
-            if cursor:
-                cursor.close()
-            if conexion and conexion.is_connected():
-                conexion.close()
-                print("Conexión a la base de datos cerrada.")
-
     @staticmethod
-    def obtener_horarios_bd() -> List['Horario']:
+    def obtener_horarios_bd(id_doctor=None) -> List['Horario']:
         """
         Obtiene todos los horarios de la base de datos con información del doctor.
+        :param id_doctor: Si se indica, solo los horarios de ese doctor.
         :return: Lista de instancias de Horario.
         """
-        conexion = None
-        cursor = None
         horarios = []
 
         try:
-            conexion = obtener_conexion()
-            if conexion is None:
-                print("❌ No se pudo establecer conexión a la base de datos.")
-                return horarios
-            cursor = conexion.cursor()
-
-            # Query con JOIN para obtener información del doctor
-            query = """
-            SELECT 
-                h.ID_Horario,
-                h.Hora_Inicio,
-                h.Hora_Fin,
-                h.Disponible,
-                d.ID_Doctor,
-                d.Nombre AS doctor_nombre,
-                d.Apellido AS doctor_apellido,
-                d.Especialidad,
-                d.Telefono AS doctor_telefono,
-                d.Correo AS doctor_correo,
-                d.Contrasena
-            FROM Horario h
-            INNER JOIN Doctor d ON h.ID_Doctor = d.ID_Doctor
-            ORDER BY h.Hora_Inicio
-            """
+            with conexion_bd() as conexion:
+                if conexion is None:
+                    logger.error("❌ No se pudo establecer conexión a la base de datos.")
+                    return horarios
+                cursor = conexion.cursor()
+
+                # Query con JOIN para obtener información del doctor
+                query = """
+                SELECT 
+                    h.ID_Horario,
+                    h.Hora_Inicio,
+                    h.Hora_Fin,
+                    h.Disponible,
+                    d.ID_Doctor,
+                    d.Nombre AS doctor_nombre,
+                    d.Apellido AS doctor_apellido,
+                    d.Especialidad,
+                    d.Telefono AS doctor_telefono,
+                    d.Correo AS doctor_correo,
+                    d.Contrasena
+                FROM Horario h
+                INNER JOIN Doctor d ON h.ID_Doctor = d.ID_Doctor
+                {filtro}
+                ORDER BY h.Hora_Inicio
+                """
             
-            cursor.execute(query)
-
-            for row in cursor.fetchall():
-                (id_horario, hora_inicio, hora_fin, disponible,
-                 id_doctor, doctor_nombre, doctor_apellido, especialidad, 
-                 doctor_telefono, doctor_correo, contrasena) = row
-
-                # Convertir timedelta a string si es necesario
-                if hasattr(hora_inicio, 'total_seconds'):
-                    total_seconds = int(hora_inicio.total_seconds())
-                    hours = total_seconds // 3600
-                    minutes = (total_seconds % 3600) // 60
-                    hora_inicio = f"{hours:02d}:{minutes:02d}"
+                if id_doctor is None:
+                    cursor.execute(query.format(filtro=""))
                 else:
-                    hora_inicio = str(hora_inicio)
+                    cursor.execute(query.format(filtro="WHERE h.ID_Doctor = %s"), (id_doctor,))
+
+                for row in cursor.fetchall():
+                    (id_horario, hora_inicio, hora_fin, disponible,
+                     id_doctor, doctor_nombre, doctor_apellido, especialidad, 
+                     doctor_telefono, doctor_correo, contrasena) = row
+
+                    # Convertir timedelta a string si es necesario
+                    if hasattr(hora_inicio, 'total_seconds'):
+                        total_seconds = int(hora_inicio.total_seconds())
+                        hours = total_seconds // 3600
+                        minutes = (total_seconds % 3600) // 60
+                        hora_inicio = f"{hours:02d}:{minutes:02d}"
+                    else:
+                        hora_inicio = str(hora_inicio)
+
+                    if hasattr(hora_fin, 'total_seconds'):
+                        total_seconds = int(hora_fin.total_seconds())
+                        hours = total_seconds // 3600
+                        minutes = (total_seconds % 3600) // 60
+                        hora_fin = f"{hours:02d}:{minutes:02d}"
+                    else:
+                        hora_fin = str(hora_fin)
+
+                    # Crear instancia de Doctor
+                    doctor = Doctor(
+                        nombre=doctor_nombre,
+                        apellido=doctor_apellido,
+                        num_junta_medica=id_doctor,
+                        especialidad=especialidad,
+                        telefono=doctor_telefono,
+                        correo=doctor_correo
+                    )
+                    doctor.id_doctor = id_doctor
+
+                    # Crear instancia de Horario
+                    horario = Horario(
+                        id_horario=id_horario,
+                        hora_inicio=hora_inicio,
+                        hora_fin=hora_fin,
+                        doctor=doctor,
+                        disponible=bool(disponible)
+                    )
+
+                    horarios.append(horario)
 
-                if hasattr(hora_fin, 'total_seconds'):
-                    total_seconds = int(hora_fin.total_seconds())
-                    hours = total_seconds // 3600
-                    minutes = (total_seconds % 3600) // 60
-                    hora_fin = f"{hours:02d}:{minutes:02d}"
-                else:
-                    hora_fin = str(hora_fin)
-
-                # Crear instancia de Doctor
-                doctor = Doctor(
-                    nombre=doctor_nombre,
-                    apellido=doctor_apellido,
-                    num_junta_medica=id_doctor,
-                    especialidad=especialidad,
-                    telefono=doctor_telefono,
-                    correo=doctor_correo
-                )
-                doctor.id_doctor = id_doctor
-
-                # Crear instancia de Horario
-                horario = Horario(
-                    id_horario=id_horario,
-                    hora_inicio=hora_inicio,
-                    hora_fin=hora_fin,
-                    doctor=doctor,
-                    disponible=bool(disponible)
-                )
-
-                horarios.append(horario)
-
-            return horarios
+                return horarios
 
         except Error as e:
-            print(f"Error al obtener los horarios: {e}")
+            logger.error("Error al obtener los horarios: %s", e)
             return []
 
-        finally:
-            if cursor:
-                cursor.close()
-            if conexion and conexion.is_connected():
-                conexion.close()
+    @staticmethod
+    def obtener_disponibilidad_bd(ids_doctor: List[str] = None) -> List[tuple]:
+        """
+        Obtiene los rangos de atención marcados como disponibles.
+        :param ids_doctor: Limitar a estos doctores (None = todos).
+        :return: Lista de (ID_Doctor, Hora_Inicio, Hora_Fin).
+        """
+        query = "SELECT ID_Doctor, Hora_Inicio, Hora_Fin FROM Horario WHERE Disponible = TRUE"
+        parametros = []
+        if ids_doctor:
+            query += f" AND ID_Doctor IN ({', '.join(['%s'] * len(ids_doctor))})"
+            parametros.extend(ids_doctor)
+
+        try:
+            with conexion_bd() as conexion:
+                if conexion is None:
+                    logger.error("❌ No se pudo establecer conexión a la base de datos.")
+                    return []
+                cursor = conexion.cursor()
+                cursor.execute(query, tuple(parametros))
+                return cursor.fetchall()
+
+        except Error as e:
+            logger.error("Error al obtener la disponibilidad de horarios: %s", e)
+            return []
 
     @staticmethod
     def eliminar_horario_bd(id_horario: str) -> bool:
@@ -217,40 +231,30 @@ class Horario:
         :param id_horario: ID del horario a eliminar.
         :return: True si la eliminación fue exitosa, False en caso contrario.
         """
-        conexion = None
-        cursor = None
 
         try:
-            conexion = obtener_conexion()   
-            if conexion is None:
-                print("❌ No se pudo establecer conexión a la base de datos.")
-                return False
+            with conexion_bd() as conexion:
+                if conexion is None:
+                    logger.error("❌ No se pudo establecer conexión a la base de datos.")
+                    return False
 
-            cursor = conexion.cursor()
+                cursor = conexion.cursor()
 
-            query = "DELETE FROM Horario WHERE ID_Horario = %s"
-            cursor.execute(query, (id_horario,))
-            conexion.commit()
+                query = "DELETE FROM Horario WHERE ID_Horario = %s"
+                cursor.execute(query, (id_horario,))
+                conexion.commit()
 
-            if cursor.rowcount > 0:
-                print(f"Horario con ID {id_horario} eliminado exitosamente.")
-                return True
-            else:
-                print(f"No se encontró el horario con ID {id_horario}")
-                return False
+                if cursor.rowcount > 0:
+                    logger.debug("Horario con ID %s eliminado exitosamente.", id_horario)
+                    return True
+                else:
+                    logger.warning("No se encontró el horario con ID %s", id_horario)
+                    return False
 
         except Error as e:
-            print(f"Error al eliminar el horario: {e}")
-            if conexion:
-                conexion.rollback()
+            logger.error("Error al eliminar el horario: %s", e)
             return False
 
-        finally:
-            if cursor:
-                cursor.close()
-            if conexion and conexion.is_connected():
-                conexion.close()
-
     @staticmethod
     def actualizar_disponibilidad_bd(id_horario: str, disponible: bool) -> bool:
         """
@@ -259,68 +263,93 @@ class Horario:
         :param disponible: Nueva disponibilidad (True/False).
         :return: True si la actualización fue exitosa, False en caso contrario.
         """
-        conexion = None
-        cursor = None
 
         try:
-            conexion = obtener_conexion()
-            if conexion is None:
-                print("❌ No se pudo establecer conexión a la base de datos.")
-                return False
+            with conexion_bd() as conexion:
+                if conexion is None:
+                    logger.error("❌ No se pudo establecer conexión a la base de datos.")
+                    return False
 
-            cursor = conexion.cursor()
+                cursor = conexion.cursor()
 
-            query = "UPDATE Horario SET Disponible = %s WHERE ID_Horario = %s"
-            cursor.execute(query, (disponible, id_horario))
-            conexion.commit()
+                query = "UPDATE Horario SET Disponible = %s WHERE ID_Horario = %s"
+                cursor.execute(query, (disponible, id_horario))
+                conexion.commit()
 
-            if cursor.rowcount > 0:
-                estado = "disponible" if disponible else "ocupado"
-                print(f"Horario {id_horario} marcado como {estado} exitosamente.")
-                return True
-            else:
-                print(f"No se encontró el horario con ID {id_horario}")
-                return False
+                if cursor.rowcount > 0:
+                    estado = "disponible" if disponible else "ocupado"
+                    logger.debug("Horario %s marcado como %s exitosamente.", id_horario, estado)
+                    return True
+                else:
+                    logger.warning("No se encontró el horario con ID %s", id_horario)
+                    return False
 
         except Error as e:
-            print(f"Error al actualizar la disponibilidad del horario: {e}")
-            if conexion:
-                conexion.rollback()
+            logger.error("Error al actualizar la disponibilidad del horario: %s", e)
             return False
 
-        finally:
-            if cursor:
-                cursor.close()
-            if conexion and conexion.is_connected():
-                conexion.close()
-
-
 class HorarioModel:
-    def __init__(self):
+    def __init__(self, cargar: bool = True):
+        """
+        :param cargar: Si es False no consulta la BD al crearse; los datos se entregan
+                       después con establecer_datos() (p. ej. desde una carga en segundo plano).
+        """
         self.horarios: List[Horario] = []
         self.doctores: List[Doctor] = []
-        self.cargar_datos_desde_bd()
+        self.indice = IndiceIntervalos()  # Horarios indexados por doctor para detectar choques
+        if cargar:
+            self.cargar_datos_desde_bd()
     
     def cargar_datos_desde_bd(self):
         """Carga todos los datos necesarios desde la base de datos"""
         try:
             # Cargar doctores desde la base de datos
             self.doctores = Doctor.obtener_todos_doctores()
-            print(f"Doctores cargados desde BD: {len(self.doctores)}")
+            logger.debug("Doctores cargados desde BD: %s", len(self.doctores))
             
             # Cargar horarios desde la base de datos
             self.horarios = Horario.obtener_horarios_bd()
-            print(f"Horarios cargados desde BD: {len(self.horarios)}")
+            logger.debug("Horarios cargados desde BD: %s", len(self.horarios))
             
         except Exception as e:
-            print(f"Error al cargar datos desde BD: {e}")
+            logger.error("Error al cargar datos desde BD: %s", e)
             self.doctores = []
             self.horarios = []
+        
+        self._reindexar()
+
+    def establecer_datos(self, doctores: List[Doctor], horarios: List[Horario]):
+        """Recibe doctores y horarios ya cargados y reconstruye el índice"""
+        self.doctores = doctores
+        self.horarios = horarios
+        self._reindexar()
+
+    def _reindexar(self):
+        """Reconstruye el índice de intervalos a partir de self.horarios"""
+        self.indice.limpiar()
+        for horario in self.horarios:
+            self.indice.agregar(str(horario.doctor.id_doctor), horario.hora_inicio, horario.hora_fin, horario)
+
+    def buscar_conflicto(self, nuevo_horario: Horario) -> Optional[Horario]:
+        """
+        Busca un horario del mismo doctor que se cruce con el nuevo, usando el índice (O(log n)).
+        Antes se recargan desde la BD solo los horarios de ese doctor, así también se
+        ven los guardados desde otras estaciones después de abrir la ventana.
+        :return: El horario en conflicto o None si el rango está libre.
+        """
+        id_doctor = nuevo_horario.doctor.id_doctor
+        clave = str(id_doctor)
+        horarios_doctor = Horario.obtener_horarios_bd(id_doctor)
+        self.horarios = [h for h in self.horarios if str(h.doctor.id_doctor) != clave] + horarios_doctor
+        self.indice.reemplazar(clave, [(h.hora_inicio, h.hora_fin, h) for h in horarios_doctor])
+        return self.indice.buscar_conflicto(clave, nuevo_horario.hora_inicio, nuevo_horario.hora_fin)
 
     def agregar_horario(self, nuevo_horario: Horario) -> bool:
         """Agrega un nuevo horario a la base de datos y a la colección local."""
         if Horario.insertar_horario_bd(nuevo_horario):
             self.horarios.append(nuevo_horario)
+            self.indice.agregar(str(nuevo_horario.doctor.id_doctor),
+                                nuevo_horario.hora_inicio, nuevo_horario.hora_fin, nuevo_horario)
             return True
         return False
     
@@ -329,12 +358,14 @@ class HorarioModel:
         if Horario.eliminar_horario_bd(id_horario):
             # Eliminar de la lista local
             self.horarios = [h for h in self.horarios if h.id_horario != id_horario]
+            self._reindexar()
             return True
         return False
         
     def obtener_horarios(self) -> List[Horario]:
         """Retorna todos los horarios actualizados desde la base de datos."""
         self.horarios = Horario.obtener_horarios_bd()
+        self._reindexar()
         return self.horarios.copy()
 
     def obtener_doctores(self) -> List[Doctor]:
@@ -346,6 +377,7 @@ class HorarioModel:
         """Retorna horarios agrupados por día."""
         # Actualizar horarios desde BD
         self.horarios = Horario.obtener_horarios_bd()
+        self._reindexar()
         
         # Por ahora agrupamos todos los horarios bajo "Hoy" ya que no tenemos fecha específica
         horarios_por_dia = {"Hoy": self.horarios}
@@ -353,52 +385,18 @@ class HorarioModel:
     
     def generar_siguiente_id(self) -> str:
         """
-        Genera el siguiente ID de horario basado en los IDs existentes en la base de datos.
-        Formato: H001, H002, H003, etc.
-        Verifica secuencialmente y encuentra el primer número disponible.
+        Devuelve el próximo ID de horario (H001, H002, ...) para mostrarlo en el diálogo.
+        No lo reserva: el ID definitivo se toma con reservar_siguiente_id() al guardar.
         """
-        try:
-            # Obtener todos los horarios desde la base de datos
-            horarios = Horario.obtener_horarios_bd()
-            
-            if not horarios:
-                return "H001"  # Primer ID si no hay horarios
-            
-            # Extraer los números de los IDs existentes y ordenarlos
-            numeros_existentes = set()
-            for horario in horarios:
-                id_horario = str(horario.id_horario).strip()  # Convertir a string primero
-                # Verificar que el ID tenga el formato correcto (H seguido de 3 dígitos)
-                if id_horario.startswith('H') and len(id_horario) == 4:
-                    try:
-                        numero = int(id_horario[1:])  # Extraer número después de 'H'
-                        numeros_existentes.add(numero)
-                    except ValueError:
-                        continue
-                # También manejar IDs que son solo números (casos legacy)
-                elif id_horario.isdigit():
-                    try:
-                        numero = int(id_horario)
-                        numeros_existentes.add(numero)
-                    except ValueError:
-                        continue
-            
-            if not numeros_existentes:
-                return "H001"  # Si no hay IDs válidos, empezar con H001
-            
-            # Buscar el primer número disponible en la secuencia
-            siguiente_numero = 1
-            while siguiente_numero in numeros_existentes:
-                siguiente_numero += 1
-            
-            # Formatear con ceros a la izquierda (siempre 3 dígitos)
-            return f"H{siguiente_numero:03d}"
-            
-        except Exception as e:
-            print(f"Error al generar siguiente ID: {e}")
-            import traceback
-            traceback.print_exc()
-            return "H001"  # ID por defecto en caso de error
+        siguiente_id = Secuencia.consultar_siguiente('Horario')
+        return siguiente_id or Secuencia.formatear('Horario', 1)
+
+    def reservar_siguiente_id(self) -> Optional[str]:
+        """
+        Reserva de forma atómica el siguiente ID de horario.
+        :return: ID reservado o None si no se pudo reservar.
+        """
+        return Secuencia.siguiente('Horario')
     
     def obtener_ids_existentes(self) -> List[str]:
         """
@@ -410,7 +408,7 @@ class HorarioModel:
             # Convertir todos los IDs a string para evitar problemas de tipo
             return [str(horario.id_horario) for horario in horarios]
         except Exception as e:
-            print(f"Error al obtener IDs existentes: {e}")
+            logger.error("Error al obtener IDs existentes: %s", e)
             return []
     
     def verificar_id_disponible(self, id_horario: str) -> bool:
@@ -418,9 +416,14 @@ class HorarioModel:
         Verifica si un ID específico está disponible (no existe en la base de datos).
         """
         try:
-            ids_existentes = self.obtener_ids_existentes()
-            # Comparar como strings para evitar problemas de tipo
-            return str(id_horario) not in ids_existentes
-        except Exception as e:
-            print(f"Error al verificar disponibilidad del ID: {e}")
+            with conexion_bd() as conexion:
+                if not conexion:
+                    logger.error("❌ No se pudo establecer conexión a la base de datos.")
+                    return False
+                cursor = conexion.cursor()
+                # Consulta puntual por clave primaria en lugar de cargar todos los horarios
+                cursor.execute("SELECT 1 FROM Horario WHERE ID_Horario = %s", (str(id_horario),))
+                return cursor.fetchone() is None
+        except Error as e:
+            logger.error("Error al verificar disponibilidad del ID: %s", e)
             return False
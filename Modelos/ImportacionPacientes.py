@@ -0,0 +1,344 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import csv
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from itertools import islice
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from Config.database_config import conexion_bd, Error
+from Config.logging_config import obtener_logger
+
+try:
+    from .PacienteModelo import Paciente
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from PacienteModelo import Paciente
+
+logger = obtener_logger('Modelos.ImportacionPacientes')
+
+# Filas que se validan juntas en un proceso y que se insertan en una transacción
+TAMANO_LOTE = 1000
+
+# Encabezados aceptados (sin distinguir mayúsculas) para cada columna de Paciente
+COLUMNAS = {
+    'nombre': ('nombre', 'nombres'),
+    'apellido': ('apellido', 'apellidos'),
+    'fecha_nacimiento': ('fecha_nacimiento', 'fecha nacimiento', 'nacimiento'),
+    'dui': ('dui',),
+    'telefono': ('telefono', 'teléfono'),
+    'correo': ('correo', 'email', 'e-mail'),
+}
+FORMATOS_FECHA = ('%Y-%m-%d', '%d/%m/%Y', '%d-%m-%Y')
+
+# Anchos de las columnas en GestionClinicaDental.sql
+MAX_NOMBRE = 50
+MAX_CORREO = 25
+DIGITOS_TELEFONO = 8
+
+_INSERT_PACIENTE = """
+    INSERT INTO Paciente (Nombre, Apellido, Fecha_Nacimiento, DUI, Telefono, Correo)
+    VALUES (%s, %s, %s, %s, %s, %s)
+"""
+
+MOTIVO_DUPLICADO_BD = "DUI ya registrado en la base de datos"
+MOTIVO_DUPLICADO_ARCHIVO = "DUI repetido en el archivo"
+
+
+def _limpiar_nombre(valor: str) -> str:
+    """Mismo formato que aplica Paciente al crearse: espacios simples y mayúscula inicial"""
+    return " ".join(valor.split()).title()
+
+
+def _leer_fecha(valor: str) -> Optional[date]:
+    for formato in FORMATOS_FECHA:
+        try:
+            return datetime.strptime(valor, formato).date()
+        except ValueError:
+            continue
+    return None
+
+
+def validar_fila(campos: Dict[str, str], hoy: date) -> Tuple[Optional[tuple], Optional[str]]:
+    """
+    Aplica a una fila del CSV las reglas de PacienteControlador.crear_paciente
+    (obligatorios, DUI, correo, teléfono y edad) más los anchos de las columnas.
+    :param campos: Valores ya mapeados a las claves de COLUMNAS.
+    :return: (parámetros para _INSERT_PACIENTE, None) o (None, motivo del rechazo).
+    """
+    nombre = _limpiar_nombre(campos.get('nombre', ''))
+    apellido = _limpiar_nombre(campos.get('apellido', ''))
+    if not nombre or not apellido:
+        return None, "Nombre y Apellido son campos obligatorios"
+    if len(nombre) > MAX_NOMBRE or len(apellido) > MAX_NOMBRE:
+        return None, f"Nombre o Apellido de más de {MAX_NOMBRE} caracteres"
+
+    nacimiento = _leer_fecha(campos.get('fecha_nacimiento', '').strip())
+    if nacimiento is None:
+        return None, "Fecha de nacimiento inválida (AAAA-MM-DD o DD/MM/AAAA)"
+    edad = hoy.year - nacimiento.year - ((hoy.month, hoy.day) < (nacimiento.month, nacimiento.day))
+    if edad <= 0 or edad > 120:
+        return None, "La edad debe estar entre 1 y 120 años"
+
+    dui = campos.get('dui', '').strip()
+    if dui and not Paciente.validar_formato_dui(dui):
+        return None, "El DUI debe tener el formato: 12345678-9"
+
+    telefono = "".join(filter(str.isdigit, campos.get('telefono', '')))
+    if telefono and not Paciente.validar_telefono(telefono):
+        return None, f"El teléfono debe tener al menos {DIGITOS_TELEFONO} dígitos"
+    if len(telefono) > DIGITOS_TELEFONO:
+        return None, f"El teléfono tiene más de {DIGITOS_TELEFONO} dígitos"
+
+    correo = campos.get('correo', '').strip().lower()
+    if correo and not Paciente.validar_formato_email(correo):
+        return None, "El email no tiene un formato válido"
+    if len(correo) > MAX_CORREO:
+        return None, f"El correo tiene más de {MAX_CORREO} caracteres"
+
+    return (nombre, apellido, nacimiento, dui or None, telefono or None, correo or None), None
+
+
+def _validar_lote(lote: List[Tuple[int, Dict[str, str]]], hoy: date) -> List[Tuple[Optional[tuple], Optional[str]]]:
+    """Unidad de trabajo de cada proceso: valida un lote completo"""
+    return [validar_fila(campos, hoy) for _, campos in lote]
+
+
+class ResultadoImportacion:
+    """Contadores y rendimiento de una importación"""
+
+    def __init__(self):
+        self.leidas = 0
+        self.importadas = 0
+        self.rechazadas = 0
+        self.motivos: Counter = Counter()
+        self.segundos = 0.0
+
+    @property
+    def filas_por_segundo(self) -> float:
+        return round(self.leidas / self.segundos, 1) if self.segundos else 0.0
+
+    def resumen(self) -> dict:
+        return {
+            'leidas': self.leidas,
+            'importadas': self.importadas,
+            'rechazadas': self.rechazadas,
+            'motivos': dict(self.motivos.most_common()),
+            'segundos': round(self.segundos, 2),
+            'filas_por_segundo': self.filas_por_segundo,
+        }
+
+
+# ==========================================
+# CLASE: ImportadorPacientes
+# PROPÓSITO: Cargar el padrón de pacientes de otra clínica desde un CSV,
+# leyendo el archivo por lotes, validando en varios procesos e insertando
+# cada lote en una sola transacción
+# ==========================================
+
+class ImportadorPacientes:
+    """
+    Uso:
+        importador = ImportadorPacientes(trabajadores=4)
+        resultado = importador.importar("pacientes.csv", "pacientes.rechazos.csv")
+        print(resultado.resumen())
+
+    - Las filas con DUI ya registrado (en la BD o antes en el mismo archivo) se
+      rechazan; los DUI existentes se leen una vez a un conjunto en memoria.
+    - Las filas sin DUI no se pueden comparar y se importan siempre.
+    - Si un lote falla al insertarse, se reintenta fila por fila para que solo
+      las filas con problema terminen en el reporte de rechazos.
+    - Con simular=True solo se valida (no se escribe en la BD).
+    """
+
+    def __init__(self, trabajadores: int = None, tamano_lote: int = TAMANO_LOTE, simular: bool = False):
+        # 0 o 1 trabajador: se valida en este mismo proceso
+        self.trabajadores = (os.cpu_count() or 1) if trabajadores is None else trabajadores
+        self.tamano_lote = tamano_lote
+        self.simular = simular
+
+    # -------------------- Lectura --------------------
+
+    @staticmethod
+    def _mapa_columnas(encabezados: List[str]) -> Dict[str, str]:
+        """Encabezado del archivo -> clave de COLUMNAS"""
+        mapa = {}
+        for encabezado in encabezados or []:
+            normalizado = encabezado.strip().lower()
+            for clave, alias in COLUMNAS.items():
+                if normalizado in alias:
+                    mapa[encabezado] = clave
+        return mapa
+
+    def _lotes(self, lector: csv.DictReader, mapa: Dict[str, str]) -> Iterator[List[Tuple[int, Dict[str, str], dict]]]:
+        """Lotes de (número de fila en el archivo, campos mapeados, fila original)"""
+        numerado = enumerate(lector, start=2)  # la fila 1 es el encabezado
+        while True:
+            lote = [
+                (numero, {mapa[k]: (v or '') for k, v in fila.items() if k in mapa}, fila)
+                for numero, fila in islice(numerado, self.tamano_lote)
+            ]
+            if not lote:
+                return
+            yield lote
+
+    def _validados(self, lotes: Iterator[list], hoy: date) -> Iterator[Tuple[list, list]]:
+        """
+        (lote, resultados de validación) en el orden del archivo. Con varios procesos
+        se mantienen a lo sumo 2 lotes por trabajador en vuelo, así la memoria no
+        depende del tamaño del archivo.
+        """
+        if self.trabajadores <= 1:
+            for lote in lotes:
+                yield lote, _validar_lote([(n, c) for n, c, _ in lote], hoy)
+            return
+
+        with ProcessPoolExecutor(max_workers=self.trabajadores) as procesos:
+            en_vuelo = deque()
+            for lote in lotes:
+                en_vuelo.append((lote, procesos.submit(_validar_lote, [(n, c) for n, c, _ in lote], hoy)))
+                if len(en_vuelo) >= 2 * self.trabajadores:
+                    lote_listo, futuro = en_vuelo.popleft()
+                    yield lote_listo, futuro.result()
+            while en_vuelo:
+                lote_listo, futuro = en_vuelo.popleft()
+                yield lote_listo, futuro.result()
+
+    # -------------------- Escritura --------------------
+
+    @staticmethod
+    def _duis_registrados() -> Optional[Set[str]]:
+        """DUI de todos los pacientes de la BD (índice hash para descartar duplicados)"""
+        try:
+            with conexion_bd() as conexion:
+                if not conexion:
+                    logger.error("❌ No se pudo establecer conexión a la base de datos.")
+                    return None
+                cursor = conexion.cursor()
+                cursor.execute("SELECT DUI FROM Paciente WHERE DUI IS NOT NULL AND DUI <> ''")
+                return {fila[0].strip() for fila in cursor.fetchall()}
+        except Error as e:
+            logger.error("❌ Error al leer los DUI registrados: %s", e)
+            return None
+
+    @staticmethod
+    def _insertar_lote(filas: List[tuple]) -> List[Optional[str]]:
+        """
+        Inserta el lote en una transacción. Si falla, lo reintenta fila por fila.
+        :return: Por cada fila, None si se insertó o el motivo del error.
+        """
+        try:
+            with conexion_bd() as conexion:
+                if not conexion:
+                    return ["Sin conexión a la base de datos"] * len(filas)
+                cursor = conexion.cursor()
+                try:
+                    cursor.executemany(_INSERT_PACIENTE, filas)
+                    conexion.commit()
+                    return [None] * len(filas)
+                except Error as e:
+                    conexion.rollback()
+                    logger.warning("⚠️ Lote de %s pacientes rechazado por la BD (%s); se reintenta fila por fila",
+                                   len(filas), e)
+
+                errores = []
+                for fila in filas:
+                    try:
+                        cursor.execute(_INSERT_PACIENTE, fila)
+                        conexion.commit()
+                        errores.append(None)
+                    except Error as e:
+                        conexion.rollback()
+                        errores.append(f"Error de base de datos: {e}")
+                return errores
+        except Error as e:
+            logger.error("❌ Error al insertar lote de pacientes: %s", e)
+            return [f"Error de base de datos: {e}"] * len(filas)
+
+    # -------------------- Importación --------------------
+
+    def importar(self, ruta_csv: str, ruta_rechazos: str = None,
+                 progreso: Callable[[ResultadoImportacion], object] = None) -> Optional[ResultadoImportacion]:
+        """
+        :param ruta_csv: Archivo CSV (UTF-8, con encabezado) con las columnas de COLUMNAS.
+        :param ruta_rechazos: CSV donde se escriben las filas rechazadas con su motivo
+                              (por defecto <archivo>.rechazos.csv).
+        :param progreso: Se llama después de cada lote con el resultado parcial.
+        :return: ResultadoImportacion, o None si no se pudo abrir el archivo o leer la BD.
+        """
+        inicio = time.perf_counter()
+        resultado = ResultadoImportacion()
+        ruta_rechazos = ruta_rechazos or os.path.splitext(ruta_csv)[0] + ".rechazos.csv"
+
+        try:
+            with open(ruta_csv, newline='', encoding='utf-8-sig') as entrada:
+                lector = csv.DictReader(entrada)
+                mapa = self._mapa_columnas(lector.fieldnames)
+                faltantes = {'nombre', 'apellido', 'fecha_nacimiento'} - set(mapa.values())
+                if faltantes:
+                    # Antes de abrir el archivo de rechazos: no se crea ni se pisa uno anterior
+                    logger.error("❌ Faltan columnas en %s: %s", ruta_csv, ", ".join(sorted(faltantes)))
+                    return None
+
+                duis = set() if self.simular else self._duis_registrados()
+                if duis is None:
+                    return None
+                duis_archivo = set()
+
+                with open(ruta_rechazos, 'w', newline='', encoding='utf-8') as salida:
+                    rechazos = csv.writer(salida)
+                    rechazos.writerow(['Fila', 'Motivo'] + list(lector.fieldnames))
+
+                    def rechazar(numero: int, original: dict, motivo: str):
+                        resultado.rechazadas += 1
+                        resultado.motivos[motivo] += 1
+                        rechazos.writerow([numero, motivo] + [original.get(c, '') for c in lector.fieldnames])
+
+                    for lote, validaciones in self._validados(self._lotes(lector, mapa), date.today()):
+                        resultado.leidas += len(lote)
+                        aceptadas = []
+                        for (numero, _, original), (fila, motivo) in zip(lote, validaciones):
+                            if motivo:
+                                rechazar(numero, original, motivo)
+                                continue
+                            dui = fila[3]
+                            if dui and dui in duis:
+                                rechazar(numero, original, MOTIVO_DUPLICADO_BD)
+                                continue
+                            if dui and dui in duis_archivo:
+                                rechazar(numero, original, MOTIVO_DUPLICADO_ARCHIVO)
+                                continue
+                            if dui:
+                                duis_archivo.add(dui)
+                            aceptadas.append((numero, original, fila))
+
+                        if aceptadas and not self.simular:
+                            errores = self._insertar_lote([fila for _, _, fila in aceptadas])
+                            for (numero, original, _), error in zip(aceptadas, errores):
+                                if error:
+                                    rechazar(numero, original, error)
+                                else:
+                                    resultado.importadas += 1
+                        else:
+                            resultado.importadas += len(aceptadas)
+
+                        resultado.segundos = time.perf_counter() - inicio
+                        if progreso:
+                            progreso(resultado)
+
+        except (OSError, csv.Error) as e:
+            logger.error("❌ Error al leer %s: %s", ruta_csv, e)
+            return None
+
+        resultado.segundos = time.perf_counter() - inicio
+        logger.info("📥 Importación de %s: %s importados, %s rechazados en %.1f s (%s filas/s)",
+                    ruta_csv, resultado.importadas, resultado.rechazadas,
+                    resultado.segundos, resultado.filas_por_segundo)
+        return resultado
+
+
+__all__ = ['ImportadorPacientes', 'ResultadoImportacion', 'validar_fila', 'COLUMNAS', 'TAMANO_LOTE']
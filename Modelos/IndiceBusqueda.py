@@ -0,0 +1,315 @@
+import heapq
+import unicodedata
+from collections import Counter
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+# ==========================================
+# FUNCIÓN: normalizar_texto
+# PROPÓSITO: Llevar nombres a una forma comparable: sin acentos,
+# en minúsculas y con espacios simples ('  Vásquez ' → 'vasquez')
+# ==========================================
+
+def normalizar_texto(texto) -> str:
+    """Quita acentos y diacríticos, aplica casefold y colapsa espacios"""
+    if not texto:
+        return ""
+    descompuesto = unicodedata.normalize('NFKD', str(texto))
+    sin_marcas = ''.join(c for c in descompuesto if not unicodedata.combining(c))
+    return ' '.join(sin_marcas.casefold().split())
+
+
+def trigramas(palabra: str) -> Set[str]:
+    """Trigramas de una palabra con relleno ('  v', ' va', 'vas', ..., 'ez ')"""
+    relleno = f"  {palabra} "
+    return {relleno[i:i + 3] for i in range(len(relleno) - 2)}
+
+
+def _trigramas_requeridos(palabra: str) -> Set[str]:
+    """
+    Trigramas que debe tener una palabra del índice para coincidir con `palabra`:
+    - 3+ letras: sus trigramas internos (puede estar en cualquier parte: 'asq' → vasquez)
+    - 1-2 letras: los trigramas de inicio (coincidencia por prefijo: 'va' → valle, vasquez)
+    """
+    if len(palabra) >= 3:
+        return {palabra[i:i + 3] for i in range(len(palabra) - 2)}
+    relleno = f"  {palabra}"
+    return {relleno[i:i + 3] for i in range(len(palabra))}
+
+
+def coincide_texto(texto, termino) -> bool:
+    """
+    True si `texto` contiene todas las palabras de `termino`, con las mismas reglas
+    que IndiceBusqueda.buscar() (sin acentos; 1-2 letras como inicio de palabra).
+    """
+    texto = ' ' + normalizar_texto(texto)
+    for palabra in normalizar_texto(termino).split():
+        buscada = palabra if len(palabra) >= 3 else ' ' + palabra
+        if buscada not in texto:
+            return False
+    return True
+
+
+def refina_busqueda(anterior, nuevo) -> bool:
+    """
+    True si todo lo que coincide con `nuevo` también coincidía con `anterior`
+    (p. ej. 'vas' → 'vasq', 'ana' → 'ana m'), así los resultados nuevos se pueden
+    obtener filtrando los anteriores sin volver a buscar.
+    """
+    palabras_anteriores = normalizar_texto(anterior).split()
+    palabras_nuevas = normalizar_texto(nuevo).split()
+    if len(palabras_nuevas) < len(palabras_anteriores):
+        return False
+    for previa, actual in zip(palabras_anteriores, palabras_nuevas):
+        if not actual.startswith(previa):
+            return False
+        # De 2 a 3 letras la regla pasa de "inicio de palabra" a "cualquier parte": no es un subconjunto
+        if len(previa) < 3 <= len(actual):
+            return False
+    return True
+
+
+# ==========================================
+# CLASE: _CampoIndexado
+# PROPÓSITO: Índice de un solo campo (p. ej. apellido) en dos niveles:
+#   palabra → claves que la contienen
+#   trigrama → palabras distintas que lo contienen (el vocabulario)
+# ==========================================
+
+class _CampoIndexado:
+    """
+    Los nombres se repiten mucho (miles de pacientes se apellidan igual), así que
+    los trigramas se calculan sobre el vocabulario de palabras distintas, que es
+    pequeño, y no sobre cada paciente. Una búsqueda primero resuelve qué palabras
+    del vocabulario coinciden y después une sus listas de claves.
+    """
+
+    def __init__(self):
+        self.claves_por_palabra: Dict[str, List[Hashable]] = {}
+        self.palabras_por_trigrama: Dict[str, Set[str]] = {}
+
+    def agregar(self, clave: Hashable, palabras: Iterable[str]):
+        for palabra in palabras:
+            claves = self.claves_por_palabra.get(palabra)
+            if claves is None:
+                claves = self.claves_por_palabra[palabra] = []
+                for trigrama in trigramas(palabra):
+                    self.palabras_por_trigrama.setdefault(trigrama, set()).add(palabra)
+            claves.append(clave)
+
+    def quitar(self, clave: Hashable, palabras: Iterable[str]):
+        for palabra in palabras:
+            claves = self.claves_por_palabra.get(palabra)
+            if not claves:
+                continue
+            claves.remove(clave)
+            if not claves:
+                # La palabra ya no la usa nadie: sale también del vocabulario
+                del self.claves_por_palabra[palabra]
+                for trigrama in trigramas(palabra):
+                    del_vocabulario = self.palabras_por_trigrama.get(trigrama)
+                    if del_vocabulario:
+                        del_vocabulario.discard(palabra)
+                        if not del_vocabulario:
+                            del self.palabras_por_trigrama[trigrama]
+
+    def palabras_que_coinciden(self, palabra: str) -> List[str]:
+        """Palabras del vocabulario que contienen `palabra` (o empiezan con ella si es corta)"""
+        grupos = [self.palabras_por_trigrama.get(t) for t in _trigramas_requeridos(palabra)]
+        if not all(grupos):
+            return []
+        candidatas = min(grupos, key=len)
+        if len(palabra) >= 3:
+            return [p for p in candidatas if palabra in p]
+        return [p for p in candidatas if p.startswith(palabra)]
+
+    def palabras_parecidas(self, palabra: str, umbral: float) -> Dict[str, float]:
+        """Palabras del vocabulario con similitud de trigramas (Jaccard) >= umbral"""
+        propios = trigramas(palabra)
+        comunes = Counter()
+        for trigrama in propios:
+            comunes.update(self.palabras_por_trigrama.get(trigrama, ()))
+        parecidas = {}
+        for candidata, compartidos in comunes.items():
+            similitud = compartidos / (len(propios) + len(trigramas(candidata)) - compartidos)
+            if similitud >= umbral:
+                parecidas[candidata] = similitud
+        return parecidas
+
+    def claves_de(self, palabras: Iterable[str]) -> Set[Hashable]:
+        resultado: Set[Hashable] = set()
+        for palabra in palabras:
+            resultado.update(self.claves_por_palabra[palabra])
+        return resultado
+
+    def limpiar(self):
+        self.claves_por_palabra.clear()
+        self.palabras_por_trigrama.clear()
+
+
+# ==========================================
+# CLASE: IndiceBusqueda
+# PROPÓSITO: Buscar por nombre en memoria sin recorrer toda la lista
+# ni la tabla (LIKE '%x%' no puede usar índices)
+# ==========================================
+
+class IndiceBusqueda:
+    """
+    Índice de búsqueda por palabras y trigramas para uno o varios campos.
+
+    - buscar(): cada palabra buscada debe aparecer en el campo, sin importar acentos
+      ni mayúsculas. Con 3+ letras puede estar en cualquier parte de una palabra
+      ('asq' → Vásquez); con 1-2 letras se busca como inicio de palabra ('va' → Valle).
+    - Si no hay coincidencias exactas, se devuelven los más parecidos por similitud
+      de trigramas (búsqueda difusa: 'Vasques' → Vásquez).
+    - agregar()/quitar() actualizan solo las entradas del elemento afectado.
+    """
+
+    def __init__(self, campos: Tuple[str, ...], umbral_similitud: float = 0.4):
+        """
+        Args:
+            campos: Nombres de los campos indexados; también fijan el orden de los resultados
+            umbral_similitud: Similitud mínima (0-1) de una palabra en la búsqueda difusa
+        """
+        self.campos = tuple(campos)
+        self.umbral_similitud = umbral_similitud
+        self._indices: Dict[str, _CampoIndexado] = {campo: _CampoIndexado() for campo in self.campos}
+        self._textos: Dict[Hashable, Tuple[str, ...]] = {}
+        self._valores: Dict[Hashable, Any] = {}
+
+    # ==========================================
+    # MANTENIMIENTO
+    # ==========================================
+
+    def agregar(self, clave: Hashable, valor: Any, **textos):
+        """
+        Indexa (o reindexa) un elemento.
+        :param clave: Identificador único (p. ej. ID_Paciente)
+        :param valor: Objeto que devuelve la búsqueda
+        :param textos: Texto de cada campo, p. ej. nombre='Ana', apellido='Vásquez'
+        """
+        normalizados = tuple(normalizar_texto(textos.get(campo, "")) for campo in self.campos)
+        self._valores[clave] = valor
+        if self._textos.get(clave) == normalizados:
+            return
+        if clave in self._textos:
+            self._quitar_textos(clave)
+
+        self._textos[clave] = normalizados
+        for campo, texto in zip(self.campos, normalizados):
+            self._indices[campo].agregar(clave, set(texto.split()))
+
+    def _quitar_textos(self, clave: Hashable):
+        for campo, texto in zip(self.campos, self._textos.pop(clave)):
+            self._indices[campo].quitar(clave, set(texto.split()))
+
+    def quitar(self, clave: Hashable) -> bool:
+        """Saca un elemento del índice; devuelve False si no estaba"""
+        if clave not in self._textos:
+            return False
+        self._quitar_textos(clave)
+        self._valores.pop(clave, None)
+        return True
+
+    def reconstruir(self, elementos: Iterable[Tuple[Hashable, Any, Dict[str, str]]]):
+        """Vacía el índice y lo vuelve a llenar con (clave, valor, textos por campo)"""
+        self.limpiar()
+        for clave, valor, textos in elementos:
+            self.agregar(clave, valor, **textos)
+
+    def limpiar(self):
+        for indice in self._indices.values():
+            indice.limpiar()
+        self._textos.clear()
+        self._valores.clear()
+
+    # ==========================================
+    # BÚSQUEDA
+    # ==========================================
+
+    def _palabras_buscadas(self, terminos: Dict[str, str]) -> List[Tuple[str, str]]:
+        """(campo, palabra) de todos los términos, ya normalizados"""
+        palabras = []
+        for campo, texto in terminos.items():
+            if campo in self._indices:
+                palabras.extend((campo, palabra) for palabra in normalizar_texto(texto).split())
+        return palabras
+
+    def _ordenar(self, claves, limite: Optional[int]) -> List[Any]:
+        textos = self._textos
+        if limite is None:
+            ordenadas = sorted(claves, key=textos.__getitem__)
+        else:
+            ordenadas = heapq.nsmallest(limite, claves, key=textos.__getitem__)
+        return [self._valores[clave] for clave in ordenadas]
+
+    def buscar(self, limite: Optional[int] = None, difuso: bool = True, **terminos) -> List[Any]:
+        """
+        Busca elementos cuyos campos contengan todas las palabras de los términos.
+
+        Args:
+            limite: Máximo de resultados (None = todos)
+            difuso: Si no hay coincidencias exactas, devolver los más parecidos
+            **terminos: Texto a buscar por campo; los vacíos se ignoran
+
+        Returns:
+            Valores encontrados: los exactos ordenados por los campos, los difusos por similitud
+        """
+        palabras = self._palabras_buscadas(terminos)
+        if not palabras:
+            return []
+
+        # Resolver cada palabra contra el vocabulario y empezar por la que menos claves trae
+        grupos = []
+        for campo, palabra in palabras:
+            indice = self._indices[campo]
+            coincidencias = indice.palabras_que_coinciden(palabra)
+            if not coincidencias:
+                grupos = None
+                break
+            grupos.append((sum(len(indice.claves_por_palabra[p]) for p in coincidencias), campo, coincidencias))
+
+        if grupos:
+            grupos.sort(key=lambda g: g[0])
+            encontrados = self._indices[grupos[0][1]].claves_de(grupos[0][2])
+            for _, campo, coincidencias in grupos[1:]:
+                if not encontrados:
+                    break
+                encontrados &= self._indices[campo].claves_de(coincidencias)
+            if encontrados:
+                return self._ordenar(encontrados, limite)
+
+        if not difuso:
+            return []
+        return self._buscar_difuso(palabras, limite)
+
+    def _buscar_difuso(self, palabras: List[Tuple[str, str]], limite: Optional[int]) -> List[Any]:
+        """Suma, por elemento, la mejor similitud de cada palabra buscada; todas deben tener alguna"""
+        puntajes: Optional[Dict[Hashable, float]] = None
+        for campo, palabra in palabras:
+            indice = self._indices[campo]
+            mejor: Dict[Hashable, float] = {}
+            for parecida, similitud in indice.palabras_parecidas(palabra, self.umbral_similitud).items():
+                for clave in indice.claves_por_palabra[parecida]:
+                    if similitud > mejor.get(clave, 0.0):
+                        mejor[clave] = similitud
+
+            if puntajes is None:
+                puntajes = mejor
+            else:
+                puntajes = {clave: puntaje + mejor[clave] for clave, puntaje in puntajes.items() if clave in mejor}
+            if not puntajes:
+                return []
+
+        textos = self._textos
+        orden = lambda clave: (-puntajes[clave], textos[clave])
+        ordenadas = sorted(puntajes, key=orden) if limite is None else heapq.nsmallest(limite, puntajes, key=orden)
+        return [self._valores[clave] for clave in ordenadas]
+
+    def __contains__(self, clave: Hashable) -> bool:
+        return clave in self._textos
+
+    def __len__(self) -> int:
+        return len(self._textos)
+
+
+__all__ = ['IndiceBusqueda', 'normalizar_texto', 'trigramas', 'coincide_texto', 'refina_busqueda']
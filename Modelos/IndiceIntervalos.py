@@ -0,0 +1,138 @@
+from bisect import bisect_left
+from datetime import time as datetime_time, timedelta
+from typing import Any, Dict, Hashable, List, Optional
+
+# ==========================================
+# FUNCIÓN: hora_a_minutos
+# PROPÓSITO: Normalizar una hora ('HH:MM', time o timedelta de MySQL)
+# a minutos desde medianoche, una sola vez por intervalo
+# ==========================================
+
+def hora_a_minutos(hora) -> int:
+    """Convierte 'HH:MM', datetime.time o timedelta (columna TIME de MySQL) a minutos"""
+    if isinstance(hora, str):
+        h, m = hora.split(':')[:2]
+        return int(h) * 60 + int(m)
+    if isinstance(hora, datetime_time):
+        return hora.hour * 60 + hora.minute
+    if isinstance(hora, timedelta):
+        return int(hora.total_seconds()) // 60
+    return 0
+
+
+# ==========================================
+# CLASE: _ListaIntervalos
+# PROPÓSITO: Intervalos de una sola clave ordenados por inicio, con el
+# máximo acumulado de los finales para responder solapes con bisect
+# ==========================================
+
+class _ListaIntervalos:
+    """Intervalos [inicio, fin) ordenados por inicio"""
+
+    def __init__(self):
+        self.inicios: List[int] = []
+        self.fines: List[int] = []
+        self.valores: List[Any] = []
+        # max_fin[i] = mayor fin entre los intervalos 0..i
+        self.max_fin: List[int] = []
+
+    def agregar(self, inicio: int, fin: int, valor: Any):
+        pos = bisect_left(self.inicios, inicio)
+        self.inicios.insert(pos, inicio)
+        self.fines.insert(pos, fin)
+        self.valores.insert(pos, valor)
+        self.max_fin.insert(pos, 0)
+        self._recalcular_desde(pos)
+
+    def quitar(self, valor: Any) -> bool:
+        for pos, actual in enumerate(self.valores):
+            if actual is valor or actual == valor:
+                del self.inicios[pos], self.fines[pos], self.valores[pos], self.max_fin[pos]
+                self._recalcular_desde(pos)
+                return True
+        return False
+
+    def _recalcular_desde(self, pos: int):
+        acumulado = self.max_fin[pos - 1] if pos > 0 else 0
+        for i in range(pos, len(self.fines)):
+            acumulado = max(acumulado, self.fines[i])
+            self.max_fin[i] = acumulado
+
+    def solapados(self, inicio: int, fin: int, excluir: Any = None):
+        """
+        Genera los valores cuyo intervalo se cruza con [inicio, fin).
+        Solo pueden cruzarse los que empiezan antes de `fin` (bisect, O(log n));
+        de esos se recorre hacia atrás mientras el máximo acumulado de los
+        finales siga pasando de `inicio`.
+        """
+        i = bisect_left(self.inicios, fin) - 1
+        while i >= 0 and self.max_fin[i] > inicio:
+            if self.fines[i] > inicio and (excluir is None or self.valores[i] != excluir):
+                yield self.valores[i]
+            i -= 1
+
+    def __len__(self):
+        return len(self.valores)
+
+
+# ==========================================
+# CLASE: IndiceIntervalos
+# PROPÓSITO: Índice en memoria de intervalos de tiempo por clave
+# (p. ej. ID_Doctor para horarios, (ID_Doctor, fecha) para citas)
+# ==========================================
+
+class IndiceIntervalos:
+    """
+    Índice de intervalos de tiempo agrupados por clave.
+
+    - buscar_conflicto: O(log n) para saber si un rango se cruza con alguno existente.
+    - agregar / quitar: O(n) de la clave afectada (inserción en lista ordenada).
+
+    Los extremos se guardan en minutos, así cada hora se interpreta una sola vez
+    al indexarla y no en cada comparación.
+    """
+
+    def __init__(self):
+        self._por_clave: Dict[Hashable, _ListaIntervalos] = {}
+
+    def agregar(self, clave: Hashable, inicio, fin, valor: Any):
+        """Indexa `valor` en el rango [inicio, fin) de la clave"""
+        lista = self._por_clave.setdefault(clave, _ListaIntervalos())
+        lista.agregar(hora_a_minutos(inicio), hora_a_minutos(fin), valor)
+
+    def quitar(self, clave: Hashable, valor: Any) -> bool:
+        """Quita `valor` del índice de la clave; devuelve False si no estaba"""
+        lista = self._por_clave.get(clave)
+        return lista.quitar(valor) if lista else False
+
+    def reemplazar(self, clave: Hashable, intervalos):
+        """Sustituye todos los intervalos de la clave por (inicio, fin, valor) dados"""
+        self._por_clave.pop(clave, None)
+        for inicio, fin, valor in intervalos:
+            self.agregar(clave, inicio, fin, valor)
+
+    def buscar_conflicto(self, clave: Hashable, inicio, fin, excluir: Any = None) -> Optional[Any]:
+        """
+        Devuelve un valor cuyo rango se cruza con [inicio, fin) en la clave, o None.
+        :param excluir: Valor a ignorar (p. ej. la misma cita al modificarla).
+        """
+        lista = self._por_clave.get(clave)
+        if not lista:
+            return None
+        return next(lista.solapados(hora_a_minutos(inicio), hora_a_minutos(fin), excluir), None)
+
+    def conflictos(self, clave: Hashable, inicio, fin, excluir: Any = None) -> List[Any]:
+        """Devuelve todos los valores cuyo rango se cruza con [inicio, fin) en la clave"""
+        lista = self._por_clave.get(clave)
+        if not lista:
+            return []
+        return list(lista.solapados(hora_a_minutos(inicio), hora_a_minutos(fin), excluir))
+
+    def limpiar(self):
+        self._por_clave.clear()
+
+    def __len__(self):
+        return sum(len(lista) for lista in self._por_clave.values())
+
+
+__all__ = ['IndiceIntervalos', 'hora_a_minutos']
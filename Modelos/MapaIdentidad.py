@@ -0,0 +1,68 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from Config.logging_config import obtener_logger
+
+logger = obtener_logger('Modelos.MapaIdentidad')
+
+# ==========================================
+# CLASE: MapaIdentidad
+# PROPÓSITO: Garantizar que, dentro de una misma carga desde la BD, cada
+# entidad (Paciente, Doctor, Tratamiento...) se construya una sola vez
+# aunque aparezca en muchas filas de un JOIN
+# ==========================================
+
+class MapaIdentidad:
+    """
+    Caché de entidades por (tipo, ID) que vive lo que dura una carga.
+
+    Uso:
+        mapa = MapaIdentidad()
+        paciente = mapa.obtener(Paciente, id_paciente, lambda: Paciente(...))
+
+    La fábrica solo se ejecuta la primera vez que aparece el ID; las filas
+    siguientes reciben la misma instancia.
+    """
+
+    def __init__(self):
+        self._entidades: Dict[Tuple[str, Hashable], Any] = {}
+        self.aciertos = 0
+        self.creadas = 0
+
+    def obtener(self, tipo, clave: Hashable, fabrica: Callable[[], Any]) -> Any:
+        """
+        Devuelve la entidad ya construida para (tipo, clave) o la crea con la fábrica.
+
+        Args:
+            tipo: Clase de la entidad (o un nombre que la identifique)
+            clave: ID de la entidad en la BD; si es None siempre se crea una instancia nueva
+            fabrica: Función sin argumentos que construye la entidad
+
+        Returns:
+            La instancia compartida de la entidad
+        """
+        if clave is None:
+            return fabrica()
+
+        llave = (getattr(tipo, '__name__', str(tipo)), clave)
+        entidad = self._entidades.get(llave)
+        if entidad is None:
+            entidad = fabrica()
+            self._entidades[llave] = entidad
+            self.creadas += 1
+        else:
+            self.aciertos += 1
+        return entidad
+
+    def registrar_resumen(self, origen: str):
+        """Deja en el log cuántas entidades se construyeron y cuántas se reutilizaron"""
+        logger.debug("🧩 %s: %s entidades creadas, %s reutilizadas", origen, self.creadas, self.aciertos)
+
+    def __len__(self):
+        return len(self._entidades)
+
+
+__all__ = ['MapaIdentidad']
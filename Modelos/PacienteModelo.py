@@ -4,8 +4,8 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 # Importar configuración centralizada
-from Config.database_config import obtener_conexion, probar_conexion, cerrar_conexion_segura
-import mysql.connector  # Mantener para manejo de errores específicos
+from Config.database_config import obtener_conexion, conexion_bd, probar_conexion, cerrar_conexion_segura, Error
+from Config.logging_config import obtener_logger
 import sys
 import os 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
@@ -18,6 +18,14 @@ from datetime import datetime
 from typing import List
 import re
 
+try:
+    from .RegistroIds import RegistroIds
+except ImportError:
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+    from RegistroIds import RegistroIds
+
+logger = obtener_logger('Modelos.PacienteModelo')
+
 # ==========================================
 # CLASE: Paciente
 # PROPÓSITO: Clase que representa un paciente de la clínica (SOLO DATOS Y OPERACIONES DE DATOS)
@@ -25,8 +33,7 @@ import re
 
 class Paciente:
     """Clase que representa un paciente de la clínica - Solo manejo de datos"""
-    _contador_id = 1  # Contador de clase para generar IDs únicos
-    _pacientes_existentes = []  # Lista para rastrear todos los IDs existentes
+    _pacientes_existentes = RegistroIds()  # IDs en uso y siguiente ID libre (búsquedas O(1))
     
     def __init__(self, nombre: str, apellido: str, fecha_nacimiento: datetime, 
                  telefono: int, correo: str, dui: str = "", saldo_pendiente: float = 0.0, id_paciente: int = None):
@@ -42,13 +49,8 @@ class Paciente:
             self.id_paciente = Paciente._obtener_siguiente_id()
         else:
             self.id_paciente = id_paciente
-            # Actualizar el contador si el ID proporcionado es mayor
-            if id_paciente >= Paciente._contador_id:
-                Paciente._contador_id = id_paciente + 1
-        
-        # Registrar este ID como usado
-        if self.id_paciente not in Paciente._pacientes_existentes:
-            Paciente._pacientes_existentes.append(self.id_paciente)
+            # Registrar este ID como usado (también adelanta el contador si es mayor)
+            Paciente._pacientes_existentes.registrar(id_paciente)
         
         self.nombre = str(nombre).replace("  ", " ") if nombre else ""
         if self.nombre.startswith(" "):
@@ -97,34 +99,15 @@ class Paciente:
     @classmethod
     def _obtener_siguiente_id(cls) -> int:
         """Obtiene el siguiente ID disponible de forma robusta"""
-        # Buscar el siguiente ID que no esté en uso
-        while cls._contador_id in cls._pacientes_existentes:
-            cls._contador_id += 1
-        
-        # Retornar el ID actual y incrementar para el siguiente
-        id_actual = cls._contador_id
-        cls._contador_id += 1
-        return id_actual
+        return cls._pacientes_existentes.asignar()
     
 
 
     @classmethod
     def inicializar_contador_desde_pacientes(cls, pacientes_existentes: List['Paciente']):
         """Inicializa el contador basado en pacientes existentes"""
-        if not pacientes_existentes:
-            cls._contador_id = 1
-            cls._pacientes_existentes = []
-            return
-        
-        # Obtener todos los IDs existentes
-        ids_existentes = [p.id_paciente for p in pacientes_existentes]
-        cls._pacientes_existentes = ids_existentes.copy()
-        
-        # Establecer el contador como el mayor ID + 1
-        if ids_existentes:
-            cls._contador_id = max(ids_existentes) + 1
-        else:
-            cls._contador_id = 1
+        # El registro toma el mayor ID + 1 como siguiente ID libre
+        cls._pacientes_existentes.reiniciar(p.id_paciente for p in pacientes_existentes or [])
 
     # ==========================================
     # MÉTODOS DE GESTIÓN DE HISTORIAL MÉDICO
@@ -206,15 +189,14 @@ class Paciente:
     @classmethod
     def get_next_id(cls) -> int:
         """Obtiene el próximo ID disponible sin incrementar el contador"""
-        return cls._contador_id
+        return cls._pacientes_existentes.siguiente
     
 
 
     @classmethod
     def set_contador_id(cls, nuevo_contador: int):
         """Establece el contador de ID (útil para cargar datos existentes)"""
-        if nuevo_contador > cls._contador_id:
-            cls._contador_id = nuevo_contador
+        cls._pacientes_existentes.adelantar_a(nuevo_contador)
     
     def tiene_dui(self) -> bool:
         """Verifica si el paciente tiene DUI registrado"""
@@ -314,62 +296,65 @@ class Paciente:
         """
         Consulta a la base de datos para buscar pacientes por nombre y/o apellido
         
+        La búsqueda es por inicio del texto ('Vás' → Vásquez) para poder usar los índices
+        idx_paciente_nombre / idx_paciente_apellido_nombre; la collation de la tabla ya ignora
+        acentos y mayúsculas. La búsqueda por cualquier parte del nombre y la difusa se hacen
+        en memoria con IndiceBusqueda (ver PacienteControlador).
+
         Args:
-            nombre (str): Nombre del paciente a buscar (búsqueda parcial)
-            apellido (str): Apellido del paciente a buscar (búsqueda parcial)
+            nombre (str): Inicio del nombre del paciente a buscar
+            apellido (str): Inicio del apellido del paciente a buscar
             
         Returns:
             List[Paciente]: Lista de objetos Paciente que coinciden con los criterios de búsqueda
         """
         try:
-            print(f"📡 Ejecutando búsqueda SQL con: nombre='{nombre}', apellido='{apellido}'")
+            logger.debug("📡 Ejecutando búsqueda SQL con: nombre='%s', apellido='%s'", nombre, apellido)
             
             # Establecer conexión con la base de datos MySQL
-            conexion = obtener_conexion()
-            if not conexion:
-                return False
-            cursor = conexion.cursor()  
-            
-            # Query con LIKE para búsqueda parcial en nombre y apellido
-            query = """
-                SELECT ID_Paciente, Nombre, Apellido, Fecha_Nacimiento, DUI
-                FROM paciente
-                WHERE Nombre LIKE %s AND Apellido LIKE %s
-            """
-            
-            # Ejecutar consulta con parámetros de búsqueda (% para wildcards)
-            cursor.execute(query, (f"%{nombre}%", f"%{apellido}%"))
-            resultados = cursor.fetchall()
-            print("✅ Resultados:", resultados)
-
-            # Convertir resultados de BD a objetos Paciente
-            pacientes = []
-            for fila in resultados:
-                id_paciente, nombre, apellido, fecha_nac, dui = fila
-                # Crear objeto Paciente con los datos básicos de la BD
-                paciente = Paciente(
-                    nombre=nombre,
-                    apellido=apellido,
-                    fecha_nacimiento=fecha_nac,
-                    telefono=0,  # Valor por defecto ya que no se consulta
-                    correo="",   # Valor por defecto ya que no se consulta
-                    dui=dui,
-                    id_paciente=id_paciente
-                )
-                pacientes.append(paciente)
-            return pacientes
-            
-        except mysql.connector.Error as e:
-            print(f"❌ Error al buscar pacientes: {e}")
-            return []  # Retornar lista vacía en caso de error
+            with conexion_bd() as conexion:
+                if not conexion:
+                    return False
+                cursor = conexion.cursor()  
+            
+                # LIKE 'texto%' (sin comodín al inicio) sí puede recorrer el índice
+                query = """
+                    SELECT ID_Paciente, Nombre, Apellido, Fecha_Nacimiento, DUI
+                    FROM paciente
+                    WHERE Nombre LIKE %s AND Apellido LIKE %s
+                    ORDER BY Apellido, Nombre
+                """
+
+                def prefijo(texto):
+                    # Escapar los comodines que escriba el usuario
+                    texto = (texto or "").strip().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+                    return f"{texto}%"
+
+                cursor.execute(query, (prefijo(nombre), prefijo(apellido)))
+                resultados = cursor.fetchall()
+                logger.debug("✅ Resultados: %s", resultados)
+
+                # Convertir resultados de BD a objetos Paciente
+                pacientes = []
+                for fila in resultados:
+                    id_paciente, nombre, apellido, fecha_nac, dui = fila
+                    # Crear objeto Paciente con los datos básicos de la BD
+                    paciente = Paciente(
+                        nombre=nombre,
+                        apellido=apellido,
+                        fecha_nacimiento=fecha_nac,
+                        telefono=0,  # Valor por defecto ya que no se consulta
+                        correo="",   # Valor por defecto ya que no se consulta
+                        dui=dui,
+                        id_paciente=id_paciente
+                    )
+                    pacientes.append(paciente)
+                return pacientes
             
-        finally:
-            # Cerrar cursor y conexión para liberar recursos
-            if 'cursor' in locals():
-                cursor.close()
-            if 'conexion' in locals():
-                conexion.close()
-                    
+        except Error as e:
+            logger.error("❌ Error al buscar pacientes: %s", e)
+            return []  # Retornar lista vacía en caso de error
+
     @staticmethod
     def insertar_en_bd(paciente: 'Paciente') -> bool:
         """
@@ -383,44 +368,37 @@ class Paciente:
         """
         try:
             # Establecer conexión con la base de datos MySQL
-            conexion = obtener_conexion()
-            if not conexion:
-                return False
-            cursor = conexion.cursor()  
-
-            # Query INSERT con todos los campos del paciente
-            query = """
-            INSERT INTO paciente (Nombre, Apellido, Fecha_Nacimiento, DUI, Telefono, Correo)
-            VALUES (%s, %s, %s, %s, %s, %s)
-            """
-            
-            # Ejecutar INSERT con los datos del paciente
-            cursor.execute(query, (
-                paciente.nombre,
-                paciente.apellido,
-                paciente.fecha_nacimiento.strftime('%Y-%m-%d'),  # Formato fecha para MySQL
-                paciente.dui,
-                str(paciente.telefono),  # Convertir a string para consistencia
-                paciente.correo
-            ))
-            
-            # Confirmar transacción en la base de datos
-            conexion.commit()
-
-            print("✅ Paciente insertado en la base de datos.")
-            return True
-
-        except mysql.connector.Error as e:
-            print(f"❌ Error al insertar paciente: {e}")
+            with conexion_bd() as conexion:
+                if not conexion:
+                    return False
+                cursor = conexion.cursor()  
+
+                # Query INSERT con todos los campos del paciente
+                query = """
+                INSERT INTO paciente (Nombre, Apellido, Fecha_Nacimiento, DUI, Telefono, Correo)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                """
+            
+                # Ejecutar INSERT con los datos del paciente
+                cursor.execute(query, (
+                    paciente.nombre,
+                    paciente.apellido,
+                    paciente.fecha_nacimiento.strftime('%Y-%m-%d'),  # Formato fecha para MySQL
+                    paciente.dui,
+                    str(paciente.telefono),  # Convertir a string para consistencia
+                    paciente.correo
+                ))
+            
+                # Confirmar transacción en la base de datos
+                conexion.commit()
+
+                logger.debug("✅ Paciente insertado en la base de datos.")
+                return True
+
+        except Error as e:
+            logger.error("❌ Error al insertar paciente: %s", e)
             return False  # Retornar False si hay error en la inserción
 
-        finally:
-            # Cerrar cursor y conexión para liberar recursos
-            if 'cursor' in locals():
-                cursor.close()
-            if 'conexion' in locals():
-                conexion.close()
-    
     @staticmethod
     def obtener_todos_los_pacientes():
         """
@@ -429,90 +407,71 @@ class Paciente:
         Returns:
             List[Paciente]: Lista de todos los objetos Paciente en la base de datos
         """
-        conexion = None
-        cursor = None
         try:
-            print("📡 Cargando todos los pacientes desde la base de datos...")
+            logger.debug("📡 Cargando todos los pacientes desde la base de datos...")
             
             # Establecer conexión con la base de datos MySQL
-            conexion = obtener_conexion()
-            if not conexion:
-                print("⚠️  No se pudo conectar a la base de datos")
-                return []  # Retornar lista vacía en lugar de False
-            
-            cursor = conexion.cursor()
-            
-            # Query para obtener todos los pacientes con todos sus campos
-            query = """
-                SELECT ID_Paciente, Nombre, Apellido, Fecha_Nacimiento, DUI, Telefono, Correo
-                FROM paciente
-                ORDER BY ID_Paciente
-            """
-            
-            print("🔍 Ejecutando consulta SQL...")
-            # Ejecutar consulta
-            cursor.execute(query)
-            resultados = cursor.fetchall()
-            print(f"✅ Se encontraron {len(resultados)} pacientes en la base de datos")
-
-            # Primero, limpiar contadores para evitar conflictos
-            Paciente._pacientes_existentes = []
-            
-            # Obtener todos los IDs existentes de la BD para inicializar correctamente
-            ids_existentes = [fila[0] for fila in resultados]  # ID_Paciente es el primer campo
-            if ids_existentes:
-                # Establecer el contador al siguiente ID disponible
-                Paciente._contador_id = max(ids_existentes) + 1
-                print(f"🔧 Contador de IDs inicializado a: {Paciente._contador_id}")
-
-            # Convertir resultados de BD a objetos Paciente
-            pacientes = []
-            for fila in resultados:
-                try:
-                    id_paciente, nombre, apellido, fecha_nac, dui, telefono, correo = fila
+            with conexion_bd() as conexion:
+                if not conexion:
+                    logger.warning("⚠️  No se pudo conectar a la base de datos")
+                    return []  # Retornar lista vacía en lugar de False
+            
+                cursor = conexion.cursor()
+            
+                # Query para obtener todos los pacientes con todos sus campos
+                query = """
+                    SELECT ID_Paciente, Nombre, Apellido, Fecha_Nacimiento, DUI, Telefono, Correo
+                    FROM paciente
+                    ORDER BY ID_Paciente
+                """
+            
+                logger.debug("🔍 Ejecutando consulta SQL...")
+                # Ejecutar consulta
+                cursor.execute(query)
+                resultados = cursor.fetchall()
+                logger.debug("✅ Se encontraron %s pacientes en la base de datos", len(resultados))
+
+                # Reiniciar el registro con los IDs de la BD (ID_Paciente es el primer campo)
+                Paciente._pacientes_existentes.reiniciar(fila[0] for fila in resultados)
+                logger.debug("🔧 Contador de IDs inicializado a: %s", Paciente.get_next_id())
+
+                # Convertir resultados de BD a objetos Paciente
+                pacientes = []
+                for fila in resultados:
+                    try:
+                        id_paciente, nombre, apellido, fecha_nac, dui, telefono, correo = fila
                     
-                    # Manejar valores nulos de la base de datos
-                    dui = dui if dui else ""
-                    telefono = int(telefono) if telefono and str(telefono).isdigit() else 0
-                    correo = correo if correo else ""
+                        # Manejar valores nulos de la base de datos
+                        dui = dui if dui else ""
+                        telefono = int(telefono) if telefono and str(telefono).isdigit() else 0
+                        correo = correo if correo else ""
                     
-                    # Crear objeto Paciente con todos los datos de la BD
-                    # Pasar explícitamente el id_paciente para evitar que se genere automáticamente
-                    paciente = Paciente(
-                        nombre=nombre,
-                        apellido=apellido,
-                        fecha_nacimiento=fecha_nac,
-                        telefono=telefono,
-                        correo=correo,
-                        dui=dui,
-                        saldo_pendiente=0.0,  # Por ahora ponemos 0, luego se puede agregar este campo a la BD
-                        id_paciente=id_paciente  # IMPORTANTE: Usar el ID de la BD
-                    )
-                    pacientes.append(paciente)
-                except Exception as e:
-                    print(f"⚠️  Error al procesar paciente {fila}: {e}")
-                    continue
-            
-            print(f"📊 IDs cargados: {[p.id_paciente for p in pacientes]}")
-            return pacientes
-            
-        except mysql.connector.Error as db_error:
-            print(f"❌ Error de MySQL al cargar pacientes: {db_error}")
+                        # Crear objeto Paciente con todos los datos de la BD
+                        # Pasar explícitamente el id_paciente para evitar que se genere automáticamente
+                        paciente = Paciente(
+                            nombre=nombre,
+                            apellido=apellido,
+                            fecha_nacimiento=fecha_nac,
+                            telefono=telefono,
+                            correo=correo,
+                            dui=dui,
+                            saldo_pendiente=0.0,  # Por ahora ponemos 0, luego se puede agregar este campo a la BD
+                            id_paciente=id_paciente  # IMPORTANTE: Usar el ID de la BD
+                        )
+                        pacientes.append(paciente)
+                    except Exception as e:
+                        logger.error("⚠️  Error al procesar paciente %s: %s", fila, e)
+                        continue
+            
+                logger.debug("📊 Pacientes cargados: %s", len(pacientes))
+                return pacientes
+            
+        except Error as db_error:
+            logger.error("❌ Error de MySQL al cargar pacientes: %s", db_error)
             return []  # Retornar lista vacía en caso de error
         except Exception as e:
-            print(f"❌ Error inesperado al cargar pacientes: {e}")
+            logger.error("❌ Error inesperado al cargar pacientes: %s", e)
             return []  # Retornar lista vacía en caso de error
-            
-        finally:
-            # Cerrar cursor y conexión para liberar recursos
-            try:
-                if cursor:
-                    cursor.close()
-                if conexion:
-                    conexion.close()
-                print("🔒 Conexión a la base de datos cerrada")
-            except Exception as e:
-                print(f"⚠️  Error al cerrar conexión: {e}")
 
     # ==========================================
     # MÉTODOS DE HISTORIAL MÉDICO CON BASE DE DATOS
@@ -531,48 +490,42 @@ class Paciente:
         """
         try:
             # Conectar a la base de datos
-            conexion = obtener_conexion()
-            if not conexion:
-                return False
-            cursor = conexion.cursor()  
-            
-            
-            # Query para obtener el historial médico
-            query = """
-                SELECT ID_Historial, ID_Paciente, Fecha_Creacion, Notas_Generales, Estado
-                FROM Historial_Medico
-                WHERE ID_Paciente = %s
-                ORDER BY Fecha_Creacion DESC
-            """
-            
-            cursor.execute(query, (id_paciente,))
-            resultados = cursor.fetchall()
-            
-            # Convertir resultados a lista de diccionarios
-            historial = []
-            for fila in resultados:
-                id_historial, id_pac, fecha_creacion, notas, estado = fila
-                historial.append({
-                    'id_historial': id_historial,
-                    'id_paciente': id_pac,
-                    'fecha_creacion': fecha_creacion,
-                    'notas_generales': notas if notas else 'Sin notas registradas',
-                    'estado': estado if estado else 'Activo'
-                })
-            
-            print(f"📋 Se encontraron {len(historial)} registros médicos para paciente #{id_paciente}")
-            return historial
-            
-        except mysql.connector.Error as e:
-            print(f"❌ Error al obtener historial médico: {e}")
+            with conexion_bd() as conexion:
+                if not conexion:
+                    return False
+                cursor = conexion.cursor()  
+            
+            
+                # Query para obtener el historial médico
+                query = """
+                    SELECT ID_Historial, ID_Paciente, Fecha_Creacion, Notas_Generales, Estado
+                    FROM Historial_Medico
+                    WHERE ID_Paciente = %s
+                    ORDER BY Fecha_Creacion DESC
+                """
+            
+                cursor.execute(query, (id_paciente,))
+                resultados = cursor.fetchall()
+            
+                # Convertir resultados a lista de diccionarios
+                historial = []
+                for fila in resultados:
+                    id_historial, id_pac, fecha_creacion, notas, estado = fila
+                    historial.append({
+                        'id_historial': id_historial,
+                        'id_paciente': id_pac,
+                        'fecha_creacion': fecha_creacion,
+                        'notas_generales': notas if notas else 'Sin notas registradas',
+                        'estado': estado if estado else 'Activo'
+                    })
+            
+                logger.debug("📋 Se encontraron %s registros médicos para paciente #%s", len(historial), id_paciente)
+                return historial
+            
+        except Error as e:
+            logger.error("❌ Error al obtener historial médico: %s", e)
             return []
-            
-        finally:
-            if 'cursor' in locals():
-                cursor.close()
-            if 'conexion' in locals():
-                conexion.close()
-    
+
     @staticmethod
     def insertar_historial_medico_en_bd(id_paciente: int, notas_generales: str, estado: str = "Activo") -> bool:
         """
@@ -589,69 +542,60 @@ class Paciente:
         try:
             # Validar datos de entrada
             if not id_paciente or id_paciente <= 0:
-                print(f"❌ ID de paciente inválido: {id_paciente}")
+                logger.error("❌ ID de paciente inválido: %s", id_paciente)
                 return False
             
             if not notas_generales or not notas_generales.strip():
-                print("❌ Las notas generales no pueden estar vacías")
+                logger.error("❌ Las notas generales no pueden estar vacías")
                 return False
             
             # Truncar notas si exceden el límite de la BD (VARCHAR(100))
             notas_truncadas = notas_generales[:100] if len(notas_generales) > 100 else notas_generales
             if len(notas_generales) > 100:
-                print(f"⚠️ Notas truncadas de {len(notas_generales)} a {len(notas_truncadas)} caracteres")
+                logger.warning("⚠️ Notas truncadas de %s a %s caracteres", len(notas_generales), len(notas_truncadas))
             
             # Conectar a la base de datos
-            conexion = obtener_conexion()
-            if not conexion:
-                print("❌ No se pudo establecer conexión a la base de datos")
-                return False
+            with conexion_bd() as conexion:
+                if not conexion:
+                    logger.error("❌ No se pudo establecer conexión a la base de datos")
+                    return False
             
-            cursor = conexion.cursor()  
+                cursor = conexion.cursor()  
             
-            # Verificar que el paciente exista
-            cursor.execute("SELECT ID_Paciente FROM Paciente WHERE ID_Paciente = %s", (id_paciente,))
-            resultado = cursor.fetchone()
-            if not resultado:
-                print(f"❌ No se encontró paciente con ID {id_paciente}")
-                return False
+                # Verificar que el paciente exista
+                cursor.execute("SELECT ID_Paciente FROM Paciente WHERE ID_Paciente = %s", (id_paciente,))
+                resultado = cursor.fetchone()
+                if not resultado:
+                    logger.error("❌ No se encontró paciente con ID %s", id_paciente)
+                    return False
             
-            # Query para insertar historial médico
-            query = """
-                INSERT INTO Historial_Medico (ID_Paciente, Fecha_Creacion, Notas_Generales, Estado)
-                VALUES (%s, %s, %s, %s)
-            """
+                # Query para insertar historial médico
+                query = """
+                    INSERT INTO Historial_Medico (ID_Paciente, Fecha_Creacion, Notas_Generales, Estado)
+                    VALUES (%s, %s, %s, %s)
+                """
             
-            fecha_actual = datetime.now()
+                fecha_actual = datetime.now()
             
-            print(f"🔧 Ejecutando query: {query}")
-            print(f"🔧 Parámetros: ID_Paciente={id_paciente}, Fecha={fecha_actual}, Notas_longitud={len(notas_truncadas)}, Estado={estado}")
+                logger.debug("🔧 Ejecutando query: %s", query)
+                logger.debug("🔧 Parámetros: ID_Paciente=%s, Fecha=%s, Notas_longitud=%s, Estado=%s", id_paciente, fecha_actual, len(notas_truncadas), estado)
             
-            cursor.execute(query, (id_paciente, fecha_actual, notas_truncadas, estado))
+                cursor.execute(query, (id_paciente, fecha_actual, notas_truncadas, estado))
             
-            # Confirmar los cambios
-            conexion.commit()
+                # Confirmar los cambios
+                conexion.commit()
             
-            print(f"✅ Historial médico insertado exitosamente para paciente #{id_paciente}")
-            return True
+                logger.debug("✅ Historial médico insertado exitosamente para paciente #%s", id_paciente)
+                return True
             
-        except mysql.connector.Error as e:
-            print(f"❌ Error MySQL al insertar historial médico: {e}")
-            print(f"❌ Código de error: {e.errno}")
-            print(f"❌ Mensaje SQL: {e.msg}")
+        except Error as e:
+            logger.error("❌ Error MySQL al insertar historial médico: %s", e)
+            logger.error("❌ Código de error: %s", e.errno)
+            logger.error("❌ Mensaje SQL: %s", e.msg)
             return False
         except Exception as e:
-            print(f"❌ Error general al insertar historial médico: {e}")
+            logger.error("❌ Error general al insertar historial médico: %s", e)
             return False
-            
-        finally:
-            try:
-                if 'cursor' in locals():
-                    cursor.close()
-                if 'conexion' in locals():
-                    conexion.close()
-            except:
-                pass
 
     # ==========================================
     # MÉTODOS DE HISTORIAL MÉDICO INTEGRADOS EN LA CLASE
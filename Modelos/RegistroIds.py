@@ -0,0 +1,69 @@
+from typing import Iterable, Iterator, Set
+
+# ==========================================
+# CLASE: RegistroIds
+# PROPÓSITO: Llevar el control de los IDs usados por una entidad
+# (Paciente, Cita) y entregar el siguiente ID libre en tiempo constante
+# ==========================================
+
+class RegistroIds:
+    """
+    Registro de IDs en uso respaldado por un set.
+
+    - registrar(id) y `id in registro` son O(1).
+    - asignar() avanza un cursor que nunca retrocede, así que cada ID se
+      revisa como mucho una vez: cargar N filas cuesta O(N) en total.
+    """
+
+    def __init__(self, ids: Iterable[int] = ()):
+        self._ids: Set[int] = set()
+        self._siguiente = 1
+        self.reiniciar(ids)
+
+    def reiniciar(self, ids: Iterable[int] = ()):
+        """Reemplaza el contenido del registro por los IDs dados"""
+        self._ids = set(ids)
+        self._siguiente = max(self._ids) + 1 if self._ids else 1
+
+    def registrar(self, id_entidad: int):
+        """Marca un ID como usado (por ejemplo, al cargarlo desde la BD)"""
+        self._ids.add(id_entidad)
+        if isinstance(id_entidad, int) and id_entidad >= self._siguiente:
+            self._siguiente = id_entidad + 1
+
+    def liberar(self, id_entidad: int):
+        """Quita un ID del registro (p. ej. uno asignado en memoria que la BD reemplazó)"""
+        self._ids.discard(id_entidad)
+
+    def asignar(self) -> int:
+        """Devuelve el siguiente ID libre y lo marca como usado"""
+        while self._siguiente in self._ids:
+            self._siguiente += 1
+        id_nuevo = self._siguiente
+        self._ids.add(id_nuevo)
+        self._siguiente += 1
+        return id_nuevo
+
+    @property
+    def siguiente(self) -> int:
+        """Próximo ID que entregaría asignar(), sin consumirlo"""
+        while self._siguiente in self._ids:
+            self._siguiente += 1
+        return self._siguiente
+
+    def adelantar_a(self, valor: int):
+        """Mueve el cursor hacia adelante (nunca hacia atrás)"""
+        if valor > self._siguiente:
+            self._siguiente = valor
+
+    def __contains__(self, id_entidad) -> bool:
+        return id_entidad in self._ids
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._ids)
+
+
+__all__ = ['RegistroIds']
@@ -0,0 +1,254 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from datetime import date, datetime
+from typing import Callable, Iterator, List, NamedTuple, Optional
+
+from Config.database_config import conexion_bd, Error
+from Config.logging_config import obtener_logger
+
+logger = obtener_logger('Modelos.ReportePacientes')
+
+# Filas que se leen de la BD por consulta; también es el tamaño de cada
+# trozo de texto que se entrega al destino del reporte
+TAMANO_LOTE = 500
+
+# Edad y saldo se calculan en la BD para no construir un Paciente por fila.
+# El saldo pendiente es la suma de las facturas del paciente con pago pendiente
+# (subconsulta que se resuelve con idx_factura_estado_paciente).
+_SELECT_LOTE = """
+    SELECT p.ID_Paciente, p.Nombre, p.Apellido,
+           TIMESTAMPDIFF(YEAR, p.Fecha_Nacimiento, CURDATE()) AS Edad,
+           p.DUI, p.Telefono, p.Correo,
+           COALESCE((SELECT SUM(f.Monto_Total) FROM Factura f
+                     WHERE f.ID_Paciente = p.ID_Paciente AND f.Estado_Pago = 'Pendiente'), 0) AS Saldo,
+           p.Fecha_Nacimiento
+    FROM Paciente p
+    WHERE p.ID_Paciente > %s
+    ORDER BY p.ID_Paciente
+    LIMIT %s
+"""
+
+
+class FilaReportePaciente(NamedTuple):
+    """Datos de un paciente tal como los necesita el reporte (sin objetos del modelo)"""
+    id_paciente: int
+    nombre: str
+    apellido: str
+    edad: int
+    dui: str
+    telefono: str
+    correo: str
+    saldo_pendiente: float
+    fecha_nacimiento: Optional[date] = None
+
+
+# ==========================================
+# FUNCIÓN: leer_lote_pacientes
+# PROPÓSITO: Leer los pacientes que siguen a un ID (un lote, una consulta)
+# ==========================================
+
+def leer_lote_pacientes(despues_de_id: int = 0, tamano_lote: int = TAMANO_LOTE) -> Optional[List[FilaReportePaciente]]:
+    """
+    Devuelve hasta `tamano_lote` pacientes con ID mayor a `despues_de_id`, ordenados por ID.
+    La conexión del pool se devuelve antes de retornar.
+    :return: Lista de filas (vacía al final de la tabla) o None si la BD falló.
+    """
+    try:
+        with conexion_bd() as conexion:
+            if not conexion:
+                logger.warning("⚠️ No se pudo conectar a la base de datos para leer pacientes")
+                return None
+            cursor = conexion.cursor()
+            cursor.execute(_SELECT_LOTE, (despues_de_id, tamano_lote))
+            filas = cursor.fetchall()
+    except Error as e:
+        logger.error("❌ Error al leer pacientes (después del ID %s): %s", despues_de_id, e)
+        return None
+
+    return [
+        FilaReportePaciente(
+            id_paciente=fila[0],
+            nombre=fila[1] or "",
+            apellido=fila[2] or "",
+            edad=int(fila[3] or 0),
+            dui=fila[4] or "",
+            telefono=fila[5] or "",
+            correo=fila[6] or "",
+            saldo_pendiente=float(fila[7] or 0),
+            fecha_nacimiento=fila[8],
+        )
+        for fila in filas
+    ]
+
+
+# ==========================================
+# FUNCIÓN: iterar_lotes_pacientes
+# PROPÓSITO: Recorrer la tabla Paciente por lotes, continuando después del
+# último ID leído (sin OFFSET y sin tener toda la tabla en memoria)
+# ==========================================
+
+def iterar_lotes_pacientes(tamano_lote: int = TAMANO_LOTE) -> Iterator[List[FilaReportePaciente]]:
+    """
+    Genera listas de hasta `tamano_lote` pacientes ordenados por ID.
+    Cada lote usa su propia conexión del pool, que se devuelve antes de
+    entregar las filas, así un consumidor lento no retiene conexiones.
+    Si la BD falla a mitad del recorrido, el generador termina ahí (queda registrado en el log).
+    """
+    ultimo_id = 0
+    while True:
+        lote = leer_lote_pacientes(ultimo_id, tamano_lote)
+        if not lote:
+            return
+        ultimo_id = lote[-1].id_paciente
+        yield lote
+
+        if len(lote) < tamano_lote:
+            return
+
+
+# ==========================================
+# CLASE: EstadisticasPacientes
+# PROPÓSITO: Acumular los totales del reporte en la misma pasada que
+# escribe el detalle
+# ==========================================
+
+class EstadisticasPacientes:
+    def __init__(self):
+        self.total_pacientes = 0
+        self.pacientes_con_saldo = 0
+        self.pacientes_menores = 0
+        self.total_saldos_pendientes = 0.0
+
+    def agregar(self, fila: FilaReportePaciente):
+        self.total_pacientes += 1
+        if fila.saldo_pendiente > 0:
+            self.pacientes_con_saldo += 1
+            self.total_saldos_pendientes += fila.saldo_pendiente
+        if fila.edad < 18:
+            self.pacientes_menores += 1
+
+    @property
+    def pacientes_al_dia(self) -> int:
+        return self.total_pacientes - self.pacientes_con_saldo
+
+
+# ==========================================
+# CLASE: GeneradorReportePacientes
+# PROPÓSITO: Escribir el resumen de todos los pacientes por partes en
+# cualquier destino (la vista o un archivo) con memoria acotada
+# ==========================================
+
+class GeneradorReportePacientes:
+    """
+    Uso:
+        generador = GeneradorReportePacientes()
+        estadisticas = generador.generar(archivo.write)             # cualquier función que reciba texto
+        estadisticas = generador.generar_archivo("reporte.txt")
+        estadisticas = generador.generar(escribir, incluir_detalle=False)  # solo encabezado y totales
+
+    En memoria solo hay un lote de pacientes y su texto a la vez.
+    """
+
+    SEPARADOR_PRINCIPAL = "=" * 80
+    SEPARADOR_PACIENTE = "-" * 60
+
+    def __init__(self, tamano_lote: int = TAMANO_LOTE):
+        self.tamano_lote = tamano_lote
+
+    def generar(self, escribir: Callable[[str], object], incluir_detalle: bool = True) -> EstadisticasPacientes:
+        """
+        Escribe el reporte llamando a `escribir` una vez por lote.
+        :return: Las estadísticas acumuladas (también quedan escritas al final del reporte).
+        """
+        estadisticas = EstadisticasPacientes()
+        escribir(self._encabezado())
+
+        for lote in iterar_lotes_pacientes(self.tamano_lote):
+            partes = []
+            for fila in lote:
+                estadisticas.agregar(fila)
+                if incluir_detalle:
+                    partes.append(self._bloque_paciente(estadisticas.total_pacientes, fila))
+            if partes:
+                escribir("".join(partes))
+
+        escribir(self._pie(estadisticas))
+        logger.info("📄 Reporte de pacientes generado: %s pacientes", estadisticas.total_pacientes)
+        return estadisticas
+
+    def generar_archivo(self, ruta: str, incluir_detalle: bool = True) -> Optional[EstadisticasPacientes]:
+        """Escribe el reporte en un archivo de texto UTF-8; devuelve None si no se pudo escribir"""
+        try:
+            with open(ruta, 'w', encoding='utf-8') as archivo:
+                return self.generar(archivo.write, incluir_detalle)
+        except OSError as e:
+            logger.error("❌ No se pudo escribir el reporte en %s: %s", ruta, e)
+            return None
+
+    # ---------- Partes del texto ----------
+
+    def _encabezado(self) -> str:
+        sep = self.SEPARADOR_PRINCIPAL
+        return f"""
+{sep}
+📚 RESUMEN DE PACIENTES REGISTRADOS - CLÍNICA DENTAL
+{sep}
+
+📊 INFORMACIÓN GENERAL:
+   ▪ Fecha de Consulta: {datetime.now().strftime('%d/%m/%Y - %H:%M:%S')}
+   ▪ Fuente: Base de Datos MySQL
+
+{sep}
+"""
+
+    def _bloque_paciente(self, numero: int, fila: FilaReportePaciente) -> str:
+        sep = self.SEPARADOR_PACIENTE
+        menor = fila.edad < 18
+        dui_label = "DUI del Responsable" if menor else "DUI"
+        edad_info = f"{fila.edad} años" + (" (Menor de edad)" if menor else "")
+        return f"""
+{sep}
+👤 PACIENTE #{numero:02d}: {fila.nombre} {fila.apellido} (ID: #{fila.id_paciente})
+{sep}
+
+📋 INFORMACIÓN PERSONAL:
+   ▪ ID del Paciente: #{fila.id_paciente}
+   ▪ Nombre Completo: {fila.nombre} {fila.apellido}
+   ▪ Edad: {edad_info}
+   ▪ {dui_label}: {fila.dui or 'No registrado'}
+   ▪ Teléfono: {fila.telefono or 'No especificado'}
+   ▪ Correo: {fila.correo or 'No especificado'}
+
+💰 INFORMACIÓN FINANCIERA:
+   ▪ Saldo Pendiente: ${fila.saldo_pendiente:,.2f}
+   ▪ Estado de Pago: {'🔴 Pendiente' if fila.saldo_pendiente > 0 else '🟢 Al día'}
+
+"""
+
+    def _pie(self, estadisticas: EstadisticasPacientes) -> str:
+        sep = self.SEPARADOR_PRINCIPAL
+        return f"""
+{sep}
+📈 ESTADÍSTICAS BÁSICAS DE LA CLÍNICA
+{sep}
+
+👥 PACIENTES:
+   ▪ Total de Pacientes: {estadisticas.total_pacientes}
+   ▪ Pacientes con Saldo Pendiente: {estadisticas.pacientes_con_saldo}
+   ▪ Pacientes al Día: {estadisticas.pacientes_al_dia}
+   ▪ Pacientes Menores de Edad: {estadisticas.pacientes_menores}
+
+💰 FINANZAS BÁSICAS:
+   ▪ Total Saldos Pendientes (facturas pendientes): ${estadisticas.total_saldos_pendientes:,.2f}
+
+💡 NOTA: Esta vista muestra únicamente información básica de pacientes.
+Para consultar historiales médicos, citas y tratamientos,
+utilice los módulos especializados correspondientes.
+
+{sep}
+"""
+
+
+__all__ = ['GeneradorReportePacientes', 'EstadisticasPacientes', 'FilaReportePaciente', 'iterar_lotes_pacientes']
@@ -0,0 +1,353 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+from Config.database_config import conexion_bd, Error
+from Config.logging_config import obtener_logger
+
+logger = obtener_logger('Modelos.ResumenIngresos')
+
+ORIGEN_FACTURA = 'Factura'  # Estado = Estado_Pago de la factura
+ORIGEN_CITA = 'Cita'        # Estado = Estado de la cita, Monto = Costo
+
+# Las llaves primarias no aceptan NULL: facturas sin tratamiento asociado
+# (las anteriores a Tratamiento_Factura) se acumulan con estos valores
+SIN_DOCTOR = ''
+SIN_TRATAMIENTO = 0
+
+# Columnas por las que se puede agrupar un reporte (también evita armar SQL con texto libre)
+DIMENSIONES = ('ID_Doctor', 'ID_Tratamiento', 'Estado')
+
+LOTE_LECTURA = 5000
+
+_TABLAS = {
+    'Ingresos_Diarios': 'Fecha',
+    'Ingresos_Mensuales': 'Mes',
+}
+
+_CREAR_TABLA = """
+    CREATE TABLE IF NOT EXISTS {tabla} (
+        {columna} DATE NOT NULL,
+        Origen VARCHAR(10) NOT NULL,
+        ID_Doctor VARCHAR(10) NOT NULL DEFAULT '',
+        ID_Tratamiento INT NOT NULL DEFAULT 0,
+        Estado VARCHAR(20) NOT NULL,
+        Cantidad INT NOT NULL DEFAULT 0,
+        Monto DECIMAL(14,2) NOT NULL DEFAULT 0,
+        PRIMARY KEY ({columna}, Origen, ID_Doctor, ID_Tratamiento, Estado)
+    )
+"""
+
+
+class MovimientoIngreso(NamedTuple):
+    """Lo que una factura o una cita suma (o resta) a los resúmenes"""
+    fecha: date
+    origen: str
+    id_doctor: str
+    id_tratamiento: int
+    estado: str
+    cantidad: int
+    monto: Decimal
+
+    def clave(self) -> tuple:
+        return (self.fecha, self.origen, self.id_doctor, self.id_tratamiento, self.estado)
+
+
+def sql_crear_tabla(tabla: str) -> str:
+    """CREATE TABLE IF NOT EXISTS de Ingresos_Diarios o Ingresos_Mensuales"""
+    return _CREAR_TABLA.format(tabla=tabla, columna=_TABLAS[tabla])
+
+
+def _dia(valor) -> date:
+    return valor.date() if isinstance(valor, datetime) else valor
+
+
+def _inicio_mes(dia: date) -> date:
+    return dia.replace(day=1)
+
+
+def _mes_siguiente(dia: date) -> date:
+    return (dia.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def tramos_consulta(fecha_desde: date, fecha_hasta: date) -> List[tuple]:
+    """
+    Divide [fecha_desde, fecha_hasta] (incluidos) en (tabla, desde, hasta_sin_incluir):
+    los meses completos se leen de Ingresos_Mensuales y solo los días sueltos de
+    los extremos de Ingresos_Diarios. Así se leen a lo sumo ~60 días más un registro
+    por mes, sin importar cuántas facturas haya en el periodo.
+    """
+    fin = fecha_hasta + timedelta(days=1)
+    primer_mes = fecha_desde if fecha_desde.day == 1 else _mes_siguiente(fecha_desde)
+    ultimo_mes = _inicio_mes(fin)
+    if primer_mes >= ultimo_mes:
+        return [('Ingresos_Diarios', fecha_desde, fin)]
+
+    tramos = []
+    if fecha_desde < primer_mes:
+        tramos.append(('Ingresos_Diarios', fecha_desde, primer_mes))
+    tramos.append(('Ingresos_Mensuales', primer_mes, ultimo_mes))
+    if ultimo_mes < fin:
+        tramos.append(('Ingresos_Diarios', ultimo_mes, fin))
+    return tramos
+
+
+# ==========================================
+# CLASE: ResumenIngresos
+# PROPÓSITO: Mantener totales de ingresos por día y por mes (doctor,
+# tratamiento y estado) para que los reportes no recorran las facturas
+# ==========================================
+
+class ResumenIngresos:
+    """
+    Tablas Ingresos_Diarios e Ingresos_Mensuales: Cantidad y Monto por
+    (fecha, origen, doctor, tratamiento, estado).
+
+    - FacturacionModel.insertar_factura_bd y las escrituras de Cita llaman a
+      registrar() con el mismo cursor, dentro de su transacción.
+    - consultar() responde un rango de fechas leyendo solo los resúmenes.
+    - recalcular() reconstruye todo desde Factura y Cita (después de cargar
+      datos por fuera de los modelos o al instalar la migración).
+
+    Cada movimiento se aplica con INSERT IGNORE de la fila en cero y luego un
+    UPDATE que suma: el UPDATE bloquea la fila, así dos estaciones que facturan
+    el mismo día no pierden montos.
+    """
+
+    _tablas_verificadas = False
+
+    @classmethod
+    def asegurar_tablas(cls, cursor):
+        """
+        Crea las tablas de resumen si no existen (solo se comprueba una vez por proceso).
+        Los escritores la llaman antes de abrir su transacción: en MySQL un CREATE TABLE
+        confirma lo que haya pendiente.
+        """
+        if cls._tablas_verificadas:
+            return
+        for tabla in _TABLAS:
+            cursor.execute(sql_crear_tabla(tabla))
+        cls._tablas_verificadas = True
+
+    # -------------------- Movimientos --------------------
+
+    @staticmethod
+    def movimientos_factura(fecha_emision, estado_pago: str, tratamientos: Sequence, montos: Sequence) -> List[MovimientoIngreso]:
+        """
+        Un movimiento por servicio de la factura. `tratamientos` va alineado con `montos`;
+        si no hay tratamientos asociados, todo el monto va a SIN_DOCTOR / SIN_TRATAMIENTO.
+        """
+        dia = _dia(fecha_emision)
+        estado = estado_pago or 'Pendiente'
+        if not tratamientos:
+            return [MovimientoIngreso(dia, ORIGEN_FACTURA, SIN_DOCTOR, SIN_TRATAMIENTO, estado, 1,
+                                      Decimal(str(sum(montos))))]
+        return [
+            MovimientoIngreso(dia, ORIGEN_FACTURA, str(tratamiento.id_doctor), tratamiento.id_tratamiento,
+                              estado, 1, Decimal(str(monto)))
+            for tratamiento, monto in zip(tratamientos, montos)
+        ]
+
+    @staticmethod
+    def movimiento_cita(fecha, id_doctor, id_tratamiento, estado: str, costo, signo: int = 1) -> MovimientoIngreso:
+        """Movimiento de una cita; signo=-1 descuenta la versión anterior al modificarla"""
+        return MovimientoIngreso(_dia(fecha), ORIGEN_CITA, str(id_doctor or SIN_DOCTOR),
+                                 id_tratamiento or SIN_TRATAMIENTO, estado or 'Pendiente',
+                                 signo, Decimal(str(costo or 0)).quantize(Decimal('0.01')) * signo)
+
+    @classmethod
+    def registrar(cls, cursor, movimientos: Iterable[MovimientoIngreso]):
+        """
+        Suma los movimientos a los resúmenes diario y mensual.
+        Usa el cursor del llamador: el commit (o rollback) es el de su transacción.
+        """
+        cls.asegurar_tablas(cursor)
+        for movimiento in movimientos:
+            for tabla, columna in _TABLAS.items():
+                fecha = movimiento.fecha if columna == 'Fecha' else _inicio_mes(movimiento.fecha)
+                clave = (fecha,) + movimiento.clave()[1:]
+                cursor.execute(f"""
+                    INSERT IGNORE INTO {tabla} ({columna}, Origen, ID_Doctor, ID_Tratamiento, Estado, Cantidad, Monto)
+                    VALUES (%s, %s, %s, %s, %s, 0, 0)
+                """, clave)
+                cursor.execute(f"""
+                    UPDATE {tabla} SET Cantidad = Cantidad + %s, Monto = Monto + %s
+                    WHERE {columna} = %s AND Origen = %s AND ID_Doctor = %s AND ID_Tratamiento = %s AND Estado = %s
+                """, (movimiento.cantidad, movimiento.monto) + clave)
+
+    # -------------------- Consultas --------------------
+
+    @classmethod
+    def consultar(cls, fecha_desde: date, fecha_hasta: date, agrupar_por: Sequence[str] = ('ID_Doctor',),
+                  origen: str = ORIGEN_FACTURA, estados: Sequence[str] = None) -> List[Dict]:
+        """
+        Totales del rango [fecha_desde, fecha_hasta] (ambos incluidos).
+        :param agrupar_por: Columnas de DIMENSIONES; vacío = un solo total.
+        :param estados: Limitar a estos Estado_Pago (o estados de cita).
+        :return: [{columna: valor, ..., 'Cantidad': int, 'Monto': Decimal}] ordenado por las columnas.
+        """
+        columnas = [c for c in agrupar_por if c in DIMENSIONES]
+        if len(columnas) != len(agrupar_por):
+            logger.error("❌ Columnas de agrupación inválidas: %s", agrupar_por)
+            return []
+        if fecha_desde > fecha_hasta:
+            return []
+
+        seleccion = "".join(f"{c}, " for c in columnas)
+        filtro_estados = ""
+        if estados:
+            filtro_estados = f" AND Estado IN ({', '.join(['%s'] * len(estados))})"
+
+        subconsultas, parametros = [], []
+        for tabla, desde, hasta in tramos_consulta(fecha_desde, fecha_hasta):
+            columna = _TABLAS[tabla]
+            subconsultas.append(f"SELECT {seleccion}Cantidad, Monto FROM {tabla} "
+                                f"WHERE Origen = %s AND {columna} >= %s AND {columna} < %s{filtro_estados}")
+            parametros.extend([origen, desde, hasta] + list(estados or []))
+
+        sql = f"SELECT {seleccion}SUM(Cantidad) AS Cantidad, SUM(Monto) AS Monto FROM ({' UNION ALL '.join(subconsultas)}) r"
+        if columnas:
+            sql += f" GROUP BY {', '.join(columnas)} ORDER BY {', '.join(columnas)}"
+
+        try:
+            with conexion_bd() as conexion:
+                if not conexion:
+                    logger.error("❌ No se pudo establecer conexión a la base de datos.")
+                    return []
+                cursor = conexion.cursor()
+                cls.asegurar_tablas(cursor)
+                cursor.execute(sql, tuple(parametros))
+                filas = cursor.fetchall()
+        except Error as e:
+            logger.error("❌ Error al consultar el resumen de ingresos: %s", e)
+            return []
+
+        resultado = []
+        for fila in filas:
+            cantidad, monto = fila[-2], fila[-1]
+            if cantidad is None:
+                continue
+            registro = dict(zip(columnas, fila))
+            registro['Cantidad'] = int(cantidad)
+            registro['Monto'] = Decimal(str(monto or 0)).quantize(Decimal('0.01'))
+            resultado.append(registro)
+        return resultado
+
+    # -------------------- Reconstrucción --------------------
+
+    @staticmethod
+    def _leer_movimientos(cursor) -> Iterable[MovimientoIngreso]:
+        """Movimientos de todas las facturas y citas, leídos por lotes"""
+        # Factura con sus tratamientos: el total se reparte en proporción al costo de cada tratamiento
+        cursor.execute("""
+            SELECT f.ID_Factura, f.Fecha_Emision, f.Estado_Pago, f.Monto_Total, t.ID_Doctor, t.ID_Tratamiento, t.Costo
+            FROM Factura f
+            LEFT JOIN Tratamiento_Factura tf ON tf.ID_Factura = f.ID_Factura
+            LEFT JOIN Tratamiento t ON t.ID_Tratamiento = tf.ID_Tratamiento
+            WHERE f.Fecha_Emision IS NOT NULL
+            ORDER BY f.ID_Factura
+        """)
+        actual, filas_factura = None, []
+
+        def repartir(filas):
+            _, emision, estado, total, _, _, _ = filas[0]
+            total = Decimal(str(total or 0))
+            con_tratamiento = [f for f in filas if f[5] is not None]
+            if not con_tratamiento:
+                yield MovimientoIngreso(_dia(emision), ORIGEN_FACTURA, SIN_DOCTOR, SIN_TRATAMIENTO,
+                                        estado or 'Pendiente', 1, total)
+                return
+            costos = [Decimal(str(f[6] or 0)) for f in con_tratamiento]
+            suma = sum(costos)
+            restante = total
+            for i, (fila, costo) in enumerate(zip(con_tratamiento, costos)):
+                if i == len(con_tratamiento) - 1:
+                    parte = restante
+                else:
+                    parte = (total * costo / suma if suma else total / len(costos)).quantize(Decimal('0.01'))
+                restante -= parte
+                yield MovimientoIngreso(_dia(emision), ORIGEN_FACTURA, str(fila[4]), fila[5],
+                                        estado or 'Pendiente', 1, parte)
+
+        while True:
+            lote = cursor.fetchmany(LOTE_LECTURA)
+            if not lote:
+                break
+            for fila in lote:
+                if fila[0] != actual and filas_factura:
+                    yield from repartir(filas_factura)
+                    filas_factura = []
+                actual = fila[0]
+                filas_factura.append(fila)
+        if filas_factura:
+            yield from repartir(filas_factura)
+
+        # Las citas ya llegan agrupadas por día (DATE() existe en MySQL y en SQLite)
+        cursor.execute("""
+            SELECT DATE(Fecha) AS Dia, ID_Doctor, ID_Tratamiento, Estado, COUNT(*), SUM(Costo)
+            FROM Cita
+            GROUP BY DATE(Fecha), ID_Doctor, ID_Tratamiento, Estado
+        """)
+        while True:
+            lote = cursor.fetchmany(LOTE_LECTURA)
+            if not lote:
+                break
+            for dia, id_doctor, id_tratamiento, estado, cantidad, monto in lote:
+                if isinstance(dia, str):
+                    dia = date.fromisoformat(dia)
+                movimiento = ResumenIngresos.movimiento_cita(dia, id_doctor, id_tratamiento, estado, monto)
+                yield movimiento._replace(cantidad=cantidad)
+
+    @classmethod
+    def recalcular(cls) -> Optional[int]:
+        """
+        Vacía y reconstruye los dos resúmenes desde Factura y Cita en una transacción.
+        Los totales se acumulan en memoria por grupo (día, doctor, tratamiento, estado),
+        no por factura.
+        :return: Filas escritas en Ingresos_Diarios, o None si la BD falla.
+        """
+        try:
+            with conexion_bd() as conexion:
+                if not conexion:
+                    logger.error("❌ No se pudo establecer conexión a la base de datos.")
+                    return None
+                cursor = conexion.cursor()
+                cls.asegurar_tablas(cursor)
+
+                diarios = defaultdict(lambda: [0, Decimal('0')])
+                for movimiento in cls._leer_movimientos(cursor):
+                    acumulado = diarios[movimiento.clave()]
+                    acumulado[0] += movimiento.cantidad
+                    acumulado[1] += movimiento.monto
+
+                mensuales = defaultdict(lambda: [0, Decimal('0')])
+                for (fecha, *resto), (cantidad, monto) in diarios.items():
+                    acumulado = mensuales[(_inicio_mes(fecha), *resto)]
+                    acumulado[0] += cantidad
+                    acumulado[1] += monto
+
+                conexion.start_transaction()
+                for tabla, columna in _TABLAS.items():
+                    grupos = diarios if columna == 'Fecha' else mensuales
+                    cursor.execute(f"DELETE FROM {tabla}")
+                    cursor.executemany(
+                        f"INSERT INTO {tabla} ({columna}, Origen, ID_Doctor, ID_Tratamiento, Estado, Cantidad, Monto) "
+                        f"VALUES (%s, %s, %s, %s, %s, %s, %s)",
+                        [clave + (cantidad, monto) for clave, (cantidad, monto) in grupos.items()])
+                conexion.commit()
+                logger.info("📊 Resumen de ingresos recalculado: %s filas diarias, %s mensuales",
+                            len(diarios), len(mensuales))
+                return len(diarios)
+
+        except Error as e:
+            logger.error("❌ Error al recalcular el resumen de ingresos: %s", e)
+            return None
+
+
+__all__ = ['ResumenIngresos', 'MovimientoIngreso', 'tramos_consulta', 'sql_crear_tabla', 'DIMENSIONES',
+           'ORIGEN_FACTURA', 'ORIGEN_CITA', 'SIN_DOCTOR', 'SIN_TRATAMIENTO']
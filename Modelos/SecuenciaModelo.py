@@ -0,0 +1,165 @@
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+# Importar configuración centralizada
+from Config.database_config import conexion_bd, Error
+from Config.logging_config import obtener_logger
+from typing import Optional
+import re
+
+logger = obtener_logger('Modelos.SecuenciaModelo')
+
+# ==========================================
+# CLASE: Secuencia
+# PROPÓSITO: Entregar IDs con prefijo (F001, H001...) desde un contador
+# guardado en la BD. Reservar un ID es un UPDATE sobre una sola fila
+# dentro de una transacción, así dos estaciones nunca reciben el mismo
+# ID y no hace falta leer toda la tabla para encontrar el siguiente.
+# ==========================================
+
+class Secuencia:
+    """
+    Contadores atómicos guardados en la tabla Secuencia (Nombre, Valor).
+
+    Cada secuencia conoce su prefijo, el ancho mínimo del número y la tabla/columna
+    de la que se toma el valor inicial la primera vez que se usa. El ancho es solo
+    un mínimo: después de F999 sigue F1000, y se puede ampliar (p. ej. a 6 → F000001)
+    sin romper los IDs existentes.
+    """
+
+    # nombre: (prefijo, ancho mínimo, tabla, columna)
+    SECUENCIAS = {
+        'Factura': ('F', 3, 'Factura', 'ID_Factura'),
+        'Horario': ('H', 3, 'Horario', 'ID_Horario'),
+    }
+
+    _tabla_verificada = False
+    _secuencias_verificadas = set()  # Secuencias cuya fila ya existe (por proceso)
+
+    @classmethod
+    def formatear(cls, nombre: str, numero: int) -> str:
+        """Convierte el número de la secuencia en el ID con prefijo, p. ej. 7 → 'F007'"""
+        prefijo, ancho, _, _ = cls.SECUENCIAS[nombre]
+        return f"{prefijo}{numero:0{ancho}d}"
+
+    @classmethod
+    def numero(cls, nombre: str, id_texto) -> Optional[int]:
+        """Parte numérica de un ID de la secuencia ('F007' → 7), o None si no tiene su formato"""
+        prefijo = cls.SECUENCIAS[nombre][0]
+        coincidencia = re.fullmatch(rf"{prefijo}?(\d+)", str(id_texto).strip())
+        return int(coincidencia.group(1)) if coincidencia else None
+
+    @classmethod
+    def asegurar_tabla(cls, cursor):
+        """Crea la tabla Secuencia si no existe (solo se comprueba una vez por proceso)"""
+        if cls._tabla_verificada:
+            return
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS Secuencia (
+                Nombre VARCHAR(30) PRIMARY KEY,
+                Valor INT UNSIGNED NOT NULL
+            )
+        """)
+        cls._tabla_verificada = True
+
+    @classmethod
+    def _asegurar_secuencia(cls, cursor, nombre: str):
+        """
+        Crea la fila de la secuencia partiendo del mayor ID existente en su tabla.
+        Ese MAX recorre la tabla, así que solo se hace si la fila todavía no existe
+        (una vez vista, se recuerda por proceso). INSERT IGNORE hace que, si dos estaciones
+        llegan a la vez, solo una la cree.
+        """
+        if nombre in cls._secuencias_verificadas:
+            return
+        cursor.execute("SELECT 1 FROM Secuencia WHERE Nombre = %s", (nombre,))
+        if cursor.fetchone():
+            cls._secuencias_verificadas.add(nombre)
+            return
+
+        prefijo, _, tabla, columna = cls.SECUENCIAS[nombre]
+        cursor.execute(f"""
+            INSERT IGNORE INTO Secuencia (Nombre, Valor)
+            SELECT %s, COALESCE(MAX(CAST(TRIM(LEADING %s FROM {columna}) AS UNSIGNED)), 0)
+            FROM {tabla}
+            WHERE {columna} REGEXP %s
+        """, (nombre, prefijo, f"^{prefijo}?[0-9]+$"))
+
+    @classmethod
+    def siguiente(cls, nombre: str) -> Optional[str]:
+        """
+        Reserva y devuelve el siguiente ID de la secuencia.
+        :param nombre: Nombre de la secuencia ('Factura', 'Horario').
+        :return: ID con prefijo, o None si no se pudo reservar.
+        """
+        try:
+            with conexion_bd() as conexion:
+                if not conexion:
+                    logger.error("❌ No se pudo establecer conexión a la base de datos.")
+                    return None
+
+                cursor = conexion.cursor()
+                # CREATE TABLE confirma lo pendiente en MySQL: va antes de abrir la transacción
+                cls.asegurar_tabla(cursor)
+
+                # El pool trabaja en autocommit: sin transacción el bloqueo no duraría
+                # más que la sentencia y dos estaciones podrían leer el mismo valor
+                conexion.start_transaction()
+                cls._asegurar_secuencia(cursor, nombre)
+                # El UPDATE incrementa y bloquea la fila hasta el commit: otra estación
+                # espera aquí y luego lee el valor ya incrementado por esta
+                cursor.execute("UPDATE Secuencia SET Valor = Valor + 1 WHERE Nombre = %s", (nombre,))
+                cursor.execute("SELECT Valor FROM Secuencia WHERE Nombre = %s", (nombre,))
+                valor = cursor.fetchone()[0]
+                conexion.commit()
+
+                nuevo_id = cls.formatear(nombre, valor)
+                logger.debug("🆔 ID reservado en secuencia %s: %s", nombre, nuevo_id)
+                return nuevo_id
+
+        except Error as e:
+            logger.error("❌ Error al reservar ID de la secuencia %s: %s", nombre, e)
+            return None
+
+    @classmethod
+    def avanzar_hasta(cls, cursor, nombre: str, id_usado) -> None:
+        """
+        Lleva la secuencia al menos hasta un ID escrito a mano, para que siguiente()
+        no lo vuelva a entregar. Usa el cursor del llamador: debe ir en la misma
+        transacción que el INSERT con ese ID; asegurar_tabla() se llama antes
+        de abrirla.
+        """
+        numero = cls.numero(nombre, id_usado)
+        if numero is None:
+            return
+        cls._asegurar_secuencia(cursor, nombre)
+        cursor.execute("UPDATE Secuencia SET Valor = %s WHERE Nombre = %s AND Valor < %s",
+                       (numero, nombre, numero))
+
+    @classmethod
+    def consultar_siguiente(cls, nombre: str) -> Optional[str]:
+        """
+        Devuelve el ID que entregaría siguiente() sin reservarlo.
+        Solo sirve para mostrarlo en pantalla; otra estación podría tomarlo antes.
+        """
+        try:
+            with conexion_bd() as conexion:
+                if not conexion:
+                    logger.error("❌ No se pudo establecer conexión a la base de datos.")
+                    return None
+
+                cursor = conexion.cursor()
+                cls.asegurar_tabla(cursor)
+                cls._asegurar_secuencia(cursor, nombre)
+                conexion.commit()
+
+                cursor.execute("SELECT Valor FROM Secuencia WHERE Nombre = %s", (nombre,))
+                return cls.formatear(nombre, cursor.fetchone()[0] + 1)
+
+        except Error as e:
+            logger.error("❌ Error al consultar la secuencia %s: %s", nombre, e)
+            return None
+
+
+__all__ = ['Secuencia']
@@ -3,15 +3,17 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 # Importar configuración centralizada
-from Config.database_config import obtener_conexion, conectar_bd, cerrar_conexion_segura
-import mysql.connector  # Mantener para manejo de errores específicos
-from mysql.connector import Error
+from Config.database_config import obtener_conexion, conectar_bd, conexion_bd, cerrar_conexion_segura, Error
+from Config.logging_config import obtener_logger
 from PyQt6.QtCore import QDate
 
 from Modelos.DoctorModelo import Doctor
+from Modelos.CacheReferencia import obtener_cache_referencia
 from datetime import datetime
 from PyQt6.QtCore import QDate
 
+logger = obtener_logger('Modelos.TratamientoModelo')
+
 class Tratamiento:
     def __init__(self, id_tratamiento, id_doctor, descripcion, costo, fecha, doctor):
         self.id_tratamiento = id_tratamiento
@@ -29,13 +31,13 @@ class Tratamiento:
     @staticmethod
     def buscar_doctor_por_codigo(codigo):
         """ Busca doctor por ID_Doctor (carnet) y devuelve nombre y apellido """
-        conn = Tratamiento.conectar_bd()
-        cursor = conn.cursor()
-        query = "SELECT Nombre, Apellido FROM Doctor WHERE ID_Doctor = %s"
-        cursor.execute(query, (codigo,))
-        resultado = cursor.fetchone()
-        cursor.close()
-        conn.close()
+        with conexion_bd() as conn:
+            if not conn:
+                return None, None
+            cursor = conn.cursor()
+            query = "SELECT Nombre, Apellido FROM Doctor WHERE ID_Doctor = %s"
+            cursor.execute(query, (codigo,))
+            resultado = cursor.fetchone()
 
         if resultado:
             nombre, apellido = resultado
@@ -49,7 +51,7 @@ class Tratamiento:
             if nombre and apellido:
                 return f"{nombre} {apellido}"
         except Exception as e:
-            print(f"❌ Error al obtener doctor: {e}")
+            logger.error("❌ Error al obtener doctor: %s", e)
         return "Doctor desconocido"
     
     @staticmethod
@@ -61,38 +63,47 @@ class Tratamiento:
             fecha = fecha.strftime("%Y-%m-%d")
 
         try:
-            conn = Tratamiento.conectar_bd()
-            cursor = conn.cursor()
-            query = """
-            INSERT INTO Tratamiento (ID_Doctor, Descripcion, Costo, Fecha)
-            VALUES (%s, %s, %s, %s)
-            """
-            cursor.execute(query, (id_doctor, descripcion, costo, fecha))
-            conn.commit()
-            return cursor.lastrowid
-        except mysql.connector.Error as e:
-            print(f"❌ Error al insertar tratamiento: {e}")
+            with conexion_bd() as conn:
+                if not conn:
+                    logger.error("❌ No se pudo conectar a la base de datos")
+                    return None
+                cursor = conn.cursor()
+                query = """
+                INSERT INTO Tratamiento (ID_Doctor, Descripcion, Costo, Fecha)
+                VALUES (%s, %s, %s, %s)
+                """
+                cursor.execute(query, (id_doctor, descripcion, costo, fecha))
+                conn.commit()
+                obtener_cache_referencia().invalidar('Tratamiento')
+                return cursor.lastrowid
+        except Error as e:
+            logger.error("❌ Error al insertar tratamiento: %s", e)
             return None
-        finally:
-            cursor.close()
-            conn.close()
 
     @staticmethod
     def obtener_todos_tratamientos():
-        """Obtiene todos los tratamientos de la base de datos"""
-        conn = None
-        cursor = None
+        """Obtiene todos los tratamientos (desde la caché de referencia o la BD)"""
+        tratamientos = obtener_cache_referencia().obtener('Tratamiento', 'todos', Tratamiento._leer_tratamientos_bd)
+        # Copia de la lista: quien la reciba puede agregar o quitar sin tocar la caché
+        return list(tratamientos) if tratamientos is not None else []
+
+    @staticmethod
+    def _leer_tratamientos_bd():
+        """Lee la tabla Tratamiento completa; None si no hay conexión o la BD falla (no se guarda en caché)"""
         tratamientos = []
         
         try:
-            conn = Tratamiento.conectar_bd()
-            cursor = conn.cursor()
-            # Consulta sin campo Estado
-            query = "SELECT ID_Tratamiento, Descripcion, Costo, ID_Doctor, Fecha FROM Tratamiento"
-            cursor.execute(query)
-            
-            resultados = cursor.fetchall()
-            print(f"Resultados de tratamientos desde BD: {resultados}")  # Debug
+            with conexion_bd() as conn:
+                if not conn:
+                    logger.error("❌ No se pudo conectar a la base de datos")
+                    return None
+                cursor = conn.cursor()
+                # Consulta sin campo Estado
+                query = "SELECT ID_Tratamiento, Descripcion, Costo, ID_Doctor, Fecha FROM Tratamiento"
+                cursor.execute(query)
+                
+                resultados = cursor.fetchall()
+            logger.debug("Resultados de tratamientos desde BD: %s", resultados)  # Debug
             
             for row in resultados:
                 # Constructor sin estado
@@ -106,19 +117,13 @@ class Tratamiento:
                 )
                 
                 tratamientos.append(tratamiento)
-                print(f"Tratamiento agregado: {tratamiento.descripcion}")  # CORREGIDO: usar descripcion
+                logger.debug("Tratamiento agregado: %s", tratamiento.descripcion)  # CORREGIDO: usar descripcion
                         
             return tratamientos
             
         except Error as e:
-            print(f"Error al obtener tratamientos: {e}")
-            return []
-            
-        finally:
-            if cursor:
-                cursor.close()
-            if conn and conn.is_connected():
-                conn.close()
+            logger.error("Error al obtener tratamientos: %s", e)
+            return None
 
     def __str__(self):
         return (f"Tratamiento ID: {self.id_tratamiento} \n " 
@@ -1,7 +1,15 @@
 import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
-from Config.database_config import obtener_conexion
+
+def _conexion_bd():
+    """
+    Importa la capa de datos (y con ella mysql.connector) recién en la primera
+    consulta: así la ventana de login se muestra sin esperar esa importación.
+    """
+    from Config.database_config import conexion_bd
+    return conexion_bd()
+
 
 class LoginModelo:
     def __init__(self):
@@ -12,27 +20,21 @@ class LoginModelo:
         Valida las credenciales del usuario consultando la base de datos
         Returns: True si las credenciales son válidas, False en caso contrario
         """
-        conexion = None
         try:
-            conexion = obtener_conexion()
-            if conexion and conexion.is_connected():
-                cursor = conexion.cursor()
+            with _conexion_bd() as conexion:
+                if conexion:
+                    cursor = conexion.cursor()
                 
-                # Consulta para validar usuario y contraseña en la tabla Asistente
-                query = "SELECT COUNT(*) FROM Asistente WHERE Nombre = %s AND Contrasena = %s"
-                cursor.execute(query, (usuario, password))
+                    # Consulta para validar usuario y contraseña en la tabla Asistente
+                    query = "SELECT COUNT(*) FROM Asistente WHERE Nombre = %s AND Contrasena = %s"
+                    cursor.execute(query, (usuario, password))
                 
-                resultado = cursor.fetchone()
-                return resultado[0] > 0
+                    resultado = cursor.fetchone()
+                    return resultado[0] > 0
                 
         except Exception as e:
             print(f"Error al validar usuario: {e}")
             return False
-            
-        finally:
-            if conexion and conexion.is_connected():
-                cursor.close()
-                conexion.close()
         
         return False
     
@@ -41,28 +43,22 @@ class LoginModelo:
         Obtiene información del usuario desde la base de datos
         Returns: 'asistente' si el usuario existe en la tabla Asistente, None en caso contrario
         """
-        conexion = None
         try:
-            conexion = obtener_conexion()
-            if conexion and conexion.is_connected():
-                cursor = conexion.cursor()
+            with _conexion_bd() as conexion:
+                if conexion:
+                    cursor = conexion.cursor()
                 
-                # Consulta para verificar si el usuario existe en la tabla Asistente
-                query = "SELECT Nombre, Apellido FROM Asistente WHERE Nombre = %s"
-                cursor.execute(query, (usuario,))
+                    # Consulta para verificar si el usuario existe en la tabla Asistente
+                    query = "SELECT Nombre, Apellido FROM Asistente WHERE Nombre = %s"
+                    cursor.execute(query, (usuario,))
                 
-                resultado = cursor.fetchone()
-                if resultado:
-                    return 'asistente'
+                    resultado = cursor.fetchone()
+                    if resultado:
+                        return 'asistente'
                 
         except Exception as e:
             print(f"Error al obtener tipo de usuario: {e}")
             return None
-            
-        finally:
-            if conexion and conexion.is_connected():
-                cursor.close()
-                conexion.close()
         
         return None
     
@@ -71,27 +67,21 @@ class LoginModelo:
         Obtiene los datos completos del usuario desde la base de datos
         Returns: Diccionario con los datos del usuario o None si no existe
         """
-        conexion = None
         try:
-            conexion = obtener_conexion()
-            if conexion and conexion.is_connected():
-                cursor = conexion.cursor(dictionary=True)
+            with _conexion_bd() as conexion:
+                if conexion:
+                    cursor = conexion.cursor(dictionary=True)
                 
-                # Consulta para obtener todos los datos del usuario
-                query = "SELECT ID_Asistente, Nombre, Apellido, Telefono, Correo FROM Asistente WHERE Nombre = %s"
-                cursor.execute(query, (usuario,))
+                    # Consulta para obtener todos los datos del usuario
+                    query = "SELECT ID_Asistente, Nombre, Apellido, Telefono, Correo FROM Asistente WHERE Nombre = %s"
+                    cursor.execute(query, (usuario,))
                 
-                resultado = cursor.fetchone()
-                return resultado
+                    resultado = cursor.fetchone()
+                    return resultado
                 
         except Exception as e:
             print(f"Error al obtener datos del usuario: {e}")
             return None
-            
-        finally:
-            if conexion and conexion.is_connected():
-                cursor.close()
-                conexion.close()
         
         return None
     
@@ -100,27 +90,21 @@ class LoginModelo:
         Lista todos los usuarios disponibles en la base de datos
         Returns: Lista de diccionarios con información de usuarios o lista vacía si hay error
         """
-        conexion = None
         try:
-            conexion = obtener_conexion()
-            if conexion and conexion.is_connected():
-                cursor = conexion.cursor(dictionary=True)
+            with _conexion_bd() as conexion:
+                if conexion:
+                    cursor = conexion.cursor(dictionary=True)
                 
-                # Consulta para obtener todos los usuarios de la tabla Asistente
-                query = "SELECT Nombre, Apellido, Correo FROM Asistente ORDER BY Nombre"
-                cursor.execute(query)
+                    # Consulta para obtener todos los usuarios de la tabla Asistente
+                    query = "SELECT Nombre, Apellido, Correo FROM Asistente ORDER BY Nombre"
+                    cursor.execute(query)
                 
-                usuarios = cursor.fetchall()
-                return usuarios
+                    usuarios = cursor.fetchall()
+                    return usuarios
                 
         except Exception as e:
             print(f"Error al listar usuarios: {e}")
             return []
-            
-        finally:
-            if conexion and conexion.is_connected():
-                cursor.close()
-                conexion.close()
         
         return []
     
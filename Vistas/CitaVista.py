@@ -6,11 +6,35 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from PyQt6.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QWidget, QLabel, QLineEdit, QPushButton,
     QTextEdit, QGroupBox, QFormLayout, QMessageBox, QComboBox, QDateTimeEdit, QInputDialog, QScrollArea,
-    QDateEdit
+    QDateEdit, QCheckBox
 )
 from PyQt6.QtCore import Qt, QDateTime, QDate 
 from PyQt6.QtGui import QFont, QIntValidator, QDoubleValidator
+from datetime import timedelta
 from Controladores.CitaControlador import ControladorCita
+from Vistas.TablaDatos import TablaDatos, Columna
+
+
+def _hora_texto(valor) -> str:
+    """Hora como HH:MM (MySQL entrega TIME como timedelta)"""
+    if isinstance(valor, timedelta):
+        minutos = int(valor.total_seconds()) // 60
+        return f"{minutos // 60:02d}:{minutos % 60:02d}"
+    if hasattr(valor, 'strftime'):
+        return valor.strftime('%H:%M')
+    return str(valor or "")
+
+
+COLUMNAS_CITAS = [
+    Columna("ID", lambda c: c.id_cita),
+    Columna("Fecha", lambda c: c.fecha, lambda v: v.strftime('%d/%m/%Y') if v else ""),
+    Columna("Inicio", lambda c: c.hora_inicio, _hora_texto),
+    Columna("Fin", lambda c: c.hora_fin, _hora_texto),
+    Columna("Paciente", lambda c: f"{c.paciente.nombre} {c.paciente.apellido}"),
+    Columna("Doctor", lambda c: f"Dr. {c.doctor.nombre} {c.doctor.apellido}"),
+    Columna("Estado", lambda c: c.estado),
+    Columna("Costo", lambda c: float(c.costo_cita), lambda v: f"${v:,.2f}"),
+]
 
 class CitaWindow(QMainWindow):
     def __init__(self, controlador = None):  
@@ -393,13 +417,69 @@ class CitaWindow(QMainWindow):
         buttons_row2 = QHBoxLayout()
         self.confirmar_btn = QPushButton("✅ Confirmar Asistencia")
         self.monto_btn = QPushButton("💲 Calcular Monto a Pagar")
+        self.huecos_btn = QPushButton("🔎 Buscar Espacio Libre")
 
         buttons_row2.addWidget(self.confirmar_btn)
         buttons_row2.addWidget(self.monto_btn)
+        buttons_row2.addWidget(self.huecos_btn)
 
         main_layout.addLayout(buttons_row1)
         main_layout.addLayout(buttons_row2)
 
+        # ====================================
+        # FILTROS Y PAGINACIÓN DEL LISTADO
+        # ====================================
+
+        filtros_group = QGroupBox("Listado de Citas")
+        filtros_layout = QHBoxLayout()
+
+        self.filtrar_fechas_check = QCheckBox("Filtrar por fechas")
+        self.filtro_desde_edit = QDateEdit(QDate.currentDate().addMonths(-1))
+        self.filtro_desde_edit.setDisplayFormat("dd/MM/yyyy")
+        self.filtro_desde_edit.setCalendarPopup(True)
+        self.filtro_hasta_edit = QDateEdit(QDate.currentDate().addMonths(1))
+        self.filtro_hasta_edit.setDisplayFormat("dd/MM/yyyy")
+        self.filtro_hasta_edit.setCalendarPopup(True)
+
+        self.filtro_estado_combo = QComboBox()
+        self.filtro_estado_combo.addItems(["Todos", "Pendiente", "Confirmada", "Cancelada", "Asistida", "Ausente"])
+
+        filtros_layout.addWidget(self.filtrar_fechas_check)
+        filtros_layout.addWidget(QLabel("Desde:"))
+        filtros_layout.addWidget(self.filtro_desde_edit)
+        filtros_layout.addWidget(QLabel("Hasta:"))
+        filtros_layout.addWidget(self.filtro_hasta_edit)
+        filtros_layout.addWidget(QLabel("Estado:"))
+        filtros_layout.addWidget(self.filtro_estado_combo)
+
+        filtros_group.setLayout(filtros_layout)
+        main_layout.addWidget(filtros_group)
+
+        paginacion_row = QHBoxLayout()
+        self.listar_btn = QPushButton("📋 Ver Citas")
+        self.filtrar_btn = QPushButton("🔍 Aplicar Filtros")
+        self.anterior_btn = QPushButton("⬅ Anterior")
+        self.siguiente_btn = QPushButton("Siguiente ➡")
+        self.exportar_btn = QPushButton("📤 Exportar")
+        self.pagina_label = QLabel("Página 1")
+        self.pagina_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.anterior_btn.setEnabled(False)
+        self.siguiente_btn.setEnabled(False)
+
+        paginacion_row.addWidget(self.listar_btn)
+        paginacion_row.addWidget(self.filtrar_btn)
+        paginacion_row.addWidget(self.anterior_btn)
+        paginacion_row.addWidget(self.pagina_label)
+        paginacion_row.addWidget(self.siguiente_btn)
+        paginacion_row.addWidget(self.exportar_btn)
+
+        main_layout.addLayout(paginacion_row)
+
+        # Listado de citas: tabla virtualizada; al llegar al final trae la siguiente página
+        self.tabla_citas = TablaDatos(COLUMNAS_CITAS, texto_filtro="🔎 Filtrar citas cargadas...")
+        self.tabla_citas.fila_activada.connect(self.seleccionar_cita_desde_tabla)
+        main_layout.addWidget(self.tabla_citas)
+
         resultado_label = QLabel("📊 Resultados:")
         resultado_label.setFont(QFont("Segoe UI", 14, QFont.Weight.Bold))
         resultado_label.setStyleSheet(f"color: {self.colors['accent']};")
@@ -523,6 +603,59 @@ class CitaWindow(QMainWindow):
         self.modificar_btn.clicked.connect(self.controlador.modificar_cita)
         self.confirmar_btn.clicked.connect(self.controlador.confirmar_asistencia)
         self.monto_btn.clicked.connect(self.controlador.calcular_monto)
+        self.huecos_btn.clicked.connect(self.controlador.buscar_espacios_libres)
+        self.listar_btn.clicked.connect(self.controlador.listar_citas)
+        self.filtrar_btn.clicked.connect(self.controlador.aplicar_filtros_citas)
+        self.anterior_btn.clicked.connect(self.controlador.pagina_anterior)
+        self.siguiente_btn.clicked.connect(self.controlador.pagina_siguiente)
+        self.exportar_btn.clicked.connect(self.controlador.exportar_citas)
+
+    def obtener_filtros(self) -> dict:
+        """Devuelve los filtros del listado en el formato que espera Cita.obtener_pagina_citas_bd"""
+        filtros = {'fecha_desde': None, 'fecha_hasta': None, 'estados': None}
+
+        if self.filtrar_fechas_check.isChecked():
+            filtros['fecha_desde'] = self.filtro_desde_edit.date().toPyDate()
+            filtros['fecha_hasta'] = self.filtro_hasta_edit.date().toPyDate()
+
+        estado = self.filtro_estado_combo.currentText()
+        if estado != "Todos":
+            filtros['estados'] = [estado]
+
+        return filtros
+
+    def mostrar_citas(self, citas, cargar_mas=None):
+        """Muestra las citas en la tabla; `cargar_mas` trae las siguientes al desplazarse"""
+        self.tabla_citas.mostrar(citas, cargar_mas)
+
+    def actualizar_cita(self, cita):
+        """Repinta solo la fila de la cita que cambió (si está cargada en la tabla)"""
+        self.tabla_citas.actualizar_fila(cita, lambda c: c.id_cita)
+
+    def seleccionar_cita_desde_tabla(self, cita):
+        """Muestra el detalle de la cita elegida en la tabla"""
+        self.resultado_text.setText(f"🏥 CITA SELECCIONADA\n{cita}")
+
+    def actualizar_paginacion(self, numero_pagina: int, hay_anterior: bool, hay_siguiente: bool, cantidad: int):
+        """Actualiza la etiqueta de página y habilita los botones de navegación"""
+        self.pagina_label.setText(f"Página {numero_pagina} ({cantidad} citas)")
+        self.anterior_btn.setEnabled(hay_anterior)
+        self.siguiente_btn.setEnabled(hay_siguiente)
+
+    def mostrar_cargando(self, cargando: bool):
+        """Bloquea las acciones y avisa al usuario mientras se cargan los datos de la BD"""
+        for widget in (self.crear_btn, self.cancelar_btn, self.modificar_btn, self.confirmar_btn,
+                       self.monto_btn, self.huecos_btn, self.listar_btn, self.filtrar_btn,
+                       self.paciente_combo, self.doctor_combo, self.tratamiento_combo):
+            widget.setEnabled(not cargando)
+
+        if cargando:
+            self.resultado_text.setPlaceholderText("⏳ Cargando pacientes, doctores y citas...")
+            self.pagina_label.setText("⏳ Cargando...")
+            self.anterior_btn.setEnabled(False)
+            self.siguiente_btn.setEnabled(False)
+        else:
+            self.resultado_text.setPlaceholderText("Aquí aparecerán los resultados de las operaciones...")
 
     def actualizar_combos(self, doctores, pacientes, tratamientos):
         """Método para que el controlador actualice los combos"""
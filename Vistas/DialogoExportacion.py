@@ -0,0 +1,148 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from datetime import date, datetime
+from typing import NamedTuple, Optional
+
+from PyQt6.QtWidgets import (
+    QApplication, QDialog, QDialogButtonBox, QFormLayout, QHBoxLayout,
+    QCheckBox, QComboBox, QDateEdit, QFileDialog, QProgressDialog, QVBoxLayout
+)
+from PyQt6.QtCore import Qt, QDate
+
+FILTRO_ARCHIVOS = {
+    'csv': "CSV (*.csv)",
+    'jsonl': "JSON Lines (*.jsonl)",
+}
+
+
+class OpcionesExportacion(NamedTuple):
+    ruta: str
+    fecha_desde: Optional[date]
+    fecha_hasta: Optional[date]
+
+
+# ==========================================
+# CLASE: DialogoExportacion
+# PROPÓSITO: Pedir formato, rango de fechas y archivo antes de exportar
+# facturas, citas o pacientes (lo comparten las tres ventanas)
+# ==========================================
+
+class DialogoExportacion(QDialog):
+    """
+    Uso:
+        opciones = DialogoExportacion.pedir(self, "Facturas", "facturas", con_fechas=True)
+        if opciones:
+            ...opciones.ruta, opciones.fecha_desde, opciones.fecha_hasta
+
+    Sin marcar "Filtrar por fechas" se exporta todo el historial.
+    """
+
+    def __init__(self, parent=None, titulo: str = "", con_fechas: bool = True,
+                 desde: QDate = None, hasta: QDate = None):
+        super().__init__(parent)
+        self.setWindowTitle(f"📤 Exportar {titulo}")
+        self.setModal(True)
+
+        layout = QVBoxLayout(self)
+        formulario = QFormLayout()
+
+        self.formato_combo = QComboBox()
+        for formato, filtro in FILTRO_ARCHIVOS.items():
+            self.formato_combo.addItem(filtro, formato)
+        formulario.addRow("Formato:", self.formato_combo)
+
+        self.filtrar_fechas_check = QCheckBox("Filtrar por fechas")
+        self.desde_edit = QDateEdit(desde or QDate.currentDate().addMonths(-1))
+        self.hasta_edit = QDateEdit(hasta or QDate.currentDate())
+        for edit in (self.desde_edit, self.hasta_edit):
+            edit.setDisplayFormat("dd/MM/yyyy")
+            edit.setCalendarPopup(True)
+            edit.setEnabled(False)
+        self.filtrar_fechas_check.toggled.connect(self.desde_edit.setEnabled)
+        self.filtrar_fechas_check.toggled.connect(self.hasta_edit.setEnabled)
+
+        if con_fechas:
+            formulario.addRow(self.filtrar_fechas_check)
+            fechas = QHBoxLayout()
+            fechas.addWidget(self.desde_edit)
+            fechas.addWidget(self.hasta_edit)
+            formulario.addRow("Desde / Hasta:", fechas)
+
+        layout.addLayout(formulario)
+        botones = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
+        botones.accepted.connect(self.accept)
+        botones.rejected.connect(self.reject)
+        layout.addWidget(botones)
+
+    def rango_fechas(self):
+        if not self.filtrar_fechas_check.isChecked():
+            return None, None
+        return self.desde_edit.date().toPyDate(), self.hasta_edit.date().toPyDate()
+
+    @classmethod
+    def pedir(cls, parent, titulo: str, nombre_base: str, con_fechas: bool = True,
+              desde: QDate = None, hasta: QDate = None) -> Optional[OpcionesExportacion]:
+        """Muestra el diálogo y luego el selector de archivo; None si el usuario cancela"""
+        dialogo = cls(parent, titulo, con_fechas, desde, hasta)
+        if dialogo.exec() != QDialog.DialogCode.Accepted:
+            return None
+
+        fecha_desde, fecha_hasta = dialogo.rango_fechas()
+        if fecha_desde and fecha_hasta and fecha_desde > fecha_hasta:
+            fecha_desde, fecha_hasta = fecha_hasta, fecha_desde
+
+        formato = dialogo.formato_combo.currentData()
+        ruta, _ = QFileDialog.getSaveFileName(
+            parent, f"📤 Exportar {titulo}",
+            f"{nombre_base}_{datetime.now().strftime('%Y%m%d_%H%M')}.{formato}",
+            FILTRO_ARCHIVOS[formato])
+        if not ruta:
+            return None
+        if not ruta.lower().endswith(f".{formato}"):
+            ruta += f".{formato}"
+        return OpcionesExportacion(ruta, fecha_desde, fecha_hasta)
+
+
+# ==========================================
+# CLASE: ProgresoExportacion
+# PROPÓSITO: Mostrar las filas exportadas y permitir cancelar, usándose
+# directamente como callback de progreso de ExportadorDatos
+# ==========================================
+
+class ProgresoExportacion:
+    """
+    Uso:
+        progreso = ProgresoExportacion(self, "Exportando facturas...")
+        resultado = ExportadorDatos().exportar('facturas', ruta, progreso=progreso)
+        progreso.cerrar()
+
+    La exportación corre en el hilo de la interfaz; cada lote se procesan los
+    eventos pendientes para que la ventana siga respondiendo y el botón
+    Cancelar funcione.
+    """
+
+    def __init__(self, parent, texto: str):
+        self.dialogo = QProgressDialog(texto, "Cancelar", 0, 0, parent)
+        self.dialogo.setWindowTitle("📤 Exportación")
+        self.dialogo.setWindowModality(Qt.WindowModality.WindowModal)
+        self.dialogo.setMinimumDuration(0)
+        self.texto = texto
+        self.dialogo.show()
+        QApplication.processEvents()
+
+    def __call__(self, filas: int) -> bool:
+        self.dialogo.setLabelText(f"{self.texto}\n{filas:,} filas exportadas")
+        QApplication.processEvents()
+        return not self.dialogo.wasCanceled()
+
+    @property
+    def cancelado(self) -> bool:
+        return self.dialogo.wasCanceled()
+
+    def cerrar(self):
+        self.dialogo.close()
+
+
+__all__ = ['DialogoExportacion', 'ProgresoExportacion', 'OpcionesExportacion']
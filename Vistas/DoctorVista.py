@@ -13,6 +13,16 @@ from PyQt6.QtCore import Qt, QTime
 from PyQt6.QtGui import QFont
 
 from Controladores.DoctorControlador import ControladorDoctor
+from Vistas.TablaDatos import TablaDatos, Columna
+
+COLUMNAS_DOCTORES = [
+    Columna("N° Junta", lambda d: d.num_junta_medica),
+    Columna("Nombre", lambda d: d.nombre),
+    Columna("Apellido", lambda d: d.apellido),
+    Columna("Especialidad", lambda d: d.especialidad),
+    Columna("Teléfono", lambda d: d.telefono),
+    Columna("Correo", lambda d: d.correo),
+]
 
 class DoctorWindow(QMainWindow):
     def __init__(self):
@@ -285,6 +295,10 @@ class DoctorWindow(QMainWindow):
         resultado_label.setFont(QFont("Segoe UI", 14, QFont.Weight.Bold))
         resultado_label.setStyleSheet(f"color: {self.colors['accent']};")
         main_layout.addWidget(resultado_label)
+
+        # Listado de doctores en tabla virtualizada
+        self.tabla_doctores = TablaDatos(COLUMNAS_DOCTORES, texto_filtro="🔎 Filtrar doctores...")
+        main_layout.addWidget(self.tabla_doctores)
         
         self.resultado_text = QTextEdit()
         self.resultado_text.setReadOnly(True)
@@ -385,6 +399,10 @@ class DoctorWindow(QMainWindow):
         self.suprimir_doctor_btn.clicked.connect(self.controlador.suprimir_doctor)
         self.actualizar_info_doctor_btn.clicked.connect(self.controlador.actualizar_info_doctor)
     
+    def mostrar_doctores(self, doctores):
+        """Muestra el listado de doctores en la tabla"""
+        self.tabla_doctores.mostrar(doctores)
+
     def crear_doctor(self):
         """Crea un nuevo paciente y lo agrega a la base de datos"""
         try:
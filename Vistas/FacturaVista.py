@@ -10,11 +10,24 @@ from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont, QDoubleValidator 
 from datetime import datetime
 from typing import List, Dict, Any
+from Vistas.TablaDatos import TablaDatos, Columna
+from Vistas.DialogoExportacion import DialogoExportacion, ProgresoExportacion
+
+COLUMNAS_FACTURAS = [
+    Columna("ID", lambda f: f.id_factura),
+    Columna("Fecha", lambda f: f.fecha_emision, lambda v: v.strftime('%d/%m/%Y') if v else ""),
+    Columna("Paciente", lambda f: f"{f.paciente.nombre} {f.paciente.apellido}"),
+    Columna("DUI", lambda f: f.paciente.dui),
+    Columna("Servicios", lambda f: ", ".join(f.servicios)),
+    Columna("Estado", lambda f: f.estado_pago),
+    Columna("Total", lambda f: float(f.monto_total), lambda v: f"${v:,.2f}"),
+]
 
 class FacturacionView(QMainWindow):  
     crear_factura_signal = pyqtSignal(dict)
     mostrar_facturas_signal = pyqtSignal()
     limpiar_campos_signal = pyqtSignal()
+    exportar_facturas_signal = pyqtSignal(object)  # OpcionesExportacion
     # actualizar_datos_signal = pyqtSignal()  
 
     def __init__(self):
@@ -347,11 +360,13 @@ class FacturacionView(QMainWindow):
         self.crear_btn = QPushButton("➕ Crear Factura")
         self.mostrar_btn = QPushButton("📋 Mostrar Facturas")
         self.limpiar_btn = QPushButton("🗑️ Limpiar Campos")
+        self.exportar_btn = QPushButton("📤 Exportar Facturas")
         # self.actualizar_btn = QPushButton("🔄 Actualizar Datos")
         
         buttons_layout.addWidget(self.crear_btn)
         buttons_layout.addWidget(self.mostrar_btn)
         buttons_layout.addWidget(self.limpiar_btn)
+        buttons_layout.addWidget(self.exportar_btn)
         # buttons_layout.addWidget(self.actualizar_btn)
         
         main_layout.addLayout(buttons_layout)
@@ -363,6 +378,11 @@ class FacturacionView(QMainWindow):
         resultado_label.setStyleSheet(f"color: {self.colors['primary']};")
         main_layout.addWidget(resultado_label)
 
+        # Listado de facturas en tabla virtualizada (solo se dibujan las filas visibles)
+        self.tabla_facturas = TablaDatos(COLUMNAS_FACTURAS, texto_filtro="🔎 Filtrar facturas...")
+        self.tabla_facturas.fila_activada.connect(self.mostrar_detalle_factura)
+        main_layout.addWidget(self.tabla_facturas)
+
         self.resultado_text = QTextEdit()
         self.resultado_text.setReadOnly(True)
         self.resultado_text.setMinimumHeight(250)
@@ -374,6 +394,7 @@ class FacturacionView(QMainWindow):
         self.crear_btn.clicked.connect(self.on_crear_factura)
         self.mostrar_btn.clicked.connect(self.on_mostrar_facturas)
         self.limpiar_btn.clicked.connect(self.on_limpiar_campos)
+        self.exportar_btn.clicked.connect(self.on_exportar_facturas)
         # self.actualizar_btn.clicked.connect(self.on_actualizar_datos)
 
     # def on_actualizar_datos(self):
@@ -420,10 +441,34 @@ class FacturacionView(QMainWindow):
         """Manejador para el botón de limpiar campos"""
         self.limpiar_campos_signal.emit()
 
+    def on_exportar_facturas(self):
+        """Manejador para el botón de exportar: pide formato, fechas y archivo"""
+        opciones = DialogoExportacion.pedir(self, "Facturas", "facturas", con_fechas=True)
+        if opciones:
+            self.exportar_facturas_signal.emit(opciones)
+
+    def iniciar_progreso_exportacion(self, texto: str) -> ProgresoExportacion:
+        """Diálogo de avance que el controlador pasa como callback de progreso"""
+        return ProgresoExportacion(self, texto)
+
     # def on_actualizar_datos(self):
     #     """Manejador para el botón de actualizar datos"""
     #     self.actualizar_datos_signal.emit()
 
+    def mostrar_cargando(self, cargando: bool):
+        """Bloquea el formulario mientras se cargan pacientes y tratamientos"""
+        for widget in (self.crear_btn, self.paciente_combo, self.tratamiento_combo):
+            widget.setEnabled(not cargando)
+
+        if cargando:
+            self.paciente_combo.clear()
+            self.paciente_combo.addItem("⏳ Cargando pacientes...", None)
+            self.tratamiento_combo.clear()
+            self.tratamiento_combo.addItem("⏳ Cargando tratamientos...", None)
+            self.id_factura_edit.setPlaceholderText("⏳ Cargando...")
+        else:
+            self.id_factura_edit.setPlaceholderText("Se generará automáticamente...")
+
     def mostrar_id_automatico(self, id_factura: str):
         """Muestra el ID generado automáticamente en el campo correspondiente"""
         self.id_factura_edit.setText(id_factura)
@@ -458,6 +503,18 @@ class FacturacionView(QMainWindow):
             self.resultado_text.clear()
         self.resultado_text.append(texto)
 
+    def mostrar_facturas(self, facturas):
+        """Muestra el listado de facturas en la tabla"""
+        self.tabla_facturas.mostrar(facturas)
+
+    def agregar_factura(self, factura):
+        """Agrega una factura recién creada al inicio del listado (el más reciente va primero)"""
+        self.tabla_facturas.agregar_fila(factura, al_inicio=True)
+
+    def mostrar_detalle_factura(self, factura):
+        """Muestra el detalle de la factura elegida en la tabla"""
+        self.actualizar_resultado(str(factura), limpiar=True)
+
     def agregar_factura_resultado(self, texto_factura):
         """Agrega una factura al área de resultados"""
         self.resultado_text.append(texto_factura)
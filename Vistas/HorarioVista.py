@@ -14,6 +14,25 @@ from PyQt6.QtGui import QFont
 from typing import List
 from Controladores.HorarioControlador import HorarioController
 from Modelos.DoctorModelo import Doctor 
+from Vistas.TablaDatos import TablaDatos, Columna
+
+COLUMNAS_HORARIOS = [
+    Columna("Día", lambda h: h.dia),
+    Columna("ID", lambda h: h.horario.id_horario),
+    Columna("Inicio", lambda h: h.horario.hora_inicio),
+    Columna("Fin", lambda h: h.horario.hora_fin),
+    Columna("Médico", lambda h: f"Dr. {h.horario.doctor.nombre} {h.horario.doctor.apellido}"),
+    Columna("Estado", lambda h: "✅ Disponible" if h.horario.disponible else "❌ Ocupado"),
+]
+
+
+class _FilaHorario:
+    """Fila de la tabla de horarios: el horario y el día bajo el que se agrupa"""
+    __slots__ = ('dia', 'horario')
+
+    def __init__(self, dia: str, horario):
+        self.dia = dia
+        self.horario = horario
 
 
 class AgregarHorarioDialog(QDialog):
@@ -489,16 +508,25 @@ class HorarioView(QMainWindow):
         resultado_label.setFont(QFont("Segoe UI", 14, QFont.Weight.Bold))
         layout.addWidget(resultado_label)
         
-        # Lista de horarios
-        self.resultados = QTextEdit()
-        self.resultados.setReadOnly(True)
-        layout.addWidget(self.resultados)
+        # Lista de horarios en tabla virtualizada
+        self.estado_horarios_label = QLabel("")
+        layout.addWidget(self.estado_horarios_label)
+        self.tabla_horarios = TablaDatos(COLUMNAS_HORARIOS, texto_filtro="🔎 Filtrar por médico, hora o estado...")
+        layout.addWidget(self.tabla_horarios)
     
     def conectar_botones(self):
         """Conecta los botones con los métodos del controlador."""
         self.btn_agregar.clicked.connect(self.controlador.agregar_horario)
         self.btn_eliminar.clicked.connect(self.controlador.eliminar_horario)
     
+    def mostrar_cargando(self, cargando: bool):
+        """Bloquea los botones y avisa mientras se cargan doctores y horarios"""
+        self.btn_agregar.setEnabled(not cargando)
+        self.btn_eliminar.setEnabled(not cargando)
+        if cargando:
+            self.tabla_horarios.limpiar()
+            self.estado_horarios_label.setText("⏳ Cargando horarios desde la base de datos...")
+
     def actualizar_combos(self, doctores: List[Doctor]):
         """Método para que el controlador actualice los combos."""
         pass 
@@ -549,18 +577,15 @@ class HorarioView(QMainWindow):
     
     def actualizar_lista_horarios(self, horarios_por_dia: dict):
         """Actualiza la lista de horarios en la interfaz."""
-        self.resultados.clear()
-        
-        if not horarios_por_dia:
-            self.resultados.setPlainText("📋 No hay horarios registrados.")
-            return
+        filas = [_FilaHorario(dia, horario)
+                 for dia, horarios in (horarios_por_dia or {}).items()
+                 for horario in sorted(horarios, key=lambda h: h.hora_inicio)]
+        self.tabla_horarios.mostrar(filas)
         
-        for dia, horarios in horarios_por_dia.items():
-            self.resultados.append(f"\n📅 HORARIOS DE HOY")
-            self.resultados.append("━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━")
-            for horario in sorted(horarios, key=lambda h: h.hora_inicio):
-                self.resultados.append(f"   {str(horario)}")
-            self.resultados.append("")
+        if not filas:
+            self.estado_horarios_label.setText("📋 No hay horarios registrados.")
+        else:
+            self.estado_horarios_label.setText(f"📅 {len(filas)} horario(s) registrados")
     
     def obtener_info_horarios_para_eliminar(self, horarios):
         """Genera la lista de información de horarios para el diálogo de eliminación."""
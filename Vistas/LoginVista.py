@@ -5,7 +5,6 @@ from PyQt6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout,
                             QLabel, QLineEdit, QPushButton, QMessageBox, QFrame, QScrollArea)
 from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QFont
-from Modelos.loginModelo import LoginModelo
 
 class LoginVista(QWidget):
     # Señal que se emite cuando el login es exitoso
@@ -26,10 +25,18 @@ class LoginVista(QWidget):
         self.inicializar_ui()
     
     def crear_info_usuarios(self):
-        """Crea el label con información de usuarios disponibles desde la base de datos"""
+        """
+        Crea el label de usuarios disponibles. La ventana se muestra sin esperar a la
+        base de datos; el controlador llena el label con mostrar_info_usuarios().
+        """
+        self.info_usuarios_label = QLabel("⏳ Cargando usuarios disponibles...")
+        return self.info_usuarios_label
+
+    def mostrar_info_usuarios(self, usuarios, error: str = None):
+        """Escribe en el label la lista de usuarios cargada desde la base de datos"""
         try:
-            modelo = LoginModelo()
-            usuarios = modelo.listar_usuarios_disponibles()
+            if error:
+                raise RuntimeError(error)
             
             if usuarios:
                 texto_usuarios = "👥 Usuarios disponibles en la base de datos:\n"
@@ -54,7 +61,7 @@ class LoginVista(QWidget):
         except Exception as e:
             texto_usuarios = f"⚠️ Error al cargar usuarios: {str(e)}\n📋 Contacta al administrador del sistema"
         
-        return QLabel(texto_usuarios)
+        self.info_usuarios_label.setText(texto_usuarios)
     
     def inicializar_ui(self):
         """Inicializa la interfaz de usuario"""
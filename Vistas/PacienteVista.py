@@ -1,5 +1,5 @@
 from PyQt6.QtWidgets import *
-from PyQt6.QtCore import Qt, QDate
+from PyQt6.QtCore import Qt, QDate, QTimer, QAbstractListModel, QModelIndex
 from PyQt6.QtGui import QFont
 from datetime import datetime
 from typing import List
@@ -15,7 +15,63 @@ sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
 from Controladores.PacienteControlador import PacienteControlador
 from Modelos.PacienteModelo import Paciente
+from Vistas.TablaDatos import TablaDatos, Columna
+from Vistas.DialogoExportacion import DialogoExportacion, ProgresoExportacion
 
+COLUMNAS_PACIENTES = [
+    Columna("ID", lambda p: p.id_paciente),
+    Columna("Apellido", lambda p: p.apellido),
+    Columna("Nombre", lambda p: p.nombre),
+    Columna("Edad", lambda p: p.calcular_edad()),
+    Columna("DUI", lambda p: p.dui if p.tiene_dui() else "No registrado"),
+    Columna("Teléfono", lambda p: p.telefono),
+    Columna("Correo", lambda p: p.correo or "No especificado"),
+    Columna("Saldo", lambda p: float(p.saldo_pendiente), lambda v: f"${v:,.2f}"),
+    Columna("Registro", lambda p: p.fecha_registro),
+]
+
+# Espera después de la última tecla antes de buscar (ms)
+ESPERA_BUSQUEDA_MS = 250
+# Máximo de pacientes que se agregan al ComboBox y al detalle de texto
+MAXIMO_RESULTADOS_COMBO = 50
+MAXIMO_RESULTADOS_DETALLE = 20
+
+
+# ==========================================
+# CLASE: ModeloListaPacientes
+# PROPÓSITO: Modelo para la lista de resultados de la búsqueda en vivo.
+# La QListView solo pide los textos de las filas visibles, así miles de
+# resultados no crean miles de widgets ni textos por adelantado
+# ==========================================
+class ModeloListaPacientes(QAbstractListModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pacientes: List[Paciente] = []
+
+    def set_pacientes(self, pacientes: List[Paciente]):
+        """Reemplaza los resultados mostrados"""
+        self.beginResetModel()
+        self.pacientes = list(pacientes or [])
+        self.endResetModel()
+
+    def paciente_en(self, fila: int):
+        if 0 <= fila < len(self.pacientes):
+            return self.pacientes[fila]
+        return None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.pacientes)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        paciente = self.paciente_en(index.row()) if index.isValid() else None
+        if paciente is None:
+            return None
+        if role == Qt.ItemDataRole.DisplayRole:
+            dui_info = f"DUI: {paciente.dui}" if paciente.tiene_dui() else "Sin DUI"
+            return f"#{paciente.id_paciente} - {paciente.apellido}, {paciente.nombre} - {dui_info}"
+        if role == Qt.ItemDataRole.UserRole:
+            return paciente
+        return None
 
 
 # ==========================================
@@ -450,6 +506,24 @@ class PacienteWindow(QMainWindow):
         # Conectar Enter para ejecutar búsqueda
         self.buscar_nombre_edit.returnPressed.connect(self.buscar_pacientes_por_nombre)
         self.buscar_apellido_edit.returnPressed.connect(self.buscar_pacientes_por_nombre)
+
+        # Búsqueda en vivo: cada tecla reinicia el temporizador y solo se busca
+        # cuando el usuario deja de escribir ESPERA_BUSQUEDA_MS
+        self.temporizador_busqueda = QTimer(self)
+        self.temporizador_busqueda.setSingleShot(True)
+        self.temporizador_busqueda.setInterval(ESPERA_BUSQUEDA_MS)
+        self.temporizador_busqueda.timeout.connect(self.buscar_pacientes_en_vivo)
+        self.buscar_nombre_edit.textChanged.connect(self.temporizador_busqueda.start)
+        self.buscar_apellido_edit.textChanged.connect(self.temporizador_busqueda.start)
+
+        # Resultados de la búsqueda en vivo (doble clic o Enter selecciona el paciente)
+        self.modelo_resultados = ModeloListaPacientes(self)
+        self.resultados_lista = QListView()
+        self.resultados_lista.setModel(self.modelo_resultados)
+        self.resultados_lista.setUniformItemSizes(True)
+        self.resultados_lista.setMaximumHeight(150)
+        self.resultados_lista.activated.connect(self.seleccionar_paciente_desde_lista)
+        self.estado_busqueda_label = QLabel("")
         
         # ComboBox para mostrar resultados de búsqueda
         self.pacientes_combo = QComboBox()
@@ -579,6 +653,8 @@ class PacienteWindow(QMainWindow):
         
         busqueda_layout.addRow("🔤 Nombre:", self.buscar_nombre_edit)
         busqueda_layout.addRow("🔤 Apellido:", self.buscar_apellido_edit)
+        busqueda_layout.addRow("⚡ Coincidencias:", self.resultados_lista)
+        busqueda_layout.addRow("", self.estado_busqueda_label)
         busqueda_layout.addRow("📋 Pacientes Encontrados:", self.pacientes_combo)
         busqueda_layout.addRow("", botones_busqueda_layout)
         
@@ -616,6 +692,14 @@ class PacienteWindow(QMainWindow):
         # Botón para mostrar todos los pacientes
         self.mostrar_todos_btn = QPushButton("📚 Todos los Pacientes")
         self.mostrar_todos_btn.clicked.connect(self.mostrar_todos_pacientes)
+
+        # Botón para guardar el reporte completo en un archivo
+        self.exportar_reporte_btn = QPushButton("💾 Exportar Reporte")
+        self.exportar_reporte_btn.clicked.connect(self.exportar_reporte_pacientes)
+
+        # Botón para exportar la tabla de pacientes a CSV / JSONL
+        self.exportar_datos_btn = QPushButton("📤 Exportar CSV/JSONL")
+        self.exportar_datos_btn.clicked.connect(self.exportar_datos_pacientes)
         
         # Botón para crear historial médico inicial
         self.crear_historial_btn = QPushButton("📋 Crear Historial Médico")
@@ -642,6 +726,8 @@ class PacienteWindow(QMainWindow):
         buttons_row2.addWidget(self.ver_info_basica_btn)
         buttons_row2.addWidget(self.mostrar_info_btn)
         buttons_row2.addWidget(self.mostrar_todos_btn)
+        buttons_row2.addWidget(self.exportar_reporte_btn)
+        buttons_row2.addWidget(self.exportar_datos_btn)
         buttons_row2.addWidget(self.crear_historial_btn)
         
         # Layout vertical para las filas de botones
@@ -656,6 +742,11 @@ class PacienteWindow(QMainWindow):
         resultado_label.setFont(QFont("Arial", 14, QFont.Weight.Bold))
         resultado_label.setStyleSheet(f"color: {self.colors['accent']};")
         main_layout.addWidget(resultado_label)
+
+        # Listado de todos los pacientes (tabla virtualizada; doble clic selecciona)
+        self.tabla_pacientes = TablaDatos(COLUMNAS_PACIENTES, texto_filtro="🔎 Filtrar pacientes...")
+        self.tabla_pacientes.fila_activada.connect(self._seleccionar_paciente)
+        main_layout.addWidget(self.tabla_pacientes)
         
         self.resultado_text = QTextEdit()
         self.resultado_text.setReadOnly(True)
@@ -949,80 +1040,6 @@ class PacienteWindow(QMainWindow):
     
 
     
-    def _generar_resumen_todos_pacientes(self) -> str:
-        """Genera un resumen básico de todos los pacientes desde la base de datos"""
-        separador_principal = "=" * 80
-        separador_paciente = "-" * 60
-        
-        # Obtener todos los pacientes desde la base de datos
-        pacientes = self.controlador.obtener_todos_los_pacientes_para_vista()
-        
-        resumen = f"""
-{separador_principal}
-📚 RESUMEN DE PACIENTES REGISTRADOS - CLÍNICA DENTAL
-{separador_principal}
-
-📊 INFORMACIÓN GENERAL:
-   ▪ Total de Pacientes Registrados: {len(pacientes)}
-   ▪ Fecha de Consulta: {datetime.now().strftime('%d/%m/%Y - %H:%M:%S')}
-   ▪ Fuente: Base de Datos MySQL
-
-{separador_principal}
-"""
-        
-        # Mostrar cada paciente
-        for i, paciente in enumerate(pacientes, 1):
-            edad = paciente.calcular_edad()
-            dui_label = "DUI del Responsable" if edad < 18 else "DUI"
-            edad_info = f"{edad} años" + (" (Menor de edad)" if edad < 18 else "")
-            dui_info = paciente.dui if paciente.tiene_dui() else "No registrado"
-            
-            resumen += f"""
-{separador_paciente}
-👤 PACIENTE #{i:02d}: {paciente.nombre} {paciente.apellido} (ID: #{paciente.id_paciente})
-{separador_paciente}
-
-📋 INFORMACIÓN PERSONAL:
-   ▪ ID del Paciente: #{paciente.id_paciente}
-   ▪ Nombre Completo: {paciente.nombre} {paciente.apellido}
-   ▪ Edad: {edad_info}
-   ▪ {dui_label}: {dui_info}
-   ▪ Teléfono: {paciente.telefono}
-   ▪ Correo: {paciente.correo if paciente.correo else 'No especificado'}
-   ▪ Fecha de Registro: {paciente.fecha_registro}
-
-💰 INFORMACIÓN FINANCIERA:
-   ▪ Saldo Pendiente: ${paciente.saldo_pendiente:,.2f}
-   ▪ Estado de Pago: {'🔴 Pendiente' if paciente.saldo_pendiente > 0 else '🟢 Al día'}
-
-"""
-        
-        # Resumen estadístico básico
-        total_pacientes = len(pacientes)
-        total_saldos_pendientes = sum(p.saldo_pendiente for p in pacientes)
-        pacientes_con_saldo = sum(1 for p in pacientes if p.saldo_pendiente > 0)
-        
-        resumen += f"""
-{separador_principal}
-📈 ESTADÍSTICAS BÁSICAS DE LA CLÍNICA
-{separador_principal}
-
-👥 PACIENTES:
-   ▪ Total de Pacientes: {total_pacientes}
-   ▪ Pacientes con Saldo Pendiente: {pacientes_con_saldo}
-   ▪ Pacientes al Día: {total_pacientes - pacientes_con_saldo}
-   
-💰 FINANZAS BÁSICAS:
-   ▪ Total Saldos Pendientes: ${total_saldos_pendientes:,.2f}
-
-💡 NOTA: Esta vista muestra únicamente información básica de pacientes.
-Para consultar historiales médicos, citas y tratamientos, 
-utilice los módulos especializados correspondientes.
-
-{separador_principal}
-"""
-        return resumen
-    
     def ver_info_basica(self):
         """Muestra información básica del paciente seleccionado"""
         paciente_actual = self.controlador.paciente_actual
@@ -1044,18 +1061,60 @@ utilice los módulos especializados correspondientes.
 """
         self.resultado_text.setText(info_basica)
 
+    def actualizar_paciente_en_tabla(self, paciente):
+        """Repinta solo la fila del paciente que cambió (si está en la tabla)"""
+        self.tabla_pacientes.actualizar_fila(paciente, lambda p: p.id_paciente)
+
     def mostrar_todos_pacientes(self):
         """Muestra un resumen de todos los pacientes registrados desde la base de datos"""
-        # Intentar cargar todos los pacientes desde la base de datos
-        pacientes = self.controlador.obtener_todos_los_pacientes_para_vista()
+        # La tabla recibe el primer lote y pide los siguientes al desplazarse,
+        # así en memoria solo están los pacientes que ya se vieron
+        pacientes, hay_mas = self.controlador.lote_pacientes_para_tabla()
         
         if not pacientes:
             QMessageBox.information(self, "ℹ️ Información", 
                                   "No hay pacientes registrados en la base de datos.")
             return
         
-        resumen_completo = self._generar_resumen_todos_pacientes()
-        self.resultado_text.setText(resumen_completo)
+        # El detalle por paciente va en la tabla; el texto solo lleva el resumen,
+        # que se escribe por partes a medida que se recorren los pacientes en la BD
+        self.tabla_pacientes.mostrar(pacientes, self.controlador.lote_pacientes_para_tabla if hay_mas else None)
+        self.resultado_text.clear()
+        self.controlador.generar_reporte_pacientes(self._escribir_resultado, incluir_detalle=False)
+        self._escribir_resultado("💡 El detalle de cada paciente está en la tabla de arriba "
+                                 "(doble clic en una fila para seleccionarlo).\n")
+
+    def _escribir_resultado(self, texto: str):
+        """Agrega texto al final del área de resultados sin reconstruir lo ya escrito"""
+        cursor = self.resultado_text.textCursor()
+        cursor.movePosition(cursor.MoveOperation.End)
+        cursor.insertText(texto)
+        self.resultado_text.setTextCursor(cursor)
+
+    def exportar_reporte_pacientes(self):
+        """Guarda el reporte completo de todos los pacientes en un archivo de texto"""
+        ruta, _ = QFileDialog.getSaveFileName(
+            self, "💾 Exportar Reporte de Pacientes",
+            f"reporte_pacientes_{datetime.now().strftime('%Y%m%d_%H%M')}.txt",
+            "Archivos de texto (*.txt)")
+        if not ruta:
+            return
+
+        exito, mensaje = self.controlador.exportar_reporte_pacientes(ruta)
+        self.mostrar_mensaje("✅ Éxito" if exito else "❌ Error", mensaje, "info" if exito else "error")
+
+    def exportar_datos_pacientes(self):
+        """Exporta todos los pacientes a CSV o JSONL mostrando el avance"""
+        opciones = DialogoExportacion.pedir(self, "Pacientes", "pacientes", con_fechas=False)
+        if not opciones:
+            return
+
+        progreso = ProgresoExportacion(self, "Exportando pacientes...")
+        exito, mensaje = self.controlador.exportar_pacientes(opciones.ruta, progreso)
+        progreso.cerrar()
+        if progreso.cancelado:
+            return
+        self.mostrar_mensaje("✅ Éxito" if exito else "❌ Error", mensaje, "info" if exito else "error")
     
     def mostrar_info_paciente(self):
         """Muestra la información básica del paciente"""
@@ -1107,8 +1166,38 @@ utilice los módulos especializados correspondientes.
     # MÉTODOS DE BÚSQUEDA DE PACIENTES
     # ==========================================
     
+    def buscar_pacientes_en_vivo(self):
+        """Busca mientras se escribe (después de la espera) y llena la lista de coincidencias"""
+        nombre = self.buscar_nombre_edit.text().strip()
+        apellido = self.buscar_apellido_edit.text().strip()
+
+        if not nombre and not apellido:
+            self.modelo_resultados.set_pacientes([])
+            self.estado_busqueda_label.setText("")
+            return
+
+        self.estado_busqueda_label.setText("⏳ Buscando...")
+        self.controlador.buscar_pacientes_en_vivo(nombre, apellido, self.mostrar_resultados_en_vivo)
+
+    def mostrar_resultados_en_vivo(self, pacientes_encontrados):
+        """Recibe los resultados de la búsqueda en vivo (del índice o de la BD en segundo plano)"""
+        self.modelo_resultados.set_pacientes(pacientes_encontrados)
+        if pacientes_encontrados:
+            self.estado_busqueda_label.setText(
+                f"✅ {len(pacientes_encontrados)} coincidencia(s). Doble clic para seleccionar.")
+        else:
+            self.estado_busqueda_label.setText("❌ No se encontraron pacientes")
+
+    def seleccionar_paciente_desde_lista(self, index):
+        """Selecciona el paciente activado en la lista de coincidencias"""
+        paciente = self.modelo_resultados.paciente_en(index.row())
+        if paciente:
+            self._seleccionar_paciente(paciente)
+
     def buscar_pacientes_por_nombre(self):
         """Busca pacientes por nombre y/o apellido y actualiza el ComboBox"""
+        # Búsqueda explícita (botón o Enter): no esperar al temporizador
+        self.temporizador_busqueda.stop()
         nombre_busqueda = str(self.buscar_nombre_edit.text())
         apellido_busqueda = str(self.buscar_apellido_edit.text())
 
@@ -1133,15 +1222,19 @@ utilice los módulos especializados correspondientes.
             nombre_busqueda, apellido_busqueda
         )
 
+        self.modelo_resultados.set_pacientes(pacientes_encontrados)
+
         if pacientes_encontrados:
-            for paciente in pacientes_encontrados:
+            for paciente in pacientes_encontrados[:MAXIMO_RESULTADOS_COMBO]:
                 edad = paciente.calcular_edad()
                 dui_info = f"DUI: {paciente.dui}" if paciente.tiene_dui() else "Sin DUI"
                 texto_combo = f"#{paciente.id_paciente} - {paciente.nombre} {paciente.apellido} ({edad} años) - {dui_info}"
                 self.pacientes_combo.addItem(texto_combo, paciente)
+            self.estado_busqueda_label.setText(f"✅ {len(pacientes_encontrados)} coincidencia(s)")
             self.mostrar_resultados_busqueda(pacientes_encontrados)
         else:
             self.pacientes_combo.addItem("❌ No se encontraron pacientes")
+            self.estado_busqueda_label.setText("❌ No se encontraron pacientes")
             self.resultado_text.setText("🔍 No se encontraron pacientes que coincidan con la búsqueda.")
 
     
@@ -1155,7 +1248,7 @@ utilice los módulos especializados correspondientes.
 
 """
         
-        for i, paciente in enumerate(pacientes_encontrados, 1):
+        for i, paciente in enumerate(pacientes_encontrados[:MAXIMO_RESULTADOS_DETALLE], 1):
             edad = paciente.calcular_edad()
             edad_info = f"{edad} años" + (" (Menor)" if edad < 18 else " (Mayor)")
             dui_info = paciente.dui if paciente.tiene_dui() else "No registrado"
@@ -1172,6 +1265,11 @@ utilice los módulos especializados correspondientes.
 └─────────────────────────────────────────────────
 """
         
+        if len(pacientes_encontrados) > MAXIMO_RESULTADOS_DETALLE:
+            info += f"""
+... y {len(pacientes_encontrados) - MAXIMO_RESULTADOS_DETALLE} paciente(s) más en la lista de coincidencias.
+"""
+
         info += f"""
 💡 INSTRUCCIONES:
 • Seleccione un paciente del ComboBox de arriba para verlo como paciente actual
@@ -1193,28 +1291,34 @@ utilice los módulos especializados correspondientes.
             paciente_seleccionado = self.pacientes_combo.itemData(indice_actual)
             
             if paciente_seleccionado:
-                # Establecer como paciente actual
-                self.controlador.paciente_actual = paciente_seleccionado
-                
-                # Mostrar mensaje de confirmación
-                edad = self.controlador.calcular_edad(paciente_seleccionado.fecha_nacimiento)
-                dui_info = f"DUI: {paciente_seleccionado.dui}" if paciente_seleccionado.tiene_dui() else "DUI: No registrado"
-                
-                QMessageBox.information(self, "✅ Paciente Seleccionado", 
-                                      f"Paciente #{paciente_seleccionado.id_paciente}: {paciente_seleccionado.nombre} {paciente_seleccionado.apellido} "
-                                      f"ha sido seleccionado como paciente actual.\n\n"
-                                      f"ID: #{paciente_seleccionado.id_paciente}\n"
-                                      f"Edad: {edad} años\n"
-                                      f"{dui_info}\n\n"
-                                      f"Ahora puede usar todas las funciones con este paciente.")
-                
-                # Mostrar información completa del paciente seleccionado
-                self.resultado_text.setText(self._generar_info_completa())
+                self._seleccionar_paciente(paciente_seleccionado)
+
+    def _seleccionar_paciente(self, paciente_seleccionado):
+        """Establece el paciente como actual, lo confirma y muestra su información"""
+        self.controlador.paciente_actual = paciente_seleccionado
+        
+        # Mostrar mensaje de confirmación
+        edad = self.controlador.calcular_edad(paciente_seleccionado.fecha_nacimiento)
+        dui_info = f"DUI: {paciente_seleccionado.dui}" if paciente_seleccionado.tiene_dui() else "DUI: No registrado"
+        
+        QMessageBox.information(self, "✅ Paciente Seleccionado", 
+                              f"Paciente #{paciente_seleccionado.id_paciente}: {paciente_seleccionado.nombre} {paciente_seleccionado.apellido} "
+                              f"ha sido seleccionado como paciente actual.\n\n"
+                              f"ID: #{paciente_seleccionado.id_paciente}\n"
+                              f"Edad: {edad} años\n"
+                              f"{dui_info}\n\n"
+                              f"Ahora puede usar todas las funciones con este paciente.")
+        
+        # Mostrar información completa del paciente seleccionado
+        self.resultado_text.setText(self._generar_info_completa())
     
     def limpiar_busqueda(self):
         """Limpia los campos de búsqueda y el ComboBox"""
         self.buscar_nombre_edit.clear()
         self.buscar_apellido_edit.clear()
+        self.temporizador_busqueda.stop()
+        self.modelo_resultados.set_pacientes([])
+        self.estado_busqueda_label.setText("")
         self.pacientes_combo.clear()
         self.pacientes_combo.addItem("-- Seleccione un paciente --")
         
@@ -0,0 +1,367 @@
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from datetime import date, datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QLabel,
+                             QTableView, QHeaderView, QAbstractItemView)
+from PyQt6.QtCore import (Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel,
+                          QTimer, pyqtSignal)
+
+from Modelos.IndiceBusqueda import normalizar_texto
+
+# Rol con el valor sin formatear de una celda (para ordenar)
+ROL_ORDEN = Qt.ItemDataRole.UserRole + 1
+
+# Espera después de la última tecla antes de filtrar (ms)
+ESPERA_FILTRO_MS = 200
+
+# Función que trae más filas cuando el usuario llega al final de la tabla:
+# recibe la última fila cargada y devuelve (filas nuevas, True si quedan más)
+CargarMas = Callable[[Any], Tuple[List[Any], bool]]
+
+
+# ==========================================
+# CLASE: Columna
+# PROPÓSITO: Describir una columna: título, cómo sacar el valor de la fila
+# y cómo mostrarlo
+# ==========================================
+
+class Columna:
+    """
+    Ejemplo:
+        Columna("Saldo", lambda p: p.saldo_pendiente, lambda v: f"${v:,.2f}")
+    El valor sin formatear se usa para ordenar (fechas y montos ordenan bien);
+    el texto formateado es lo que se ve y lo que se filtra.
+    """
+
+    def __init__(self, titulo: str, valor: Callable[[Any], Any],
+                 formato: Callable[[Any], str] = None):
+        self.titulo = titulo
+        self.valor = valor
+        self.formato = formato or Columna.formato_por_defecto
+
+    @staticmethod
+    def formato_por_defecto(valor) -> str:
+        if valor is None:
+            return ""
+        if isinstance(valor, datetime):
+            return valor.strftime('%d/%m/%Y %H:%M')
+        if isinstance(valor, date):
+            return valor.strftime('%d/%m/%Y')
+        if isinstance(valor, float):
+            return f"{valor:,.2f}"
+        return str(valor)
+
+
+# ==========================================
+# CLASE: ModeloTabla
+# PROPÓSITO: Modelo de tabla compartido por los módulos. Guarda los objetos
+# (citas, facturas, pacientes...) y solo genera el texto de las celdas que
+# la vista pide, es decir, las visibles
+# ==========================================
+
+class ModeloTabla(QAbstractTableModel):
+    """
+    Las filas se entregan a la vista por lotes (canFetchMore/fetchMore): al abrir
+    solo existen las primeras `tamano_lote` y el resto aparece al desplazarse.
+    Si se indica `cargar_mas`, al terminarse las filas en memoria se piden más a
+    la BD (p. ej. la siguiente página de citas por clave).
+    """
+
+    def __init__(self, columnas: Sequence[Columna], tamano_lote: int = 200, parent=None):
+        super().__init__(parent)
+        self.columnas = list(columnas)
+        self.tamano_lote = tamano_lote
+        self._filas: List[Any] = []
+        self._visibles = 0
+        self._cargar_mas: Optional[CargarMas] = None
+        self._hay_mas = False
+        self._textos_busqueda: Dict[int, str] = {}
+
+    # ---------- Datos ----------
+
+    def set_filas(self, filas: Sequence[Any], cargar_mas: CargarMas = None):
+        """Reemplaza todas las filas; `cargar_mas` permite seguir trayendo filas al desplazarse"""
+        self.beginResetModel()
+        self._filas = list(filas or [])
+        self._visibles = min(len(self._filas), self.tamano_lote)
+        self._cargar_mas = cargar_mas
+        self._hay_mas = cargar_mas is not None
+        self._textos_busqueda = {}
+        self.endResetModel()
+
+    @property
+    def filas(self) -> List[Any]:
+        """Todas las filas cargadas (también las que la vista aún no pidió)"""
+        return self._filas
+
+    @property
+    def hay_mas(self) -> bool:
+        """True si quedan filas por traer de la BD"""
+        return self._hay_mas
+
+    def fila_en(self, fila: int):
+        if 0 <= fila < self._visibles:
+            return self._filas[fila]
+        return None
+
+    def valor_orden(self, fila: int, columna: int):
+        return self.columnas[columna].valor(self._filas[fila])
+
+    def texto_busqueda(self, fila: int) -> str:
+        """Texto normalizado de toda la fila (se calcula una vez y se guarda)"""
+        texto = self._textos_busqueda.get(fila)
+        if texto is None:
+            objeto = self._filas[fila]
+            texto = normalizar_texto(" ".join(c.formato(c.valor(objeto)) for c in self.columnas))
+            self._textos_busqueda[fila] = texto
+        return texto
+
+    def reemplazar_fila(self, objeto, clave: Callable[[Any], Any]) -> bool:
+        """
+        Cambia la fila cuya clave coincide con la de `objeto` (p. ej. el mismo ID_Cita)
+        y repinta solo esa fila. Devuelve False si no está entre las filas cargadas.
+        """
+        buscada = clave(objeto)
+        for fila, actual in enumerate(self._filas):
+            if clave(actual) == buscada:
+                self._filas[fila] = objeto
+                self._textos_busqueda.pop(fila, None)
+                if fila < self._visibles:
+                    self.dataChanged.emit(self.index(fila, 0), self.index(fila, len(self.columnas) - 1))
+                return True
+        return False
+
+    def agregar_fila(self, objeto, al_inicio: bool = False):
+        """Agrega una fila nueva (al final o al inicio) sin reconstruir la tabla"""
+        if al_inicio:
+            self.beginInsertRows(QModelIndex(), 0, 0)
+            self._filas.insert(0, objeto)
+            # Las filas se corrieron una posición: sus textos de búsqueda también
+            self._textos_busqueda = {fila + 1: texto for fila, texto in self._textos_busqueda.items()}
+            self._visibles += 1
+            self.endInsertRows()
+        elif self._visibles == len(self._filas):
+            fila = len(self._filas)
+            self.beginInsertRows(QModelIndex(), fila, fila)
+            self._filas.append(objeto)
+            self._visibles += 1
+            self.endInsertRows()
+        else:
+            # Quedan filas por entregar a la vista: la nueva aparecerá con ellas
+            self._filas.append(objeto)
+
+    def mostrar_cargadas(self):
+        """Entrega a la vista todas las filas ya cargadas (para filtrar sobre todas)"""
+        if self._visibles < len(self._filas):
+            self.beginInsertRows(QModelIndex(), self._visibles, len(self._filas) - 1)
+            self._visibles = len(self._filas)
+            self.endInsertRows()
+
+    # ---------- QAbstractTableModel ----------
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._visibles
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columnas)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= self._visibles:
+            return None
+        columna = self.columnas[index.column()]
+        objeto = self._filas[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return columna.formato(columna.valor(objeto))
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            if isinstance(columna.valor(objeto), (int, float)):
+                return int(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+            return None
+        if role == Qt.ItemDataRole.UserRole:
+            return objeto
+        if role == ROL_ORDEN:
+            return columna.valor(objeto)
+        return None
+
+    def headerData(self, seccion, orientacion, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientacion == Qt.Orientation.Horizontal:
+            return self.columnas[seccion].titulo
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return self._visibles < len(self._filas) or self._hay_mas
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+
+        if self._visibles >= len(self._filas) and self._hay_mas:
+            nuevas, self._hay_mas = self._cargar_mas(self._filas[-1] if self._filas else None)
+            if not nuevas:
+                self._hay_mas = False
+            self._filas.extend(nuevas or [])
+
+        cantidad = min(len(self._filas) - self._visibles, self.tamano_lote)
+        if cantidad <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._visibles, self._visibles + cantidad - 1)
+        self._visibles += cantidad
+        self.endInsertRows()
+
+
+# ==========================================
+# CLASE: ProxyTabla
+# PROPÓSITO: Ordenar por el valor real de la columna y filtrar por texto
+# sin importar acentos ni mayúsculas
+# ==========================================
+
+class ProxyTabla(QSortFilterProxyModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._palabras: List[str] = []
+
+    def set_texto_filtro(self, texto: str):
+        """Cada palabra escrita debe aparecer en alguna columna de la fila"""
+        self._palabras = normalizar_texto(texto).split()
+        if self._palabras:
+            # El filtro debe ver todas las filas cargadas, no solo las ya entregadas a la vista
+            self.sourceModel().mostrar_cargadas()
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, fila, padre):
+        if not self._palabras:
+            return True
+        texto = self.sourceModel().texto_busqueda(fila)
+        return all(palabra in texto for palabra in self._palabras)
+
+    def lessThan(self, izquierda, derecha):
+        modelo = self.sourceModel()
+        a = modelo.valor_orden(izquierda.row(), izquierda.column())
+        b = modelo.valor_orden(derecha.row(), derecha.column())
+        if a is None or b is None:
+            return a is None and b is not None
+        try:
+            return a < b
+        except TypeError:
+            return str(a) < str(b)
+
+
+# ==========================================
+# CLASE: TablaDatos
+# PROPÓSITO: Widget listo para usar en las ventanas: campo de filtro,
+# tabla virtualizada y contador de filas
+# ==========================================
+
+class TablaDatos(QWidget):
+    """
+    Uso:
+        self.tabla_facturas = TablaDatos([
+            Columna("ID", lambda f: f.id_factura),
+            Columna("Total", lambda f: f.monto_total, lambda v: f"${v:,.2f}"),
+        ])
+        self.tabla_facturas.fila_activada.connect(self.al_elegir_factura)
+        self.tabla_facturas.mostrar(facturas)
+    """
+
+    fila_activada = pyqtSignal(object)  # objeto de la fila (doble clic o Enter)
+
+    def __init__(self, columnas: Sequence[Columna], parent=None, tamano_lote: int = 200,
+                 texto_filtro: str = "🔎 Filtrar resultados..."):
+        super().__init__(parent)
+
+        self.modelo = ModeloTabla(columnas, tamano_lote, self)
+        self.proxy = ProxyTabla(self)
+        self.proxy.setSourceModel(self.modelo)
+
+        self.filtro_edit = QLineEdit()
+        self.filtro_edit.setPlaceholderText(texto_filtro)
+        self.filtro_edit.setClearButtonEnabled(True)
+        self.contador_label = QLabel("")
+
+        self.temporizador_filtro = QTimer(self)
+        self.temporizador_filtro.setSingleShot(True)
+        self.temporizador_filtro.setInterval(ESPERA_FILTRO_MS)
+        self.temporizador_filtro.timeout.connect(self._aplicar_filtro)
+        self.filtro_edit.textChanged.connect(self.temporizador_filtro.start)
+
+        self.tabla = QTableView()
+        self.tabla.setModel(self.proxy)
+        self.tabla.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.tabla.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.tabla.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.tabla.setAlternatingRowColors(True)
+        self.tabla.setWordWrap(False)
+        # Filas de alto fijo: la vista no tiene que medir cada fila para desplazarse
+        self.tabla.verticalHeader().setVisible(False)
+        self.tabla.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.tabla.horizontalHeader().setStretchLastSection(True)
+        # Sin columna de orden al inicio: se respeta el orden en que llegan las filas
+        self.tabla.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.tabla.setSortingEnabled(True)
+        self.tabla.setMinimumHeight(220)
+        self.tabla.activated.connect(self._al_activar)
+
+        self.modelo.modelReset.connect(self._actualizar_contador)
+        self.modelo.rowsInserted.connect(self._actualizar_contador)
+
+        encabezado = QHBoxLayout()
+        encabezado.addWidget(self.filtro_edit)
+        encabezado.addWidget(self.contador_label)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(encabezado)
+        layout.addWidget(self.tabla)
+
+    def mostrar(self, filas: Sequence[Any], cargar_mas: CargarMas = None):
+        """Muestra las filas; con `cargar_mas` se siguen trayendo al llegar al final"""
+        self.modelo.set_filas(filas, cargar_mas)
+        if self.filtro_edit.text().strip():
+            self.proxy.set_texto_filtro(self.filtro_edit.text())
+
+    def limpiar(self):
+        self.modelo.set_filas([])
+
+    def actualizar_fila(self, objeto, clave: Callable[[Any], Any]) -> bool:
+        """Reemplaza y repinta la fila con la misma clave que `objeto` (ver ModeloTabla.reemplazar_fila)"""
+        actualizada = self.modelo.reemplazar_fila(objeto, clave)
+        if actualizada and self.filtro_edit.text().strip():
+            # El texto de la fila cambió: puede dejar de coincidir con el filtro (o empezar a hacerlo)
+            self.proxy.invalidateFilter()
+            self._actualizar_contador()
+        return actualizada
+
+    def agregar_fila(self, objeto, al_inicio: bool = False):
+        self.modelo.agregar_fila(objeto, al_inicio)
+        self._actualizar_contador()
+
+    def fila_actual(self):
+        """Objeto de la fila seleccionada, o None"""
+        index = self.tabla.currentIndex()
+        if not index.isValid():
+            return None
+        return self.modelo.fila_en(self.proxy.mapToSource(index).row())
+
+    def _aplicar_filtro(self):
+        self.proxy.set_texto_filtro(self.filtro_edit.text())
+        self._actualizar_contador()
+
+    def _al_activar(self, index):
+        objeto = self.modelo.fila_en(self.proxy.mapToSource(index).row())
+        if objeto is not None:
+            self.fila_activada.emit(objeto)
+
+    def _actualizar_contador(self, *args):
+        cargadas = len(self.modelo.filas)
+        texto = f"{self.proxy.rowCount()} de {cargadas}"
+        if self.modelo.hay_mas:
+            texto += "+ (desplácese para cargar más)"
+        self.contador_label.setText(texto)
+
+
+__all__ = ['TablaDatos', 'ModeloTabla', 'ProxyTabla', 'Columna', 'ROL_ORDEN']